@@ -2,7 +2,14 @@
 Proxmox MCP Server - A Model Context Protocol server for interacting with Proxmox hypervisors.
 """
 
-from .server import ProxmoxMCPServer
-
 __version__ = "0.1.0"
 __all__ = ["ProxmoxMCPServer"]
+
+
+def __getattr__(name):
+    # Imported on first use: the HTTP entry points don't need FastMCP and
+    # would otherwise pay for its import before they can bind
+    if name == "ProxmoxMCPServer":
+        from .server import ProxmoxMCPServer
+        return ProxmoxMCPServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,7 +13,7 @@ The models provide:
 - Field descriptions
 - Required vs optional field handling
 """
-from typing import Optional, Annotated
+from typing import Dict, List, Optional, Annotated
 from pydantic import BaseModel, Field
 
 class NodeStatus(BaseModel):
@@ -62,19 +62,207 @@ class LoggingConfig(BaseModel):
     
     Defines logging parameters with sensible defaults.
     Supports both file and console logging with
-    customizable format and log levels.
+    customizable format and log levels, written from a
+    background queue, as text or JSON lines, with
+    repeated DEBUG/INFO messages rate limited.
     """
     level: str = "INFO"  # Optional: Log level (default: INFO)
     format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"  # Optional: Log format
     file: Optional[str] = None  # Optional: Log file path (default: None for console logging)
+    queued: bool = True  # Optional: Write records from a background thread instead of the caller
+    queue_size: int = Field(default=10000, ge=0)  # Optional: Queued records before new ones are dropped (0: unbounded)
+    json_format: bool = False  # Optional: One JSON object per line instead of `format`
+    repeat_window: float = Field(default=10.0, ge=0)  # Optional: Seconds per rate limiting window (0: disabled)
+    repeat_burst: int = Field(default=20, ge=1)  # Optional: Records per call site and window before sampling
+    repeat_sample: int = Field(default=100, ge=0)  # Optional: Keep one in N records past the burst (0: none)
+
+class InventoryConfig(BaseModel):
+    """Model for the background inventory refresher.
+
+    Controls how often the in-memory cluster model is refreshed from
+    /cluster/resources. The refresh interval adapts between the
+    minimum and maximum depending on how fast the cluster changes.
+    """
+    enabled: bool = True  # Optional: Run the background refresher (default: True)
+    min_interval: float = 5.0  # Optional: Fastest refresh interval in seconds
+    max_interval: float = 60.0  # Optional: Slowest refresh interval in seconds
+    max_staleness: float = 120.0  # Optional: Older snapshots are ignored by listing tools
+
+class MetricsConfig(BaseModel):
+    """Model for the bulk metrics engine.
+
+    Controls the size of the per-guest ring buffers, how long a
+    bulk /cluster/resources sample is reused when no fresh inventory
+    snapshot is available, and the optional on-disk history store.
+    """
+    ring_capacity: int = Field(default=360, ge=1)  # Optional: Samples kept per guest series
+    sample_ttl: float = 10.0  # Optional: Seconds a bulk sample is reused without inventory
+    query_workers: int = Field(default=8, ge=1)  # Optional: Concurrent RRD fetches per query
+    store_path: Optional[str] = None  # Optional: Directory of the local time-series store (disabled if unset)
+    store_retention_days: int = Field(default=30, ge=1)  # Optional: Days of history kept on disk
+    store_flush_interval: float = 60.0  # Optional: Seconds between two batched store writes
+
+class PlacementConfig(BaseModel):
+    """Model for the placement recommender.
+
+    Controls which nodes and storages are eligible for new guests and
+    how candidates are ranked when `node="auto"` or `storage="auto"`.
+    """
+    memory_headroom: float = Field(default=0.1, ge=0, lt=1)  # Optional: Fraction of node memory kept free
+    storage_headroom: float = Field(default=0.1, ge=0, lt=1)  # Optional: Fraction of storage kept free
+    cpu_overcommit: float = Field(default=4.0, gt=0)  # Optional: Max allocated vCPUs per physical core
+    memory_weight: float = 0.6  # Optional: Weight of free memory in the node score
+    cpu_weight: float = 0.4  # Optional: Weight of CPU commit in the node score
+    storage_weight: float = 0.5  # Optional: Weight of storage free space in the final score
+    reservation_ttl: float = 300.0  # Optional: Max seconds capacity stays reserved for a new guest
+
+class NodeConfig(BaseModel):
+    """Model for live node status collection.
+
+    Controls the fan-out used by get_nodes when no fresh inventory is
+    available: how many nodes are queried at once and how long a slow
+    node may delay the listing before its basic data is used instead.
+    """
+    status_deadline: float = Field(default=3.0, gt=0)  # Optional: Seconds to wait for per-node status
+    status_workers: int = Field(default=8, ge=1)  # Optional: Nodes queried concurrently
+
+class StorageConfig(BaseModel):
+    """Model for cluster-wide storage status collection and content indexing.
+
+    Controls how many nodes or storages are queried at once, how long a
+    collected status is served from cache, and how often the storage
+    content index is refreshed.
+    """
+    status_ttl: float = 15.0  # Optional: Seconds a storage status collection is reused
+    status_workers: int = Field(default=8, ge=1)  # Optional: Nodes/storages queried concurrently
+    content_index: bool = True  # Optional: Refresh the content index in the background (HTTP servers)
+    content_interval: float = 300.0  # Optional: Seconds between two content index refreshes
+    content_max_age: float = 3600.0  # Optional: Re-list a storage after this long even if unchanged
+
+class ListingBoundsConfig(BaseModel):
+    """Model for the staleness bounds of one listing tool (unset fields use the defaults)."""
+    ttl: Optional[float] = Field(default=None, ge=0)  # Optional: Seconds a result is served as fresh
+    max_stale: Optional[float] = Field(default=None, ge=0)  # Optional: Seconds past ttl it is served while refreshed
+
+class ListingCacheConfig(BaseModel):
+    """Model for stale-while-revalidate caching of listing tools.
+
+    get_nodes, get_vms, get_containers, get_storage and get_cluster_status
+    results are reused for ttl seconds. For max_stale more seconds an
+    expired result is still returned at once, flagged with its age, while
+    a single background refresh runs. Bounds can be set per tool.
+    """
+    enabled: bool = True  # Optional: Cache listing results
+    ttl: float = Field(default=5.0, ge=0)  # Optional: Seconds a result is served as fresh
+    max_stale: float = Field(default=60.0, ge=0)  # Optional: Seconds past ttl it is served while refreshed
+    tools: Dict[str, ListingBoundsConfig] = Field(default_factory=dict)  # Optional: Bounds per tool name
+    refresh_workers: int = Field(default=2, ge=1)  # Optional: Concurrent background refreshes
+    max_entries: int = Field(default=128, ge=1)  # Optional: Cached results (tool and arguments)
+
+class StartupConfig(BaseModel):
+    """Model for server startup behaviour.
+
+    With fast_start, the HTTP servers bind and answer /health before the
+    Proxmox connection is checked; the connection and the tools are set up
+    in the background and retried until they succeed. Tool calls made in
+    the meantime wait up to ready_timeout for them. With warmup, readiness
+    is only reported once connections are open and the caches are filled.
+    """
+    fast_start: bool = True  # Optional: Bind first, connect to Proxmox in the background
+    ready_timeout: float = Field(default=30.0, ge=0)  # Optional: Seconds a tool call waits for readiness
+    retry_interval: float = Field(default=5.0, gt=0)  # Optional: Seconds between two connection attempts
+    warmup: bool = True  # Optional: Prefetch caches and open connections before reporting ready
+    warmup_connections: int = Field(default=4, ge=0, le=10)  # Optional: Pooled API connections opened at warm-up
+
+class GovernorConfig(BaseModel):
+    """Model for the client-side governor of Proxmox API requests.
+
+    Requests are rate limited per node and per endpoint class (read,
+    write, tasks, rrd), and each node has a circuit breaker that opens
+    after consecutive failures. While a circuit is open, GET requests are
+    answered with the last good response when it is recent enough.
+    """
+    enabled: bool = True  # Optional: Govern Proxmox API requests
+    node_rate: float = Field(default=20.0, gt=0)  # Optional: Requests per second per node
+    class_rates: Dict[str, float] = Field(  # Optional: Requests per second per endpoint class
+        default_factory=lambda: {"read": 30.0, "write": 5.0, "tasks": 20.0, "rrd": 10.0}
+    )
+    max_delay: float = Field(default=10.0, ge=0)  # Optional: Seconds a request may be held back
+    failure_threshold: int = Field(default=5, ge=1)  # Optional: Consecutive failures opening a circuit
+    open_seconds: float = Field(default=15.0, gt=0)  # Optional: Seconds before the first probe
+    max_open_seconds: float = Field(default=120.0, gt=0)  # Optional: Upper bound of the doubling open time
+    stale_ttl: float = Field(default=300.0, ge=0)  # Optional: Seconds a response may be served stale (0 disables)
+    stale_entries: int = Field(default=512, ge=0)  # Optional: Responses kept for stale serving
+
+class RetryConfig(BaseModel):
+    """Model for retries of transient Proxmox API failures.
+
+    GET requests are retried on timeouts, connection errors and 502, 503,
+    504, 595 and 596 responses; other requests only when the connection
+    could not be established or when their path ends with one of
+    safe_posts. Attempts use exponential backoff with jitter and stop at
+    the per-call deadline.
+    """
+    enabled: bool = True  # Optional: Retry transient API failures
+    max_attempts: int = Field(default=3, ge=1)  # Optional: Attempts per API call, the first included
+    base_delay: float = Field(default=0.2, ge=0)  # Optional: Backoff before the first retry (seconds, doubled each time)
+    max_delay: float = Field(default=2.0, ge=0)  # Optional: Upper bound of a backoff
+    deadline: float = Field(default=20.0, gt=0)  # Optional: Seconds per API call, retries included
+    safe_posts: List[str] = Field(default_factory=list)  # Optional: Path suffixes of POSTs safe to retry (e.g. "status/start")
+
+class SchedulerConfig(BaseModel):
+    """Model for per-client rate limiting and fair scheduling of tool calls.
+
+    Clients are API keys, or API key and MCP session when the client sends
+    one. Read and write tools have separate budgets and execution slots;
+    when the slots are busy, calls wait in a queue weighted by the
+    weight of the API key.
+    """
+    enabled: bool = True  # Optional: Rate limit and queue tool calls
+    read_rate: float = Field(default=10.0, gt=0)  # Optional: Read tool calls per second and client
+    read_burst: int = Field(default=30, ge=1)  # Optional: Read tool calls allowed in a burst
+    read_slots: int = Field(default=8, ge=1)  # Optional: Read tool calls executed concurrently
+    write_rate: float = Field(default=1.0, gt=0)  # Optional: Write tool calls per second and client
+    write_burst: int = Field(default=10, ge=1)  # Optional: Write tool calls allowed in a burst
+    write_slots: int = Field(default=4, ge=1)  # Optional: Write tool calls executed concurrently
+    max_queued: int = Field(default=20, ge=0)  # Optional: Calls a client may have waiting per lane
+    queue_timeout: float = Field(default=30.0, gt=0)  # Optional: Seconds a call waits for a slot
+
+class ApiKeyConfig(BaseModel):
+    """Model for an API key accepted by the HTTP servers.
+
+    The key is given as a value, as the name of an environment variable
+    holding it or as its SHA-256 (so that it doesn't appear in the config).
+    Scopes are read (listing and status tools), power (tools changing
+    guests, implies read) and admin (/admin endpoints, implies both).
+    """
+    name: str  # Required: Key name, shown in logs and admin reports
+    key: Optional[str] = None  # Optional: Key value
+    key_env: Optional[str] = None  # Optional: Environment variable holding the key
+    key_sha256: Optional[str] = None  # Optional: Hex SHA-256 of the key
+    scopes: List[str] = Field(default_factory=lambda: ["read"])  # Optional: read, power and/or admin
+    rate_limit: float = Field(default=0.0, ge=0)  # Optional: Requests per second (0 for unlimited)
+    rate_burst: int = Field(default=20, ge=1)  # Optional: Requests allowed in a burst
+    weight: float = Field(default=1.0, gt=0)  # Optional: Share of tool execution slots relative to other keys
 
 class Config(BaseModel):
     """Root configuration model.
-    
+
     Combines all configuration models into a single validated
-    configuration object. All sections are required to ensure
-    proper server operation.
+    configuration object. The proxmox, auth and logging sections
+    are required; the remaining sections fall back to defaults.
     """
     proxmox: ProxmoxConfig  # Required: Proxmox connection settings
     auth: AuthConfig  # Required: Authentication credentials
     logging: LoggingConfig  # Required: Logging configuration
+    inventory: InventoryConfig = Field(default_factory=InventoryConfig)  # Optional: Background inventory settings
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)  # Optional: Metrics engine settings
+    placement: PlacementConfig = Field(default_factory=PlacementConfig)  # Optional: Placement recommender settings
+    nodes: NodeConfig = Field(default_factory=NodeConfig)  # Optional: Node status collection settings
+    storage: StorageConfig = Field(default_factory=StorageConfig)  # Optional: Storage status collection settings
+    listings: ListingCacheConfig = Field(default_factory=ListingCacheConfig)  # Optional: Listing tool caching
+    startup: StartupConfig = Field(default_factory=StartupConfig)  # Optional: Server startup settings
+    governor: GovernorConfig = Field(default_factory=GovernorConfig)  # Optional: Proxmox API rate limits and circuit breakers
+    retry: RetryConfig = Field(default_factory=RetryConfig)  # Optional: Retries of transient API failures
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)  # Optional: Per-client tool call scheduling
+    api_keys: List[ApiKeyConfig] = Field(default_factory=list)  # Optional: API keys besides MCPO_API_KEY
@@ -0,0 +1,231 @@
+"""
+API key authentication for the HTTP servers.
+
+Every HTTP server used to carry its own copy of `verify_api_key`, comparing
+the bearer token to the single MCPO_API_KEY with `!=`. This module replaces
+them with one registry shared by all servers:
+- Several keys, from MCPO_API_KEY and the `api_keys` config section
+- Per-key scopes: "read" (listing and status tools), "power" (tools that
+  change guests) and "admin" (/admin endpoints); power implies read and
+  admin implies both
+- Per-key rate limits (token bucket), answered with 429 and Retry-After
+- Constant-time comparison: the presented token is hashed with SHA-256 and
+  the digest is compared with `hmac.compare_digest`, so neither the key
+  values nor the config need to be scanned per request
+
+Principals are built once when the keys are loaded and looked up by
+digest, so the per-request cost is one hash and one dict lookup whatever
+the number of keys and scopes.
+"""
+import hashlib
+import hmac
+import logging
+import math
+import os
+import time
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from fastapi import HTTPException
+
+from ..config.models import ApiKeyConfig
+
+READ = "read"
+POWER = "power"
+ADMIN = "admin"
+
+# Scopes granted by each configurable scope
+_IMPLIED: Dict[str, FrozenSet[str]] = {
+    READ: frozenset({READ}),
+    POWER: frozenset({READ, POWER}),
+    ADMIN: frozenset({READ, POWER, ADMIN}),
+}
+
+# Tools that don't change anything; every other tool needs the power scope
+READ_TOOLS = frozenset({
+    "get_nodes",
+    "get_node_status",
+    "get_vms",
+    "get_storage",
+    "search_storage_content",
+    "get_cluster_status",
+    "get_cluster_health",
+    "get_containers",
+    "list_tasks",
+    "wait_tasks",
+    "tail_task_log",
+    "query_metrics",
+})
+
+
+def tool_scope(tool_name: str) -> str:
+    """Scope needed to call a tool (power unless known to be read-only)."""
+    return READ if tool_name in READ_TOOLS else POWER
+
+
+def key_digest(key: str) -> bytes:
+    """SHA-256 digest of an API key."""
+    return hashlib.sha256(key.encode()).digest()
+
+
+class RateLimit:
+    """Token bucket: `rate` requests per second, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """Take a token.
+
+        Returns:
+            0 if a token was taken, else the seconds until one is available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Principal:
+    """An authenticated API key: its name, scopes and rate limit."""
+
+    __slots__ = ("name", "scopes", "digest", "limit", "weight", "requests", "limited")
+
+    def __init__(self, name: str, scopes: FrozenSet[str], digest: bytes,
+                 limit: Optional[RateLimit] = None, weight: float = 1.0):
+        self.name = name
+        self.scopes = scopes
+        self.digest = digest
+        self.limit = limit
+        self.weight = weight
+        self.requests = 0
+        self.limited = 0
+
+    def require(self, scope: str) -> "Principal":
+        """Raise 403 unless the key has `scope`."""
+        if scope not in self.scopes:
+            raise HTTPException(status_code=403, detail=f"API key '{self.name}' lacks the '{scope}' scope")
+        return self
+
+    def client(self, session: Optional[str] = None) -> str:
+        """Client identifier for scheduling: the key name, and the session if any."""
+        return f"{self.name}/{session[:64]}" if session else self.name
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "scopes": sorted(self.scopes),
+            "rate_limit": self.limit.rate if self.limit else None,
+            "weight": self.weight,
+            "requests": self.requests,
+            "limited": self.limited,
+        }
+
+
+class ApiKeyAuth:
+    """Registry of the accepted API keys."""
+
+    def __init__(self, keys: Iterable[ApiKeyConfig] = (), default_key: Optional[str] = None):
+        """Build the principals.
+
+        Args:
+            keys: Configured keys
+            default_key: Key with every scope and no rate limit (MCPO_API_KEY)
+
+        Raises:
+            ValueError: If a key has no value, an unknown scope or is
+                       configured twice, or if there is no key at all
+                       (keys whose key_env is unset are skipped)
+        """
+        self.logger = logging.getLogger("proxmox-mcp.auth")
+        self._principals: Dict[bytes, Principal] = {}
+        if default_key:
+            self._add(Principal("default", _IMPLIED[ADMIN], key_digest(default_key)))
+        for key in keys:
+            if key.key_env and not key.key and not key.key_sha256 and not os.getenv(key.key_env):
+                # Fail closed: the key just can't be used
+                self.logger.warning(f"API key '{key.name}' disabled: {key.key_env} is not set")
+                continue
+            self._add(self._principal(key))
+        if not self._principals:
+            raise ValueError("No API key configured: set MCPO_API_KEY or api_keys")
+
+    @classmethod
+    def from_env(cls, keys: Iterable[ApiKeyConfig] = ()) -> "ApiKeyAuth":
+        """Registry of the configured keys plus MCPO_API_KEY."""
+        return cls(keys, os.getenv("MCPO_API_KEY"))
+
+    @staticmethod
+    def _principal(key: ApiKeyConfig) -> Principal:
+        if key.key_sha256:
+            try:
+                digest = bytes.fromhex(key.key_sha256)
+            except ValueError:
+                digest = b""
+            if len(digest) != hashlib.sha256().digest_size:
+                raise ValueError(f"API key '{key.name}': key_sha256 must be 64 hex digits")
+        else:
+            value = key.key or (os.getenv(key.key_env) if key.key_env else None)
+            if not value:
+                raise ValueError(f"API key '{key.name}' has no value (set key, key_env or key_sha256)")
+            digest = key_digest(value)
+        scopes: FrozenSet[str] = frozenset()
+        for scope in key.scopes:
+            if scope not in _IMPLIED:
+                raise ValueError(f"API key '{key.name}': unknown scope '{scope}'")
+            scopes |= _IMPLIED[scope]
+        limit = RateLimit(key.rate_limit, key.rate_burst) if key.rate_limit > 0 else None
+        return Principal(key.name, scopes, digest, limit, key.weight)
+
+    def _add(self, principal: Principal) -> None:
+        if principal.digest in self._principals:
+            raise ValueError(f"API key '{principal.name}' is the same key as "
+                             f"'{self._principals[principal.digest].name}'")
+        self._principals[principal.digest] = principal
+
+    def authenticate(self, authorization: Optional[str], scope: Optional[str] = READ) -> Principal:
+        """Resolve the Authorization header to a principal.
+
+        Args:
+            authorization: "Bearer <key>" header value
+            scope: Scope to require (None to check it later with
+                  Principal.require)
+
+        Returns:
+            The principal of the key
+
+        Raises:
+            HTTPException: 401 without a bearer token, 403 for an unknown
+                          key or a missing scope, 429 when rate limited
+        """
+        if not authorization:
+            raise HTTPException(status_code=401, detail="Missing Authorization header")
+        if not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Invalid Authorization header format. Use: Bearer <token>")
+
+        digest = key_digest(authorization[7:])
+        principal = self._principals.get(digest)
+        if principal is None or not hmac.compare_digest(principal.digest, digest):
+            raise HTTPException(status_code=403, detail="Invalid API key")
+
+        if principal.limit is not None:
+            wait = principal.limit.acquire()
+            if wait:
+                principal.limited += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Rate limit exceeded for API key '{principal.name}'",
+                    headers={"Retry-After": str(math.ceil(wait))}
+                )
+        principal.requests += 1
+        if scope is not None:
+            principal.require(scope)
+        return principal
+
+    def report(self) -> Dict[str, object]:
+        """Per-key counters for admin endpoints (no key material)."""
+        return {p.name: p.report() for p in self._principals.values()}
@@ -0,0 +1,318 @@
+"""
+Storage content index for the Proxmox MCP server.
+
+Finding an ISO, the backups of a guest or disks nobody owns means listing
+/nodes/{node}/storage/{storage}/content for every storage in the cluster.
+This module keeps that listing in memory instead:
+- Storages are crawled concurrently, shared storages from a single node
+- Crawls are incremental: a storage is only listed again when its usage
+  changed since the last crawl (or its entry is older than a maximum age)
+- Volumes are indexed by vmid, content type and format for fast lookups
+- Guests known to the metrics snapshot tell which disks are orphaned
+
+The index is refreshed by a background task in the HTTP servers and
+lazily on search otherwise.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config.models import StorageConfig
+
+# Content types holding guest disks (candidates for orphan detection)
+DISK_CONTENT = ("images", "rootdir")
+SORT_KEYS = ("size", "ctime", "volid")
+
+Key = Tuple[str, str]  # (scope, volid); scope is the node name or "shared"
+
+
+def _vmid(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StorageContentIndex:
+    """In-memory, incrementally refreshed index of storage volumes."""
+
+    def __init__(self, proxmox_api: Any, collector: Any, metrics: Any,
+                 config: Optional[StorageConfig] = None):
+        """Initialize the index.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            collector: StorageStatusCollector telling which storages exist and changed
+            metrics: MetricsEngine providing the guest snapshot (orphan detection)
+            config: Storage configuration (defaults apply when omitted)
+        """
+        self.proxmox = proxmox_api
+        self.collector = collector
+        self.metrics = metrics
+        self.config = config or StorageConfig()
+        self.logger = logging.getLogger("proxmox-mcp.content")
+
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._volumes: Dict[Key, Dict[str, Any]] = {}
+        self._by_vmid: Dict[int, Set[Key]] = {}
+        self._by_content: Dict[str, Set[Key]] = {}
+        self._by_format: Dict[str, Set[Key]] = {}
+        self._by_storage: Dict[Tuple[str, str], Set[Key]] = {}
+        # (scope, storage) -> (usage signature, crawl time)
+        self._crawled: Dict[Tuple[str, str], Tuple[Tuple[int, int], float]] = {}
+        self._updated_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, Any] = {
+            "refreshes": 0,
+            "storages_crawled": 0,
+            "storages_skipped": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_refresh_ms": 0.0,
+        }
+
+    # ---------- refresh ----------
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """Crawl storages whose usage changed since their last crawl.
+
+        Args:
+            force: Crawl every storage again
+
+        Returns:
+            Counts of crawled/skipped storages and added/removed volumes
+        """
+        with self._refresh_lock:
+            started = time.perf_counter()
+            status = self.collector.collect()
+            now = time.time()
+
+            targets: Dict[Tuple[str, str], Tuple[str, Tuple[int, int]]] = {}
+            for store in status["storages"]:
+                if store["status"] != "online":
+                    continue
+                scope = "shared" if store["shared"] else store["node"]
+                targets[(scope, store["storage"])] = (store["nodes"][0], (store["used"], store["total"]))
+
+            todo = []
+            for key, (node, signature) in targets.items():
+                crawled = self._crawled.get(key)
+                if (not force and crawled is not None and crawled[0] == signature
+                        and now - crawled[1] < self.config.content_max_age):
+                    continue
+                todo.append((key, node, signature))
+
+            listings: List[Tuple[Tuple[str, str], Tuple[int, int], Optional[List[Dict[str, Any]]]]] = []
+            if todo:
+                workers = max(1, min(self.config.status_workers, len(todo)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-content") as pool:
+                    listings = list(pool.map(self._list_content, todo))
+
+            added = removed = 0
+            with self._lock:
+                # Storages that disappeared (or went offline) drop their volumes;
+                # those of nodes that didn't answer are kept until they do
+                for key in [k for k in self._by_storage
+                            if k not in targets and k[0] not in status["errors"]]:
+                    removed += self._drop_storage(key)
+                    self._crawled.pop(key, None)
+                for key, signature, volumes in listings:
+                    if volumes is None:
+                        continue
+                    removed += self._drop_storage(key)
+                    for item in volumes:
+                        self._add(key, item)
+                        added += 1
+                    self._crawled[key] = (signature, now)
+                self._updated_at = now
+
+            self.stats["refreshes"] += 1
+            self.stats["storages_crawled"] += len(todo)
+            self.stats["storages_skipped"] += len(targets) - len(todo)
+            self.stats["last_refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return {"crawled": len(todo), "skipped": len(targets) - len(todo),
+                    "added": added, "removed": removed}
+
+    def _list_content(self, target: Tuple[Tuple[str, str], str, Tuple[int, int]]):
+        """Content listing of one storage (runs in a worker thread)."""
+        key, node, signature = target
+        try:
+            return key, signature, self.proxmox.nodes(node).storage(key[1]).content.get() or []
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.stats["last_error"] = f"{key[1]}@{node}: {e}"
+            self.logger.warning(f"Failed to list content of storage {key[1]} on {node}: {e}")
+            return key, signature, None
+
+    def _add(self, storage_key: Tuple[str, str], item: Dict[str, Any]) -> None:
+        scope, storage = storage_key
+        volid = item.get("volid")
+        if not volid:
+            return
+        key = (scope, volid)
+        record = {
+            "volid": volid,
+            "storage": storage,
+            "node": scope,
+            "content": item.get("content"),
+            "format": item.get("format"),
+            "size": int(item.get("size") or 0),
+            "vmid": _vmid(item.get("vmid")),
+            "ctime": int(item.get("ctime") or 0),
+            "notes": item.get("notes"),
+        }
+        self._volumes[key] = record
+        self._by_storage.setdefault(storage_key, set()).add(key)
+        if record["vmid"] is not None:
+            self._by_vmid.setdefault(record["vmid"], set()).add(key)
+        if record["content"]:
+            self._by_content.setdefault(record["content"], set()).add(key)
+        if record["format"]:
+            self._by_format.setdefault(record["format"], set()).add(key)
+
+    def _drop_storage(self, storage_key: Tuple[str, str]) -> int:
+        keys = self._by_storage.pop(storage_key, set())
+        for key in keys:
+            record = self._volumes.pop(key, None)
+            if record is None:
+                continue
+            for index, value in ((self._by_vmid, record["vmid"]),
+                                 (self._by_content, record["content"]),
+                                 (self._by_format, record["format"])):
+                bucket = index.get(value)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del index[value]
+        return len(keys)
+
+    async def run(self) -> None:
+        """Refresh forever; intended to run as a background asyncio task."""
+        while True:
+            try:
+                counts = await asyncio.to_thread(self.refresh)
+                self.logger.debug(f"Storage content index refreshed: {counts}")
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.stats["last_error"] = str(e)
+                self.logger.warning(f"Storage content refresh failed: {e}")
+            await asyncio.sleep(self.config.content_interval)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start the background refresher on the running event loop."""
+        if not self.config.content_index or self._task is not None:
+            return self._task
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the background refresher."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    # ---------- queries ----------
+    def age(self) -> Optional[float]:
+        """Seconds since the last refresh (None if never built)."""
+        if self._updated_at is None:
+            return None
+        return time.time() - self._updated_at
+
+    def _guest_vmids(self) -> Set[int]:
+        return {
+            vmid for vmid in (_vmid(item.get("vmid")) for item in self.metrics.latest().values()
+                              if item.get("type") in ("qemu", "lxc"))
+            if vmid is not None
+        }
+
+    def search(self, content: Optional[str] = None, vmid: Optional[int] = None,
+               storage: Optional[str] = None, node: Optional[str] = None,
+               fmt: Optional[str] = None, name: Optional[str] = None,
+               orphaned: bool = False, sort: str = "size", limit: int = 50) -> Dict[str, Any]:
+        """Search indexed volumes.
+
+        Args:
+            content: Content type (iso, vztmpl, backup, images, rootdir, snippets, import)
+            vmid: Owning guest ID
+            storage: Storage name
+            node: Node name ("shared" for shared storages); local storages of
+                other nodes are excluded, shared storages always match
+            fmt: Volume format (qcow2, raw, iso, vma.zst, tar.zst, ...)
+            name: Case-insensitive substring of the volume ID
+            orphaned: Only guest disks whose VMID no longer exists
+            sort: "size" (largest first), "ctime" (newest first) or "volid"
+            limit: Maximum results (0 for all)
+
+        Returns:
+            Dictionary with "results", "matched", "indexed" and the index "age"
+
+        Raises:
+            ValueError: If `sort` is unknown
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}'. Expected one of: {', '.join(SORT_KEYS)}")
+        if self._task is None:
+            age = self.age()
+            if age is None or age > self.config.content_interval:
+                self.refresh()
+
+        guests = self._guest_vmids() if orphaned else set()
+        with self._lock:
+            candidates: Optional[Set[Key]] = None
+            for index, value in ((self._by_vmid, vmid), (self._by_content, content),
+                                 (self._by_format, fmt)):
+                if value is None:
+                    continue
+                bucket = index.get(value, set())
+                candidates = set(bucket) if candidates is None else candidates & bucket
+            keys: Iterable[Key] = candidates if candidates is not None else self._volumes.keys()
+            needle = name.lower() if name else None
+            results = []
+            for key in keys:
+                record = self._volumes[key]
+                if storage is not None and record["storage"] != storage:
+                    continue
+                if node is not None and record["node"] not in (node, "shared"):
+                    continue
+                if needle is not None and needle not in record["volid"].lower():
+                    continue
+                if orphaned and (record["content"] not in DISK_CONTENT
+                                 or record["vmid"] is None or record["vmid"] in guests):
+                    continue
+                results.append(dict(record))
+            indexed = len(self._volumes)
+
+        if sort == "volid":
+            results.sort(key=lambda r: (r["volid"], r["node"]))
+        else:
+            results.sort(key=lambda r: (r[sort], r["volid"]), reverse=True)
+        matched = len(results)
+        age = self.age()
+        return {
+            "results": results[:limit] if limit else results,
+            "matched": matched,
+            "indexed": indexed,
+            "age": round(age, 1) if age is not None else None,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Index state for admin endpoints."""
+        with self._lock:
+            volumes = len(self._volumes)
+            storages = len(self._by_storage)
+        age = self.age()
+        return {
+            "volumes": volumes,
+            "storages": storages,
+            "age": round(age, 1) if age is not None else None,
+            "background": self._task is not None,
+            **self.stats,
+        }
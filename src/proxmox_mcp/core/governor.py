@@ -0,0 +1,383 @@
+"""
+Client-side governor for the Proxmox API.
+
+When pveproxy or a node is overloaded, every tool used to keep sending
+requests at full speed, and each failure became a RuntimeError after the
+full request timeout. The governor wraps the HTTP session of proxmoxer,
+so every request of every tool and engine goes through it:
+- Rate limits: a token bucket per node (paths outside /nodes/{node}
+  count as node "cluster") and one per endpoint class (read, write,
+  tasks, rrd). A request over budget is held back until a token is
+  available, or fails if that would take longer than `max_delay`
+- Circuit breakers per node: after `failure_threshold` consecutive
+  failures (timeouts, connection errors, 502/503/504 and the 595/596
+  codes pveproxy returns when it can't reach a node), requests to the
+  node fail immediately for `open_seconds`. Then a single probe request
+  is let through; if it fails, the circuit opens again for twice as
+  long, up to `max_open_seconds`
+- Stale data: the last successful response of each GET is kept for
+  `stale_ttl` seconds and served in place of a failure only while the
+  circuit of its node is open, including the failure that opens it. A
+  passing hiccup on a healthy node surfaces as an error, so callers never
+  diff against outdated configs (task status and logs are never served
+  stale, they would make waits spin on outdated data)
+
+HTTP 500 is not a failure: Proxmox uses it for ordinary errors such as
+"VM is locked". `report()` gives the circuit states and counters.
+
+The session wrapper also applies the retry policy (see retry.py); stale
+data is then only served once the retries are exhausted.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..config.models import GovernorConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses meaning that pveproxy or the node could not serve the request
+FAILURE_STATUSES = frozenset({502, 503, 504, 595, 596})
+
+_API_PREFIX = "/api2/json/"
+
+
+class CircuitOpenError(RuntimeError):
+    """Requests to a node are suspended after repeated failures."""
+
+    def __init__(self, node: str, retry_in: float):
+        super().__init__(f"Proxmox API circuit open for {node} after repeated failures, "
+                         f"retry in {retry_in:.0f}s")
+        self.node = node
+        self.retry_in = retry_in
+
+
+class ThrottledError(RuntimeError):
+    """A request would have been held back longer than max_delay."""
+
+
+def classify(method: str, url: str) -> Tuple[str, str]:
+    """Node and endpoint class of a request.
+
+    Returns:
+        (node, class) with node "cluster" for paths outside /nodes/{node}
+        and class one of read, write, tasks and rrd
+    """
+    path = urlsplit(url).path
+    index = path.find(_API_PREFIX)
+    parts = path[index + len(_API_PREFIX):].split("/") if index >= 0 else path.strip("/").split("/")
+    node = parts[1] if len(parts) > 1 and parts[0] == "nodes" and parts[1] else "cluster"
+    if method.upper() != "GET":
+        kind = "write"
+    elif "tasks" in parts:
+        kind = "tasks"
+    elif parts[-1] in ("rrddata", "rrd"):
+        kind = "rrd"
+    else:
+        kind = "read"
+    return node, kind
+
+
+class _Bucket:
+    """Token bucket handing out reservations (the wait before sending)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.burst = max(1.0, rate * 2)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def refund(self) -> None:
+        self.tokens += 1
+
+
+class _Circuit:
+    """Circuit breaker and counters of one node."""
+
+    def __init__(self, open_seconds: float):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_for = open_seconds
+        self.probing = False
+        self.opens = 0
+        self.requests = 0
+        self.failed = 0
+        self.rejected = 0
+        self.stale_served = 0
+        self.throttled = 0
+        self.delay_total = 0.0
+
+    def report(self, now: float) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(max(0.0, self.opened_at + self.open_for - now), 1) if self.state == OPEN else 0.0,
+            "opens": self.opens,
+            "requests": self.requests,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "stale_served": self.stale_served,
+            "throttled": self.throttled,
+            "delay_ms_total": round(self.delay_total * 1000, 1),
+        }
+
+
+class UpstreamGovernor:
+    """Rate limits, circuit breakers and stale fallback for Proxmox API requests."""
+
+    def __init__(self, config: Optional[GovernorConfig] = None):
+        """Initialize the governor.
+
+        Args:
+            config: Governor configuration (defaults apply when omitted)
+        """
+        self.config = config or GovernorConfig()
+        self.logger = logging.getLogger("proxmox-mcp.governor")
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+        self._node_buckets: Dict[str, _Bucket] = {}
+        self._class_buckets = {kind: _Bucket(rate) for kind, rate in self.config.class_rates.items()}
+        self._class_counts: Dict[str, int] = {kind: 0 for kind in self._class_buckets}
+        # (url, params) -> (stored at, response), least recently used first
+        self._stale: "OrderedDict[Tuple[str, Any], Tuple[float, Any]]" = OrderedDict()
+
+    def _circuit(self, node: str) -> _Circuit:
+        circuit = self._circuits.get(node)
+        if circuit is None:
+            circuit = self._circuits[node] = _Circuit(self.config.open_seconds)
+            self._node_buckets[node] = _Bucket(self.config.node_rate)
+        return circuit
+
+    def _admit(self, node: str, kind: str, circuit: _Circuit, now: float) -> Optional[float]:
+        """Check the circuit and reserve tokens (called with the lock held).
+
+        Returns:
+            The delay before sending, or None if the circuit is open
+        """
+        if circuit.state == OPEN:
+            if now < circuit.opened_at + circuit.open_for or circuit.probing:
+                return None
+            circuit.state = HALF_OPEN
+        if circuit.state == HALF_OPEN:
+            if circuit.probing:
+                return None
+            circuit.probing = True
+
+        buckets = [self._node_buckets[node]]
+        if kind in self._class_buckets:
+            buckets.append(self._class_buckets[kind])
+        delay = max(bucket.reserve(now) for bucket in buckets)
+        if delay > self.config.max_delay:
+            for bucket in buckets:
+                bucket.refund()
+            circuit.probing = False
+            if circuit.state == HALF_OPEN:
+                circuit.state = OPEN
+            raise ThrottledError(f"Proxmox API request to {node} ({kind}) throttled: "
+                                 f"{delay:.1f}s over the {self.config.max_delay:g}s limit")
+        circuit.requests += 1
+        if kind in self._class_counts:
+            self._class_counts[kind] += 1
+        if delay:
+            circuit.throttled += 1
+            circuit.delay_total += delay
+        return delay
+
+    def _record(self, node: str, circuit: _Circuit, ok: bool, now: float) -> None:
+        """Update the circuit after a response (called with the lock held)."""
+        circuit.probing = False
+        if ok:
+            if circuit.state != CLOSED:
+                self.logger.info(f"Proxmox API circuit for {node} closed")
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.open_for = self.config.open_seconds
+            return
+        circuit.failed += 1
+        circuit.failures += 1
+        if circuit.state == OPEN:
+            # A request sent before the circuit opened
+            return
+        if circuit.state == HALF_OPEN:
+            circuit.open_for = min(circuit.open_for * 2, self.config.max_open_seconds)
+        elif circuit.failures < self.config.failure_threshold:
+            return
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.opens += 1
+        self.logger.warning(f"Proxmox API circuit for {node} opened after {circuit.failures} "
+                            f"consecutive failures, retrying in {circuit.open_for:g}s")
+
+    def _stale_response(self, key: Optional[Tuple[str, Any]], circuit: _Circuit, now: float) -> Any:
+        """Last good response for `key` if its circuit is open and the response
+        recent enough (called with the lock held)."""
+        if key is None or circuit.state == CLOSED:
+            return None
+        entry = self._stale.get(key)
+        if entry is None or now - entry[0] > self.config.stale_ttl:
+            return None
+        circuit.stale_served += 1
+        return entry[1]
+
+    def _stale_key(self, method: str, url: str, kind: str, params: Any) -> Optional[Tuple[str, Any]]:
+        if self.config.stale_ttl <= 0 or method.upper() != "GET" or kind == "tasks":
+            return None
+        return (url, tuple(sorted(params.items())) if params else ())
+
+    def stale(self, method: str, url: str, params: Any = None) -> Any:
+        """Last good response of a GET whose node circuit is open (None otherwise)."""
+        node, kind = classify(method, url)
+        key = self._stale_key(method, url, kind, params)
+        with self._lock:
+            return self._stale_response(key, self._circuit(node), time.monotonic())
+
+    def request(self, send: Callable[..., Any], method: str, url: str,
+                fallback: bool = True, **kwargs: Any) -> Any:
+        """Send a request through the rate limits and the circuit of its node.
+
+        Args:
+            send: The wrapped session's request method
+            method: HTTP method
+            url: Request URL
+            fallback: Answer GETs with stale data while the node's circuit is
+                     open (the retry policy asks for it after its last attempt)
+
+        Returns:
+            The response, or a stale response for a GET whose node circuit is open
+
+        Raises:
+            CircuitOpenError: If the circuit is open and there is no stale data
+            ThrottledError: If the request would wait longer than max_delay
+        """
+        node, kind = classify(method, url)
+        key = self._stale_key(method, url, kind, kwargs.get("params")) if fallback else None
+
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(node)
+            delay = self._admit(node, kind, circuit, now)
+            if delay is None:
+                stale = self._stale_response(key, circuit, now)
+                if stale is not None:
+                    return stale
+                circuit.rejected += 1
+                raise CircuitOpenError(node, max(0.0, circuit.opened_at + circuit.open_for - now))
+        if delay:
+            time.sleep(delay)
+
+        try:
+            response = send(method, url, **kwargs)
+        except OSError as e:  # requests' timeouts and connection errors
+            with self._lock:
+                now = time.monotonic()
+                self._record(node, circuit, False, now)
+                stale = self._stale_response(key, circuit, now)
+            if stale is not None:
+                self.logger.warning(f"Serving stale {url} after failure: {e}")
+                return stale
+            raise
+
+        status = getattr(response, "status_code", 200)
+        with self._lock:
+            now = time.monotonic()
+            if status in FAILURE_STATUSES:
+                self._record(node, circuit, False, now)
+                stale = self._stale_response(key, circuit, now)
+                if stale is not None:
+                    return stale
+                return response
+            self._record(node, circuit, True, now)
+            if 200 <= status < 300 and not fallback:
+                key = self._stale_key(method, url, kind, kwargs.get("params"))
+            if key is not None and 200 <= status < 300:
+                self._stale[key] = (now, response)
+                self._stale.move_to_end(key)
+                while len(self._stale) > self.config.stale_entries:
+                    self._stale.popitem(last=False)
+        return response
+
+    def open_circuits(self) -> Dict[str, float]:
+        """Nodes whose circuit is not closed, with the seconds until the next probe."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                node: round(max(0.0, c.opened_at + c.open_for - now), 1)
+                for node, c in self._circuits.items() if c.state != CLOSED
+            }
+
+    def report(self) -> Dict[str, Any]:
+        """Circuit states and counters for admin endpoints."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "nodes": {node: circuit.report(now) for node, circuit in self._circuits.items()},
+                "classes": {
+                    kind: {"rate": bucket.rate, "requests": self._class_counts[kind]}
+                    for kind, bucket in self._class_buckets.items()
+                },
+                "stale_entries": len(self._stale),
+            }
+
+
+class GovernedSession:
+    """Proxy of a requests session applying a governor and a retry policy."""
+
+    def __init__(self, session: Any, governor: Optional[UpstreamGovernor] = None, retry: Any = None):
+        self._session = session
+        self._governor = governor
+        self._retry = retry
+
+    def _attempt(self, method: str, url: str, fallback: bool, **kwargs: Any) -> Any:
+        if self._governor is None:
+            return self._session.request(method, url, **kwargs)
+        return self._governor.request(self._session.request, method, url, fallback=fallback, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        if self._retry is None:
+            return self._attempt(method, url, True, **kwargs)
+        auth = getattr(self._session, "auth", None)
+        try:
+            response = self._retry.call(lambda **kw: self._attempt(method, url, False, **kw),
+                                        method, url, kwargs, getattr(auth, "timeout", None))
+        except (OSError, CircuitOpenError):
+            stale = self._governor.stale(method, url, kwargs.get("params")) if self._governor else None
+            if stale is None:
+                raise
+            self._governor.logger.warning(f"Serving stale {url} after failed attempts")
+            return stale
+        if getattr(response, "status_code", 200) in FAILURE_STATUSES and self._governor is not None:
+            stale = self._governor.stale(method, url, kwargs.get("params"))
+            if stale is not None:
+                return stale
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+def install(api: Any, governor: Optional[UpstreamGovernor] = None, retry: Any = None) -> bool:
+    """Route the requests of a ProxmoxAPI instance through a governor and a retry policy.
+
+    Returns:
+        Whether the instance had an HTTP session to wrap
+    """
+    store = getattr(api, "_store", None)
+    if not isinstance(store, dict) or store.get("session") is None:
+        return False
+    session = store["session"]
+    if isinstance(session, GovernedSession):
+        session = session._session
+    store["session"] = GovernedSession(session, governor, retry)
+    return True
@@ -0,0 +1,218 @@
+"""
+Cluster health summary for the Proxmox MCP server.
+
+Builds a compact "how is the cluster doing" report from one
+/cluster/resources snapshot and one /cluster/status reply:
+- Quorum and node availability
+- CPU, memory and storage totals
+- vCPU and memory overcommit ratios
+- Running / stopped guest counts
+- Top consumers and fullest storages
+- A short list of alerts
+
+Resources are loaded once into per-type columns (array('d')) and every
+aggregate is a bulk reduction over those columns.
+"""
+import heapq
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+# Usage ratios above which an alert is raised
+NODE_MEM_ALERT = 0.9
+NODE_CPU_ALERT = 0.9
+STORAGE_ALERT = 0.85
+
+GUEST_FIELDS = ("cpu", "maxcpu", "mem", "maxmem", "disk", "maxdisk")
+NODE_FIELDS = ("cpu", "maxcpu", "mem", "maxmem")
+STORAGE_FIELDS = ("disk", "maxdisk")
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Columns:
+    """Entries of one resource type as parallel columns."""
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self.cols = {f: array("d") for f in self.fields}
+        self.items: List[Dict[str, Any]] = []
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self.items.append(item)
+        for f in self.fields:
+            self.cols[f].append(_num(item.get(f)))
+
+    def total(self, field: str, mask: Optional[List[bool]] = None) -> float:
+        col = self.cols[field]
+        if mask is None:
+            return sum(col)
+        return sum(v for v, keep in zip(col, mask) if keep)
+
+    def weighted(self, field: str, weight: str, mask: List[bool]) -> float:
+        """Sum of field * weight over the masked rows."""
+        return sum(a * b for a, b, keep in zip(self.cols[field], self.cols[weight], mask) if keep)
+
+
+def _ratio(num: float, den: float) -> Optional[float]:
+    return round(num / den, 2) if den else None
+
+
+def _pct(num: float, den: float) -> float:
+    return round(num / den * 100, 1) if den else 0.0
+
+
+def summarize(resources: Iterable[Dict[str, Any]], cluster_status: Optional[List[Dict[str, Any]]],
+              top: int = 5) -> Dict[str, Any]:
+    """Compute the cluster health report.
+
+    Args:
+        resources: /cluster/resources entries
+        cluster_status: /cluster/status reply (None if unavailable)
+        top: Number of top consumers / fullest storages to report
+
+    Returns:
+        Report dictionary (cluster, nodes, guests, storage, overcommit,
+        top consumers and alerts)
+    """
+    nodes = _Columns(NODE_FIELDS)
+    guests = _Columns(GUEST_FIELDS)
+    storages = _Columns(STORAGE_FIELDS)
+    seen_shared = set()
+    templates = 0
+    for item in resources:
+        rtype = item.get("type")
+        if rtype == "node":
+            nodes.add(item)
+        elif rtype in ("qemu", "lxc"):
+            if item.get("template"):
+                templates += 1
+            else:
+                guests.add(item)
+        elif rtype == "storage" and item.get("status", "available") == "available":
+            if item.get("shared"):
+                # Shared storages appear once per node; count them once
+                if item.get("storage") in seen_shared:
+                    continue
+                seen_shared.add(item.get("storage"))
+            storages.add(item)
+
+    # ---------- cluster / quorum ----------
+    cluster: Dict[str, Any] = {"name": None, "quorate": None}
+    for entry in cluster_status or []:
+        if entry.get("type") == "cluster":
+            cluster["name"] = entry.get("name")
+            cluster["quorate"] = bool(entry.get("quorate"))
+    if cluster_status and cluster["quorate"] is None:
+        # Single-node installations report no cluster entry
+        cluster["quorate"] = True
+
+    # ---------- nodes ----------
+    node_online = [n.get("status") == "online" for n in nodes.items]
+    cores = nodes.total("maxcpu", node_online)
+    node_mem = nodes.total("mem", node_online)
+    node_maxmem = nodes.total("maxmem", node_online)
+    node_report = {
+        "total": len(nodes.items),
+        "online": sum(node_online),
+        "offline": sorted(n.get("node") for n, up in zip(nodes.items, node_online) if not up),
+        "cores": int(cores),
+        "cpu_pct": _pct(nodes.weighted("cpu", "maxcpu", node_online), cores),
+        "mem_used": int(node_mem),
+        "mem_total": int(node_maxmem),
+        "mem_pct": _pct(node_mem, node_maxmem),
+    }
+
+    # ---------- guests ----------
+    running = [g.get("status") == "running" for g in guests.items]
+    counts: Dict[str, Dict[str, int]] = {}
+    for g, up in zip(guests.items, running):
+        bucket = counts.setdefault(g.get("type"), {"running": 0, "stopped": 0, "other": 0})
+        status = g.get("status")
+        bucket["running" if up else "stopped" if status == "stopped" else "other"] += 1
+    guest_report = {
+        "total": len(guests.items),
+        "running": sum(running),
+        "templates": templates,
+        "by_type": counts,
+        "cpu_used_cores": round(guests.weighted("cpu", "maxcpu", running), 2),
+        "mem_used": int(guests.total("mem", running)),
+    }
+
+    # ---------- overcommit ----------
+    all_rows = [True] * len(guests.items)
+    overcommit = {
+        "vcpu_running": _ratio(guests.total("maxcpu", running), cores),
+        "vcpu_allocated": _ratio(guests.total("maxcpu", all_rows), cores),
+        "mem_running": _ratio(guests.total("maxmem", running), node_maxmem),
+        "mem_allocated": _ratio(guests.total("maxmem", all_rows), node_maxmem),
+    }
+
+    # ---------- storage ----------
+    used = storages.total("disk")
+    total = storages.total("maxdisk")
+    fill = [
+        (_pct(d, m), i) for i, (d, m) in enumerate(zip(storages.cols["disk"], storages.cols["maxdisk"]))
+        if m > 0
+    ]
+    def _where(i: int) -> str:
+        item = storages.items[i]
+        return "shared" if item.get("shared") else item.get("node")
+
+    storage_report = {
+        "count": len(storages.items),
+        "used": int(used),
+        "total": int(total),
+        "pct": _pct(used, total),
+        "fullest": [
+            {"storage": storages.items[i].get("storage"), "node": _where(i), "pct": pct}
+            for pct, i in heapq.nlargest(top, fill)
+        ],
+    }
+
+    # ---------- top consumers ----------
+    cpu_cores = [c * m for c, m in zip(guests.cols["cpu"], guests.cols["maxcpu"])]
+    top_cpu = heapq.nlargest(top, ((v, i) for i, v in enumerate(cpu_cores) if running[i] and v > 0))
+    top_mem = heapq.nlargest(top, ((v, i) for i, v in enumerate(guests.cols["mem"]) if running[i] and v > 0))
+
+    def _guest(i: int) -> Dict[str, Any]:
+        g = guests.items[i]
+        return {"vmid": g.get("vmid"), "name": g.get("name"), "type": g.get("type"), "node": g.get("node")}
+
+    consumers = {
+        "cpu": [dict(_guest(i), cores=round(v, 2)) for v, i in top_cpu],
+        "mem": [dict(_guest(i), mem=int(v)) for v, i in top_mem],
+    }
+
+    # ---------- alerts ----------
+    alerts: List[str] = []
+    if cluster["quorate"] is False:
+        alerts.append("Cluster is not quorate")
+    for name in node_report["offline"]:
+        alerts.append(f"Node {name} is offline")
+    for n, up in zip(nodes.items, node_online):
+        if not up:
+            continue
+        if _num(n.get("maxmem")) and _num(n.get("mem")) / _num(n.get("maxmem")) > NODE_MEM_ALERT:
+            alerts.append(f"Node {n.get('node')} memory at {_pct(_num(n.get('mem')), _num(n.get('maxmem')))}%")
+        if _num(n.get("cpu")) > NODE_CPU_ALERT:
+            alerts.append(f"Node {n.get('node')} CPU at {round(_num(n.get('cpu')) * 100, 1)}%")
+    for pct, i in sorted(fill, reverse=True):
+        if pct <= STORAGE_ALERT * 100:
+            break
+        where = "shared" if _where(i) == "shared" else f"on {_where(i)}"
+        alerts.append(f"Storage {storages.items[i].get('storage')} ({where}) at {pct}%")
+
+    return {
+        "cluster": cluster,
+        "nodes": node_report,
+        "guests": guest_report,
+        "overcommit": overcommit,
+        "storage": storage_report,
+        "top": consumers,
+        "alerts": alerts,
+    }
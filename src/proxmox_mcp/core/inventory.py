@@ -0,0 +1,230 @@
+"""
+In-memory cluster inventory for the Proxmox MCP server.
+
+This module keeps a live model of the cluster built from a single
+/cluster/resources call, providing:
+- Background refresh with incremental change detection
+- Adaptive polling that speeds up while the cluster is changing
+- Cheap, lock-protected lookups for listing tools
+- Refresh cost accounting (API latency, CPU time, change counts)
+- Refresh listeners, so other components reuse each snapshot
+
+Entries are keyed by the resource "id" reported by Proxmox
+(e.g. "qemu/100", "lxc/200", "node/pve1", "storage/pve1/local").
+Only entries whose payload differs from the previous snapshot are
+replaced, so unchanged entries keep their identity between refreshes.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.models import InventoryConfig
+
+# Fields whose change means the cluster layout changed (as opposed to the
+# usage counters that move on every poll for running guests)
+STRUCTURAL_FIELDS = (
+    "status", "node", "name", "maxmem", "maxcpu", "maxdisk",
+    "template", "lock", "hastate", "tags", "content", "shared",
+)
+
+
+class ClusterInventory:
+    """Background-refreshed model of /cluster/resources.
+
+    The refresher is driven by `run()`, which is meant to be started as an
+    asyncio task from a server lifespan. The blocking API call itself runs
+    in a worker thread so the event loop keeps serving requests.
+    """
+
+    def __init__(self, proxmox_api: Any, config: Optional[InventoryConfig] = None):
+        """Initialize the inventory.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            config: Refresher configuration (defaults apply when omitted)
+        """
+        self.proxmox = proxmox_api
+        self.config = config or InventoryConfig()
+        self.logger = logging.getLogger("proxmox-mcp.inventory")
+
+        self._lock = threading.RLock()
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._updated_at: Optional[float] = None
+        self._interval = self.config.min_interval
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[List[Dict[str, Any]], float], Any]] = []
+        self.version = 0
+        self.stats: Dict[str, Any] = {
+            "refreshes": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_api_ms": 0.0,
+            "last_cpu_ms": 0.0,
+            "total_cpu_ms": 0.0,
+            "last_added": 0,
+            "last_removed": 0,
+            "last_changed": 0,
+            "last_structural": 0,
+        }
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]], float], Any]) -> None:
+        """Call `callback(resources, timestamp)` after every successful refresh.
+
+        Listener errors are logged and never abort a refresh.
+        """
+        self._listeners.append(callback)
+
+    # ---------- refresh ----------
+    def refresh(self) -> Dict[str, int]:
+        """Fetch /cluster/resources and apply the difference.
+
+        Returns:
+            Counts of added, removed, changed and structurally changed entries
+
+        Raises:
+            Exception: Any API error is propagated to the caller
+        """
+        cpu_start = time.thread_time()
+        api_start = time.perf_counter()
+        raw = self.proxmox.cluster.resources.get()
+        api_ms = (time.perf_counter() - api_start) * 1000.0
+
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for item in raw if isinstance(raw, list) else []:
+            if isinstance(item, dict) and item.get("id"):
+                fresh[item["id"]] = item
+
+        with self._lock:
+            previous = self._resources
+            removed = [rid for rid in previous if rid not in fresh]
+            added = changed = structural = 0
+            for rid, item in fresh.items():
+                old = previous.get(rid)
+                if old is None:
+                    added += 1
+                    previous[rid] = item
+                elif old != item:
+                    changed += 1
+                    if any(old.get(f) != item.get(f) for f in STRUCTURAL_FIELDS):
+                        structural += 1
+                    previous[rid] = item
+            for rid in removed:
+                del previous[rid]
+
+            if added or removed or structural:
+                self.version += 1
+            self._updated_at = time.time()
+
+            cpu_ms = (time.thread_time() - cpu_start) * 1000.0
+            self.stats.update({
+                "refreshes": self.stats["refreshes"] + 1,
+                "last_api_ms": round(api_ms, 3),
+                "last_cpu_ms": round(cpu_ms, 3),
+                "total_cpu_ms": round(self.stats["total_cpu_ms"] + cpu_ms, 3),
+                "last_added": added,
+                "last_removed": len(removed),
+                "last_changed": changed,
+                "last_structural": structural,
+            })
+            self._adapt_interval(bool(added or removed or structural))
+            updated_at = self._updated_at
+
+        for callback in self._listeners:
+            try:
+                callback(list(fresh.values()), updated_at)
+            except Exception as e:
+                self.logger.warning(f"Inventory listener failed: {e}")
+
+        return {"added": added, "removed": len(removed), "changed": changed,
+                "structural": structural}
+
+    def _adapt_interval(self, layout_changed: bool) -> None:
+        """Halve the poll interval while things move; back off when idle."""
+        if layout_changed:
+            self._interval = max(self.config.min_interval, self._interval / 2.0)
+        else:
+            self._interval = min(self.config.max_interval, self._interval * 1.5)
+
+    async def run(self) -> None:
+        """Refresh forever; intended to run as a background asyncio task."""
+        while True:
+            try:
+                counts = await asyncio.to_thread(self.refresh)
+                self.logger.debug(
+                    f"Inventory refreshed: {counts}, api={self.stats['last_api_ms']}ms, "
+                    f"cpu={self.stats['last_cpu_ms']}ms, next in {self._interval:.1f}s"
+                )
+            except Exception as e:
+                with self._lock:
+                    self.stats["errors"] += 1
+                    self.stats["last_error"] = str(e)
+                    self._interval = self.config.max_interval
+                self.logger.warning(f"Inventory refresh failed: {e}")
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start the background refresher on the running event loop."""
+        if not self.config.enabled or self._task is not None:
+            return self._task
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the background refresher."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    # ---------- queries ----------
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh (None if never)."""
+        if self._updated_at is None:
+            return None
+        return time.time() - self._updated_at
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        """Whether the snapshot is recent enough to answer queries."""
+        age = self.age()
+        limit = self.config.max_staleness if max_age is None else max_age
+        return age is not None and age <= limit
+
+    def resources(self, rtype: Optional[str] = None,
+                  node: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return shallow copies of entries, optionally filtered.
+
+        Args:
+            rtype: Resource type ('node', 'qemu', 'lxc', 'storage', ...)
+            node: Node name filter
+        """
+        with self._lock:
+            return [
+                dict(item) for item in self._resources.values()
+                if (rtype is None or item.get("type") == rtype)
+                and (node is None or item.get("node") == node)
+            ]
+
+    def get(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a single entry by resource id."""
+        with self._lock:
+            item = self._resources.get(resource_id)
+            return dict(item) if item is not None else None
+
+    def report(self) -> Dict[str, Any]:
+        """Return refresher cost and state for metrics endpoints."""
+        with self._lock:
+            age = self.age()
+            return {
+                **self.stats,
+                "entries": len(self._resources),
+                "version": self.version,
+                "interval_seconds": round(self._interval, 2),
+                "age_seconds": round(age, 3) if age is not None else None,
+                "running": self._task is not None and not self._task.done(),
+            }
@@ -0,0 +1,169 @@
+"""
+Stale-while-revalidate cache of listing tool results.
+
+Listings (get_nodes, get_vms, get_containers, get_storage,
+get_cluster_status) fan out to several API calls, and the caller that hit
+an expired cache entry used to pay the whole refresh. Results are now
+cached per tool and arguments, and their age decides how a call is served:
+- Younger than `ttl`: returned as is
+- Expired but younger than `ttl + max_stale`: returned immediately,
+  flagged with its age, while one background refresh runs
+- Older, or missing: computed by the caller; concurrent callers of the
+  same listing wait for that one computation instead of each fanning out
+- A failed background refresh keeps the previous entry, which is served
+  until it is too old
+Bounds are configured per tool; write operations drop every entry, so the
+next listing reflects them.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config.models import ListingCacheConfig
+
+Key = Tuple[str, Hashable]
+
+
+class ListingCache:
+    """Per-tool stale-while-revalidate cache of listing results."""
+
+    def __init__(self, config: Optional[ListingCacheConfig] = None):
+        """Initialize the cache.
+
+        Args:
+            config: Cache configuration (defaults apply when omitted)
+        """
+        self.config = config or ListingCacheConfig()
+        self.logger = logging.getLogger("proxmox-mcp.listings")
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Key, Future] = {}
+        self._generation = 0  # bumped by invalidate(); older computations aren't stored
+        self._pool = ThreadPoolExecutor(max_workers=self.config.refresh_workers,
+                                        thread_name_prefix="listing-refresh")
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def bounds(self, tool: str) -> Tuple[float, float]:
+        """Fresh TTL and stale window of a tool, in seconds."""
+        override = self.config.tools.get(tool)
+        ttl = override.ttl if override is not None and override.ttl is not None else self.config.ttl
+        max_stale = (override.max_stale if override is not None and override.max_stale is not None
+                     else self.config.max_stale)
+        return ttl, max_stale
+
+    def _count(self, tool: str, name: str) -> None:
+        counts = self._counts.setdefault(
+            tool, {"fresh": 0, "stale": 0, "computed": 0, "joined": 0, "refreshes": 0, "refresh_errors": 0}
+        )
+        counts[name] += 1
+
+    def get(self, tool: str, args: Hashable, compute: Callable[[], Any],
+            refresh: bool = False) -> Tuple[Any, Optional[float]]:
+        """Return the result of a listing, from cache when possible.
+
+        Args:
+            tool: Tool name (selects the staleness bounds)
+            args: Hashable arguments of the call
+            compute: Produces the result; exceptions propagate to the caller
+            refresh: Ignore the cached entry and compute a new one
+
+        Returns:
+            Tuple of (result, age in seconds); the age is None unless the
+            result is an expired entry served while it is refreshed
+        """
+        key = (tool, args)
+        ttl, max_stale = self.bounds(tool)
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            age = now - entry[0] if entry is not None else None
+            if not refresh and age is not None and age < ttl:
+                self._entries.move_to_end(key)
+                self._count(tool, "fresh")
+                return entry[1], None
+            if not refresh and age is not None and age < ttl + max_stale:
+                self._entries.move_to_end(key)
+                self._count(tool, "stale")
+                if key not in self._inflight:
+                    self._count(tool, "refreshes")
+                    future = self._inflight[key] = Future()
+                    self._pool.submit(self._refresh, key, compute, generation, future)
+                return entry[1], age
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self._count(tool, "computed")
+            else:
+                self._count(tool, "joined")
+
+        if not owner:
+            return future.result(), None
+        try:
+            result = compute()
+        except BaseException as e:
+            self._finish(key, future, generation, error=e)
+            raise
+        self._finish(key, future, generation, result)
+        return result, None
+
+    def _refresh(self, key: Key, compute: Callable[[], Any], generation: int, future: Future) -> None:
+        try:
+            result = compute()
+        except Exception as e:
+            self.logger.warning(f"Background refresh of {key[0]} failed: {e}")
+            with self._lock:
+                self._count(key[0], "refresh_errors")
+            self._finish(key, future, generation, error=e)
+            return
+        self._finish(key, future, generation, result)
+
+    def _finish(self, key: Key, future: Future, generation: int, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        """Store a computed result and hand it to the callers waiting for it."""
+        with self._lock:
+            if error is None and generation == self._generation:
+                self._entries[key] = (time.monotonic(), result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.config.max_entries:
+                    self._entries.popitem(last=False)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def invalidate(self) -> None:
+        """Drop every entry (after a write operation)."""
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()  # computations already running aren't joined
+            self._generation += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Bounds, entry ages and counters per tool for admin endpoints."""
+        now = time.monotonic()
+        with self._lock:
+            ages: Dict[str, list] = {}
+            for (tool, _), (stored, _) in self._entries.items():
+                ages.setdefault(tool, []).append(now - stored)
+            tools = set(self._counts) | set(ages) | set(self.config.tools)
+            return {
+                "entries": len(self._entries),
+                "refreshing": len(self._inflight),
+                "tools": {
+                    tool: {
+                        "ttl": self.bounds(tool)[0],
+                        "max_stale": self.bounds(tool)[1],
+                        "entries": len(ages.get(tool, [])),
+                        "oldest_age": round(max(ages[tool]), 1) if tool in ages else None,
+                        **self._counts.get(tool, {}),
+                    }
+                    for tool in sorted(tools)
+                },
+            }
@@ -13,12 +13,217 @@ The logging system supports:
 - Console logging for errors
 - Custom format strings
 - Multiple handler management
+
+Records are queued by default: the logging call only enqueues the record
+and a background listener thread formats and writes it, so disk and
+console I/O stay off the request path. On top of that:
+- Records can be written as one JSON object per line
+- Every record carries the ID of the request it was logged for
+  (`%(request_id)s`, "-" outside requests)
+- Log statements firing repeatedly are rate limited per call site: a burst
+  is let through, then one record in `repeat_sample`, and a summary of
+  the suppressed count follows when the window ends
+- When the queue is full, records are dropped and counted rather than
+  blocking the caller
 """
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
 from ..config.models import LoggingConfig
 
+# ID of the request being served, set by RequestIdMiddleware
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+# Attributes of every LogRecord; anything else was passed with `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional["BackgroundWriter"] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_limiter: Optional["RepeatLimiter"] = None
+
+
+def new_request_id() -> str:
+    """Generate a short request ID."""
+    return uuid.uuid4().hex[:16]
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request ID."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class RepeatLimiter(logging.Filter):
+    """Rate limit records per call site (logger, level, file and line).
+
+    In every window of `window` seconds, the first `burst` records of a
+    call site pass; after that only one in `sample` does (none if 0). The
+    first record of a call site in the next window reports how many were
+    suppressed. Warnings and above are never limited.
+    """
+
+    def __init__(self, window: float, burst: int, sample: int):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.sample = sample
+        self.suppressed_total = 0
+        self._lock = threading.Lock()
+        # call site -> [window start, records seen, records suppressed]
+        self._sites: Dict[Tuple[str, int, str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Without the queue every handler asks; decide once per record
+        allowed = getattr(record, "_repeat_allowed", None)
+        if allowed is None:
+            allowed = record._repeat_allowed = self._allow(record)
+        return allowed
+
+    def _allow(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.window <= 0:
+            return True
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                    record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+                    record.args = None
+                return True
+            site[1] += 1
+            if site[1] <= self.burst or (self.sample and (site[1] - self.burst) % self.sample == 0):
+                return True
+            site[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full.
+
+    Only the message is merged on the calling thread; exception tracebacks
+    are formatted by the listener, as the queue never leaves the process.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.enqueued = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class BackgroundWriter(logging.handlers.QueueListener):
+    """QueueListener whose stop waits for room in a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with extra fields and the request ID."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestIdMiddleware:
+    """ASGI middleware binding a request ID to everything logged for a request.
+
+    The ID comes from the X-Request-ID header when the client sends a
+    usable one and is generated otherwise; it is echoed in the response.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                value = value.decode("latin-1")
+                if 0 < len(value) <= 64 and value.isprintable():
+                    rid = value
+                break
+        rid = rid or new_request_id()
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + [(b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+
+        token = request_id.set(rid)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
+
+
+def shutdown_logging() -> None:
+    """Stop the background writer after flushing queued records."""
+    global _listener, _queue_handler, _limiter
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _queue_handler = None
+    _limiter = None
+
+
+def logging_report() -> Dict[str, Any]:
+    """Logging pipeline counters for admin endpoints."""
+    handler = _queue_handler
+    return {
+        "queued": handler is not None,
+        "enqueued": handler.enqueued if handler is not None else 0,
+        "dropped": handler.dropped if handler is not None else 0,
+        "backlog": handler.queue.qsize() if handler is not None else 0,
+        "suppressed": _limiter.suppressed_total if _limiter is not None else 0,
+    }
+
+
 def setup_logging(config: LoggingConfig) -> logging.Logger:
     """Configure and initialize logging system.
 
@@ -26,22 +231,24 @@ def setup_logging(config: LoggingConfig) -> logging.Logger:
     - File logging (if configured):
       * Handles relative/absolute paths
       * Uses configured log level
-      * Applies custom format
-    
+      * Applies custom format (or JSON lines)
+
     - Console logging:
       * Always enabled for errors
       * Ensures critical issues are visible
-    
+
     - Handler Management:
       * Removes existing handlers
       * Configures new handlers
       * Sets up formatters
-    
+      * Puts them behind a queue and a background writer (if queued)
+
     Args:
         config: Logging configuration containing:
                - Log level (e.g., "INFO", "DEBUG")
                - Format string
                - Optional log file path
+               - Queue, JSON and repeat limiting settings
 
     Returns:
         Configured logger instance for "proxmox-mcp"
@@ -54,41 +261,63 @@ def setup_logging(config: LoggingConfig) -> logging.Logger:
             "file": "/path/to/log/file.log"  # Optional
         }
     """
+    global _listener, _queue_handler, _limiter
+    shutdown_logging()
+
     # Convert relative path to absolute
     log_file = config.file
     if log_file and not os.path.isabs(log_file):
         log_file = os.path.join(os.getcwd(), log_file)
-        
+
     # Create handlers
     handlers = []
-    
+
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(getattr(logging, config.level.upper()))
         handlers.append(file_handler)
-    
+
     # Console handler for errors only
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.ERROR)
     handlers.append(console_handler)
-    
+
     # Configure formatters
-    formatter = logging.Formatter(config.format)
+    formatter = JsonFormatter() if config.json_format else logging.Formatter(config.format)
     for handler in handlers:
         handler.setFormatter(formatter)
-    
+
+    # Request IDs and repeat limiting apply on the calling thread, before
+    # anything is queued or written
+    filters = [RequestIdFilter()]
+    if config.repeat_window > 0:
+        _limiter = RepeatLimiter(config.repeat_window, config.repeat_burst, config.repeat_sample)
+        filters.append(_limiter)
+
+    if config.queued:
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(config.queue_size))
+        _listener = BackgroundWriter(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [_queue_handler]
+    for handler in handlers:
+        for log_filter in filters:
+            handler.addFilter(log_filter)
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, config.level.upper()))
-    
+
     # Remove any existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
+
     # Add new handlers
     for handler in handlers:
         root_logger.addHandler(handler)
-    
+
     # Create and return server logger
     logger = logging.getLogger("proxmox-mcp")
     return logger
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,597 @@
+"""
+Bulk guest metrics for the Proxmox MCP server.
+
+Per-guest RRD downloads (`/nodes/{node}/lxc/{vmid}/rrddata`) return a whole
+timeframe of samples even when only the last row is needed. This module
+avoids them by providing:
+- Latest usage samples for every guest from a single /cluster/resources call
+  (or from the background inventory, which already fetches it)
+- Compact fixed-size ring buffers holding the recent series of each guest
+- RRD series cached per guest and only re-requested once a new RRD step
+  is due, with only the rows newer than the cached ones being appended
+- Cluster-wide queries: RRD series fetched concurrently, reduced
+  server-side (mean, max, percentiles) and ranked (top-K, thresholds)
+- An optional on-disk store (see tsstore) written from every snapshot,
+  which answers queries locally once it covers the requested period
+
+Ring buffers are columnar `array('d')` storage: one slot per sample per
+field, NaN for values Proxmox did not report.
+"""
+import logging
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config.models import MetricsConfig
+from .tsstore import TimeSeriesStore
+
+# Usage counters tracked for each guest / node
+FIELDS = (
+    "cpu", "mem", "maxmem", "disk", "maxdisk",
+    "netin", "netout", "diskread", "diskwrite",
+)
+
+# RRD rows carry a few node-only columns on top of the usage counters
+RRD_FIELDS = FIELDS + ("loadavg", "iowait")
+
+# Resource types sampled from /cluster/resources
+SAMPLED_TYPES = ("qemu", "lxc", "node", "storage")
+
+# Seconds between two rows of each RRD timeframe
+RRD_STEPS = {"hour": 60, "day": 1800, "week": 10800, "month": 43200, "year": 604800}
+
+# Period covered by a query over each RRD timeframe
+RRD_SPANS = {"hour": 3600, "day": 86400, "week": 604800, "month": 2592000, "year": 31536000}
+
+# Queryable metrics: derived from RRD columns, with their display unit
+QUERY_METRICS = {
+    "cpu": "%",
+    "mem": "bytes",
+    "mem_pct": "%",
+    "disk": "bytes",
+    "disk_pct": "%",
+    "netin": "bytes/s",
+    "netout": "bytes/s",
+    "diskread": "bytes/s",
+    "diskwrite": "bytes/s",
+    "loadavg": "",
+    "iowait": "%",
+}
+
+# Columns each query metric is derived from
+METRIC_FIELDS = {
+    "cpu": ("cpu",),
+    "mem": ("mem",),
+    "mem_pct": ("mem", "maxmem"),
+    "disk": ("disk",),
+    "disk_pct": ("disk", "maxdisk"),
+    "netin": ("netin",),
+    "netout": ("netout",),
+    "diskread": ("diskread",),
+    "diskwrite": ("diskwrite",),
+    "loadavg": ("loadavg",),
+    "iowait": ("iowait",),
+}
+
+# Cumulative counters in /cluster/resources (RRD reports them as rates)
+COUNTER_METRICS = ("netin", "netout", "diskread", "diskwrite")
+
+# Metrics the local store can answer (RRD-only columns excluded)
+STORE_METRICS = tuple(m for m in METRIC_FIELDS if m not in ("loadavg", "iowait"))
+
+AGGREGATES = ("mean", "min", "max", "last", "p50", "p90", "p95", "p99")
+
+NAN = float("nan")
+
+
+def _to_float(value: Any) -> float:
+    """Convert an API value to float, NaN when missing or invalid."""
+    if value is None:
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def aggregate(values: Sequence[float], funcs: Iterable[str]) -> Dict[str, Optional[float]]:
+    """Reduce a series with the given aggregate functions.
+
+    NaN gaps are ignored. The series is filtered and sorted once, and
+    all reductions run as C-level bulk operations (sum/min/max/sorted)
+    over the array.
+
+    Args:
+        values: Series values (NaN for missing samples)
+        funcs: Names from AGGREGATES
+
+    Returns:
+        Mapping of function name to value (None if no valid samples)
+    """
+    clean = array("d", [v for v in values if v == v])
+    out: Dict[str, Optional[float]] = {}
+    ordered: Optional[List[float]] = None
+    for func in funcs:
+        if not clean:
+            out[func] = None
+        elif func == "mean":
+            out[func] = math.fsum(clean) / len(clean)
+        elif func == "min":
+            out[func] = min(clean)
+        elif func == "max":
+            out[func] = max(clean)
+        elif func == "last":
+            out[func] = clean[-1]
+        elif func.startswith("p") and func[1:].isdigit():
+            if ordered is None:
+                ordered = sorted(clean)
+            out[func] = _percentile(ordered, float(func[1:]))
+        else:
+            raise ValueError(f"Unknown aggregate: {func}")
+    return out
+
+
+class SeriesRing:
+    """Fixed-capacity columnar ring buffer of timestamped samples.
+
+    Samples must arrive in time order; older or duplicate timestamps are
+    rejected so repeated ingestion of the same snapshot is harmless.
+    """
+
+    __slots__ = ("capacity", "fields", "_time", "_cols", "_head", "_size")
+
+    def __init__(self, capacity: int, fields: Iterable[str] = FIELDS):
+        """Initialize an empty ring.
+
+        Args:
+            capacity: Maximum number of samples kept
+            fields: Names of the value columns
+        """
+        self.capacity = max(1, int(capacity))
+        self.fields = tuple(fields)
+        self._time = array("d", [0.0]) * self.capacity
+        self._cols = {f: array("d", [NAN]) * self.capacity for f in self.fields}
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def last_time(self) -> Optional[float]:
+        """Timestamp of the newest sample, or None if empty."""
+        if not self._size:
+            return None
+        return self._time[(self._head - 1) % self.capacity]
+
+    def append(self, ts: float, sample: Dict[str, Any]) -> bool:
+        """Append one sample.
+
+        Args:
+            ts: Sample timestamp (epoch seconds)
+            sample: Mapping holding (a subset of) the ring fields
+
+        Returns:
+            True if stored, False if `ts` is not newer than the last sample
+        """
+        last = self.last_time()
+        if last is not None and ts <= last:
+            return False
+        i = self._head
+        self._time[i] = ts
+        for f in self.fields:
+            self._cols[f][i] = _to_float(sample.get(f))
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return True
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """Newest sample as a dict (with its `time`), or None if empty."""
+        if not self._size:
+            return None
+        i = (self._head - 1) % self.capacity
+        out = {f: self._cols[f][i] for f in self.fields}
+        out["time"] = self._time[i]
+        return out
+
+    def _order(self) -> List[int]:
+        """Slot indexes from oldest to newest."""
+        start = (self._head - self._size) % self.capacity
+        return [(start + k) % self.capacity for k in range(self._size)]
+
+    def window(self, since: Optional[float] = None,
+               fields: Optional[Iterable[str]] = None) -> Tuple[List[float], Dict[str, List[float]]]:
+        """Return samples as columns, oldest first.
+
+        Args:
+            since: Only samples strictly newer than this timestamp
+            fields: Subset of fields to return (default: all)
+
+        Returns:
+            Tuple of (timestamps, {field: values})
+        """
+        wanted = tuple(fields) if fields is not None else self.fields
+        idx = [i for i in self._order() if since is None or self._time[i] > since]
+        times = [self._time[i] for i in idx]
+        cols = {f: [self._cols[f][i] for i in idx] for f in wanted if f in self._cols}
+        return times, cols
+
+
+class MetricsEngine:
+    """Shared store of recent guest and node metrics.
+
+    Fed in bulk from /cluster/resources snapshots: when an inventory is
+    given the engine listens to its refreshes and never needs its own call
+    while that inventory is fresh. RRD history is fetched lazily per guest
+    and cached in separate rings (RRD rows are step-aligned averages and
+    must not be mixed with instantaneous samples).
+    """
+
+    def __init__(self, proxmox_api: Any, inventory: Optional[Any] = None,
+                 config: Optional[MetricsConfig] = None):
+        """Initialize the engine.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            inventory: Optional ClusterInventory to take snapshots from
+            config: Engine configuration (defaults apply when omitted)
+        """
+        self.proxmox = proxmox_api
+        self.inventory = inventory
+        self.config = config or MetricsConfig()
+        self.logger = logging.getLogger("proxmox-mcp.metrics")
+
+        self._lock = threading.RLock()
+        self._rings: Dict[str, SeriesRing] = {}
+        self._rrd: Dict[Tuple[str, str], SeriesRing] = {}
+        self._rrd_checked: Dict[Tuple[str, str], float] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._latest_at: Optional[float] = None
+        self.stats: Dict[str, int] = {
+            "bulk_fetches": 0,
+            "snapshots_ingested": 0,
+            "rrd_fetches": 0,
+            "rrd_cache_hits": 0,
+        }
+
+        self.store: Optional[TimeSeriesStore] = None
+        if self.config.store_path:
+            self.store = TimeSeriesStore(
+                self.config.store_path,
+                retention_days=self.config.store_retention_days,
+                flush_interval=self.config.store_flush_interval,
+            )
+
+        if inventory is not None:
+            inventory.add_listener(self.ingest)
+
+    # ---------- bulk samples ----------
+    def ingest(self, resources: Iterable[Dict[str, Any]], ts: Optional[float] = None) -> int:
+        """Record one /cluster/resources snapshot.
+
+        Args:
+            resources: Entries as returned by /cluster/resources
+            ts: Snapshot time (default: now)
+
+        Returns:
+            Number of samples stored
+        """
+        ts = time.time() if ts is None else ts
+        stored = 0
+        with self._lock:
+            latest: Dict[str, Dict[str, Any]] = {}
+            for item in resources:
+                if not isinstance(item, dict) or item.get("type") not in SAMPLED_TYPES:
+                    continue
+                rid = item.get("id")
+                if not rid:
+                    continue
+                latest[rid] = item
+                ring = self._rings.get(rid)
+                if ring is None:
+                    ring = self._rings[rid] = SeriesRing(self.config.ring_capacity)
+                stored += ring.append(ts, item)
+            # Guests that disappeared from the cluster drop their history
+            dropped = [r for r in self._rings if r not in latest]
+            for rid in dropped:
+                del self._rings[rid]
+            if dropped:
+                # RRD caches are keyed by resource id
+                for key in [k for k in self._rrd if k[0] not in latest]:
+                    del self._rrd[key]
+                    self._rrd_checked.pop(key, None)
+            self._latest = latest
+            self._latest_at = ts
+            self.stats["snapshots_ingested"] += 1
+        if self.store is not None:
+            try:
+                self.store.append(ts, latest.values())
+            except OSError as e:
+                self.logger.warning(f"Metrics store write failed: {e}")
+        return stored
+
+    def _max_age(self) -> float:
+        if self.inventory is not None and self.inventory.is_fresh():
+            return self.inventory.config.max_staleness
+        return self.config.sample_ttl
+
+    def refresh(self, force: bool = False) -> None:
+        """Fetch a new bulk snapshot unless the current one is recent enough."""
+        with self._lock:
+            at = self._latest_at
+        if not force and at is not None and time.time() - at <= self._max_age():
+            return
+        raw = self.proxmox.cluster.resources.get()
+        with self._lock:
+            self.stats["bulk_fetches"] += 1
+        self.ingest(raw if isinstance(raw, list) else [])
+
+    def latest(self, rtype: Optional[str] = None, node: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Latest sample of every guest, keyed by resource id ("lxc/200").
+
+        Costs at most one /cluster/resources call for the whole cluster.
+
+        Args:
+            rtype: Optional resource type filter ("qemu", "lxc", "node")
+            node: Optional node filter
+
+        Returns:
+            Mapping of resource id to the /cluster/resources entry
+        """
+        self.refresh()
+        with self._lock:
+            return {
+                rid: dict(item) for rid, item in self._latest.items()
+                if (rtype is None or item.get("type") == rtype)
+                and (node is None or item.get("node") == node)
+            }
+
+    def series(self, rid: str, since: Optional[float] = None,
+               fields: Optional[Iterable[str]] = None) -> Tuple[List[float], Dict[str, List[float]]]:
+        """Recent bulk samples of one resource (see SeriesRing.window)."""
+        with self._lock:
+            ring = self._rings.get(rid)
+            if ring is None:
+                return [], {}
+            return ring.window(since, fields)
+
+    # ---------- RRD ----------
+    def rrd(self, node: str, rtype: str, vmid: Any, timeframe: str = "hour",
+            cf: str = "AVERAGE") -> SeriesRing:
+        """RRD series of one guest, re-fetched only when a new step is due.
+
+        Args:
+            node: Node hosting the guest
+            rtype: "qemu", "lxc", "node" or "storage" (`vmid` is then the
+                node or storage name)
+            vmid: Guest ID
+            timeframe: RRD timeframe (hour, day, week, month, year)
+            cf: Consolidation function (AVERAGE or MAX)
+
+        Returns:
+            Ring buffer holding the cached rows
+        """
+        step = RRD_STEPS.get(timeframe, 60)
+        # Resource id: storage names are only unique per node
+        rid = f"storage/{node}/{vmid}" if rtype == "storage" else f"{rtype}/{vmid}"
+        key = (rid, f"{timeframe}:{cf}")
+        now = time.time()
+        with self._lock:
+            ring = self._rrd.get(key)
+            checked = self._rrd_checked.get(key, 0.0)
+            last = ring.last_time() if ring is not None else None
+            if ring is not None and (
+                (last is not None and now - last < 2 * step) or now - checked < step
+            ):
+                # The newest cached row is still the newest RRD row
+                self.stats["rrd_cache_hits"] += 1
+                return ring
+            created = ring is None
+            if created:
+                ring = self._rrd[key] = SeriesRing(self.config.ring_capacity, RRD_FIELDS)
+            self._rrd_checked[key] = now
+
+        try:
+            if rtype == "node":
+                rows = self.proxmox.nodes(node).rrddata.get(timeframe=timeframe, cf=cf)
+            elif rtype == "storage":
+                rows = self.proxmox.nodes(node).storage(vmid).rrddata.get(timeframe=timeframe, cf=cf)
+            else:
+                guest = getattr(self.proxmox.nodes(node), rtype)(vmid)
+                rows = guest.rrddata.get(timeframe=timeframe, cf=cf)
+        except Exception:
+            # A failed fetch must not pass for a checked step
+            with self._lock:
+                if self._rrd_checked.get(key) == now:
+                    if checked:
+                        self._rrd_checked[key] = checked
+                    else:
+                        self._rrd_checked.pop(key, None)
+                if created and self._rrd.get(key) is ring:
+                    del self._rrd[key]
+            raise
+        with self._lock:
+            self.stats["rrd_fetches"] += 1
+            for row in rows if isinstance(rows, list) else []:
+                if isinstance(row, dict) and row.get("time") is not None:
+                    if rtype == "node":
+                        row = dict(row, mem=row.get("memused"), maxmem=row.get("memtotal"))
+                    elif rtype == "storage":
+                        row = dict(row, disk=row.get("used"), maxdisk=row.get("total"))
+                    ring.append(float(row["time"]), row)
+        return ring
+
+    def rrd_last(self, node: str, rtype: str, vmid: Any) -> Optional[Dict[str, float]]:
+        """Most recent complete RRD row of a guest (NaN rows are skipped)."""
+        times, cols = self.rrd(node, rtype, vmid).window()
+        for i in range(len(times) - 1, -1, -1):
+            if not math.isnan(cols["cpu"][i]):
+                row = {f: cols[f][i] for f in cols}
+                row["time"] = times[i]
+                return row
+        return None
+
+    # ---------- queries ----------
+    @staticmethod
+    def _metric_values(metric: str, cols: Dict[str, List[float]],
+                       times: Optional[List[float]] = None) -> List[float]:
+        """Derive one query metric from series columns.
+
+        When `times` is given, counter metrics hold cumulative values (local
+        store samples) and are turned into per-second rates; counter resets
+        yield a gap.
+        """
+        if metric in ("cpu", "iowait"):
+            return [v * 100.0 for v in cols[metric]]
+        if metric in ("mem_pct", "disk_pct"):
+            used, total = METRIC_FIELDS[metric]
+            return [
+                u / t * 100.0 if t and t == t else NAN
+                for u, t in zip(cols[used], cols[total])
+            ]
+        values = list(cols[metric])
+        if times is not None and metric in COUNTER_METRICS:
+            return [
+                (b - a) / (tb - ta) if b >= a and tb > ta else NAN
+                for a, b, ta, tb in zip(values, values[1:], times, times[1:])
+            ]
+        return values
+
+    def query(self, metric: str = "cpu", timeframe: str = "day", agg: str = "mean",
+              rtype: str = "qemu", node: Optional[str] = None, top: Optional[int] = 10,
+              threshold: Optional[float] = None, cf: str = "AVERAGE",
+              source: str = "auto") -> Dict[str, Any]:
+        """Aggregate one metric over a timeframe for every matching resource.
+
+        Targets come from one bulk /cluster/resources sample. Their series
+        are read from the local store when it covers the whole period, or
+        else fetched from RRD concurrently (and cached, see `rrd`); they are
+        then reduced server-side and ranked highest first.
+
+        Args:
+            metric: One of QUERY_METRICS
+            timeframe: RRD timeframe (hour, day, week, month, year)
+            agg: One of AGGREGATES
+            rtype: "qemu", "lxc", "node" or "storage"
+            node: Optional node filter
+            top: Keep only the K highest results (None or 0: all)
+            threshold: Keep only results strictly above this value
+            cf: RRD consolidation function (AVERAGE or MAX)
+            source: "auto", "store" (local store only) or "rrd" (API only)
+
+        Returns:
+            Query summary with a compact `results` list
+
+        Raises:
+            ValueError: If an argument is not supported
+        """
+        if metric not in QUERY_METRICS:
+            raise ValueError(f"Unknown metric: {metric} (expected one of {', '.join(QUERY_METRICS)})")
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {agg} (expected one of {', '.join(AGGREGATES)})")
+        if timeframe not in RRD_SPANS:
+            raise ValueError(f"Unknown timeframe: {timeframe} (expected one of {', '.join(RRD_SPANS)})")
+        if rtype not in SAMPLED_TYPES:
+            raise ValueError(f"Unknown resource type: {rtype}")
+        if source not in ("auto", "store", "rrd"):
+            raise ValueError(f"Unknown source: {source}")
+
+        since = time.time() - RRD_SPANS[timeframe]
+        if source == "store":
+            if self.store is None:
+                raise ValueError("The local metrics store is not enabled (metrics.store_path)")
+            if metric not in STORE_METRICS:
+                raise ValueError(f"Metric {metric} is only available from RRD")
+            use_store = True
+        else:
+            use_store = (
+                source == "auto" and self.store is not None
+                and metric in STORE_METRICS and self.store.covers(since)
+            )
+
+        targets = [
+            item for item in self.latest(rtype, node).values()
+            if rtype in ("node", "storage") or not item.get("template")
+        ]
+        fields = METRIC_FIELDS[metric]
+
+        def series(item: Dict[str, Any]) -> Tuple[List[float], Dict[str, List[float]]]:
+            if use_store:
+                return self.store.window(item["id"], since, fields=fields)
+            key = {"node": item.get("node"), "storage": item.get("storage")}.get(rtype, item.get("vmid"))
+            return self.rrd(item.get("node"), rtype, key, timeframe, cf).window(since, fields)
+
+        def evaluate(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            try:
+                times, cols = series(item)
+            except Exception as e:
+                self.logger.warning(f"Series read failed for {item.get('id')}: {e}")
+                return None
+            if not times:
+                return None
+            values = self._metric_values(metric, cols, times if use_store else None)
+            value = aggregate(values, (agg,))[agg]
+            if value is None:
+                return None
+            return {
+                "id": item.get("id"),
+                "name": item.get("name") or item.get("storage") or item.get("node"),
+                "vmid": item.get("vmid"),
+                "node": item.get("node"),
+                "samples": sum(1 for v in values if v == v),
+                "value": round(value, 2),
+            }
+
+        workers = max(1, min(self.config.query_workers, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metrics") as pool:
+            evaluated = [r for r in pool.map(evaluate, targets) if r is not None]
+
+        if threshold is not None:
+            evaluated = [r for r in evaluated if r["value"] > threshold]
+        evaluated.sort(key=lambda r: r["value"], reverse=True)
+        matched = len(evaluated)
+        if top:
+            evaluated = evaluated[:top]
+
+        return {
+            "metric": metric,
+            "unit": QUERY_METRICS[metric],
+            "aggregate": agg,
+            "timeframe": timeframe,
+            "type": rtype,
+            "node": node,
+            "threshold": threshold,
+            "source": "store" if use_store else "rrd",
+            "evaluated": len(targets),
+            "matched": matched,
+            "results": evaluated,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Engine state and cost counters for admin endpoints."""
+        with self._lock:
+            return {
+                "series": len(self._rings),
+                "rrd_series": len(self._rrd),
+                "ring_capacity": self.config.ring_capacity,
+                "latest_age_seconds": (
+                    round(time.time() - self._latest_at, 1) if self._latest_at else None
+                ),
+                "store": self.store.report() if self.store is not None else None,
+                **self.stats,
+            }
+
+    def close(self) -> None:
+        """Flush and close the local store, if any."""
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,331 @@
+"""
+Capacity-aware placement for new guests.
+
+Picks a node and a storage for a guest in one pass over the cached
+/cluster/resources snapshot (no per-node API calls), using:
+- Free memory on the node after the allocation, minus a safety headroom
+- CPU commit ratio (allocated vCPUs / physical cores) against a ceiling
+- Free space on the storage after the allocation
+- A content-type index of storages ("images" for VMs, "rootdir" for CTs)
+
+Placements can reserve the capacity they consume until the new guest
+shows up in the snapshot (or a timeout expires), so that a burst of
+creations spreads over the cluster instead of piling onto the node that
+looked best before the first one landed. VMIDs for bulk creations are
+allocated the same way: one /cluster/nextid call, then a local table of
+handed-out IDs so concurrent batches never pick the same numbers.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.models import PlacementConfig
+
+GIB = 1024 ** 3
+MIB = 1024 ** 2
+
+
+class PlacementError(ValueError):
+    """Raised when no node/storage can host the requested guest."""
+
+
+class PlacementEngine:
+    """Scores nodes and storages for new guests.
+
+    Resource snapshots come from the shared metrics engine, which answers
+    from the background inventory when it is fresh and otherwise from a
+    single, short-lived bulk /cluster/resources sample.
+    """
+
+    def __init__(self, metrics: Any, config: Optional[PlacementConfig] = None):
+        """Initialize the engine.
+
+        Args:
+            metrics: MetricsEngine providing `latest()` snapshots
+            config: Scoring configuration (defaults apply when omitted)
+        """
+        self.metrics = metrics
+        self.config = config or PlacementConfig()
+        self.logger = logging.getLogger("proxmox-mcp.placement")
+        self._lock = threading.Lock()
+        self._reservations: List[Dict[str, Any]] = []
+        self._vmids: Dict[int, float] = {}
+
+    # ---------- snapshot ----------
+    def _reserved(self, present: set) -> Tuple[Dict[str, Tuple[int, int]], Dict[Tuple[str, str], int]]:
+        """Active reservations: per node (cpus, mem) and per storage disk.
+
+        Disk reservations are keyed by (node, storage) and additionally by
+        ("*", storage), which shared storages use since every node sees them.
+
+        Reservations expire after `reservation_ttl`, or as soon as their
+        guest appears in the snapshot (its usage is then counted directly).
+        """
+        now = time.time()
+        nodes: Dict[str, Tuple[int, int]] = {}
+        storages: Dict[Tuple[str, str], int] = {}
+        with self._lock:
+            self._reservations = [
+                r for r in self._reservations
+                if r["expires_at"] > now and str(r["vmid"]) not in present
+            ]
+            for r in self._reservations:
+                c, m = nodes.get(r["node"], (0, 0))
+                nodes[r["node"]] = (c + r["cpus"], m + r["mem"])
+                if r["storage"]:
+                    for key in ((r["node"], r["storage"]), ("*", r["storage"])):
+                        storages[key] = storages.get(key, 0) + r["disk"]
+        return nodes, storages
+
+    def capacity(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node capacity view built from one snapshot.
+
+        Returns:
+            Mapping of node name to its free memory, CPU commit and storages
+        """
+        snapshot = self.metrics.latest()
+        present = {
+            str(item.get("vmid")) for item in snapshot.values()
+            if item.get("type") in ("qemu", "lxc")
+        }
+        reserved_nodes, reserved_disks = self._reserved(present)
+
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for item in snapshot.values():
+            if item.get("type") == "node":
+                name = item.get("node")
+                cpus, mem = reserved_nodes.get(name, (0, 0))
+                maxmem = int(item.get("maxmem") or 0)
+                nodes[name] = {
+                    "node": name,
+                    "online": item.get("status") == "online",
+                    "maxcpu": int(item.get("maxcpu") or 0),
+                    "maxmem": maxmem,
+                    "free_mem": maxmem - int(item.get("mem") or 0) - mem,
+                    "committed_cpu": cpus,
+                    "storages": [],
+                }
+
+        for item in snapshot.values():
+            rtype = item.get("type")
+            node = nodes.get(item.get("node"))
+            if node is None:
+                continue
+            if rtype in ("qemu", "lxc") and not item.get("template"):
+                node["committed_cpu"] += int(item.get("maxcpu") or 0)
+            elif rtype == "storage" and item.get("status", "available") == "available":
+                name = item.get("storage")
+                shared = bool(item.get("shared"))
+                maxdisk = int(item.get("maxdisk") or 0)
+                reserved = reserved_disks.get(("*" if shared else node["node"], name), 0)
+                node["storages"].append({
+                    "storage": name,
+                    "type": item.get("plugintype"),
+                    "content": set(filter(None, str(item.get("content") or "").split(","))),
+                    "shared": shared,
+                    "maxdisk": maxdisk,
+                    "free": maxdisk - int(item.get("disk") or 0) - reserved,
+                })
+        return nodes
+
+    # ---------- scoring ----------
+    def _node_score(self, node: Dict[str, Any], cpus: int, mem_bytes: int) -> Optional[float]:
+        """Score in [0, 1] (higher is better), or None if the node can't fit the guest."""
+        if not node["online"] or node["maxmem"] <= 0 or node["maxcpu"] <= 0:
+            return None
+        free_after = node["free_mem"] - mem_bytes
+        if free_after < node["maxmem"] * self.config.memory_headroom:
+            return None
+        commit_after = (node["committed_cpu"] + cpus) / node["maxcpu"]
+        if commit_after > self.config.cpu_overcommit:
+            return None
+        mem_score = free_after / node["maxmem"]
+        cpu_score = 1.0 - commit_after / self.config.cpu_overcommit
+        return self.config.memory_weight * mem_score + self.config.cpu_weight * cpu_score
+
+    def _storage_score(self, storage: Dict[str, Any], content: str, disk_bytes: int) -> Optional[float]:
+        """Free fraction after allocation, or None if the storage can't fit the disk."""
+        if content not in storage["content"] or storage["maxdisk"] <= 0:
+            return None
+        free_after = storage["free"] - disk_bytes
+        if free_after < storage["maxdisk"] * self.config.storage_headroom:
+            return None
+        return free_after / storage["maxdisk"]
+
+    def place(self, cpus: int, memory_mb: int, disk_gb: int, node: Optional[str] = None,
+              storage: Optional[str] = None, content: str = "images",
+              vmid: Optional[Any] = None) -> Dict[str, Any]:
+        """Choose the best node and storage for a new guest.
+
+        Args:
+            cpus: vCPUs of the guest
+            memory_mb: Memory of the guest in MiB
+            disk_gb: Size of the root disk in GiB
+            node: Fixed node (None or "auto" to choose)
+            storage: Fixed storage (None or "auto" to choose)
+            content: Storage content type the disk needs ("images" or "rootdir")
+            vmid: ID of the guest being created; when given, the consumed
+                capacity is reserved until that guest appears in the snapshot
+
+        Returns:
+            Placement with node, storage, storage_type, score and candidate count
+
+        Raises:
+            PlacementError: If no candidate satisfies the constraints
+        """
+        node = None if node in (None, "", "auto") else node
+        storage = None if storage in (None, "", "auto") else storage
+        mem_bytes = int(memory_mb) * MIB
+        disk_bytes = int(disk_gb) * GIB
+
+        capacity = self.capacity()
+        if node is not None and node not in capacity:
+            raise PlacementError(f"Node '{node}' not found in cluster")
+
+        best: Optional[Dict[str, Any]] = None
+        candidates = 0
+        for info in capacity.values():
+            if node is not None and info["node"] != node:
+                continue
+            node_score = self._node_score(info, cpus, mem_bytes)
+            if node_score is None:
+                continue
+            for st in info["storages"]:
+                if storage is not None and st["storage"] != storage:
+                    continue
+                storage_score = self._storage_score(st, content, disk_bytes)
+                if storage_score is None:
+                    continue
+                candidates += 1
+                score = node_score + self.config.storage_weight * storage_score
+                if best is None or score > best["score"]:
+                    best = {
+                        "node": info["node"],
+                        "storage": st["storage"],
+                        "storage_type": st["type"],
+                        "score": round(score, 4),
+                        "free_mem_after": info["free_mem"] - mem_bytes,
+                        "cpu_commit_after": round(
+                            (info["committed_cpu"] + cpus) / info["maxcpu"], 2
+                        ),
+                        "storage_free_after": st["free"] - disk_bytes,
+                    }
+
+        if best is None:
+            where = f"node '{node}'" if node else "any online node"
+            what = f"storage '{storage}'" if storage else f"a storage with '{content}' content"
+            raise PlacementError(
+                f"No capacity for {cpus} vCPU / {memory_mb} MiB / {disk_gb} GiB on {where} "
+                f"with {what} (memory headroom {self.config.memory_headroom:.0%}, "
+                f"CPU overcommit {self.config.cpu_overcommit}x)"
+            )
+
+        best["candidates"] = candidates
+        if vmid is not None:
+            self.reserve(vmid, best["node"], best["storage"], cpus, memory_mb, disk_gb)
+        return best
+
+    def check_growth(self, growth: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        """Check resource increases of existing guests against node headroom.
+
+        Uses the same limits as `place`: memory must stay above the
+        headroom fraction once the increase is counted as used, and the
+        CPU commit ratio must stay under the overcommit ceiling.
+
+        Args:
+            growth: Net (vCPUs, memory MiB) increase per node
+
+        Returns:
+            Reason per node that can't absorb its increase (nodes missing
+            from the snapshot are not checked)
+        """
+        capacity = self.capacity()
+        problems: Dict[str, str] = {}
+        for name, (cpus, memory_mb) in growth.items():
+            info = capacity.get(name)
+            if info is None or (cpus <= 0 and memory_mb <= 0):
+                continue
+            if not info["online"]:
+                problems[name] = f"node '{name}' is offline"
+                continue
+            mem_bytes = max(0, int(memory_mb)) * MIB
+            free_after = info["free_mem"] - mem_bytes
+            if mem_bytes and free_after < info["maxmem"] * self.config.memory_headroom:
+                problems[name] = (
+                    f"+{memory_mb} MiB would leave {max(0, free_after) // MIB} MiB free on '{name}' "
+                    f"(memory headroom {self.config.memory_headroom:.0%})"
+                )
+                continue
+            if cpus > 0 and info["maxcpu"] > 0:
+                commit_after = (info["committed_cpu"] + cpus) / info["maxcpu"]
+                if commit_after > self.config.cpu_overcommit:
+                    problems[name] = (
+                        f"+{cpus} vCPU would commit {commit_after:.2f}x the cores of '{name}' "
+                        f"(CPU overcommit {self.config.cpu_overcommit}x)"
+                    )
+        return problems
+
+    def reserve(self, vmid: Any, node: str, storage: Optional[str], cpus: int,
+                memory_mb: int, disk_gb: int) -> None:
+        """Hold capacity for a guest being created until the snapshot shows it."""
+        with self._lock:
+            self._reservations.append({
+                "vmid": vmid,
+                "expires_at": time.time() + self.config.reservation_ttl,
+                "node": node,
+                "storage": storage,
+                "cpus": int(cpus),
+                "mem": int(memory_mb) * MIB,
+                "disk": int(disk_gb) * GIB,
+            })
+
+    def release(self, vmid: Any) -> None:
+        """Drop the reservations of a guest (e.g. after a failed creation)."""
+        with self._lock:
+            self._reservations = [r for r in self._reservations if str(r["vmid"]) != str(vmid)]
+            try:
+                self._vmids.pop(int(vmid), None)
+            except (TypeError, ValueError):
+                pass
+
+    # ---------- VMIDs ----------
+    def allocate_vmids(self, count: int, start: Optional[int] = None) -> List[int]:
+        """Hand out `count` free VMIDs in one shot.
+
+        IDs in use in the snapshot or handed out by a previous call (until
+        `reservation_ttl` expires or the guest appears) are skipped.
+
+        Args:
+            count: Number of IDs needed
+            start: First candidate ID (default: /cluster/nextid)
+
+        Returns:
+            Ascending list of reserved VMIDs
+        """
+        snapshot = self.metrics.latest()
+        used = set()
+        for item in snapshot.values():
+            if item.get("type") in ("qemu", "lxc") and item.get("vmid") is not None:
+                used.add(int(item["vmid"]))
+        if start is None:
+            start = int(self.metrics.proxmox.cluster.nextid.get())
+
+        now = time.time()
+        allocated: List[int] = []
+        with self._lock:
+            self._vmids = {
+                vmid: expires for vmid, expires in self._vmids.items()
+                if expires > now and vmid not in used
+            }
+            candidate = max(int(start), 100)
+            while len(allocated) < count:
+                if candidate > 999999999:
+                    raise PlacementError(f"No {count} free VMIDs from {start}")
+                if candidate not in used and candidate not in self._vmids:
+                    allocated.append(candidate)
+                candidate += 1
+            expires = now + self.config.reservation_ttl
+            for vmid in allocated:
+                self._vmids[vmid] = expires
+        return allocated
@@ -0,0 +1,158 @@
+"""
+Runtime profiling support for the Proxmox MCP server.
+
+This module provides low-overhead instrumentation that can be switched on
+against a live server:
+- A sampling profiler that walks every thread's stack at a fixed interval
+  and emits collapsed stacks (flamegraph.pl / speedscope compatible)
+- Per-tool cumulative CPU and wall time accounting
+
+The sampler runs in its own thread and only reads interpreter frames, so
+the profiled code is never instrumented or slowed down beyond the cost of
+taking the GIL once per sample.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class SamplingProfiler:
+    """Statistical stack sampler producing collapsed-stack output.
+
+    Only one profiling session may run at a time; concurrent requests
+    are rejected instead of queued so an operator cannot accidentally
+    stack several sampling threads on a loaded server.
+    """
+
+    MAX_SECONDS = 300
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether a profiling session is currently active."""
+        return self._lock.locked()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> str:
+        """Sample all threads for `seconds` and return collapsed stacks.
+
+        Args:
+            seconds: Sampling duration (clamped to 0.1..MAX_SECONDS)
+            interval: Delay between samples in seconds (min 1ms)
+
+        Returns:
+            Text where each line is 'frame;frame;frame count', root first
+
+        Raises:
+            RuntimeError: If another profiling session is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profiling session is already running")
+        try:
+            seconds = min(max(float(seconds), 0.1), float(self.MAX_SECONDS))
+            interval = max(float(interval), 0.001)
+            own_ident = threading.get_ident()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks: Counter = Counter()
+
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stacks[self._collapse(frame, names.get(ident, str(ident)))] += 1
+                time.sleep(interval)
+
+            return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _collapse(frame: Any, thread_name: str) -> str:
+        """Render a frame chain as a semicolon-joined root-first stack."""
+        parts: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            parts.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        parts.append(f"thread:{thread_name}")
+        parts.reverse()
+        return ";".join(parts)
+
+
+class ToolStats:
+    """Cumulative per-tool CPU/wall time accounting.
+
+    CPU time is measured with `time.thread_time()`, which only counts the
+    calling thread, so concurrent requests do not inflate each other.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def track(self, tool_name: str) -> Iterator[None]:
+        """Context manager accounting the enclosed block to `tool_name`."""
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(
+                tool_name,
+                time.thread_time() - cpu_start,
+                time.perf_counter() - wall_start,
+                failed,
+            )
+
+    def record(self, tool_name: str, cpu_seconds: float, wall_seconds: float,
+               failed: bool = False) -> None:
+        """Add a single tool invocation to the counters."""
+        with self._lock:
+            entry = self._stats.setdefault(
+                tool_name,
+                {"calls": 0, "errors": 0, "cpu_seconds": 0.0, "wall_seconds": 0.0,
+                 "max_wall_seconds": 0.0},
+            )
+            entry["calls"] += 1
+            entry["errors"] += 1 if failed else 0
+            entry["cpu_seconds"] += cpu_seconds
+            entry["wall_seconds"] += wall_seconds
+            entry["max_wall_seconds"] = max(entry["max_wall_seconds"], wall_seconds)
+
+    def snapshot(self, tool_name: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Return a copy of the counters, sorted by cumulative CPU time."""
+        with self._lock:
+            items = [
+                (name, dict(entry))
+                for name, entry in self._stats.items()
+                if tool_name is None or name == tool_name
+            ]
+        items.sort(key=lambda kv: kv[1]["cpu_seconds"], reverse=True)
+        for _, entry in items:
+            calls = entry["calls"] or 1
+            entry["avg_cpu_ms"] = round(entry["cpu_seconds"] / calls * 1000.0, 3)
+            entry["avg_wall_ms"] = round(entry["wall_seconds"] / calls * 1000.0, 3)
+        return dict(items)
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide instances shared by all transports
+profiler = SamplingProfiler()
+tool_stats = ToolStats()
@@ -12,9 +12,12 @@ interactions, ensuring consistent connection handling and authentication
 across the MCP server.
 """
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from proxmoxer import ProxmoxAPI
-from ..config.models import ProxmoxConfig, AuthConfig
+from ..config.models import ProxmoxConfig, AuthConfig, GovernorConfig, RetryConfig
+from .governor import UpstreamGovernor, install
+from .retry import RetryPolicy
 
 class ProxmoxManager:
     """Manager class for Proxmox API operations.
@@ -29,16 +32,24 @@ class ProxmoxManager:
     ensuring proper initialization and error handling for all API operations.
     """
     
-    def __init__(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig):
+    def __init__(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig, verify: bool = True,
+                 governor: Optional[GovernorConfig] = None, retry: Optional[RetryConfig] = None):
         """Initialize the Proxmox API manager.
 
         Args:
             proxmox_config: Proxmox connection configuration
             auth_config: Authentication configuration
+            verify: Test the connection now; when False, call check() later
+            governor: Rate limits and circuit breakers for the API requests
+                     (none when omitted or disabled)
+            retry: Retry policy for transient API failures (none when
+                  omitted or disabled)
         """
         self.logger = logging.getLogger("proxmox-mcp.proxmox")
         self.config = self._create_config(proxmox_config, auth_config)
-        self.api = self._setup_api()
+        self.governor = UpstreamGovernor(governor) if governor is not None and governor.enabled else None
+        self.retry = RetryPolicy(retry) if retry is not None and retry.enabled else None
+        self.api = self._setup_api(verify)
 
     def _create_config(self, proxmox_config: ProxmoxConfig, auth_config: AuthConfig) -> Dict[str, Any]:
         """Create a configuration dictionary for ProxmoxAPI.
@@ -67,15 +78,18 @@ class ProxmoxManager:
             'service': proxmox_config.service
         }
 
-    def _setup_api(self) -> ProxmoxAPI:
+    def _setup_api(self, verify: bool = True) -> ProxmoxAPI:
         """Initialize and test Proxmox API connection.
 
         Performs the following steps:
         1. Creates ProxmoxAPI instance with configured settings
-        2. Tests connection by making a version check request
+        2. Tests connection by making a version check request (when `verify`)
         3. Validates authentication and permissions
         4. Logs connection status and any issues
 
+        Args:
+            verify: Make the version check request
+
         Returns:
             Initialized and tested ProxmoxAPI instance
 
@@ -89,16 +103,63 @@ class ProxmoxManager:
         try:
             self.logger.info(f"Connecting to Proxmox host: {self.config['host']}")
             api = ProxmoxAPI(**self.config)
+            if (self.governor is not None or self.retry is not None) and not install(api, self.governor, self.retry):
+                self.logger.warning("Proxmox API session not found, requests are not governed")
+                self.governor = self.retry = None
             
             # Test connection
-            api.version.get()
-            self.logger.info("Successfully connected to Proxmox API")
+            if verify:
+                api.version.get()
+                self.logger.info("Successfully connected to Proxmox API")
             
             return api
         except Exception as e:
             self.logger.error(f"Failed to connect to Proxmox: {e}")
             raise RuntimeError(f"Failed to connect to Proxmox: {e}")
 
+    def check(self) -> Dict[str, Any]:
+        """Test the connection with a version check request.
+
+        Returns:
+            Proxmox version information
+
+        Raises:
+            RuntimeError: If the request fails
+        """
+        try:
+            version = self.api.version.get()
+        except Exception as e:
+            self.logger.error(f"Failed to connect to Proxmox: {e}")
+            raise RuntimeError(f"Failed to connect to Proxmox: {e}")
+        self.logger.info("Successfully connected to Proxmox API")
+        return version
+
+    def warm_up(self, connections: int) -> int:
+        """Open pooled connections to the API ahead of the first requests.
+
+        Runs `connections` version requests concurrently, so that many
+        connections (TLS handshake included) are left open in the session
+        pool for the concurrent per-node requests of the tools.
+
+        Args:
+            connections: Number of connections to open
+
+        Returns:
+            Number of requests that succeeded
+        """
+        if connections <= 0:
+            return 0
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="proxmox-warmup") as pool:
+            futures = [pool.submit(self.api.version.get) for _ in range(connections)]
+        return sum(1 for future in futures if future.exception() is None)
+
+    def upstream_report(self) -> Dict[str, Any]:
+        """Governor and retry state for admin endpoints."""
+        return {
+            "governor": {"enabled": False} if self.governor is None else {"enabled": True, **self.governor.report()},
+            "retry": {"enabled": False} if self.retry is None else {"enabled": True, **self.retry.report()},
+        }
+
     def get_api(self) -> ProxmoxAPI:
         """Get the initialized Proxmox API instance.
         
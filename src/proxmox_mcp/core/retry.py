@@ -0,0 +1,138 @@
+"""
+Retries of transient Proxmox API failures.
+
+A connection reset or a 502/503 from pveproxy used to fail the whole tool
+call, or turn into "N/A" cells of a listing, and callers then re-ran the
+whole listing. The retry policy is applied per API request, under the
+tools, by the governed session:
+- GET requests are idempotent and retried on timeouts, connection errors
+  and the failure statuses of the governor (502, 503, 504, 595, 596)
+- Other methods are only retried when the connection could not be
+  established (the request never reached Proxmox), or when their path
+  ends with one of the configured `safe_posts` (e.g. "status/start")
+- Attempts are spaced by exponential backoff with full jitter, honoring
+  Retry-After, and bounded by a per-call deadline: no attempt starts, and
+  no backoff sleeps, past it, and later attempts get their timeout
+  shortened to what remains
+- Requests refused by the governor (circuit open, throttled) are not
+  retried
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from ..config.models import RetryConfig
+from .governor import FAILURE_STATUSES
+
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryPolicy:
+    """Retry decisions, backoff and counters for Proxmox API requests."""
+
+    def __init__(self, config: Optional[RetryConfig] = None):
+        """Initialize the policy.
+
+        Args:
+            config: Retry configuration (defaults apply when omitted)
+        """
+        self.config = config or RetryConfig()
+        self.logger = logging.getLogger("proxmox-mcp.retry")
+        self._lock = threading.Lock()
+        self._counts = {"retries": 0, "recovered": 0, "exhausted": 0, "deadline": 0}
+        self._safe_posts = tuple(path.strip("/") for path in self.config.safe_posts)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def retryable(self, method: str, url: str, error: Optional[BaseException] = None) -> bool:
+        """Whether a failed attempt may be repeated.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            error: Exception raised by the attempt (None for a failure status)
+        """
+        if method.upper() in _IDEMPOTENT:
+            return True
+        if isinstance(error, requests.ConnectTimeout):
+            return True  # never reached Proxmox
+        return urlsplit(url).path.rstrip("/").endswith(self._safe_posts) if self._safe_posts else False
+
+    def backoff(self, attempt: int, response: Any = None) -> float:
+        """Delay before attempt `attempt + 1` (full jitter, or Retry-After)."""
+        headers = getattr(response, "headers", None) or {}
+        retry_after = headers.get("Retry-After") if hasattr(headers, "get") else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.config.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.config.max_delay, self.config.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, attempt: Callable[..., Any], method: str, url: str,
+             kwargs: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Run `attempt(**kwargs)` until it succeeds or may not be retried.
+
+        Args:
+            attempt: Sends the request once; returns the response or raises
+            method: HTTP method
+            url: Request URL
+            kwargs: Arguments of the request
+            timeout: Default request timeout, shortened near the deadline
+
+        Returns:
+            The first response that is not a failure, or the last one
+
+        Raises:
+            The exception of the last attempt
+        """
+        deadline = time.monotonic() + self.config.deadline
+        for number in range(1, self.config.max_attempts + 1):
+            if number > 1 and timeout is not None and "timeout" not in kwargs:
+                remaining = deadline - time.monotonic()
+                if remaining < timeout:
+                    kwargs = {**kwargs, "timeout": max(0.1, remaining)}
+            error: Optional[BaseException] = None
+            response = None
+            try:
+                response = attempt(**kwargs)
+            except OSError as e:  # requests' timeouts and connection errors
+                error = e
+            if error is None and getattr(response, "status_code", 200) not in FAILURE_STATUSES:
+                if number > 1:
+                    self._count("recovered")
+                return response
+
+            if number == self.config.max_attempts or not self.retryable(method, url, error):
+                break
+            delay = self.backoff(number, response)
+            if time.monotonic() + delay >= deadline:
+                self._count("deadline")
+                break
+            self._count("retries")
+            self.logger.info(f"Retrying {method} {urlsplit(url).path} in {delay:.2f}s "
+                             f"(attempt {number} failed: {error or response.status_code})")
+            time.sleep(delay)
+
+        if number > 1:
+            self._count("exhausted")
+        if error is not None:
+            raise error
+        return response
+
+    def report(self) -> Dict[str, Any]:
+        """Retry counters for admin endpoints."""
+        with self._lock:
+            return {
+                "max_attempts": self.config.max_attempts,
+                "deadline": self.config.deadline,
+                "safe_posts": list(self.config.safe_posts),
+                **self._counts,
+            }
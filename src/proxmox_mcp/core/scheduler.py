@@ -0,0 +1,288 @@
+"""
+Per-client rate limiting and fair scheduling of tool calls.
+
+One client calling a listing tool in a tight loop used to get as many
+worker threads and Proxmox requests as it asked for, at the expense of
+everyone else. The scheduler sits in front of tool execution:
+- Each client (API key, or key and MCP session) has a token bucket per
+  lane, read tools and write tools having separate budgets; a call over
+  budget is rejected with the time until a token is available
+- Each lane has a fixed number of execution slots. When they are all
+  busy, calls wait in a weighted fair queue: every queued call gets a
+  virtual finish time advancing by 1/weight per call of its client, and
+  freed slots go to the smallest one, so a busy client only delays its
+  own calls and keys with a higher weight get a proportionally larger
+  share
+- A client may only have `max_queued` calls waiting per lane, and a call
+  waiting longer than `queue_timeout` gives up; both are rejected with a
+  retry hint
+
+The scheduler runs on the event loop and needs no locks. `report()`
+returns per-client counters, queue waits and Jain's fairness index of
+the weighted share of each lane.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..config.models import SchedulerConfig
+from .auth import READ, RateLimit, tool_scope
+
+READ_LANE = "read"
+WRITE_LANE = "write"
+
+# JSON-RPC server error code of rejected calls (see "retry_after" in data)
+JSONRPC_RATE_LIMITED = -32029
+
+# Clients idle for this long are forgotten once there are many of them
+_IDLE_CLIENT_SECONDS = 600.0
+_MAX_CLIENTS = 1024
+
+
+def tool_lane(tool_name: str) -> str:
+    """Lane of a tool: read for read-only tools, write for the others."""
+    return READ_LANE if tool_scope(tool_name) == READ else WRITE_LANE
+
+
+class Rejected(Exception):
+    """A tool call refused by the scheduler."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+    def jsonrpc_error(self) -> Dict[str, Any]:
+        """JSON-RPC error object with the retry hint."""
+        return {
+            "code": JSONRPC_RATE_LIMITED,
+            "message": str(self),
+            "data": {"retry_after": round(self.retry_after, 3)}
+        }
+
+
+class _ClientLane:
+    """State of one client in one lane."""
+
+    __slots__ = ("bucket", "finish", "queued", "admitted", "rate_limited", "queue_rejected",
+                 "timed_out", "served", "wait_total", "wait_max", "last_seen")
+
+    def __init__(self, bucket: RateLimit):
+        self.bucket = bucket
+        self.finish = 0.0
+        self.queued = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.queue_rejected = 0
+        self.timed_out = 0
+        self.served = 0.0  # calls divided by weight
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.last_seen = time.monotonic()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rate_limited": self.rate_limited,
+            "queue_rejected": self.queue_rejected,
+            "timed_out": self.timed_out,
+            "wait_ms_avg": round(self.wait_total / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "wait_ms_max": round(self.wait_max * 1000, 1),
+        }
+
+
+class _Lane:
+    """Execution slots and weighted fair queue of one lane."""
+
+    def __init__(self, name: str, rate: float, burst: int, slots: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.slots = slots
+        self.active = 0
+        self.vtime = 0.0
+        self.clients: Dict[str, _ClientLane] = {}
+        # (virtual finish time, arrival order, future)
+        self.waiting: List[Tuple[float, int, asyncio.Future]] = []
+        self.service_time = 0.0  # moving average of a call's duration
+
+    def client(self, name: str) -> _ClientLane:
+        state = self.clients.get(name)
+        if state is None:
+            if len(self.clients) >= _MAX_CLIENTS:
+                self._forget_idle()
+            state = self.clients[name] = _ClientLane(RateLimit(self.rate, self.burst))
+        state.last_seen = time.monotonic()
+        return state
+
+    def _forget_idle(self) -> None:
+        cutoff = time.monotonic() - _IDLE_CLIENT_SECONDS
+        for name in [n for n, c in self.clients.items() if not c.queued and c.last_seen < cutoff]:
+            del self.clients[name]
+
+    def dispatch(self) -> None:
+        """Hand free slots to the waiting calls with the smallest finish times."""
+        while self.active < self.slots and self.waiting:
+            tag, _, future = heapq.heappop(self.waiting)
+            if future.done():  # timed out or cancelled
+                continue
+            self.vtime = tag
+            self.active += 1
+            future.set_result(None)
+
+    def jain_index(self) -> Optional[float]:
+        shares = [c.served for c in self.clients.values() if c.served]
+        if not shares:
+            return None
+        return round(sum(shares) ** 2 / (len(shares) * sum(s * s for s in shares)), 3)
+
+
+class Ticket:
+    """An execution slot held by a tool call; release it when done.
+
+    Tickets of a disabled scheduler hold nothing.
+    """
+
+    __slots__ = ("_lane", "_started", "_released")
+
+    def __init__(self, lane: Optional[_Lane]):
+        self._lane = lane
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if self._released or self._lane is None:
+            return
+        self._released = True
+        lane = self._lane
+        lane.service_time += 0.1 * ((time.monotonic() - self._started) - lane.service_time)
+        lane.active -= 1
+        lane.dispatch()
+
+    async def __aenter__(self) -> "Ticket":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class FairScheduler:
+    """Rate limits and fair queueing of tool calls per client."""
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        """Initialize the lanes.
+
+        Args:
+            config: Scheduler configuration (defaults apply when omitted)
+        """
+        self.config = config or SchedulerConfig()
+        self.logger = logging.getLogger("proxmox-mcp.scheduler")
+        self.lanes = {
+            READ_LANE: _Lane(READ_LANE, self.config.read_rate, self.config.read_burst, self.config.read_slots),
+            WRITE_LANE: _Lane(WRITE_LANE, self.config.write_rate, self.config.write_burst, self.config.write_slots),
+        }
+        self._order = itertools.count()
+
+    async def acquire(self, client: str, tool_name: str, weight: float = 1.0) -> Ticket:
+        """Wait for an execution slot for a tool call.
+
+        Args:
+            client: Client identifier (API key name, optionally with session)
+            tool_name: Tool being called, which selects the lane
+            weight: Share of the client relative to the others
+
+        Returns:
+            A ticket to release once the call is done
+
+        Raises:
+            Rejected: If the client is over budget, has too many calls
+                     waiting or waited longer than queue_timeout
+        """
+        if not self.config.enabled:
+            return Ticket(None)
+        lane = self.lanes[tool_lane(tool_name)]
+        state = lane.client(client)
+
+        wait = state.bucket.acquire()
+        if wait:
+            state.rate_limited += 1
+            self.logger.info(f"Rate limited {lane.name} call to {tool_name} from {client}")
+            raise Rejected(f"Rate limit exceeded for {client} ({lane.name} tools): "
+                           f"{lane.rate:g} calls/s, burst {lane.burst}", wait)
+
+        arrived = time.monotonic()
+        state.finish = max(lane.vtime, state.finish) + 1.0 / weight
+        if lane.active < lane.slots and not lane.waiting:
+            lane.vtime = state.finish
+            lane.active += 1
+        else:
+            if state.queued >= self.config.max_queued:
+                state.queue_rejected += 1
+                state.finish -= 1.0 / weight
+                raise Rejected(f"Too many queued {lane.name} calls for {client}",
+                               self._queue_eta(lane))
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(lane.waiting, (state.finish, next(self._order), future))
+            state.queued += 1
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self.config.queue_timeout)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    future.cancel()
+                    state.timed_out += 1
+                    raise Rejected(f"Timed out after {self.config.queue_timeout:g}s waiting for a "
+                                   f"{lane.name} slot", self._queue_eta(lane))
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over while the caller went away
+                    lane.active -= 1
+                    lane.dispatch()
+                else:
+                    future.cancel()
+                raise
+            finally:
+                state.queued -= 1
+
+        waited = time.monotonic() - arrived
+        state.admitted += 1
+        state.served += 1.0 / weight
+        state.wait_total += waited
+        state.wait_max = max(state.wait_max, waited)
+        return Ticket(lane)
+
+    @staticmethod
+    def _queue_eta(lane: _Lane) -> float:
+        """Rough time until the queue ahead drains."""
+        return max(1.0, lane.service_time * (len(lane.waiting) + 1) / lane.slots)
+
+    async def release_after(self, ticket: Ticket, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass a stream through, releasing its slot when it ends."""
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            ticket.release()
+
+    def report(self) -> Dict[str, Any]:
+        """Lane occupancy, per-client counters and fairness, for admin endpoints."""
+        return {
+            name: {
+                "slots": lane.slots,
+                "active": lane.active,
+                "waiting": sum(1 for *_, f in lane.waiting if not f.done()),
+                "rate": lane.rate,
+                "burst": lane.burst,
+                "service_ms_avg": round(lane.service_time * 1000, 1),
+                "jain_index": lane.jain_index(),
+                "clients": {client: state.report() for client, state in lane.clients.items()},
+            }
+            for name, lane in self.lanes.items()
+        }
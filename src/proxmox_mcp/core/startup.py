@@ -0,0 +1,178 @@
+"""
+Fast start for the HTTP servers.
+
+Connecting to Proxmox and building the engines and tools (which imports
+proxmoxer, requests and the MCP types) takes seconds, and an unreachable
+host used to keep the server from binding at all. With fast start:
+- The listener binds as soon as the configuration is loaded
+- The connection and the tools are initialized in a worker thread and
+  retried until they succeed
+- /health reports readiness, the current phase and how long each phase
+  took to be reached
+- Tool calls made before readiness wait for it, up to a timeout
+- An optional warm-up (pooled connections, inventory, storage and node
+  status, pre-rendered tool list) runs before readiness is reported, so
+  the first calls after a deploy don't pay for cold caches
+
+Timings are measured from the import of this module, which the servers
+do first.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ..config.models import StartupConfig
+
+LOADED_AT = time.perf_counter()
+
+
+class Startup:
+    """Readiness of a server whose tools are initialized in the background."""
+
+    def __init__(self, config: Optional[StartupConfig] = None):
+        """Initialize the startup state.
+
+        Args:
+            config: Startup configuration (defaults apply when omitted)
+        """
+        self.config = config or StartupConfig()
+        self.logger = logging.getLogger("proxmox-mcp.startup")
+        self.phase = "starting"
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.timings: Dict[str, float] = {}
+        self.warmup: Dict[str, Any] = {}
+        self._ready = asyncio.Event()
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._mark("starting")
+
+    def _mark(self, phase: str) -> None:
+        self.phase = phase
+        self.timings.setdefault(phase, round(time.perf_counter() - LOADED_AT, 3))
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def run(self, initialize: Callable[[], Any]) -> bool:
+        """Call `initialize` until it succeeds (blocking).
+
+        Args:
+            initialize: Connects to Proxmox and builds the tools; raises on failure
+
+        Returns:
+            True once initialized, False if stopped before
+        """
+        self._mark("connecting")
+        while not self._stopped.is_set():
+            self.attempts += 1
+            try:
+                initialize()
+            except Exception as e:
+                self.error = str(e)
+                self._mark("retrying")
+                self.logger.warning(
+                    f"Initialization attempt {self.attempts} failed, "
+                    f"retrying in {self.config.retry_interval}s: {e}"
+                )
+                self._stopped.wait(self.config.retry_interval)
+                continue
+            self.error = None
+            return True
+        return False
+
+    def warm_up(self, steps: Iterable[Tuple[str, Callable[[], Any]]]) -> None:
+        """Run warm-up steps one after the other (blocking).
+
+        A failing step is logged and recorded in the report; it doesn't
+        prevent readiness, the tools then fetch what they need on demand.
+
+        Args:
+            steps: (name, callable) pairs
+        """
+        self._mark("warming")
+        for name, step in steps:
+            if self._stopped.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                self.warmup[name] = {"ok": False, "error": str(e)}
+                self.logger.warning(f"Warm-up step {name} failed: {e}")
+                continue
+            self.warmup[name] = {"ok": True, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def set_ready(self) -> None:
+        """Mark the server ready (must be called on the event loop)."""
+        self._mark("ready")
+        self._ready.set()
+        self.logger.info(f"Ready after {self.timings['ready']}s ({self.attempts} attempt(s))")
+
+    def start(self, initialize: Callable[[], Any],
+              on_ready: Optional[Callable[[], Any]] = None,
+              warm_up: Optional[Callable[[], Iterable[Tuple[str, Callable[[], Any]]]]] = None) -> asyncio.Task:
+        """Initialize in the background on the running event loop.
+
+        Args:
+            initialize: Blocking initialization, run in a worker thread
+            on_ready: Called on the event loop once initialized, before
+                readiness is reported (e.g. to start background refreshers)
+            warm_up: Returns the warm-up steps once initialized (None to skip)
+        """
+        async def _background() -> None:
+            if not await asyncio.to_thread(self.run, initialize):
+                return
+            if warm_up is not None:
+                await asyncio.to_thread(self.warm_up, warm_up())
+                if self._stopped.is_set():
+                    return
+            if on_ready is not None:
+                on_ready()
+            self.set_ready()
+
+        self._task = asyncio.create_task(_background())
+        return self._task
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until ready.
+
+        Args:
+            timeout: Seconds to wait (defaults to ready_timeout)
+
+        Returns:
+            Whether the server is ready
+        """
+        if self._ready.is_set():
+            return True
+        timeout = self.config.ready_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._ready.is_set()
+
+    async def stop(self) -> None:
+        """Stop retrying; an attempt in progress is left to finish."""
+        self._stopped.set()
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def report(self) -> Dict[str, Any]:
+        """Startup state for /health."""
+        return {
+            "ready": self.ready,
+            "phase": self.phase,
+            "attempts": self.attempts,
+            "error": self.error,
+            "timings": dict(self.timings),
+            "warmup": dict(self.warmup),
+        }
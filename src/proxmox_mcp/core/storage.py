@@ -0,0 +1,185 @@
+"""
+Cluster-wide storage status collection.
+
+Storage usage lives on the nodes: every node reports the storages it can
+reach through /nodes/{node}/storage, one call returning the status of all
+of them. This module builds the cluster view from those listings:
+- Nodes are queried concurrently (one call per online node)
+- Shared storages, reported by every node that mounts them, are merged
+  into a single entry so their capacity is counted once
+- Results are cached for a short TTL, and concurrent callers share a
+  single collection instead of each fanning out again
+- Cluster-wide totals (used / total / available) are computed on the way
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.models import StorageConfig
+
+
+def _content_list(content: Any) -> List[str]:
+    """Normalize the comma-separated content attribute."""
+    if isinstance(content, (list, tuple)):
+        return [str(c) for c in content]
+    return [c for c in str(content or "").split(",") if c]
+
+
+class StorageStatusCollector:
+    """Concurrent, cached collector of per-node storage status."""
+
+    def __init__(self, proxmox_api: Any, config: Optional[StorageConfig] = None):
+        """Initialize the collector.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            config: Collector configuration (defaults apply when omitted)
+        """
+        self.proxmox = proxmox_api
+        self.config = config or StorageConfig()
+        self.logger = logging.getLogger("proxmox-mcp.storage")
+
+        self._lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self.stats: Dict[str, Any] = {
+            "collections": 0,
+            "cache_hits": 0,
+            "api_calls": 0,
+            "last_collect_ms": 0.0,
+        }
+
+    def _fresh(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._cached
+        if cached is not None and time.time() - cached["collected_at"] < self.config.status_ttl:
+            return cached
+        return None
+
+    def collect(self, force: bool = False) -> Dict[str, Any]:
+        """Return the storage status of the whole cluster.
+
+        Args:
+            force: Ignore the cache and query the nodes again
+
+        Returns:
+            Dictionary with "storages" (one entry per local storage per node
+            and per shared storage), "totals", per-node "errors" and
+            "collected_at"
+        """
+        if not force:
+            cached = self._fresh()
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        with self._collect_lock:
+            # Another caller may have collected while we waited
+            if not force:
+                cached = self._fresh()
+                if cached is not None:
+                    self.stats["cache_hits"] += 1
+                    return cached
+            result = self._collect()
+            with self._lock:
+                self._cached = result
+            return result
+
+    def _collect(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        nodes = self.proxmox.nodes.get()
+        self.stats["api_calls"] += 1
+        online = sorted(n["node"] for n in nodes if n.get("status", "online") == "online")
+        errors: Dict[str, str] = {
+            n["node"]: "node offline" for n in nodes if n.get("status", "online") != "online"
+        }
+
+        listings: Dict[str, List[Dict[str, Any]]] = {}
+        if online:
+            workers = max(1, min(self.config.status_workers, len(online)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-status") as pool:
+                for node, listing, error in pool.map(self._node_storages, online):
+                    if error is not None:
+                        errors[node] = error
+                    else:
+                        listings[node] = listing
+            self.stats["api_calls"] += len(online)
+
+        storages = self._merge(online, listings)
+        result = {
+            "storages": storages,
+            "totals": self._totals(storages, len(nodes), len(listings)),
+            "errors": errors,
+            "collected_at": time.time(),
+        }
+        self.stats["collections"] += 1
+        self.stats["last_collect_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _node_storages(self, node: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+        """Storage listing of one node (runs in a worker thread)."""
+        try:
+            listing = self.proxmox.nodes(node).storage.get()
+            return node, listing or [], None
+        except Exception as e:
+            self.logger.warning(f"Failed to get storage status of node {node}: {e}")
+            return node, [], str(e)
+
+    @staticmethod
+    def _merge(online: List[str], listings: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Turn per-node listings into one entry per (node, storage), shared storages once."""
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for node in online:
+            for store in listings.get(node, []):
+                name = store.get("storage")
+                shared = bool(store.get("shared"))
+                key = ("*", name) if shared else (node, name)
+                active = bool(store.get("active", 1)) and bool(store.get("enabled", 1))
+                entry = merged.get(key)
+                if entry is not None:
+                    entry["nodes"].append(node)
+                    if entry["status"] == "online" or not active:
+                        continue
+                entry = merged[key] = {
+                    "storage": name,
+                    "node": "shared" if shared else node,
+                    "nodes": entry["nodes"] if entry is not None else [node],
+                    "type": store.get("type", "unknown"),
+                    "content": _content_list(store.get("content")),
+                    "shared": shared,
+                    "status": "online" if active else "offline",
+                    "used": int(store.get("used") or 0),
+                    "total": int(store.get("total") or 0),
+                    "available": int(store.get("avail") or 0),
+                }
+        return sorted(merged.values(), key=lambda s: (s["shared"], s["node"], s["storage"]))
+
+    @staticmethod
+    def _totals(storages: List[Dict[str, Any]], nodes: int, nodes_ok: int) -> Dict[str, Any]:
+        """Cluster-wide capacity over online storages."""
+        online = [s for s in storages if s["status"] == "online"]
+        used = sum(s["used"] for s in online)
+        total = sum(s["total"] for s in online)
+        return {
+            "storages": len(storages),
+            "online": len(online),
+            "shared": sum(1 for s in storages if s["shared"]),
+            "used": used,
+            "total": total,
+            "available": sum(s["available"] for s in online),
+            "percent": round(used / total * 100, 1) if total else 0.0,
+            "nodes": nodes,
+            "nodes_ok": nodes_ok,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Collector state for admin endpoints."""
+        with self._lock:
+            cached = self._cached
+        return {
+            "status_ttl": self.config.status_ttl,
+            "cached_age": round(time.time() - cached["collected_at"], 1) if cached else None,
+            **self.stats,
+        }
@@ -0,0 +1,109 @@
+"""
+Streaming of tool output over the HTTP transports.
+
+Listing tools can render their text row by row (see formatting.renderer).
+This module carries those chunks to the client as they are produced
+instead of buffering one large response:
+- Clients opt in with `Accept: text/event-stream` (without also accepting
+  application/json, so existing clients keep their JSON responses)
+- The blocking chunk iterator is advanced in worker threads, one chunk at a
+  time, so the event loop never waits on Proxmox calls
+- Chunks are sent as Server-Sent Events, either as plain text events or as
+  JSON-RPC notifications followed by the final response
+- CPU and wall time are accounted to the tool across those threads
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from .profiler import tool_stats
+
+STREAM_HEADERS = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+
+_DONE = object()
+
+
+def wants_stream(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for an event stream rather than JSON."""
+    if not accept:
+        return False
+    types = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+    return "text/event-stream" in types and "application/json" not in types
+
+
+async def iterate_chunks(chunks: Iterator[str], tool_name: str) -> AsyncIterator[str]:
+    """Advance a blocking chunk iterator from worker threads.
+
+    Args:
+        chunks: Iterator doing Proxmox calls and rendering between chunks
+        tool_name: Tool the time is accounted to in tool_stats
+    """
+    cpu = 0.0
+    started = time.perf_counter()
+    failed = False
+
+    def advance() -> Any:
+        nonlocal cpu
+        cpu_start = time.thread_time()
+        try:
+            return next(chunks, _DONE)
+        finally:
+            cpu += time.thread_time() - cpu_start
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(advance)
+            if chunk is _DONE:
+                break
+            yield chunk
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                # Still running in its worker thread (client went away mid-chunk)
+                pass
+        tool_stats.record(tool_name, cpu, time.perf_counter() - started, failed)
+
+
+async def text_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Render chunks as SSE: `chunk` events, then `end` (or `error`)."""
+    count = 0
+    try:
+        async for chunk in chunks:
+            count += 1
+            yield f"event: chunk\ndata: {json.dumps({'type': 'text', 'text': chunk})}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+        return
+    yield f"event: end\ndata: {json.dumps({'chunks': count})}\n\n"
+
+
+async def jsonrpc_events(request_id: Any, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Render chunks as JSON-RPC messages over SSE.
+
+    Every chunk is a `notifications/tools/output` notification carrying the
+    request id; the stream ends with the response to the request, whose
+    result only reports that the content was streamed (or with an error).
+    """
+    count = 0
+    try:
+        async for chunk in chunks:
+            count += 1
+            message = {
+                "jsonrpc": "2.0",
+                "method": "notifications/tools/output",
+                "params": {"requestId": request_id, "content": [{"type": "text", "text": chunk}]},
+            }
+            yield f"event: message\ndata: {json.dumps(message)}\n\n"
+    except Exception as e:
+        response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": str(e)}}
+    else:
+        response = {"jsonrpc": "2.0", "id": request_id,
+                    "result": {"content": [], "streamed": True, "chunks": count}}
+    yield f"event: message\ndata: {json.dumps(response)}\n\n"
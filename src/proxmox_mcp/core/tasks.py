@@ -0,0 +1,457 @@
+"""
+Asynchronous task (UPID) tracking for the Proxmox MCP server.
+
+Most Proxmox write operations return immediately with a UPID while the
+actual work runs as a background task on the node. This module provides:
+- UPID parsing
+- A tracker that remembers submitted tasks and polls their status
+- Per-node batching: one /nodes/{node}/tasks?source=active call answers
+  "still running?" for every tracked task on that node
+- Poll rate capping so many waiters never hammer pveproxy
+- Blocking waits with timeouts for tools that offer wait=true
+- Incremental task log reads and a shared, per-node log tailer that fans
+  new lines out to any number of streaming subscribers
+
+Finished tasks are kept for a retention window so they can be listed.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def parse_upid(upid: str) -> Dict[str, Any]:
+    """Split a UPID string into its components.
+
+    Format: UPID:{node}:{pid}:{pstart}:{starttime}:{type}:{id}:{user}:
+
+    Args:
+        upid: Task identifier returned by Proxmox
+
+    Returns:
+        Dictionary with node, pid, pstart, starttime, type, id and user
+
+    Raises:
+        ValueError: If the string is not a UPID
+    """
+    parts = str(upid).strip().split(":")
+    if len(parts) < 8 or parts[0] != "UPID":
+        raise ValueError(f"Invalid UPID: {upid}")
+    try:
+        starttime = int(parts[4], 16)
+    except ValueError:
+        starttime = 0
+    return {
+        "node": parts[1],
+        "pid": parts[2],
+        "pstart": parts[3],
+        "starttime": starttime,
+        "type": parts[5],
+        "id": parts[6],
+        "user": parts[7],
+    }
+
+
+class TaskTracker:
+    """Registry and poller for Proxmox tasks.
+
+    All methods are thread-safe; tools call them from request handlers
+    while waiters may be blocked in `wait()` on other threads.
+    """
+
+    def __init__(self, proxmox_api: Any, min_poll_interval: float = 1.0,
+                 retention: float = 3600.0, max_poll_interval: float = 5.0):
+        """Initialize the tracker.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            min_poll_interval: Minimum seconds between two polls of the same node
+            retention: Seconds finished tasks are kept for listing
+            max_poll_interval: Upper bound for the wait() backoff
+        """
+        self.proxmox = proxmox_api
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.retention = retention
+        self.logger = logging.getLogger("proxmox-mcp.tasks")
+
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._last_poll: Dict[str, float] = {}
+        self.api_calls = 0
+
+    # ---------- registration ----------
+    def track(self, upid: Any, label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Start tracking a task.
+
+        Args:
+            upid: Value returned by a Proxmox POST/PUT/DELETE (non-UPIDs are ignored)
+            label: Human-readable description of the operation
+
+        Returns:
+            Copy of the task record, or None if `upid` is not a UPID
+        """
+        if not isinstance(upid, str) or not upid.startswith("UPID:"):
+            return None
+        try:
+            info = parse_upid(upid)
+        except ValueError:
+            return None
+        with self._lock:
+            record = self._tasks.get(upid)
+            if record is None:
+                record = {
+                    "upid": upid,
+                    "node": info["node"],
+                    "type": info["type"],
+                    "id": info["id"],
+                    "user": info["user"],
+                    "label": label or f"{info['type']} {info['id']}".strip(),
+                    "status": "running",
+                    "exitstatus": None,
+                    "submitted_at": time.time(),
+                    "finished_at": None,
+                }
+                self._tasks[upid] = record
+            elif label:
+                record["label"] = label
+            self._prune()
+            return dict(record)
+
+    def _prune(self) -> None:
+        """Drop finished tasks that are past the retention window."""
+        cutoff = time.time() - self.retention
+        stale = [
+            upid for upid, rec in self._tasks.items()
+            if rec["finished_at"] is not None and rec["finished_at"] < cutoff
+        ]
+        for upid in stale:
+            del self._tasks[upid]
+
+    # ---------- polling ----------
+    def _pending_by_node(self, upids: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        with self._lock:
+            wanted = set(upids) if upids is not None else None
+            grouped: Dict[str, List[str]] = {}
+            for upid, rec in self._tasks.items():
+                if rec["status"] != "running":
+                    continue
+                if wanted is not None and upid not in wanted:
+                    continue
+                grouped.setdefault(rec["node"], []).append(upid)
+            return grouped
+
+    def poll(self, upids: Optional[Iterable[str]] = None, force: bool = False) -> None:
+        """Refresh the status of running tasks, batched per node.
+
+        Nodes polled less than `min_poll_interval` seconds ago are skipped
+        unless `force` is set.
+
+        Args:
+            upids: Restrict polling to these tasks (default: all running)
+            force: Ignore the per-node poll rate cap
+        """
+        for node, pending in self._pending_by_node(upids).items():
+            now = time.monotonic()
+            with self._lock:
+                last = self._last_poll.get(node, 0.0)
+                if not force and now - last < self.min_poll_interval:
+                    continue
+                self._last_poll[node] = now
+            try:
+                self._poll_node(node, pending)
+            except Exception as e:
+                self.logger.warning(f"Failed to poll tasks on node {node}: {e}")
+
+    def _poll_node(self, node: str, pending: List[str]) -> None:
+        """Resolve finished tasks on one node with as few calls as possible."""
+        if len(pending) > 1:
+            # One listing call tells which of the pending tasks are still active
+            active_raw = self.proxmox.nodes(node).tasks.get(source="active")
+            self.api_calls += 1
+            active = {
+                t.get("upid") for t in (active_raw or []) if isinstance(t, dict)
+            }
+            finished = [upid for upid in pending if upid not in active]
+        else:
+            finished = pending
+
+        for upid in finished:
+            status = self.proxmox.nodes(node).tasks(upid).status.get()
+            self.api_calls += 1
+            self._apply_status(upid, status if isinstance(status, dict) else {})
+
+    def _apply_status(self, upid: str, status: Dict[str, Any]) -> None:
+        with self._lock:
+            rec = self._tasks.get(upid)
+            if rec is None:
+                return
+            if status.get("status") == "stopped":
+                rec["status"] = "stopped"
+                rec["exitstatus"] = status.get("exitstatus")
+                rec["finished_at"] = time.time()
+
+    # ---------- waiting / queries ----------
+    def wait(self, upids: Iterable[str], timeout: float = 60.0) -> List[Dict[str, Any]]:
+        """Block until the given tasks finish or `timeout` expires.
+
+        Args:
+            upids: Task identifiers (untracked UPIDs are tracked on the fly)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Copies of the task records in the order requested
+        """
+        wanted = [u for u in upids if self.track(u) is not None]
+        deadline = time.monotonic() + max(0.0, timeout)
+        delay = self.min_poll_interval
+
+        while True:
+            # Concurrent waiters share one rate-capped poll per node, which
+            # covers every running task on it
+            nodes = set(self._pending_by_node(wanted))
+            if nodes:
+                self.poll([u for node, pending in self._pending_by_node().items()
+                           if node in nodes for u in pending])
+            if not self._pending_by_node(wanted) or time.monotonic() >= deadline:
+                break
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 1.5, self.max_poll_interval)
+
+        return [self.get(u) for u in wanted]
+
+    def get(self, upid: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a task record, with elapsed time."""
+        with self._lock:
+            rec = self._tasks.get(upid)
+            if rec is None:
+                return None
+            out = dict(rec)
+        end = out["finished_at"] or time.time()
+        out["elapsed"] = round(end - out["submitted_at"], 1)
+        out["ok"] = out["status"] == "stopped" and out["exitstatus"] == "OK"
+        return out
+
+    def list(self, node: Optional[str] = None, include_finished: bool = True) -> List[Dict[str, Any]]:
+        """Return tracked tasks, newest first."""
+        with self._lock:
+            self._prune()
+            upids = [
+                upid for upid, rec in self._tasks.items()
+                if (node is None or rec["node"] == node)
+                and (include_finished or rec["status"] == "running")
+            ]
+        records = [r for r in (self.get(u) for u in upids) if r is not None]
+        records.sort(key=lambda r: r["submitted_at"], reverse=True)
+        return records
+
+    def outstanding(self) -> List[str]:
+        """UPIDs of tasks not known to have finished."""
+        return [u for pending in self._pending_by_node().values() for u in pending]
+
+    # ---------- logs ----------
+    def fetch_log(self, upid: str, start: int = 0, limit: Optional[int] = None,
+                  page_size: int = 500) -> Tuple[List[Dict[str, Any]], int]:
+        """Read task log lines from offset `start` onwards.
+
+        Proxmox numbers log lines from 1 (`n`) while `start` is a 0-based
+        offset, so the next offset is simply the last `n` seen. Placeholder
+        entries such as "no content" (n=0) are dropped.
+
+        Args:
+            upid: Task identifier
+            start: 0-based offset of the first line to return
+            limit: Maximum number of lines (default: everything available)
+            page_size: Lines requested per API call
+
+        Returns:
+            Tuple of (lines, next_start)
+        """
+        node = parse_upid(upid)["node"]
+        lines: List[Dict[str, Any]] = []
+        offset = max(0, int(start))
+        while limit is None or len(lines) < limit:
+            want = page_size if limit is None else min(page_size, limit - len(lines))
+            page = self.proxmox.nodes(node).tasks(upid).log.get(start=offset, limit=want)
+            self.api_calls += 1
+            fresh = [
+                line for line in (page or [])
+                if isinstance(line, dict) and int(line.get("n", 0)) > offset
+            ]
+            if not fresh:
+                break
+            lines.extend(fresh)
+            offset = int(fresh[-1]["n"])
+            if len(fresh) < want:
+                break
+        return lines, offset
+
+
+class _Tail:
+    """Shared cursor over one task log and the queues subscribed to it."""
+
+    def __init__(self, upid: str, node: str, start: int):
+        self.upid = upid
+        self.node = node
+        self.base = start
+        self.offset = start
+        self.history: List[Dict[str, Any]] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+
+
+class TaskLogTailer:
+    """Fan-out tailer for task logs.
+
+    Each tailed UPID has a single cursor no matter how many clients follow
+    it, and each node has a single polling loop that refreshes task states
+    (batched through the TaskTracker) and reads only the lines past every
+    cursor. Recent lines are kept so late subscribers can catch up without
+    another full download.
+    """
+
+    def __init__(self, tracker: TaskTracker, poll_interval: float = 1.0,
+                 max_history: int = 5000, keepalive: float = 15.0):
+        """Initialize the tailer.
+
+        Args:
+            tracker: Task tracker used for status polling and log reads
+            poll_interval: Seconds between two polls of a node
+            max_history: Lines kept per tail for late subscribers
+            keepalive: Seconds of silence before a keepalive event is emitted
+        """
+        self.tracker = tracker
+        self.poll_interval = poll_interval
+        self.max_history = max_history
+        self.keepalive = keepalive
+        self.logger = logging.getLogger("proxmox-mcp.tasks")
+
+        self._tails: Dict[str, _Tail] = {}
+        self._node_loops: Dict[str, asyncio.Task] = {}
+
+    async def stream(self, upid: str, start: int = 0) -> AsyncIterator[Tuple[str, Any]]:
+        """Follow a task log until the task finishes.
+
+        Yields ("line", {"n", "t"}) for every new line, ("keepalive", None)
+        after `keepalive` seconds of silence and finally ("end", task record).
+
+        Args:
+            upid: Task identifier
+            start: 0-based offset to resume from
+
+        Raises:
+            ValueError: If `upid` is not a UPID
+        """
+        node = parse_upid(upid)["node"]
+        self.tracker.track(upid)
+        queue: asyncio.Queue = asyncio.Queue()
+        pos = await self._subscribe(upid, node, max(0, int(start)), queue)
+        try:
+            while True:
+                try:
+                    kind, payload = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield "keepalive", None
+                    continue
+                if kind == "lines":
+                    for line in payload:
+                        if int(line["n"]) > pos:
+                            pos = int(line["n"])
+                            yield "line", line
+                else:
+                    yield kind, payload
+                    return
+        finally:
+            self._unsubscribe(upid, queue)
+
+    async def _subscribe(self, upid: str, node: str, start: int, queue: asyncio.Queue) -> int:
+        """Attach `queue` to the shared tail, replaying lines from `start`."""
+        pos = start
+        while True:
+            tail = self._tails.get(upid)
+            if tail is None:
+                tail = self._tails[upid] = _Tail(upid, node, pos)
+            if pos >= tail.base:
+                backlog = tail.history[pos - tail.base:]
+                if backlog:
+                    queue.put_nowait(("lines", backlog))
+                tail.subscribers.add(queue)
+                break
+            # Older than the kept history: fetch the gap once for this client
+            lines, nxt = await asyncio.to_thread(self.tracker.fetch_log, upid, pos, tail.base - pos)
+            if lines:
+                queue.put_nowait(("lines", lines))
+            pos = nxt if lines else tail.base
+
+        loop_task = self._node_loops.get(node)
+        if loop_task is None or loop_task.done():
+            self._node_loops[node] = asyncio.get_running_loop().create_task(self._run_node(node))
+        return start
+
+    def _unsubscribe(self, upid: str, queue: asyncio.Queue) -> None:
+        tail = self._tails.get(upid)
+        if tail is None:
+            return
+        tail.subscribers.discard(queue)
+        if not tail.subscribers:
+            del self._tails[upid]
+
+    async def _run_node(self, node: str) -> None:
+        """Poll one node for as long as some of its tasks are followed."""
+        while True:
+            tails = [t for t in self._tails.values() if t.node == node]
+            if not tails:
+                return
+            try:
+                updates = await asyncio.to_thread(self._collect, tails)
+            except Exception as e:
+                self.logger.warning(f"Task log polling failed on node {node}: {e}")
+                updates = []
+            for tail, lines, final in updates:
+                self._publish(tail, lines, final)
+            await asyncio.sleep(self.poll_interval)
+
+    def _collect(self, tails: List[_Tail]) -> List[Tuple[_Tail, List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """Read new lines for every tail (runs in a worker thread)."""
+        upids = [t.upid for t in tails]
+        self.tracker.poll(upids)
+        updates = []
+        for tail in tails:
+            # Status first: a task seen finished here has its whole log on disk
+            record = self.tracker.get(tail.upid)
+            finished = record is not None and record["status"] != "running"
+            lines, _ = self.tracker.fetch_log(tail.upid, tail.offset)
+            updates.append((tail, lines, record if finished else None))
+        return updates
+
+    def _publish(self, tail: _Tail, lines: List[Dict[str, Any]],
+                 final: Optional[Dict[str, Any]]) -> None:
+        if lines:
+            tail.offset = int(lines[-1]["n"])
+            tail.history.extend(lines)
+            overflow = len(tail.history) - self.max_history
+            if overflow > 0:
+                del tail.history[:overflow]
+                tail.base += overflow
+            for queue in tail.subscribers:
+                queue.put_nowait(("lines", lines))
+        if final is not None:
+            for queue in tail.subscribers:
+                queue.put_nowait(("end", final))
+            self._tails.pop(tail.upid, None)
+
+
+async def task_log_events(tailer: TaskLogTailer, upid: str, start: int = 0) -> AsyncIterator[str]:
+    """Render a task log stream as Server-Sent Events.
+
+    Each line is sent with its line number as event id so that clients can
+    resume with the Last-Event-ID header.
+    """
+    async for kind, payload in tailer.stream(upid, start):
+        if kind == "line":
+            yield f"id: {payload['n']}\nevent: log\ndata: {json.dumps(payload)}\n\n"
+        elif kind == "keepalive":
+            yield ": keepalive\n\n"
+        else:
+            yield f"event: end\ndata: {json.dumps(payload)}\n\n"
@@ -0,0 +1,336 @@
+"""
+Embedded time-series store for historical metrics.
+
+Proxmox RRD archives lose resolution quickly for older data (30 minute
+rows after a day, 3 hours after a week) and every query re-downloads them.
+This store keeps our own samples on local disk instead:
+- One directory per UTC day segment, one sub-directory per resource
+- Columnar layout: one append-only file per field holding fixed-width
+  float64 values (native endianness), plus a `time` column
+- Samples buffered in memory and appended in batches; a series interrupted
+  mid-flush is truncated back to its last complete row before it grows
+- Reads through read-only memory maps with binary search on the time column
+- Whole-segment retention: day directories older than the retention are removed
+
+Resources are identified by their /cluster/resources id ("qemu/100",
+"lxc/200", "node/pve1", "storage/pve1/local").
+"""
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+# Fields stored per resource type
+STORE_FIELDS = {
+    "qemu": ("cpu", "mem", "maxmem", "disk", "maxdisk", "netin", "netout", "diskread", "diskwrite"),
+    "lxc": ("cpu", "mem", "maxmem", "disk", "maxdisk", "netin", "netout", "diskread", "diskwrite"),
+    "node": ("cpu", "mem", "maxmem", "disk", "maxdisk"),
+    "storage": ("disk", "maxdisk"),
+}
+
+ITEM_SIZE = array("d").itemsize
+NAN = float("nan")
+
+
+def _segment_of(ts: float) -> str:
+    """UTC day segment name of a timestamp (YYYYMMDD)."""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%d")
+
+
+def _value(item: Dict[str, Any], field: str) -> float:
+    value = item.get(field)
+    if value is None:
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class TimeSeriesStore:
+    """Append-only columnar store backed by memory-mapped files.
+
+    Writes are buffered per resource and flushed every `flush_interval`
+    seconds (or on `flush()` / `close()`); reads merge flushed data with
+    the in-memory buffer so recent samples are always visible.
+    """
+
+    def __init__(self, path: str, retention_days: int = 30, flush_interval: float = 60.0,
+                 max_open_maps: int = 4096):
+        """Open (or create) a store.
+
+        Args:
+            path: Root directory of the store
+            retention_days: Day segments kept on disk
+            flush_interval: Seconds between two batched writes
+            max_open_maps: Memory maps of closed segments kept open for reuse
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.max_open_maps = max_open_maps
+        self.logger = logging.getLogger("proxmox-mcp.tsstore")
+
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        # (segment, rid) -> {field: array('d')} including "time"
+        self._buffer: Dict[Tuple[str, str], Dict[str, array]] = {}
+        self._last_ts: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self._maps: Dict[Tuple[str, str, str], Tuple[mmap.mmap, memoryview]] = {}
+        self._segment: Optional[str] = None
+        self._repaired: set = set()  # (segment, rid) whose columns were aligned
+        self._first_ts: Optional[float] = None  # earliest sample on disk, reset by flushes
+        self.stats: Dict[str, int] = {"samples": 0, "flushes": 0, "bytes_written": 0,
+                                      "segments_expired": 0}
+
+    # ---------- paths ----------
+    def _series_dir(self, segment: str, rid: str) -> str:
+        return os.path.join(self.path, segment, quote(rid, safe=""))
+
+    def segments(self) -> List[str]:
+        """Day segments present on disk, oldest first."""
+        return sorted(
+            name for name in os.listdir(self.path)
+            if len(name) == 8 and name.isdigit()
+        )
+
+    # ---------- writes ----------
+    def append(self, ts: float, resources: Iterable[Dict[str, Any]]) -> int:
+        """Buffer one snapshot of /cluster/resources entries.
+
+        Args:
+            ts: Snapshot timestamp (epoch seconds)
+            resources: Entries with "id" and "type"; unknown types are skipped
+
+        Returns:
+            Number of samples buffered
+        """
+        segment = _segment_of(ts)
+        count = 0
+        with self._lock:
+            if segment != self._segment:
+                if self._segment is not None:
+                    self._flush_locked()
+                self._segment = segment
+                self._expire_locked(ts)
+            for item in resources:
+                fields = STORE_FIELDS.get(item.get("type"))
+                rid = item.get("id")
+                if not fields or not rid or ts <= self._last_ts.get(rid, 0.0):
+                    continue
+                cols = self._buffer.get((segment, rid))
+                if cols is None:
+                    cols = self._buffer[(segment, rid)] = {
+                        f: array("d") for f in ("time",) + fields
+                    }
+                cols["time"].append(ts)
+                for f in fields:
+                    cols[f].append(_value(item, f))
+                self._last_ts[rid] = ts
+                count += 1
+            self.stats["samples"] += count
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+        return count
+
+    def flush(self) -> None:
+        """Append buffered samples to their column files."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        today = _segment_of(time.time())
+        for (segment, rid), cols in self._buffer.items():
+            if not cols["time"]:
+                continue
+            if segment < today:
+                # Late flush of a closed segment: drop its cached maps
+                for key in [k for k in self._maps if k[0] == segment and k[1] == rid]:
+                    self._release(key)
+            directory = self._series_dir(segment, rid)
+            os.makedirs(directory, exist_ok=True)
+            if (segment, rid) not in self._repaired:
+                self._align_columns(directory, cols)
+                self._repaired.add((segment, rid))
+            # Data columns first, time last: a torn flush never exposes
+            # timestamps without values (readers trim to the shortest column)
+            for field in sorted(cols, key=lambda f: f == "time"):
+                data = cols[field].tobytes()
+                with open(os.path.join(directory, f"{field}.f64"), "ab") as fh:
+                    fh.write(data)
+                self.stats["bytes_written"] += len(data)
+        self._buffer.clear()
+        self._first_ts = None
+        self._last_flush = time.monotonic()
+        self.stats["flushes"] += 1
+
+    def _align_columns(self, directory: str, cols: Dict[str, array]) -> None:
+        """Truncate every column of a series to its last complete row.
+
+        A flush interrupted by a crash can leave columns of different
+        lengths, or a partial float at the end of one; appending to them
+        would shift every later row.
+        """
+        sizes = {}
+        for field in cols:
+            try:
+                sizes[field] = os.path.getsize(os.path.join(directory, f"{field}.f64"))
+            except OSError:
+                sizes[field] = 0
+        rows = min(sizes.values()) // ITEM_SIZE
+        for field, size in sizes.items():
+            if size > rows * ITEM_SIZE:
+                self.logger.warning(f"Truncating torn column {directory}/{field}.f64 to {rows} rows")
+                os.truncate(os.path.join(directory, f"{field}.f64"), rows * ITEM_SIZE)
+
+    def _expire_locked(self, now: float) -> None:
+        """Delete day segments older than the retention window."""
+        cutoff = _segment_of(now - self.retention_days * 86400)
+        for segment in self.segments():
+            if segment < cutoff:
+                for key in [k for k in self._maps if k[0] == segment]:
+                    self._release(key)
+                shutil.rmtree(os.path.join(self.path, segment), ignore_errors=True)
+                self._repaired = {key for key in self._repaired if key[0] != segment}
+                self._first_ts = None
+                self.stats["segments_expired"] += 1
+
+    # ---------- reads ----------
+    def _release(self, key: Tuple[str, str, str]) -> None:
+        mm, view = self._maps.pop(key)
+        view.release()
+        mm.close()
+
+    def _column(self, segment: str, rid: str, field: str) -> Optional[memoryview]:
+        """Float64 view of one column file (None if missing or empty).
+
+        Maps of past segments never change and are cached; the current
+        segment grows and is mapped again on every read.
+        """
+        key = (segment, rid, field)
+        cached = self._maps.get(key)
+        if cached is not None:
+            return cached[1]
+        filename = os.path.join(self._series_dir(segment, rid), f"{field}.f64")
+        try:
+            size = os.path.getsize(filename)
+        except OSError:
+            return None
+        usable = size - size % ITEM_SIZE
+        if usable <= 0:
+            return None
+        with open(filename, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), usable, access=mmap.ACCESS_READ)
+        view = memoryview(mm).cast("d")
+        if segment >= _segment_of(time.time()):
+            # Still growing: the caller copies what it needs, drop the map
+            data = memoryview(array("d", view))
+            view.release()
+            mm.close()
+            return data
+        if len(self._maps) >= self.max_open_maps:
+            self._release(next(iter(self._maps)))
+        self._maps[key] = (mm, view)
+        return view
+
+    def window(self, rid: str, since: float, until: Optional[float] = None,
+               fields: Iterable[str] = ("cpu",)) -> Tuple[List[float], Dict[str, List[float]]]:
+        """Read samples of one resource in (since, until], oldest first.
+
+        Args:
+            rid: Resource id (e.g. "qemu/100")
+            since: Exclusive lower time bound
+            until: Inclusive upper time bound (default: now)
+            fields: Columns to return
+
+        Returns:
+            Tuple of (timestamps, {field: values})
+        """
+        until = time.time() if until is None else until
+        fields = tuple(fields)
+        times: List[float] = []
+        cols: Dict[str, List[float]] = {f: [] for f in fields}
+        first, last = _segment_of(since), _segment_of(until)
+        with self._lock:
+            for segment in self.segments():
+                if segment < first or segment > last:
+                    continue
+                tcol = self._column(segment, rid, "time")
+                if tcol is None:
+                    continue
+                views = {f: self._column(segment, rid, f) for f in fields}
+                n = min([len(tcol)] + [len(v) for v in views.values() if v is not None])
+                lo = bisect_right(tcol, since, 0, n)
+                hi = bisect_right(tcol, until, lo, n)
+                times.extend(tcol[lo:hi].tolist())
+                for f, v in views.items():
+                    cols[f].extend(v[lo:hi].tolist() if v is not None else [NAN] * (hi - lo))
+            # Unflushed samples
+            for (segment, buffered_rid), bcols in self._buffer.items():
+                if buffered_rid != rid:
+                    continue
+                tcol = bcols["time"]
+                lo = bisect_right(tcol, since)
+                hi = bisect_right(tcol, until, lo)
+                times.extend(tcol[lo:hi])
+                for f in fields:
+                    col = bcols.get(f)
+                    cols[f].extend(col[lo:hi] if col is not None else [NAN] * (hi - lo))
+        return times, cols
+
+    def _earliest_sample(self, segment: str) -> Optional[float]:
+        """First timestamp of any series of a segment (None if it has none)."""
+        earliest = None
+        directory = os.path.join(self.path, segment)
+        for name in os.listdir(directory):
+            try:
+                with open(os.path.join(directory, name, "time.f64"), "rb") as fh:
+                    head = fh.read(ITEM_SIZE)
+            except OSError:
+                continue
+            if len(head) == ITEM_SIZE:
+                ts = array("d", head)[0]
+                earliest = ts if earliest is None else min(earliest, ts)
+        return earliest
+
+    def covers(self, since: float) -> bool:
+        """Whether the store holds samples going back to `since`."""
+        with self._lock:
+            if self._first_ts is None:
+                for segment in self.segments():
+                    self._first_ts = self._earliest_sample(segment)
+                    if self._first_ts is not None:
+                        break
+            firsts = [cols["time"][0] for cols in self._buffer.values() if cols["time"]]
+            if self._first_ts is not None:
+                firsts.append(self._first_ts)
+            return bool(firsts) and min(firsts) <= since
+
+    def close(self) -> None:
+        """Flush pending samples and release every memory map."""
+        with self._lock:
+            self._flush_locked()
+            for key in list(self._maps):
+                self._release(key)
+
+    def report(self) -> Dict[str, Any]:
+        """Store state for admin endpoints."""
+        with self._lock:
+            segments = self.segments()
+            return {
+                "path": self.path,
+                "segments": len(segments),
+                "oldest_segment": segments[0] if segments else None,
+                "retention_days": self.retention_days,
+                "buffered_series": len(self._buffer),
+                "open_maps": len(self._maps),
+                **self.stats,
+            }
@@ -4,6 +4,7 @@ Core formatting functions for Proxmox MCP output.
 from typing import List, Union, Dict, Any
 from .theme import ProxmoxTheme
 from .colors import ProxmoxColors
+from .renderer import format_bytes as _format_bytes
 
 class ProxmoxFormatters:
     """Core formatting functions for Proxmox data."""
@@ -18,11 +19,7 @@ class ProxmoxFormatters:
         Returns:
             Formatted string with appropriate unit
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} TB"
+        return _format_bytes(bytes_value)
     
     @staticmethod
     def format_uptime(seconds: int) -> str:
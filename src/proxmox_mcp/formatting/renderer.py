@@ -0,0 +1,151 @@
+"""
+Precompiled rendering for list templates.
+
+List outputs (nodes, VMs, containers, storage) repeat the same block of
+lines once per row. Building every block from f-strings evaluates the
+theme lookups again and runs the byte formatting loop for every field.
+This module does that work once per layout instead:
+- Layouts are written with named str.format-style fields and compiled into
+  a printf-style template with theme icons and constant text baked in
+- A row is rendered by a single `%` of that template over a tuple of field
+  values, which is close to the cost of an f-string and far below that of
+  str.format with keyword arguments
+- Byte sizes are looked up in a bounded memo first (capacities such as
+  maxmem repeat across guests) and otherwise scaled by comparison against
+  precomputed thresholds
+- Rows are written into one buffer and the text is materialized once, or
+  yielded one by one and grouped into chunks for streaming transports
+"""
+import io
+import json
+from string import Formatter
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+
+# Target size of the text chunks sent by streaming transports
+CHUNK_SIZE = 16 * 1024
+
+# Scales are exact powers of two, so multiplying gives the same value as the
+# repeated division by 1024 of the original loop. Sizes of 1 PiB and more
+# keep the historical "TB" label on the PiB-scaled value.
+_KIB, _MIB, _GIB, _TIB, _PIB = (1024 ** i for i in range(1, 6))
+_PER_KIB, _PER_MIB, _PER_GIB, _PER_TIB, _PER_PIB = (1 / 1024 ** i for i in range(1, 6))
+_BYTES_MEMO: Dict[Union[int, float], str] = {}
+_BYTES_MEMO_SIZE = 4096
+
+
+def _scale_bytes(value: Union[int, float]) -> str:
+    if value < _MIB:
+        if value < _KIB:
+            return "%.2f B" % value
+        return "%.2f KB" % (value * _PER_KIB)
+    if value < _GIB:
+        return "%.2f MB" % (value * _PER_MIB)
+    if value < _TIB:
+        return "%.2f GB" % (value * _PER_GIB)
+    if value < _PIB:
+        return "%.2f TB" % (value * _PER_TIB)
+    return "%.2f TB" % (value * _PER_PIB)
+
+
+def format_bytes(value: Union[int, float]) -> str:
+    """Format a byte count with a binary unit.
+
+    Produces exactly the output of the original unit loop.
+
+    Args:
+        value: Number of bytes
+
+    Returns:
+        Formatted string, e.g. "1.50 GB"
+    """
+    text = _BYTES_MEMO.get(value)
+    if text is None:
+        text = _scale_bytes(value)
+        if len(_BYTES_MEMO) >= _BYTES_MEMO_SIZE:
+            _BYTES_MEMO.clear()
+        _BYTES_MEMO[value] = text
+    return text
+
+
+class RowLayout:
+    """A block of output lines compiled once into a printf-style template.
+
+    Lines use str.format fields; format specs must also be valid printf
+    specs (".1f", "d", ...). Fields named in `constants` are resolved at
+    compile time. The remaining ones, in order of appearance, are listed in
+    `fields`, and `render` takes a tuple of their values. Each line is
+    emitted preceded by a newline, so rendered blocks can be appended one
+    after the other to a buffer holding the header.
+    """
+
+    def __init__(self, *lines: str, **constants: Any):
+        compiled = []
+        fields = []
+        for literal, field, spec, conversion in Formatter().parse("".join("\n" + line for line in lines)):
+            compiled.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if field in constants:
+                value = constants[field]
+                if conversion == "r":
+                    value = repr(value)
+                compiled.append(format(value, spec or "").replace("%", "%%"))
+                continue
+            fields.append(field)
+            compiled.append("%" + (spec or ("r" if conversion == "r" else "s")))
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.template = "".join(compiled)
+        self.render = self.template.__mod__
+
+
+class RenderBuffer:
+    """Single text buffer for a rendered list."""
+
+    def __init__(self, header: str):
+        self._buffer = io.StringIO()
+        self._buffer.write(header)
+        self.write = self._buffer.write
+
+    def line(self, text: str) -> None:
+        """Append one free-form line."""
+        self.write("\n")
+        self.write(text)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+def usage(data: Dict[str, Any]) -> Tuple[Any, Any, float]:
+    """(used, total, percent) of a {"used": ..., "total": ...} dictionary."""
+    used = data.get("used", 0)
+    total = data.get("total", 0)
+    return used, total, (used / total * 100) if total > 0 else 0
+
+
+def chunked(parts: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Group rendered parts into chunks of at least `size` characters.
+
+    Parts are consumed lazily, so a chunk is yielded as soon as enough rows
+    have been rendered; the last chunk may be shorter.
+    """
+    pending = []
+    length = 0
+    for part in parts:
+        pending.append(part)
+        length += len(part)
+        if length >= size:
+            yield "".join(pending)
+            pending.clear()
+            length = 0
+    if pending:
+        yield "".join(pending)
+
+
+def iter_json_array(items: Iterable[Any], sort_keys: bool = False) -> Iterator[str]:
+    """Yield the parts of json.dumps(list(items), indent=2) one item at a time."""
+    first = True
+    for item in items:
+        text = json.dumps(item, indent=2, sort_keys=sort_keys).replace("\n", "\n  ")
+        yield ("[\n  " if first else ",\n  ") + text
+        first = False
+    yield "[]" if first else "\n]"
@@ -1,11 +1,47 @@
 """
 Output templates for Proxmox MCP resource types.
 """
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 from .formatters import ProxmoxFormatters
 from .theme import ProxmoxTheme
 from .colors import ProxmoxColors
 from .components import ProxmoxComponents
+from .renderer import RenderBuffer, RowLayout, format_bytes, usage
+
+# Row layouts of the list templates, compiled once at import. Rows are
+# rendered from tuples in the order of the layout fields.
+_NODE_ROW = RowLayout(
+    "",  # Empty line between nodes
+    "{icon} {node}",
+    "  • Status: {status}",
+    "  • Uptime: {uptime}",
+    "  • CPU Cores: {cores}",
+    "  • Memory: {mem_used} / {mem_total} ({mem_pct:.1f}%)",
+    icon=ProxmoxTheme.RESOURCES['node'],
+)
+_NODE_STALE = RowLayout(
+    "  {icon} Partial data (live status unavailable: {reason})",
+    icon=ProxmoxTheme.STATUS['warning'],
+)
+_DISK_LINE = RowLayout("  • Disk: {used} / {total} ({pct:.1f}%)")
+_GUEST_ROW = (
+    "",  # Empty line between guests
+    "{icon} {name} (ID: {vmid})",
+    "  • Status: {status}",
+    "  • Node: {node}",
+    "  • CPU Cores: {cpus}",
+    "  • Memory: {mem_used} / {mem_total} ({mem_pct:.1f}%)",
+)
+_VM_ROW = RowLayout(*_GUEST_ROW, icon=ProxmoxTheme.RESOURCES['vm'])
+_CONTAINER_ROW = RowLayout(*_GUEST_ROW, icon=ProxmoxTheme.RESOURCES['container'])
+_STORAGE_ROW = RowLayout(
+    "",  # Empty line between storage pools
+    "{icon} {name}",
+    "  • Status: {status}",
+    "  • Type: {type}",
+    "  • Usage: {used} / {total} ({pct:.1f}%)",
+    icon=ProxmoxTheme.RESOURCES['storage'],
+)
 
 class ProxmoxTemplates:
     """Output templates for different Proxmox resource types."""
@@ -20,41 +56,31 @@ class ProxmoxTemplates:
         Returns:
             Formatted node list string
         """
-        result = [f"{ProxmoxTheme.RESOURCES['node']} Proxmox Nodes"]
+        out = RenderBuffer(f"{ProxmoxTheme.RESOURCES['node']} Proxmox Nodes")
+        write, row, stale, disk_line = out.write, _NODE_ROW.render, _NODE_STALE.render, _DISK_LINE.render
+        uptime = ProxmoxFormatters.format_uptime
         
         for node in nodes:
-            # Get node status
-            status = node.get("status", "unknown")
-            
-            # Get memory info
-            memory = node.get("memory", {})
-            memory_used = memory.get("used", 0)
-            memory_total = memory.get("total", 0)
-            memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
-            
-            # Format node info
-            result.extend([
-                "",  # Empty line between nodes
-                f"{ProxmoxTheme.RESOURCES['node']} {node['node']}",
-                f"  • Status: {status.upper()}",
-                f"  • Uptime: {ProxmoxFormatters.format_uptime(node.get('uptime', 0))}",
-                f"  • CPU Cores: {node.get('maxcpu', 'N/A')}",
-                f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
-                f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)"
-            ])
+            memory_used, memory_total, memory_percent = usage(node.get("memory", {}))
+            write(row((
+                node['node'],
+                node.get("status", "unknown").upper(),
+                uptime(node.get('uptime', 0)),
+                node.get('maxcpu', 'N/A'),
+                format_bytes(memory_used),
+                format_bytes(memory_total),
+                memory_percent,
+            )))
+            if node.get("stale"):
+                write(stale((node.get('stale_reason', 'unknown'),)))
             
             # Add disk usage if available
             disk = node.get("disk", {})
             if disk:
-                disk_used = disk.get("used", 0)
-                disk_total = disk.get("total", 0)
-                disk_percent = (disk_used / disk_total * 100) if disk_total > 0 else 0
-                result.append(
-                    f"  • Disk: {ProxmoxFormatters.format_bytes(disk_used)} / "
-                    f"{ProxmoxFormatters.format_bytes(disk_total)} ({disk_percent:.1f}%)"
-                )
+                disk_used, disk_total, disk_percent = usage(disk)
+                write(disk_line((format_bytes(disk_used), format_bytes(disk_total), disk_percent)))
             
-        return "\n".join(result)
+        return out.getvalue()
     
     @staticmethod
     def node_status(node: str, status: Dict[str, Any]) -> str:
@@ -104,54 +130,98 @@ class ProxmoxTemplates:
         Returns:
             Formatted VM list string
         """
-        result = [f"{ProxmoxTheme.RESOURCES['vm']} Virtual Machines"]
+        return "".join(ProxmoxTemplates.iter_vm_list(vms))
+
+    @staticmethod
+    def iter_vm_list(vms: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Streaming form of vm_list: yields the header, then one block per VM.
         
-        for vm in vms:
-            memory = vm.get("memory", {})
-            memory_used = memory.get("used", 0)
-            memory_total = memory.get("total", 0)
-            memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
-            
-            result.extend([
-                "",  # Empty line between VMs
-                f"{ProxmoxTheme.RESOURCES['vm']} {vm['name']} (ID: {vm['vmid']})",
-                f"  • Status: {vm['status'].upper()}",
-                f"  • Node: {vm['node']}",
-                f"  • CPU Cores: {vm.get('cpus', 'N/A')}",
-                f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
-                f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)"
-            ])
+        Args:
+            vms: VM data dictionaries, consumed lazily
             
-        return "\n".join(result)
+        Returns:
+            Iterator over text parts whose concatenation is vm_list(vms)
+        """
+        yield f"{ProxmoxTheme.RESOURCES['vm']} Virtual Machines"
+        yield from ProxmoxTemplates._iter_guest_rows(_VM_ROW, vms)
     
     @staticmethod
-    def storage_list(storage: List[Dict[str, Any]]) -> str:
+    def storage_list(storage: List[Dict[str, Any]], totals: Optional[Dict[str, Any]] = None,
+                     errors: Optional[Dict[str, str]] = None) -> str:
         """Template for storage list output.
         
         Args:
             storage: List of storage data dictionaries
+            totals: Optional cluster-wide totals
+            errors: Optional per-node collection errors
             
         Returns:
             Formatted storage list string
         """
-        result = [f"{ProxmoxTheme.RESOURCES['storage']} Storage Pools"]
+        out = RenderBuffer(f"{ProxmoxTheme.RESOURCES['storage']} Storage Pools")
+        
+        if totals:
+            out.line(
+                f"  • Cluster total: {ProxmoxFormatters.format_bytes(totals.get('used', 0))} / "
+                f"{ProxmoxFormatters.format_bytes(totals.get('total', 0))} ({totals.get('percent', 0.0):.1f}%), "
+                f"{ProxmoxFormatters.format_bytes(totals.get('available', 0))} available"
+            )
+            out.line(
+                f"  • Storages: {totals.get('online', 0)}/{totals.get('storages', 0)} online "
+                f"({totals.get('shared', 0)} shared), nodes answered: "
+                f"{totals.get('nodes_ok', 0)}/{totals.get('nodes', 0)}"
+            )
+        for node, error in sorted((errors or {}).items()):
+            out.line(f"  {ProxmoxTheme.STATUS['warning']} {node}: {error}")
         
+        write, row = out.write, _STORAGE_ROW.render
         for store in storage:
-            used = store.get("used", 0)
-            total = store.get("total", 0)
-            percent = (used / total * 100) if total > 0 else 0
+            used, total, percent = usage(store)
+            name = store['storage']
+            if store.get("node"):
+                name = f"{name} ({store['node']})"
+            write(row((
+                name,
+                store.get('status', 'unknown').upper(),
+                store['type'],
+                format_bytes(used),
+                format_bytes(total),
+                percent,
+            )))
             
-            result.extend([
-                "",  # Empty line between storage pools
-                f"{ProxmoxTheme.RESOURCES['storage']} {store['storage']}",
-                f"  • Status: {store.get('status', 'unknown').upper()}",
-                f"  • Type: {store['type']}",
-                f"  • Usage: {ProxmoxFormatters.format_bytes(used)} / "
-                f"{ProxmoxFormatters.format_bytes(total)} ({percent:.1f}%)"
-            ])
+        return out.getvalue()
+
+    @staticmethod
+    def storage_content(result: Dict[str, Any]) -> str:
+        """Template for storage content search results.
+        
+        Args:
+            result: Search summary from StorageContentIndex.search
             
-        return "\n".join(result)
-    
+        Returns:
+            Formatted volume list string
+        """
+        age = result.get("age")
+        shown = len(result.get("results", []))
+        lines = [
+            f"{ProxmoxTheme.RESOURCES['storage']} Storage content: {result.get('matched', 0)} matching "
+            f"of {result.get('indexed', 0)} volumes" + (f" (showing {shown})" if shown < result.get("matched", 0) else ""),
+            f"  • Index age: {age}s" if age is not None else "  • Index age: n/a",
+            ""
+        ]
+        
+        for vol in result.get("results", []):
+            details = [vol.get("content") or "?", vol.get("format") or "?",
+                       ProxmoxFormatters.format_bytes(vol.get("size", 0))]
+            if vol.get("vmid") is not None:
+                details.append(f"VM {vol['vmid']}")
+            lines.append(f"  • {vol.get('volid')} ({vol.get('node')}): {', '.join(details)}")
+        
+        if not result.get("results"):
+            lines.append("  (no matching volumes)")
+        
+        return "\n".join(lines)
+
     @staticmethod
     def container_list(containers: List[Dict[str, Any]]) -> str:
         """Template for container list output.
@@ -165,25 +235,25 @@ class ProxmoxTemplates:
         if not containers:
             return f"{ProxmoxTheme.RESOURCES['container']} No containers found"
             
-        result = [f"{ProxmoxTheme.RESOURCES['container']} Containers"]
-        
-        for container in containers:
-            memory = container.get("memory", {})
-            memory_used = memory.get("used", 0)
-            memory_total = memory.get("total", 0)
-            memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
-            
-            result.extend([
-                "",  # Empty line between containers
-                f"{ProxmoxTheme.RESOURCES['container']} {container['name']} (ID: {container['vmid']})",
-                f"  • Status: {container['status'].upper()}",
-                f"  • Node: {container['node']}",
-                f"  • CPU Cores: {container.get('cpus', 'N/A')}",
-                f"  • Memory: {ProxmoxFormatters.format_bytes(memory_used)} / "
-                f"{ProxmoxFormatters.format_bytes(memory_total)} ({memory_percent:.1f}%)"
-            ])
-            
-        return "\n".join(result)
+        header = f"{ProxmoxTheme.RESOURCES['container']} Containers"
+        return header + "".join(ProxmoxTemplates._iter_guest_rows(_CONTAINER_ROW, containers))
+
+    @staticmethod
+    def _iter_guest_rows(layout: RowLayout, guests: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Render VM or container rows one by one."""
+        row = layout.render
+        for guest in guests:
+            memory_used, memory_total, memory_percent = usage(guest.get("memory", {}))
+            yield row((
+                guest['name'],
+                guest['vmid'],
+                guest['status'].upper(),
+                guest['node'],
+                guest.get('cpus', 'N/A'),
+                format_bytes(memory_used),
+                format_bytes(memory_total),
+                memory_percent,
+            ))
 
     @staticmethod
     def cluster_status(status: Dict[str, Any]) -> str:
@@ -211,3 +281,220 @@ class ProxmoxTemplates:
             result.append(f"  • Resources: {len(resources)}")
         
         return "\n".join(result)
+
+    @staticmethod
+    def cluster_health(report: Dict[str, Any]) -> str:
+        """Template for the cluster health summary.
+        
+        Args:
+            report: Health report from core.health.summarize
+            
+        Returns:
+            Formatted compact health report string
+        """
+        fmt = ProxmoxFormatters.format_bytes
+        cluster = report.get("cluster", {})
+        nodes = report.get("nodes", {})
+        guests = report.get("guests", {})
+        storage = report.get("storage", {})
+        over = report.get("overcommit", {})
+        
+        def ratio(value: Optional[float]) -> str:
+            return f"{value:.2f}x" if value is not None else "n/a"
+        
+        quorum = {True: "OK", False: "NOT OK"}.get(cluster.get("quorate"), "unknown")
+        alerts = report.get("alerts", [])
+        state = ProxmoxTheme.STATUS['warning'] if alerts else ProxmoxTheme.ACTIONS['success']
+        result = [
+            f"{ProxmoxTheme.SECTIONS['statistics']} Cluster health: {cluster.get('name') or 'standalone'} "
+            f"{state} (quorum {quorum})",
+            f"  {ProxmoxTheme.RESOURCES['node']} Nodes: {nodes.get('online', 0)}/{nodes.get('total', 0)} online, "
+            f"{nodes.get('cores', 0)} cores",
+            f"  {ProxmoxTheme.RESOURCES['cpu']} CPU: {nodes.get('cpu_pct', 0.0):.1f}%, vCPU overcommit "
+            f"{ratio(over.get('vcpu_running'))} running / {ratio(over.get('vcpu_allocated'))} allocated",
+            f"  {ProxmoxTheme.RESOURCES['memory']} Memory: {fmt(nodes.get('mem_used', 0))} / "
+            f"{fmt(nodes.get('mem_total', 0))} ({nodes.get('mem_pct', 0.0):.1f}%), overcommit "
+            f"{ratio(over.get('mem_running'))} running / {ratio(over.get('mem_allocated'))} allocated",
+            f"  {ProxmoxTheme.RESOURCES['storage']} Storage: {fmt(storage.get('used', 0))} / "
+            f"{fmt(storage.get('total', 0))} ({storage.get('pct', 0.0):.1f}%) over {storage.get('count', 0)} storages",
+        ]
+        
+        by_type = guests.get("by_type", {})
+        parts = [
+            f"{label} {by_type[t]['running']} running / {by_type[t]['stopped']} stopped"
+            for t, label in (("qemu", "VMs"), ("lxc", "containers")) if t in by_type
+        ]
+        result.append(
+            f"  {ProxmoxTheme.RESOURCES['vm']} Guests: " + (", ".join(parts) or "none")
+            + f", {guests.get('templates', 0)} templates"
+        )
+        
+        top = report.get("top", {})
+        if top.get("cpu"):
+            result.append("  • Top CPU: " + ", ".join(
+                f"{g.get('name')} ({g.get('vmid')}@{g.get('node')}) {g.get('cores'):.2f} cores" for g in top["cpu"]))
+        if top.get("mem"):
+            result.append("  • Top memory: " + ", ".join(
+                f"{g.get('name')} ({g.get('vmid')}@{g.get('node')}) {fmt(g.get('mem', 0))}" for g in top["mem"]))
+        if storage.get("fullest"):
+            result.append("  • Fullest storage: " + ", ".join(
+                f"{s.get('storage')} ({s.get('node')}) {s.get('pct'):.1f}%" for s in storage["fullest"]))
+        
+        for alert in alerts:
+            result.append(f"  {ProxmoxTheme.STATUS['warning']} {alert}")
+        
+        return "\n".join(result)
+
+    @staticmethod
+    def task_status(task: Dict[str, Any]) -> str:
+        """Template for a single-line task status.
+        
+        Args:
+            task: Task record from the task tracker
+            
+        Returns:
+            Formatted task status string
+        """
+        elapsed = task.get("elapsed", 0)
+        if task.get("status") == "running":
+            return f"{ProxmoxTheme.STATUS['pending']} Task running ({elapsed}s elapsed)"
+        if task.get("exitstatus") == "OK":
+            return f"{ProxmoxTheme.ACTIONS['success']} Task finished: OK ({elapsed}s)"
+        return f"{ProxmoxTheme.ACTIONS['error']} Task failed: {task.get('exitstatus')} ({elapsed}s)"
+    
+    @staticmethod
+    def vm_bulk_create(entries: List[Dict[str, Any]]) -> str:
+        """Template for a bulk VM creation summary.
+        
+        Args:
+            entries: One record per requested VM (vmid, name, node, storage,
+                upid, error, the optional clone mode and task record)
+            
+        Returns:
+            Formatted creation summary string
+        """
+        failed = sum(
+            1 for e in entries
+            if e.get("error") or (e.get("task") and e["task"].get("status") == "stopped"
+                                  and not e["task"].get("ok"))
+        )
+        running = sum(1 for e in entries if e.get("task") and e["task"].get("status") == "running")
+        done = len(entries) - failed - running
+        result = [
+            f"{ProxmoxTheme.ACTIONS['create']} Bulk VM creation: {len(entries)} requested, "
+            f"{done} ok, {running} running, {failed} failed",
+            ""
+        ]
+        
+        for entry in entries:
+            where = "/".join(str(v) for v in (entry.get("node"), entry.get("storage")) if v)
+            if entry.get("mode"):
+                where += f", {entry['mode']}"
+            if entry.get("error"):
+                status = f"{ProxmoxTheme.ACTIONS['error']} {entry['error']}"
+            elif entry.get("task"):
+                status = ProxmoxTemplates.task_status(entry["task"])
+            else:
+                status = f"{ProxmoxTheme.STATUS['pending']} Submitted"
+            result.append(f"  • {entry.get('name')} (ID: {entry.get('vmid')}, {where}): {status}")
+        
+        upids = [e["upid"] for e in entries if e.get("upid")]
+        if upids:
+            result.extend(["", f"🔧 Task IDs: {', '.join(upids)}"])
+        
+        return "\n".join(result)
+
+    @staticmethod
+    def task_list(tasks: List[Dict[str, Any]]) -> str:
+        """Template for tracked task list output.
+        
+        Args:
+            tasks: List of task records
+            
+        Returns:
+            Formatted task list string
+        """
+        if not tasks:
+            return f"{ProxmoxTheme.SECTIONS['tasks']} No tracked tasks"
+        
+        running = sum(1 for t in tasks if t.get("status") == "running")
+        result = [f"{ProxmoxTheme.SECTIONS['tasks']} Tasks ({running} running, {len(tasks) - running} finished)"]
+        
+        for task in tasks:
+            result.extend([
+                "",
+                f"{ProxmoxTheme.SECTIONS['tasks']} {task.get('label')}",
+                f"  • Node: {task.get('node')}",
+                f"  • {ProxmoxTemplates.task_status(task)}",
+                f"  • UPID: {task.get('upid')}"
+            ])
+        
+        return "\n".join(result)
+
+    @staticmethod
+    def task_log(upid: str, lines: List[Dict[str, Any]], start: int, next_start: int,
+                 task: Optional[Dict[str, Any]] = None) -> str:
+        """Template for an incremental task log read.
+        
+        Args:
+            upid: Task identifier
+            lines: Log lines ({"n": ..., "t": ...})
+            start: Offset the read started at
+            next_start: Offset to pass for the next read
+            task: Optional task record for the status line
+            
+        Returns:
+            Formatted task log string
+        """
+        result = [f"{ProxmoxTheme.SECTIONS['tasks']} Task log {upid}"]
+        if task:
+            result.append(f"  • {ProxmoxTemplates.task_status(task)}")
+        result.append(f"  • Lines: {start}-{next_start} (next start: {next_start})")
+        result.append("")
+        if lines:
+            result.extend(str(line.get("t", "")) for line in lines)
+        else:
+            result.append("(no new lines)")
+        
+        return "\n".join(result)
+
+    @staticmethod
+    def metrics_query(result: Dict[str, Any]) -> str:
+        """Template for an aggregated metrics query.
+        
+        Args:
+            result: Query summary from MetricsEngine.query
+            
+        Returns:
+            Formatted ranking string
+        """
+        scope = result.get("type")
+        if result.get("node"):
+            scope = f"{scope} on {result['node']}"
+        header = (
+            f"{ProxmoxTheme.SECTIONS['statistics']} {result.get('aggregate')} {result.get('metric')} "
+            f"over the last {result.get('timeframe')} ({scope})"
+        )
+        summary = f"  • Evaluated: {result.get('evaluated', 0)}, matched: {result.get('matched', 0)}"
+        if result.get("threshold") is not None:
+            summary += f" (> {result['threshold']})"
+        lines = [header, summary, ""]
+        
+        unit = result.get("unit")
+        for row in result.get("results", []):
+            value = row.get("value")
+            if unit == "bytes":
+                shown = ProxmoxFormatters.format_bytes(value)
+            elif unit == "bytes/s":
+                shown = f"{ProxmoxFormatters.format_bytes(value)}/s"
+            elif unit == "%":
+                shown = f"{value:.1f}%"
+            else:
+                shown = f"{value:.2f}"
+            ident = f"ID: {row['vmid']}, " if row.get("vmid") is not None else ""
+            lines.append(f"  • {row.get('name')} ({ident}{row.get('node')}): {shown}")
+        
+        if not result.get("results"):
+            lines.append("  (no matching resources)")
+        
+        return "\n".join(lines)
@@ -18,6 +18,7 @@ import logging
 import os
 import sys
 import signal
+import threading
 from typing import Optional, List, Annotated, Literal
 
 from mcp.server.fastmcp import FastMCP
@@ -29,16 +30,25 @@ from fastapi import Body
 from .config.loader import load_config
 from .core.logging import setup_logging
 from .core.proxmox import ProxmoxManager
+from .core.tasks import TaskTracker
+from .core.metrics import MetricsEngine
+from .core.placement import PlacementEngine
+from .core.storage import StorageStatusCollector
+from .core.listings import ListingCache
+from .core.content import StorageContentIndex
 from .tools.node import NodeTools
 from .tools.vm import VMTools
 from .tools.storage import StorageTools
 from .tools.cluster import ClusterTools
 from .tools.containers import ContainerTools
+from .tools.tasks import MAX_WAIT_TIMEOUT, TaskTools
+from .tools.metrics import MetricsTools
 from .tools.definitions import (
     GET_NODES_DESC,
     GET_NODE_STATUS_DESC,
     GET_VMS_DESC,
     CREATE_VM_DESC,
+    BULK_CREATE_VMS_DESC,
     EXECUTE_VM_COMMAND_DESC,
     START_VM_DESC,
     STOP_VM_DESC,
@@ -51,7 +61,13 @@ from .tools.definitions import (
     RESTART_CONTAINER_DESC,
     UPDATE_CONTAINER_RESOURCES_DESC,
     GET_STORAGE_DESC,
-    GET_CLUSTER_STATUS_DESC
+    SEARCH_STORAGE_CONTENT_DESC,
+    GET_CLUSTER_STATUS_DESC,
+    GET_CLUSTER_HEALTH_DESC,
+    LIST_TASKS_DESC,
+    WAIT_TASKS_DESC,
+    TAIL_TASK_LOG_DESC,
+    QUERY_METRICS_DESC
 )
 
 class ProxmoxMCPServer:
@@ -66,22 +82,49 @@ class ProxmoxMCPServer:
         self.config = load_config(config_path)
         self.logger = setup_logging(self.config.logging)
         
-        # Initialize core components
-        self.proxmox_manager = ProxmoxManager(self.config.proxmox, self.config.auth)
+        # Initialize core components; with fast_start the connection is
+        # checked in the background so the MCP handshake isn't delayed
+        fast_start = self.config.startup.fast_start
+        self.proxmox_manager = ProxmoxManager(self.config.proxmox, self.config.auth, verify=not fast_start,
+                                              governor=self.config.governor, retry=self.config.retry)
         self.proxmox = self.proxmox_manager.get_api()
+        if fast_start:
+            threading.Thread(target=self._check_connection, name="proxmox-check", daemon=True).start()
+        
+        self.task_tracker = TaskTracker(self.proxmox)
+        self.metrics = MetricsEngine(self.proxmox, config=self.config.metrics)
+        self.placement = PlacementEngine(self.metrics, self.config.placement)
+        self.storage_status = StorageStatusCollector(self.proxmox, self.config.storage)
+        self.content_index = StorageContentIndex(self.proxmox, self.storage_status, self.metrics,
+                                                 self.config.storage)
+        self.listings = ListingCache(self.config.listings) if self.config.listings.enabled else None
         
         # Initialize tools
-        self.node_tools = NodeTools(self.proxmox)
-        self.vm_tools = VMTools(self.proxmox)
-        self.storage_tools = StorageTools(self.proxmox)
-        self.cluster_tools = ClusterTools(self.proxmox)
-        self.container_tools = ContainerTools(self.proxmox)
+        self.node_tools = NodeTools(self.proxmox, metrics=self.metrics, listings=self.listings,
+                                    config=self.config.nodes)
+        self.vm_tools = VMTools(self.proxmox, tasks=self.task_tracker, metrics=self.metrics,
+                                placement=self.placement, listings=self.listings)
+        self.storage_tools = StorageTools(self.proxmox, metrics=self.metrics, listings=self.listings,
+                                          collector=self.storage_status,
+                                          content_index=self.content_index)
+        self.cluster_tools = ClusterTools(self.proxmox, metrics=self.metrics, listings=self.listings)
+        self.container_tools = ContainerTools(self.proxmox, tasks=self.task_tracker, metrics=self.metrics,
+                                              listings=self.listings)
+        self.task_tools = TaskTools(self.proxmox, tasks=self.task_tracker, metrics=self.metrics)
+        self.metrics_tools = MetricsTools(self.proxmox, metrics=self.metrics)
 
         
         # Initialize MCP server
         self.mcp = FastMCP("ProxmoxMCP")
         self._setup_tools()
 
+    def _check_connection(self) -> None:
+        """Test the Proxmox connection (failures are logged, tools report their own errors)."""
+        try:
+            self.proxmox_manager.check()
+        except RuntimeError:
+            pass
+
     def _setup_tools(self) -> None:
         """Register MCP tools with the server.
         
@@ -113,16 +156,40 @@ class ProxmoxMCPServer:
 
         @self.mcp.tool(description=CREATE_VM_DESC)
         def create_vm(
-            node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
+            node: Annotated[str, Field(description="Host node name (e.g. 'pve'), or 'auto' for capacity-aware placement")],
             vmid: Annotated[str, Field(description="New VM ID number (e.g. '200', '300')")],
             name: Annotated[str, Field(description="VM name (e.g. 'my-new-vm', 'web-server')")],
             cpus: Annotated[int, Field(description="Number of CPU cores (e.g. 1, 2, 4)", ge=1, le=32)],
             memory: Annotated[int, Field(description="Memory size in MB (e.g. 2048 for 2GB)", ge=512, le=131072)],
             disk_size: Annotated[int, Field(description="Disk size in GB (e.g. 10, 20, 50)", ge=5, le=1000)],
-            storage: Annotated[Optional[str], Field(description="Storage name (optional, will auto-detect)", default=None)] = None,
-            ostype: Annotated[Optional[str], Field(description="OS type (optional, default: 'l26' for Linux)", default=None)] = None
+            storage: Annotated[Optional[str], Field(description="Storage name (optional, will auto-detect; 'auto' for capacity-aware placement)", default=None)] = None,
+            ostype: Annotated[Optional[str], Field(description="OS type (optional, default: 'l26' for Linux)", default=None)] = None,
+            wait: Annotated[bool, Field(description="Wait for the creation task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 120
+        ):
+            return self.vm_tools.create_vm(node, vmid, name, cpus, memory, disk_size, storage, ostype, wait, timeout)
+
+        @self.mcp.tool(description=BULK_CREATE_VMS_DESC)
+        def bulk_create_vms(
+            count: Annotated[int, Field(description="Number of VMs to create", ge=1, le=200)],
+            name_pattern: Annotated[str, Field(description="Name template with {index} and/or {vmid} (e.g. 'ci-{index}')")] = "vm-{index}",
+            cpus: Annotated[int, Field(description="CPU cores per VM", ge=1, le=32)] = 1,
+            memory: Annotated[int, Field(description="Memory per VM in MB", ge=512, le=131072)] = 2048,
+            disk_size: Annotated[int, Field(description="Disk size per VM in GB", ge=5, le=1000)] = 10,
+            node: Annotated[str, Field(description="Host node name, or 'auto' for capacity-aware placement")] = "auto",
+            storage: Annotated[Optional[str], Field(description="Storage name (optional, will auto-detect; 'auto' for capacity-aware placement)", default=None)] = None,
+            ostype: Annotated[Optional[str], Field(description="OS type (optional, default: 'l26' for Linux)", default=None)] = None,
+            start_vmid: Annotated[Optional[int], Field(description="First VMID to try (default: next free cluster ID)", default=None, ge=100)] = None,
+            max_parallel: Annotated[int, Field(description="Creation requests in flight", ge=1, le=16)] = 4,
+            wait: Annotated[bool, Field(description="Wait for all creation tasks to finish", default=True)] = True,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 600,
+            template_vmid: Annotated[Optional[int], Field(description="Clone this template instead of creating empty VMs", default=None)] = None,
+            full_clone: Annotated[Optional[bool], Field(description="Force full (true) or linked (false) clones; default: linked when possible", default=None)] = None,
+            per_storage_parallel: Annotated[int, Field(description="Clone tasks running at once per storage", ge=1, le=16)] = 2
         ):
-            return self.vm_tools.create_vm(node, vmid, name, cpus, memory, disk_size, storage, ostype)
+            return self.vm_tools.bulk_create_vms(count, name_pattern, cpus, memory, disk_size, node, storage,
+                                                 ostype, start_vmid, max_parallel, wait, timeout,
+                                                 template_vmid, full_clone, per_storage_parallel)
 
         @self.mcp.tool(description=EXECUTE_VM_COMMAND_DESC)
         async def execute_vm_command(
@@ -136,49 +203,84 @@ class ProxmoxMCPServer:
         @self.mcp.tool(description=START_VM_DESC)
         def start_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
-            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
+            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")],
+            wait: Annotated[bool, Field(description="Wait for the task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60
         ):
-            return self.vm_tools.start_vm(node, vmid)
+            return self.vm_tools.start_vm(node, vmid, wait, timeout)
 
         @self.mcp.tool(description=STOP_VM_DESC)
         def stop_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
-            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
+            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")],
+            wait: Annotated[bool, Field(description="Wait for the task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60
         ):
-            return self.vm_tools.stop_vm(node, vmid)
+            return self.vm_tools.stop_vm(node, vmid, wait, timeout)
 
         @self.mcp.tool(description=SHUTDOWN_VM_DESC)
         def shutdown_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
-            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
+            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")],
+            wait: Annotated[bool, Field(description="Wait for the task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60
         ):
-            return self.vm_tools.shutdown_vm(node, vmid)
+            return self.vm_tools.shutdown_vm(node, vmid, wait, timeout)
 
         @self.mcp.tool(description=RESET_VM_DESC)
         def reset_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
-            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")]
+            vmid: Annotated[str, Field(description="VM ID number (e.g. '101')")],
+            wait: Annotated[bool, Field(description="Wait for the task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60
         ):
-            return self.vm_tools.reset_vm(node, vmid)
+            return self.vm_tools.reset_vm(node, vmid, wait, timeout)
 
         @self.mcp.tool(description=DELETE_VM_DESC)
         def delete_vm(
             node: Annotated[str, Field(description="Host node name (e.g. 'pve')")],
             vmid: Annotated[str, Field(description="VM ID number (e.g. '998')")],
-            force: Annotated[bool, Field(description="Force deletion even if VM is running", default=False)] = False
+            force: Annotated[bool, Field(description="Force deletion even if VM is running", default=False)] = False,
+            wait: Annotated[bool, Field(description="Wait for the deletion task to finish", default=False)] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 120
         ):
-            return self.vm_tools.delete_vm(node, vmid, force)
+            return self.vm_tools.delete_vm(node, vmid, force, wait, timeout)
 
         # Storage tools
         @self.mcp.tool(description=GET_STORAGE_DESC)
-        def get_storage():
-            return self.storage_tools.get_storage()
+        def get_storage(
+            refresh: Annotated[bool, Field(description="Bypass the short-lived status cache", default=False)] = False
+        ):
+            return self.storage_tools.get_storage(refresh)
+
+        @self.mcp.tool(description=SEARCH_STORAGE_CONTENT_DESC)
+        def search_storage_content(
+            content: Annotated[Optional[str], Field(description="Content type: 'iso', 'vztmpl', 'backup', 'images', 'rootdir', 'snippets'", default=None)] = None,
+            vmid: Annotated[Optional[int], Field(description="Owning VM/container ID", default=None)] = None,
+            storage: Annotated[Optional[str], Field(description="Storage name", default=None)] = None,
+            node: Annotated[Optional[str], Field(description="Node name (shared storages always match)", default=None)] = None,
+            format: Annotated[Optional[str], Field(description="Volume format (e.g. 'qcow2', 'raw', 'vma.zst')", default=None)] = None,
+            name: Annotated[Optional[str], Field(description="Substring of the volume ID", default=None)] = None,
+            orphaned: Annotated[bool, Field(description="Only disks whose VM/container no longer exists", default=False)] = False,
+            sort: Annotated[Literal["size", "ctime", "volid"], Field(description="Sort order")] = "size",
+            limit: Annotated[int, Field(description="Maximum results (0 for all)", ge=0)] = 50,
+            format_style: Annotated[Literal["pretty", "json"], Field(description="Output format")] = "pretty"
+        ):
+            return self.storage_tools.search_storage_content(content, vmid, storage, node, format, name,
+                                                             orphaned, sort, limit, format_style)
 
         # Cluster tools
         @self.mcp.tool(description=GET_CLUSTER_STATUS_DESC)
         def get_cluster_status():
             return self.cluster_tools.get_cluster_status()
 
+        @self.mcp.tool(description=GET_CLUSTER_HEALTH_DESC)
+        def get_cluster_health(
+            top: Annotated[int, Field(description="Number of top consumers and fullest storages to list", ge=0, le=50)] = 5,
+            format_style: Annotated[Literal["pretty", "json"], Field(description="Output format")] = "pretty"
+        ):
+            return self.cluster_tools.get_cluster_health(top, format_style)
+
         # Containers (LXC)
         class GetContainersPayload(BaseModel):
             node: Optional[str] = Field(None, description="Optional node name (e.g. 'pve1')")
@@ -204,8 +306,12 @@ class ProxmoxMCPServer:
         def start_container(
             selector: Annotated[str, Field(description="CT selector: '123' | 'pve1:123' | 'pve1/name' | 'name' | comma list")],
             format_style: Annotated[str, Field(description="'pretty' or 'json'", pattern="^(pretty|json)$")] = "pretty",
+            wait: Annotated[bool, Field(description="Wait for the start tasks to finish")] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60,
         ):
-            return self.container_tools.start_container(selector=selector, format_style=format_style)
+            return self.container_tools.start_container(
+                selector=selector, format_style=format_style, wait=wait, timeout=timeout
+            )
 
         @self.mcp.tool(description=STOP_CONTAINER_DESC)
         def stop_container(
@@ -213,18 +319,24 @@ class ProxmoxMCPServer:
             graceful: Annotated[bool, Field(description="Graceful shutdown (True) or forced stop (False)", default=True)] = True,
             timeout_seconds: Annotated[int, Field(description="Timeout for stop/shutdown", ge=1, le=600)] = 10,
             format_style: Annotated[Literal["pretty","json"], Field(description="Output format")] = "pretty",
+            wait: Annotated[bool, Field(description="Wait for the stop tasks to finish")] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60,
         ):
             return self.container_tools.stop_container(
-               selector=selector, graceful=graceful, timeout_seconds=timeout_seconds, format_style=format_style
+               selector=selector, graceful=graceful, timeout_seconds=timeout_seconds, format_style=format_style,
+               wait=wait, timeout=timeout
             )
         @self.mcp.tool(description=RESTART_CONTAINER_DESC)
         def restart_container(
             selector: Annotated[str, Field(description="CT selector (see start_container)")],
             timeout_seconds: Annotated[int, Field(description="Timeout for reboot", ge=1, le=600)] = 10,
             format_style: Annotated[str, Field(description="'pretty' or 'json'", pattern="^(pretty|json)$")] = "pretty",
+            wait: Annotated[bool, Field(description="Wait for the reboot tasks to finish")] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=3600)] = 60,
         ):
             return self.container_tools.restart_container(
-               selector=selector, timeout_seconds=timeout_seconds, format_style=format_style
+               selector=selector, timeout_seconds=timeout_seconds, format_style=format_style,
+               wait=wait, timeout=timeout
             )
 
         @self.mcp.tool(description=UPDATE_CONTAINER_RESOURCES_DESC)
@@ -236,6 +348,10 @@ class ProxmoxMCPServer:
             disk_gb: Annotated[Optional[int], Field(description="Additional disk size in GiB", ge=1)] = None,
             disk: Annotated[str, Field(description="Disk to resize", default="rootfs")] = "rootfs",
             format_style: Annotated[Literal["pretty","json"], Field(description="Output format")] = "pretty",
+            wait: Annotated[bool, Field(description="Wait for resize tasks to finish")] = False,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait for resize tasks when wait is set", ge=1, le=3600)] = 120,
+            per_node_parallel: Annotated[int, Field(description="Containers updated at once per node", ge=1, le=16)] = 4,
+            force: Annotated[bool, Field(description="Apply even without node headroom")] = False,
         ):
             return self.container_tools.update_container_resources(
                 selector=selector,
@@ -245,8 +361,51 @@ class ProxmoxMCPServer:
                 disk_gb=disk_gb,
                 disk=disk,
                 format_style=format_style,
+                wait=wait,
+                timeout=timeout,
+                per_node_parallel=per_node_parallel,
+                force=force,
             )
 
+        # Task tracking tools
+        @self.mcp.tool(description=LIST_TASKS_DESC)
+        def list_tasks(
+            node: Annotated[Optional[str], Field(description="Optional node name filter (e.g. 'pve1')")] = None,
+            include_finished: Annotated[bool, Field(description="Include recently finished tasks")] = True,
+        ):
+            return self.task_tools.list_tasks(node, include_finished)
+
+        @self.mcp.tool(description=WAIT_TASKS_DESC)
+        def wait_tasks(
+            upids: Annotated[Optional[str], Field(description="Comma-separated UPIDs (default: all outstanding)")] = None,
+            timeout: Annotated[int, Field(description="Maximum seconds to wait", ge=1, le=MAX_WAIT_TIMEOUT)] = 60,
+        ):
+            return self.task_tools.wait_tasks(upids, timeout)
+
+        @self.mcp.tool(description=TAIL_TASK_LOG_DESC)
+        def tail_task_log(
+            upid: Annotated[str, Field(description="Task UPID (e.g. 'UPID:pve1:...')")],
+            start: Annotated[int, Field(description="0-based line offset to read from", ge=0)] = 0,
+            limit: Annotated[int, Field(description="Maximum lines to return", ge=1, le=5000)] = 100,
+        ):
+            return self.task_tools.tail_task_log(upid, start, limit)
+
+        # Metrics tools
+        @self.mcp.tool(description=QUERY_METRICS_DESC)
+        def query_metrics(
+            metric: Annotated[Literal["cpu", "mem", "mem_pct", "disk", "disk_pct", "netin", "netout", "diskread", "diskwrite", "loadavg", "iowait"], Field(description="Metric to aggregate")] = "cpu",
+            timeframe: Annotated[Literal["hour", "day", "week", "month", "year"], Field(description="RRD timeframe")] = "day",
+            aggregate: Annotated[Literal["mean", "min", "max", "last", "p50", "p90", "p95", "p99"], Field(description="Aggregate function")] = "mean",
+            type: Annotated[Literal["qemu", "lxc", "node", "storage"], Field(description="Resource type to rank")] = "qemu",
+            node: Annotated[Optional[str], Field(description="Optional node filter (e.g. 'pve1')")] = None,
+            top: Annotated[int, Field(description="Number of results (0 for all)", ge=0)] = 10,
+            threshold: Annotated[Optional[float], Field(description="Only results above this value (e.g. 80)")] = None,
+            cf: Annotated[Literal["AVERAGE", "MAX"], Field(description="RRD consolidation function")] = "AVERAGE",
+            source: Annotated[Literal["auto", "store", "rrd"], Field(description="Local history store or RRD")] = "auto",
+            format_style: Annotated[Literal["pretty", "json"], Field(description="Output format")] = "pretty",
+        ):
+            return self.metrics_tools.query_metrics(metric, timeframe, aggregate, type, node, top, threshold, cf, source, format_style)
+
 
     def start(self) -> None:
         """Start the MCP server.
@@ -4,6 +4,7 @@ HTTP Streamable server implementation for Proxmox MCP (MCP-compliant).
 This module implements an MCP server with HTTP Streamable transport (not SSE).
 Conforms to MCP specification with list_tools and call_tool endpoints.
 """
+import asyncio
 import logging
 import os
 import sys
@@ -11,23 +12,30 @@ from typing import Optional, Annotated, Literal
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Header, Request
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, StreamingResponse, JSONResponse, PlainTextResponse
 from pydantic import Field, BaseModel
 import json
 
+from proxmox_mcp.core.startup import Startup
+from proxmox_mcp.core.auth import ADMIN, READ, ApiKeyAuth, tool_scope
+from proxmox_mcp.core.scheduler import FairScheduler, Rejected
 from proxmox_mcp.config.loader import load_config
-from proxmox_mcp.core.logging import setup_logging
-from proxmox_mcp.core.proxmox import ProxmoxManager
-from proxmox_mcp.tools.node import NodeTools
-from proxmox_mcp.tools.vm import VMTools
-from proxmox_mcp.tools.storage import StorageTools
-from proxmox_mcp.tools.cluster import ClusterTools
-from proxmox_mcp.tools.containers import ContainerTools
+from proxmox_mcp.core.logging import RequestIdMiddleware, logging_report, setup_logging
+from proxmox_mcp.core.profiler import profiler, tool_stats
+from proxmox_mcp.core.tasks import task_log_events
+from proxmox_mcp.core.streaming import STREAM_HEADERS, iterate_chunks, text_events, wants_stream
 
 # Global instances
 proxmox_manager = None
+inventory = None
+metrics = None
+content_index = None
+listings = None
+startup = None
 logger = None
-API_KEY = None
+api_keys = None
+scheduler = None
+tools_body = None
 
 # Tools instances
 node_tools = None
@@ -35,40 +43,116 @@ vm_tools = None
 storage_tools = None
 cluster_tools = None
 container_tools = None
+task_tools = None
+metrics_tools = None
+task_tailer = None
+
+
+def _initialize(config):
+    """Connect to Proxmox and build the engines and tools (blocking)."""
+    global proxmox_manager, inventory, metrics, content_index, listings, node_tools, vm_tools, storage_tools, cluster_tools, container_tools, task_tools, metrics_tools, task_tailer
+    
+    # Imported here so that the listener can bind without paying for
+    # proxmoxer and the tool modules (which import the MCP types)
+    from proxmox_mcp.core.proxmox import ProxmoxManager
+    from proxmox_mcp.core.inventory import ClusterInventory
+    from proxmox_mcp.core.metrics import MetricsEngine
+    from proxmox_mcp.core.placement import PlacementEngine
+    from proxmox_mcp.core.storage import StorageStatusCollector
+    from proxmox_mcp.core.listings import ListingCache
+    from proxmox_mcp.core.content import StorageContentIndex
+    from proxmox_mcp.core.tasks import TaskTracker, TaskLogTailer
+    from proxmox_mcp.tools.node import NodeTools
+    from proxmox_mcp.tools.vm import VMTools
+    from proxmox_mcp.tools.storage import StorageTools
+    from proxmox_mcp.tools.cluster import ClusterTools
+    from proxmox_mcp.tools.containers import ContainerTools
+    from proxmox_mcp.tools.tasks import TaskTools
+    from proxmox_mcp.tools.metrics import MetricsTools
+    
+    proxmox_manager = ProxmoxManager(config.proxmox, config.auth, governor=config.governor, retry=config.retry)
+    proxmox = proxmox_manager.get_api()
+    
+    # Background cluster inventory shared by the listing tools
+    inventory = ClusterInventory(proxmox, config.inventory)
+    task_tracker = TaskTracker(proxmox)
+    metrics = MetricsEngine(proxmox, inventory, config.metrics)
+    placement = PlacementEngine(metrics, config.placement)
+    storage_status = StorageStatusCollector(proxmox, config.storage)
+    content_index = StorageContentIndex(proxmox, storage_status, metrics, config.storage)
+    listings = ListingCache(config.listings) if config.listings.enabled else None
+    
+    # Initialize tools
+    node_tools = NodeTools(proxmox, inventory, metrics=metrics, listings=listings, config=config.nodes)
+    vm_tools = VMTools(proxmox, inventory, task_tracker, metrics, placement, listings)
+    storage_tools = StorageTools(proxmox, inventory, metrics=metrics, listings=listings, collector=storage_status,
+                                 content_index=content_index)
+    cluster_tools = ClusterTools(proxmox, inventory, metrics=metrics, listings=listings)
+    container_tools = ContainerTools(proxmox, inventory, task_tracker, metrics, listings=listings)
+    task_tools = TaskTools(proxmox, inventory, task_tracker, metrics)
+    metrics_tools = MetricsTools(proxmox, inventory, metrics=metrics)
+    task_tailer = TaskLogTailer(task_tracker)
+
+
+def _warm_up_steps(config):
+    """Warm-up run before readiness: connections, caches and the tool list."""
+    return [
+        ("connections", lambda: proxmox_manager.warm_up(config.startup.warmup_connections)),
+        ("inventory", inventory.refresh),
+        ("storage", storage_tools.collector.collect),
+        ("nodes", node_tools.get_nodes),
+        ("tools_list", _render_tools),
+    ]
+
+
+def _start_background():
+    """Start the background refreshers (on the event loop, once initialized)."""
+    inventory.start()
+    content_index.start()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global proxmox_manager, logger, node_tools, vm_tools, storage_tools, cluster_tools, container_tools, API_KEY
+    global logger, startup, api_keys, scheduler
     
     # Startup
     config_path = os.getenv("PROXMOX_MCP_CONFIG")
     if not config_path:
         raise RuntimeError("PROXMOX_MCP_CONFIG environment variable must be set")
     
-    API_KEY = os.getenv("MCPO_API_KEY")
-    if not API_KEY:
-        raise RuntimeError("MCPO_API_KEY environment variable must be set")
-    
     config = load_config(config_path)
     logger = setup_logging(config.logging)
+    try:
+        api_keys = ApiKeyAuth.from_env(config.api_keys)
+    except ValueError as e:
+        raise RuntimeError(str(e))
+    scheduler = FairScheduler(config.scheduler)
+    startup = Startup(config.startup)
     
-    proxmox_manager = ProxmoxManager(config.proxmox, config.auth)
-    proxmox = proxmox_manager.get_api()
-    
-    # Initialize tools
-    node_tools = NodeTools(proxmox)
-    vm_tools = VMTools(proxmox)
-    storage_tools = StorageTools(proxmox)
-    cluster_tools = ClusterTools(proxmox)
-    container_tools = ContainerTools(proxmox)
-    
-    logger.info("Proxmox MCP HTTP Streamable Server started")
+    warm_up = (lambda: _warm_up_steps(config)) if config.startup.warmup else None
+    if config.startup.fast_start:
+        # Bind now; connect and build the tools in the background
+        startup.start(lambda: _initialize(config), _start_background, warm_up)
+        logger.info("Proxmox MCP HTTP Streamable Server started (initializing in the background)")
+    else:
+        _initialize(config)
+        if warm_up is not None:
+            startup.warm_up(warm_up())
+        _start_background()
+        startup.set_ready()
+        logger.info("Proxmox MCP HTTP Streamable Server started")
     
     yield
     
     # Shutdown
+    await startup.stop()
+    if content_index is not None:
+        await content_index.stop()
+    if inventory is not None:
+        await inventory.stop()
+    if metrics is not None:
+        metrics.close()
     logger.info("Shutting down Proxmox MCP HTTP Streamable Server")
 
 
@@ -81,39 +165,175 @@ app = FastAPI(
     redoc_url=None,
     openapi_url=None
 )
+app.add_middleware(RequestIdMiddleware)
 
 
-async def verify_api_key(authorization: Optional[str] = Header(None)):
-    """Verify API key from Authorization header."""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-    
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid Authorization header format")
-    
-    token = authorization[7:]
-    if token != API_KEY:
-        raise HTTPException(status_code=403, detail="Invalid API key")
-    
-    return token
+async def acquire_slot(principal, session: Optional[str], tool_name: str):
+    """Wait for a tool execution slot (429 with Retry-After when rejected)."""
+    try:
+        return await scheduler.acquire(principal.client(session), tool_name, principal.weight)
+    except Rejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": e.retry_after_header})
+
+
+async def require_ready():
+    """Wait for the tools to be initialized (503 after the ready timeout)."""
+    if not await startup.wait_ready():
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server is still initializing ({startup.phase}): {startup.error or 'connecting to Proxmox'}",
+            headers={"Retry-After": str(int(startup.config.retry_interval))}
+        )
+
+
+def _open_circuits():
+    """Proxmox nodes whose API circuit is open (empty before initialization)."""
+    governor = proxmox_manager.governor if proxmox_manager is not None else None
+    return governor.open_circuits() if governor is not None else {}
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint (no auth required)."""
+    """Health check endpoint (no auth required).
+    
+    Answers as soon as the listener is bound; `ready` tells whether the
+    Proxmox connection and the tools are initialized.
+    """
     return {
         "status": "healthy",
         "transport": "http-streamable",
-        "mcp_version": "1.0.0"
+        "mcp_version": "1.0.0",
+        **startup.report(),
+        "open_circuits": _open_circuits()
     }
 
 
-@app.post("/mcp/list_tools")
-async def list_tools(authorization: str = Header(None)):
-    """MCP list_tools endpoint - returns available tools."""
-    await verify_api_key(authorization)
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint (no auth required).
+
+    503 until the tools are initialized and the warm-up has finished, so
+    probes (`curl -f`) only route traffic to a warm server; /health stays
+    the liveness check.
+    """
+    return JSONResponse(
+        {"ready": startup.ready, "phase": startup.phase, "error": startup.error},
+        status_code=200 if startup.ready else 503
+    )
+
+
+@app.get("/admin/profile")
+async def admin_profile(seconds: float = 10.0, interval_ms: float = 5.0,
+                        authorization: str = Header(None)):
+    """Sample the live server for `seconds` and return collapsed stacks."""
+    api_keys.authenticate(authorization, ADMIN)
+
+    try:
+        stacks = await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000.0)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PlainTextResponse(
+        stacks,
+        headers={"Content-Disposition": 'attachment; filename="proxmox-mcp.collapsed"'}
+    )
+
+
+@app.get("/admin/tool_stats")
+async def admin_tool_stats(reset: bool = False, authorization: str = Header(None)):
+    """Return cumulative CPU/wall time per tool."""
+    api_keys.authenticate(authorization, ADMIN)
+
+    stats = tool_stats.snapshot()
+    if reset:
+        tool_stats.reset()
+    return {"tools": stats}
+
+
+@app.get("/admin/inventory")
+async def admin_inventory(authorization: str = Header(None)):
+    """Return background inventory refresher state and cost."""
+    api_keys.authenticate(authorization, ADMIN)
+    await require_ready()
+    
+    return inventory.report()
+
+
+@app.get("/admin/metrics")
+async def admin_metrics(authorization: str = Header(None)):
+    """Return metrics engine state and API cost counters."""
+    api_keys.authenticate(authorization, ADMIN)
+    await require_ready()
     
-    tools = [
+    return metrics.report()
+
+
+@app.get("/admin/listings")
+async def admin_listings(authorization: str = Header(None)):
+    """Return listing cache bounds, entry ages and hit counters."""
+    api_keys.authenticate(authorization, ADMIN)
+    await require_ready()
+    
+    if listings is None:
+        return {"enabled": False}
+    return {"enabled": True, **listings.report()}
+
+
+@app.get("/admin/governor")
+async def admin_governor(authorization: str = Header(None)):
+    """Return Proxmox API rate limiter, circuit breaker and retry state."""
+    api_keys.authenticate(authorization, ADMIN)
+    await require_ready()
+    
+    return proxmox_manager.upstream_report()
+
+
+@app.get("/admin/logging")
+async def admin_logging(authorization: str = Header(None)):
+    """Return logging queue and rate limiting counters."""
+    api_keys.authenticate(authorization, ADMIN)
+    
+    return logging_report()
+
+
+@app.get("/admin/auth")
+async def admin_auth(authorization: str = Header(None)):
+    """Return the configured API keys (names and scopes) and their counters."""
+    api_keys.authenticate(authorization, ADMIN)
+    
+    return {"keys": api_keys.report()}
+
+
+@app.get("/admin/scheduler")
+async def admin_scheduler(authorization: str = Header(None)):
+    """Return tool call lanes, per-client counters and fairness."""
+    api_keys.authenticate(authorization, ADMIN)
+    
+    return scheduler.report()
+
+
+@app.get("/tasks/log/stream")
+async def task_log_stream(upid: str, start: int = 0, authorization: str = Header(None),
+                          last_event_id: Optional[str] = Header(None)):
+    """Follow a task log over SSE, sending only new lines."""
+    api_keys.authenticate(authorization, READ)
+    await require_ready()
+    
+    if last_event_id and last_event_id.isdigit():
+        start = int(last_event_id)
+    if not upid.startswith("UPID:"):
+        raise HTTPException(status_code=400, detail=f"Invalid UPID: {upid}")
+    
+    return StreamingResponse(
+        task_log_events(task_tailer, upid, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
+
+
+def _tool_list() -> list:
+    """Definitions of the tools served by list_tools."""
+    return [
         {
             "name": "get_nodes",
             "description": "List all Proxmox nodes in the cluster",
@@ -143,6 +363,31 @@ async def list_tools(authorization: str = Header(None)):
                 "required": []
             }
         },
+        {
+            "name": "bulk_create_vms",
+            "description": "Create a batch of identical VMs, from scratch or as linked/full clones of a template",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "count": {"type": "integer", "description": "Number of VMs to create", "minimum": 1, "maximum": 200},
+                    "name_pattern": {"type": "string", "description": "Name template with {index} and/or {vmid}", "default": "vm-{index}"},
+                    "cpus": {"type": "integer", "description": "CPU cores per VM", "minimum": 1, "maximum": 32, "default": 1},
+                    "memory": {"type": "integer", "description": "Memory per VM in MB", "minimum": 512, "default": 2048},
+                    "disk_size": {"type": "integer", "description": "Disk size per VM in GB", "minimum": 5, "default": 10},
+                    "node": {"type": "string", "description": "Host node name, or 'auto' for capacity-aware placement", "default": "auto"},
+                    "storage": {"type": "string", "description": "Storage name (optional, 'auto' for capacity-aware placement)"},
+                    "ostype": {"type": "string", "description": "OS type (optional, default: 'l26')"},
+                    "start_vmid": {"type": "integer", "description": "First VMID to try (default: next free cluster ID)"},
+                    "max_parallel": {"type": "integer", "description": "Creation requests in flight", "minimum": 1, "maximum": 16, "default": 4},
+                    "wait": {"type": "boolean", "description": "Wait for all tasks to finish", "default": True},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 600},
+                    "template_vmid": {"type": "integer", "description": "Clone this template instead of creating empty VMs"},
+                    "full_clone": {"type": "boolean", "description": "Force full (true) or linked (false) clones; default: linked when possible"},
+                    "per_storage_parallel": {"type": "integer", "description": "Clone tasks running at once per storage", "minimum": 1, "maximum": 16, "default": 2}
+                },
+                "required": ["count"]
+            }
+        },
         {
             "name": "start_vm",
             "description": "Start a VM",
@@ -150,7 +395,9 @@ async def list_tools(authorization: str = Header(None)):
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Node name"},
-                    "vmid": {"type": "string", "description": "VM ID"}
+                    "vmid": {"type": "string", "description": "VM ID"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -162,7 +409,9 @@ async def list_tools(authorization: str = Header(None)):
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Node name"},
-                    "vmid": {"type": "string", "description": "VM ID"}
+                    "vmid": {"type": "string", "description": "VM ID"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -174,7 +423,9 @@ async def list_tools(authorization: str = Header(None)):
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Node name"},
-                    "vmid": {"type": "string", "description": "VM ID"}
+                    "vmid": {"type": "string", "description": "VM ID"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -186,7 +437,9 @@ async def list_tools(authorization: str = Header(None)):
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Node name"},
-                    "vmid": {"type": "string", "description": "VM ID"}
+                    "vmid": {"type": "string", "description": "VM ID"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -199,7 +452,9 @@ async def list_tools(authorization: str = Header(None)):
                 "properties": {
                     "node": {"type": "string", "description": "Node name"},
                     "vmid": {"type": "string", "description": "VM ID"},
-                    "force": {"type": "boolean", "description": "Force deletion", "default": False}
+                    "force": {"type": "boolean", "description": "Force deletion", "default": False},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 120}
                 },
                 "required": ["node", "vmid"]
             }
@@ -209,7 +464,29 @@ async def list_tools(authorization: str = Header(None)):
             "description": "List all storage in the cluster",
             "inputSchema": {
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "refresh": {"type": "boolean", "description": "Bypass the short-lived status cache", "default": False}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "search_storage_content",
+            "description": "Search ISOs, templates, backups and disks across all storages (server-side index)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "content": {"type": "string", "description": "Content type: iso, vztmpl, backup, images, rootdir, snippets"},
+                    "vmid": {"type": "integer", "description": "Owning VM/container ID"},
+                    "storage": {"type": "string", "description": "Storage name"},
+                    "node": {"type": "string", "description": "Node name (shared storages always match)"},
+                    "format": {"type": "string", "description": "Volume format (qcow2, raw, vma.zst, ...)"},
+                    "name": {"type": "string", "description": "Substring of the volume ID"},
+                    "orphaned": {"type": "boolean", "description": "Only disks whose VM/container no longer exists", "default": False},
+                    "sort": {"type": "string", "enum": ["size", "ctime", "volid"], "default": "size"},
+                    "limit": {"type": "integer", "description": "Maximum results (0 for all)", "default": 50},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
                 "required": []
             }
         },
@@ -222,6 +499,18 @@ async def list_tools(authorization: str = Header(None)):
                 "required": []
             }
         },
+        {
+            "name": "get_cluster_health",
+            "description": "Cluster health summary: quorum, capacity, overcommit, top consumers (one snapshot)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "top": {"type": "integer", "description": "Number of top consumers and fullest storages", "default": 5},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
+                "required": []
+            }
+        },
         {
             "name": "get_containers",
             "description": "List all LXC containers",
@@ -242,7 +531,9 @@ async def list_tools(authorization: str = Header(None)):
                 "type": "object",
                 "properties": {
                     "selector": {"type": "string", "description": "Container selector (ID or name)"},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["selector"]
             }
@@ -256,14 +547,87 @@ async def list_tools(authorization: str = Header(None)):
                     "selector": {"type": "string"},
                     "graceful": {"type": "boolean", "default": True},
                     "timeout_seconds": {"type": "integer", "default": 10},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["selector"]
             }
+        },
+        {
+            "name": "list_tasks",
+            "description": "List asynchronous Proxmox tasks started through this server",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "node": {"type": "string", "description": "Optional node name"},
+                    "include_finished": {"type": "boolean", "default": True}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "wait_tasks",
+            "description": "Wait until Proxmox tasks finish",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "upids": {"type": "string", "description": "Comma-separated UPIDs (default: all outstanding)"},
+                    "timeout": {"type": "integer", "default": 60}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "tail_task_log",
+            "description": "Read a Proxmox task log incrementally from a line offset",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "upid": {"type": "string", "description": "Task UPID"},
+                    "start": {"type": "integer", "description": "0-based line offset", "default": 0},
+                    "limit": {"type": "integer", "description": "Maximum lines to return", "default": 100}
+                },
+                "required": ["upid"]
+            }
+        },
+        {
+            "name": "query_metrics",
+            "description": "Rank VMs, containers, nodes or storages by an aggregated metric (e.g. VMs averaging >80% CPU over the last day)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "metric": {"type": "string", "enum": ["cpu", "mem", "mem_pct", "disk", "disk_pct", "netin", "netout", "diskread", "diskwrite", "loadavg", "iowait"], "default": "cpu"},
+                    "timeframe": {"type": "string", "enum": ["hour", "day", "week", "month", "year"], "default": "day"},
+                    "aggregate": {"type": "string", "enum": ["mean", "min", "max", "last", "p50", "p90", "p95", "p99"], "default": "mean"},
+                    "type": {"type": "string", "enum": ["qemu", "lxc", "node", "storage"], "default": "qemu"},
+                    "node": {"type": "string", "description": "Optional node filter"},
+                    "top": {"type": "integer", "description": "Number of results (0 for all)", "default": 10},
+                    "threshold": {"type": "number", "description": "Only results above this value"},
+                    "cf": {"type": "string", "enum": ["AVERAGE", "MAX"], "default": "AVERAGE"},
+                    "source": {"type": "string", "enum": ["auto", "store", "rrd"], "default": "auto"},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
+                "required": []
+            }
         }
     ]
+
+
+def _render_tools() -> bytes:
+    """list_tools response body, serialized once (at warm-up or on first call)."""
+    global tools_body
+    if tools_body is None:
+        tools_body = json.dumps({"tools": _tool_list()}).encode()
+    return tools_body
+
+
+@app.post("/mcp/list_tools")
+async def list_tools(authorization: str = Header(None)):
+    """MCP list_tools endpoint - returns available tools."""
+    api_keys.authenticate(authorization, READ)
     
-    return {"tools": tools}
+    return Response(content=_render_tools(), media_type="application/json")
 
 
 class CallToolRequest(BaseModel):
@@ -272,15 +636,9 @@ class CallToolRequest(BaseModel):
     arguments: dict = {}
 
 
-@app.post("/mcp/call_tool")
-async def call_tool(request: CallToolRequest, authorization: str = Header(None)):
-    """MCP call_tool endpoint - execute a tool and return results."""
-    await verify_api_key(authorization)
-    
-    tool_name = request.name
-    args = request.arguments
-    
-    try:
+def _dispatch_tool(tool_name: str, args: dict):
+    """Route a tool call to its implementation (blocking, runs in a worker thread)."""
+    with tool_stats.track(tool_name):
         # Route to appropriate tool
         if tool_name == "get_nodes":
             result = node_tools.get_nodes()
@@ -288,21 +646,72 @@ async def call_tool(request: CallToolRequest, authorization: str = Header(None))
             result = node_tools.get_node_status(args["node"])
         elif tool_name == "get_vms":
             result = vm_tools.get_vms()
+        elif tool_name == "bulk_create_vms":
+            result = vm_tools.bulk_create_vms(
+                args["count"],
+                name_pattern=args.get("name_pattern", "vm-{index}"),
+                cpus=args.get("cpus", 1),
+                memory=args.get("memory", 2048),
+                disk_size=args.get("disk_size", 10),
+                node=args.get("node", "auto"),
+                storage=args.get("storage"),
+                ostype=args.get("ostype"),
+                start_vmid=args.get("start_vmid"),
+                max_parallel=args.get("max_parallel", 4),
+                wait=args.get("wait", True),
+                timeout=args.get("timeout", 600),
+                template_vmid=args.get("template_vmid"),
+                full_clone=args.get("full_clone"),
+                per_storage_parallel=args.get("per_storage_parallel", 2)
+            )
         elif tool_name == "start_vm":
-            result = vm_tools.start_vm(args["node"], args["vmid"])
+            result = vm_tools.start_vm(
+                args["node"], args["vmid"],
+                args.get("wait", False), args.get("timeout", 60)
+            )
         elif tool_name == "stop_vm":
-            result = vm_tools.stop_vm(args["node"], args["vmid"])
+            result = vm_tools.stop_vm(
+                args["node"], args["vmid"],
+                args.get("wait", False), args.get("timeout", 60)
+            )
         elif tool_name == "shutdown_vm":
-            result = vm_tools.shutdown_vm(args["node"], args["vmid"])
+            result = vm_tools.shutdown_vm(
+                args["node"], args["vmid"],
+                args.get("wait", False), args.get("timeout", 60)
+            )
         elif tool_name == "reset_vm":
-            result = vm_tools.reset_vm(args["node"], args["vmid"])
+            result = vm_tools.reset_vm(
+                args["node"], args["vmid"],
+                args.get("wait", False), args.get("timeout", 60)
+            )
         elif tool_name == "delete_vm":
             force = args.get("force", False)
-            result = vm_tools.delete_vm(args["node"], args["vmid"], force)
+            result = vm_tools.delete_vm(
+                args["node"], args["vmid"], force,
+                args.get("wait", False), args.get("timeout", 120)
+            )
         elif tool_name == "get_storage":
-            result = storage_tools.get_storage()
+            result = storage_tools.get_storage(args.get("refresh", False))
+        elif tool_name == "search_storage_content":
+            result = storage_tools.search_storage_content(
+                content=args.get("content"),
+                vmid=args.get("vmid"),
+                storage=args.get("storage"),
+                node=args.get("node"),
+                format=args.get("format"),
+                name=args.get("name"),
+                orphaned=args.get("orphaned", False),
+                sort=args.get("sort", "size"),
+                limit=args.get("limit", 50),
+                format_style=args.get("format_style", "pretty")
+            )
         elif tool_name == "get_cluster_status":
             result = cluster_tools.get_cluster_status()
+        elif tool_name == "get_cluster_health":
+            result = cluster_tools.get_cluster_health(
+                top=args.get("top", 5),
+                format_style=args.get("format_style", "pretty")
+            )
         elif tool_name == "get_containers":
             result = container_tools.get_containers(
                 node=args.get("node"),
@@ -312,17 +721,95 @@ async def call_tool(request: CallToolRequest, authorization: str = Header(None))
         elif tool_name == "start_container":
             result = container_tools.start_container(
                 selector=args["selector"],
-                format_style=args.get("format_style", "pretty")
+                format_style=args.get("format_style", "pretty"),
+                wait=args.get("wait", False),
+                timeout=args.get("timeout", 60)
             )
         elif tool_name == "stop_container":
             result = container_tools.stop_container(
                 selector=args["selector"],
                 graceful=args.get("graceful", True),
                 timeout_seconds=args.get("timeout_seconds", 10),
+                format_style=args.get("format_style", "pretty"),
+                wait=args.get("wait", False),
+                timeout=args.get("timeout", 60)
+            )
+        elif tool_name == "list_tasks":
+            result = task_tools.list_tasks(
+                node=args.get("node"),
+                include_finished=args.get("include_finished", True)
+            )
+        elif tool_name == "wait_tasks":
+            result = task_tools.wait_tasks(
+                upids=args.get("upids"),
+                timeout=args.get("timeout", 60)
+            )
+        elif tool_name == "tail_task_log":
+            result = task_tools.tail_task_log(
+                args["upid"],
+                start=args.get("start", 0),
+                limit=args.get("limit", 100)
+            )
+        elif tool_name == "query_metrics":
+            result = metrics_tools.query_metrics(
+                metric=args.get("metric", "cpu"),
+                timeframe=args.get("timeframe", "day"),
+                aggregate=args.get("aggregate", "mean"),
+                type=args.get("type", "qemu"),
+                node=args.get("node"),
+                top=args.get("top", 10),
+                threshold=args.get("threshold"),
+                cf=args.get("cf", "AVERAGE"),
+                source=args.get("source", "auto"),
                 format_style=args.get("format_style", "pretty")
             )
         else:
             raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
+    
+    return result
+
+
+def _stream_tool(tool_name: str, args: dict):
+    """Chunked output of the tools that can stream (None for the others)."""
+    if tool_name == "get_vms":
+        return vm_tools.stream_vms()
+    if tool_name == "get_containers":
+        return container_tools.stream_containers(
+            node=args.get("node"),
+            include_stats=args.get("include_stats", True),
+            format_style=args.get("format_style", "pretty")
+        )
+    return None
+
+
+@app.post("/mcp/call_tool")
+async def call_tool(request: CallToolRequest, authorization: str = Header(None),
+                    accept: Optional[str] = Header(None),
+                    mcp_session_id: Optional[str] = Header(None)):
+    """MCP call_tool endpoint - execute a tool and return results.
+    
+    Listing tools stream their output as Server-Sent Events when the client
+    accepts only text/event-stream. Calls are rate limited and queued per
+    client (API key and Mcp-Session-Id) by the scheduler.
+    """
+    principal = api_keys.authenticate(authorization, tool_scope(request.name))
+    await require_ready()
+    
+    tool_name = request.name
+    args = request.arguments
+    ticket = await acquire_slot(principal, mcp_session_id, tool_name)
+    
+    if wants_stream(accept):
+        stream = _stream_tool(tool_name, args)
+        if stream is not None:
+            return StreamingResponse(
+                text_events(scheduler.release_after(ticket, iterate_chunks(stream, tool_name))),
+                media_type="text/event-stream",
+                headers=STREAM_HEADERS
+            )
+    
+    try:
+        result = await asyncio.to_thread(_dispatch_tool, tool_name, args)
         
         # Return result in MCP format
         return {
@@ -339,6 +826,8 @@ async def call_tool(request: CallToolRequest, authorization: str = Header(None))
     except Exception as e:
         logger.error(f"Error executing tool {tool_name}: {e}")
         raise HTTPException(status_code=500, detail=f"Error executing tool: {str(e)}")
+    finally:
+        ticket.release()
 
 
 if __name__ == "__main__":
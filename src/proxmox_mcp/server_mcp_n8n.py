@@ -7,48 +7,25 @@ compatible with n8n's MCP client.
 import os
 import sys
 import uvicorn
-from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from typing import Optional
 
 from proxmox_mcp.config.loader import load_config
-from proxmox_mcp.core.logging import setup_logging
+from proxmox_mcp.core.auth import POWER, ApiKeyAuth
 from proxmox_mcp.server import ProxmoxMCPServer
 
-# Global API key from environment
-API_KEY = None
-
-async def verify_api_key(authorization: Optional[str] = Header(None)):
-    """Verify API key from Authorization header."""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-    
-    # Extract token from "Bearer <token>"
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid Authorization header format. Use: Bearer <token>")
-    
-    token = authorization[7:]  # Remove "Bearer " prefix
-    
-    if token != API_KEY:
-        raise HTTPException(status_code=403, detail="Invalid API key")
-    
-    return token
+# Accepted API keys (MCPO_API_KEY and the api_keys config section)
+api_keys = None
 
 def main():
     """Start the MCP server in SSE mode with authentication for n8n."""
-    global API_KEY
+    global api_keys
     
     config_path = os.getenv("PROXMOX_MCP_CONFIG")
     if not config_path:
         print("PROXMOX_MCP_CONFIG environment variable must be set")
         sys.exit(1)
     
-    # Get API key from environment
-    API_KEY = os.getenv("MCPO_API_KEY")
-    if not API_KEY:
-        print("MCPO_API_KEY environment variable must be set")
-        sys.exit(1)
-    
     # Get host and port from environment
     host = os.getenv("SSE_HOST", "0.0.0.0")
     port = int(os.getenv("SSE_PORT", "3333"))
@@ -56,6 +33,7 @@ def main():
     try:
         # Create server instance
         server = ProxmoxMCPServer(config_path)
+        api_keys = ApiKeyAuth.from_env(server.config.api_keys)
         
         server.logger.info(f"Starting Proxmox MCP SSE Server for n8n on {host}:{port}")
         server.logger.info(f"SSE Endpoint: http://{host}:{port}/mcp")
@@ -89,14 +67,16 @@ def main():
         # Create a middleware to check authentication for /mcp
         @app.middleware("http")
         async def auth_middleware(request: Request, call_next):
-            # Only check auth for /mcp paths
+            # Only check auth for /mcp paths; the FastMCP app exposes every
+            # tool on the same session, so the key needs the power scope
             if request.url.path.startswith("/mcp"):
                 try:
-                    await verify_api_key(request.headers.get("authorization"))
+                    api_keys.authenticate(request.headers.get("authorization"), POWER)
                 except HTTPException as e:
                     return JSONResponse(
                         status_code=e.status_code,
-                        content={"detail": e.detail}
+                        content={"detail": e.detail},
+                        headers=e.headers
                     )
             
             response = await call_next(request)
@@ -7,22 +7,31 @@ import sys
 import uvicorn
 import asyncio
 import json
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Header, HTTPException, Request
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from typing import Optional, AsyncGenerator
 from uuid import uuid4
 
+from proxmox_mcp.core.startup import Startup
+from proxmox_mcp.core.auth import ADMIN, READ, ApiKeyAuth, tool_scope
+from proxmox_mcp.core.scheduler import FairScheduler, Rejected
 from proxmox_mcp.config.loader import load_config
-from proxmox_mcp.core.logging import setup_logging
-from proxmox_mcp.core.proxmox import ProxmoxManager
-from proxmox_mcp.tools.node import NodeTools
-from proxmox_mcp.tools.vm import VMTools
-from proxmox_mcp.tools.storage import StorageTools
-from proxmox_mcp.tools.cluster import ClusterTools
-from proxmox_mcp.tools.containers import ContainerTools
+from proxmox_mcp.core.logging import RequestIdMiddleware, logging_report, setup_logging
+from proxmox_mcp.core.profiler import profiler, tool_stats
+from proxmox_mcp.core.tasks import task_log_events
+from proxmox_mcp.core.streaming import STREAM_HEADERS, iterate_chunks, jsonrpc_events, wants_stream
 
-API_KEY = None
+api_keys = None
+scheduler = None
 logger = None
+proxmox_manager = None
+inventory = None
+metrics = None
+content_index = None
+listings = None
+startup = None
+tools_list = None
 sessions = {}
 
 # Global tools instances
@@ -31,20 +40,18 @@ vm_tools = None
 storage_tools = None
 cluster_tools = None
 container_tools = None
+task_tools = None
+metrics_tools = None
+task_tailer = None
 
-async def verify_api_key(authorization: Optional[str] = Header(None)):
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
-    
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid Authorization header format")
-    
-    token = authorization[7:]
-    
-    if token != API_KEY:
-        raise HTTPException(status_code=403, detail="Invalid API key")
-    
-    return token
+async def require_ready():
+    """Wait for the tools to be initialized (503 after the ready timeout)"""
+    if not await startup.wait_ready():
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server is still initializing ({startup.phase}): {startup.error or 'connecting to Proxmox'}",
+            headers={"Retry-After": str(int(startup.config.retry_interval))}
+        )
 
 def get_all_tools():
     """Return list of all available tools"""
@@ -86,18 +93,45 @@ def get_all_tools():
             "inputSchema": {
                 "type": "object",
                 "properties": {
-                    "node": {"type": "string", "description": "Host node name (e.g. 'pve')"},
+                    "node": {"type": "string", "description": "Host node name (e.g. 'pve'), or 'auto' for capacity-aware placement"},
                     "vmid": {"type": "string", "description": "New VM ID number (e.g. '200', '300')"},
                     "name": {"type": "string", "description": "VM name"},
                     "cpus": {"type": "integer", "description": "Number of CPU cores", "minimum": 1, "maximum": 32},
                     "memory": {"type": "integer", "description": "Memory size in MB (e.g. 2048 for 2GB)", "minimum": 512},
                     "disk_size": {"type": "integer", "description": "Disk size in GB", "minimum": 5},
-                    "storage": {"type": "string", "description": "Storage name (optional)"},
-                    "ostype": {"type": "string", "description": "OS type (optional, default: 'l26')"}
+                    "storage": {"type": "string", "description": "Storage name (optional, 'auto' for capacity-aware placement)"},
+                    "ostype": {"type": "string", "description": "OS type (optional, default: 'l26')"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 120}
                 },
                 "required": ["node", "vmid", "name", "cpus", "memory", "disk_size"]
             }
         },
+        {
+            "name": "bulk_create_vms",
+            "description": "Create a batch of identical VMs, from scratch or as linked/full clones of a template",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "count": {"type": "integer", "description": "Number of VMs to create", "minimum": 1, "maximum": 200},
+                    "name_pattern": {"type": "string", "description": "Name template with {index} and/or {vmid}", "default": "vm-{index}"},
+                    "cpus": {"type": "integer", "description": "CPU cores per VM", "minimum": 1, "maximum": 32, "default": 1},
+                    "memory": {"type": "integer", "description": "Memory per VM in MB", "minimum": 512, "default": 2048},
+                    "disk_size": {"type": "integer", "description": "Disk size per VM in GB", "minimum": 5, "default": 10},
+                    "node": {"type": "string", "description": "Host node name, or 'auto' for capacity-aware placement", "default": "auto"},
+                    "storage": {"type": "string", "description": "Storage name (optional, 'auto' for capacity-aware placement)"},
+                    "ostype": {"type": "string", "description": "OS type (optional, default: 'l26')"},
+                    "start_vmid": {"type": "integer", "description": "First VMID to try (default: next free cluster ID)"},
+                    "max_parallel": {"type": "integer", "description": "Creation requests in flight", "minimum": 1, "maximum": 16, "default": 4},
+                    "wait": {"type": "boolean", "description": "Wait for all tasks to finish", "default": True},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 600},
+                    "template_vmid": {"type": "integer", "description": "Clone this template instead of creating empty VMs"},
+                    "full_clone": {"type": "boolean", "description": "Force full (true) or linked (false) clones; default: linked when possible"},
+                    "per_storage_parallel": {"type": "integer", "description": "Clone tasks running at once per storage", "minimum": 1, "maximum": 16, "default": 2}
+                },
+                "required": ["count"]
+            }
+        },
         {
             "name": "start_vm",
             "description": "Start a VM",
@@ -105,7 +139,9 @@ def get_all_tools():
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Host node name"},
-                    "vmid": {"type": "string", "description": "VM ID number"}
+                    "vmid": {"type": "string", "description": "VM ID number"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -117,7 +153,9 @@ def get_all_tools():
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Host node name"},
-                    "vmid": {"type": "string", "description": "VM ID number"}
+                    "vmid": {"type": "string", "description": "VM ID number"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -129,7 +167,9 @@ def get_all_tools():
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Host node name"},
-                    "vmid": {"type": "string", "description": "VM ID number"}
+                    "vmid": {"type": "string", "description": "VM ID number"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -141,7 +181,9 @@ def get_all_tools():
                 "type": "object",
                 "properties": {
                     "node": {"type": "string", "description": "Host node name"},
-                    "vmid": {"type": "string", "description": "VM ID number"}
+                    "vmid": {"type": "string", "description": "VM ID number"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["node", "vmid"]
             }
@@ -154,7 +196,9 @@ def get_all_tools():
                 "properties": {
                     "node": {"type": "string", "description": "Host node name"},
                     "vmid": {"type": "string", "description": "VM ID number"},
-                    "force": {"type": "boolean", "description": "Force deletion even if VM is running", "default": False}
+                    "force": {"type": "boolean", "description": "Force deletion even if VM is running", "default": False},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 120}
                 },
                 "required": ["node", "vmid"]
             }
@@ -165,7 +209,29 @@ def get_all_tools():
             "description": "List all storage in the cluster",
             "inputSchema": {
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "refresh": {"type": "boolean", "description": "Bypass the short-lived status cache", "default": False}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "search_storage_content",
+            "description": "Search ISOs, templates, backups and disks across all storages (server-side index)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "content": {"type": "string", "description": "Content type: iso, vztmpl, backup, images, rootdir, snippets"},
+                    "vmid": {"type": "integer", "description": "Owning VM/container ID"},
+                    "storage": {"type": "string", "description": "Storage name"},
+                    "node": {"type": "string", "description": "Node name (shared storages always match)"},
+                    "format": {"type": "string", "description": "Volume format (qcow2, raw, vma.zst, ...)"},
+                    "name": {"type": "string", "description": "Substring of the volume ID"},
+                    "orphaned": {"type": "boolean", "description": "Only disks whose VM/container no longer exists", "default": False},
+                    "sort": {"type": "string", "enum": ["size", "ctime", "volid"], "default": "size"},
+                    "limit": {"type": "integer", "description": "Maximum results (0 for all)", "default": 50},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
                 "required": []
             }
         },
@@ -179,6 +245,18 @@ def get_all_tools():
                 "required": []
             }
         },
+        {
+            "name": "get_cluster_health",
+            "description": "Cluster health summary: quorum, capacity, overcommit, top consumers (one snapshot)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "top": {"type": "integer", "description": "Number of top consumers and fullest storages", "default": 5},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
+                "required": []
+            }
+        },
         # Container tools
         {
             "name": "get_containers",
@@ -200,7 +278,9 @@ def get_all_tools():
                 "type": "object",
                 "properties": {
                     "selector": {"type": "string", "description": "Container selector: ID, name, or 'node:id'"},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["selector"]
             }
@@ -214,7 +294,9 @@ def get_all_tools():
                     "selector": {"type": "string", "description": "Container selector"},
                     "graceful": {"type": "boolean", "description": "Graceful shutdown", "default": True},
                     "timeout_seconds": {"type": "integer", "description": "Timeout in seconds", "default": 10},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["selector"]
             }
@@ -227,7 +309,9 @@ def get_all_tools():
                 "properties": {
                     "selector": {"type": "string", "description": "Container selector"},
                     "timeout_seconds": {"type": "integer", "description": "Timeout in seconds", "default": 10},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the task to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "default": 60}
                 },
                 "required": ["selector"]
             }
@@ -244,24 +328,84 @@ def get_all_tools():
                     "swap": {"type": "integer", "description": "New swap limit in MiB", "minimum": 0},
                     "disk_gb": {"type": "integer", "description": "Additional disk size in GiB", "minimum": 1},
                     "disk": {"type": "string", "description": "Disk to resize", "default": "rootfs"},
-                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"},
+                    "wait": {"type": "boolean", "description": "Wait for the resize tasks to finish", "default": False},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait for resize tasks when wait is set", "default": 120},
+                    "per_node_parallel": {"type": "integer", "description": "Containers updated at once per node", "minimum": 1, "maximum": 16, "default": 4},
+                    "force": {"type": "boolean", "description": "Apply even without node headroom", "default": False}
                 },
                 "required": ["selector"]
             }
+        },
+        # Task tools
+        {
+            "name": "list_tasks",
+            "description": "List asynchronous Proxmox tasks started through this server",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "node": {"type": "string", "description": "Optional node name to filter"},
+                    "include_finished": {"type": "boolean", "description": "Include recently finished tasks", "default": True}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "wait_tasks",
+            "description": "Wait until Proxmox tasks finish",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "upids": {"type": "string", "description": "Comma-separated UPIDs (default: all outstanding)"},
+                    "timeout": {"type": "integer", "description": "Maximum seconds to wait", "minimum": 0, "maximum": 300, "default": 60}
+                },
+                "required": []
+            }
+        },
+        {
+            "name": "tail_task_log",
+            "description": "Read a Proxmox task log incrementally from a line offset",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "upid": {"type": "string", "description": "Task UPID"},
+                    "start": {"type": "integer", "description": "0-based line offset", "default": 0},
+                    "limit": {"type": "integer", "description": "Maximum lines to return", "default": 100}
+                },
+                "required": ["upid"]
+            }
+        },
+        {
+            "name": "query_metrics",
+            "description": "Rank VMs, containers, nodes or storages by an aggregated metric (e.g. VMs averaging >80% CPU over the last day)",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "metric": {"type": "string", "enum": ["cpu", "mem", "mem_pct", "disk", "disk_pct", "netin", "netout", "diskread", "diskwrite", "loadavg", "iowait"], "default": "cpu"},
+                    "timeframe": {"type": "string", "enum": ["hour", "day", "week", "month", "year"], "default": "day"},
+                    "aggregate": {"type": "string", "enum": ["mean", "min", "max", "last", "p50", "p90", "p95", "p99"], "default": "mean"},
+                    "type": {"type": "string", "enum": ["qemu", "lxc", "node", "storage"], "default": "qemu"},
+                    "node": {"type": "string", "description": "Optional node filter"},
+                    "top": {"type": "integer", "description": "Number of results (0 for all)", "default": 10},
+                    "threshold": {"type": "number", "description": "Only results above this value"},
+                    "cf": {"type": "string", "enum": ["AVERAGE", "MAX"], "default": "AVERAGE"},
+                    "source": {"type": "string", "enum": ["auto", "store", "rrd"], "default": "auto"},
+                    "format_style": {"type": "string", "enum": ["pretty", "json"], "default": "pretty"}
+                },
+                "required": []
+            }
         }
     ]
 
-async def execute_tool(tool_name: str, arguments: dict) -> dict:
-    """Execute a tool and return the result"""
-    global node_tools, vm_tools, storage_tools, cluster_tools, container_tools, logger
-    
-    try:
+def _dispatch_tool(tool_name: str, arguments: dict):
+    """Route a tool call to its implementation (blocking, runs in a worker thread)"""
+    with tool_stats.track(tool_name):
         # Node tools
         if tool_name == "get_nodes":
             result = node_tools.get_nodes()
         elif tool_name == "get_node_status":
             result = node_tools.get_node_status(arguments["node"])
-        
+    
         # VM tools
         elif tool_name == "get_vms":
             result = vm_tools.get_vms()
@@ -274,31 +418,91 @@ async def execute_tool(tool_name: str, arguments: dict) -> dict:
                 arguments["memory"],
                 arguments["disk_size"],
                 arguments.get("storage"),
-                arguments.get("ostype")
+                arguments.get("ostype"),
+                arguments.get("wait", False),
+                arguments.get("timeout", 120)
+            )
+        elif tool_name == "bulk_create_vms":
+            result = vm_tools.bulk_create_vms(
+                arguments["count"],
+                name_pattern=arguments.get("name_pattern", "vm-{index}"),
+                cpus=arguments.get("cpus", 1),
+                memory=arguments.get("memory", 2048),
+                disk_size=arguments.get("disk_size", 10),
+                node=arguments.get("node", "auto"),
+                storage=arguments.get("storage"),
+                ostype=arguments.get("ostype"),
+                start_vmid=arguments.get("start_vmid"),
+                max_parallel=arguments.get("max_parallel", 4),
+                wait=arguments.get("wait", True),
+                timeout=arguments.get("timeout", 600),
+                template_vmid=arguments.get("template_vmid"),
+                full_clone=arguments.get("full_clone"),
+                per_storage_parallel=arguments.get("per_storage_parallel", 2)
             )
         elif tool_name == "start_vm":
-            result = vm_tools.start_vm(arguments["node"], arguments["vmid"])
+            result = vm_tools.start_vm(
+                arguments["node"],
+                arguments["vmid"],
+                arguments.get("wait", False),
+                arguments.get("timeout", 60)
+            )
         elif tool_name == "stop_vm":
-            result = vm_tools.stop_vm(arguments["node"], arguments["vmid"])
+            result = vm_tools.stop_vm(
+                arguments["node"],
+                arguments["vmid"],
+                arguments.get("wait", False),
+                arguments.get("timeout", 60)
+            )
         elif tool_name == "shutdown_vm":
-            result = vm_tools.shutdown_vm(arguments["node"], arguments["vmid"])
+            result = vm_tools.shutdown_vm(
+                arguments["node"],
+                arguments["vmid"],
+                arguments.get("wait", False),
+                arguments.get("timeout", 60)
+            )
         elif tool_name == "reset_vm":
-            result = vm_tools.reset_vm(arguments["node"], arguments["vmid"])
+            result = vm_tools.reset_vm(
+                arguments["node"],
+                arguments["vmid"],
+                arguments.get("wait", False),
+                arguments.get("timeout", 60)
+            )
         elif tool_name == "delete_vm":
             result = vm_tools.delete_vm(
                 arguments["node"],
                 arguments["vmid"],
-                arguments.get("force", False)
+                arguments.get("force", False),
+                arguments.get("wait", False),
+                arguments.get("timeout", 120)
             )
-        
+    
         # Storage tools
         elif tool_name == "get_storage":
-            result = storage_tools.get_storage()
-        
+            result = storage_tools.get_storage(arguments.get("refresh", False))
+        elif tool_name == "search_storage_content":
+            result = storage_tools.search_storage_content(
+                content=arguments.get("content"),
+                vmid=arguments.get("vmid"),
+                storage=arguments.get("storage"),
+                node=arguments.get("node"),
+                format=arguments.get("format"),
+                name=arguments.get("name"),
+                orphaned=arguments.get("orphaned", False),
+                sort=arguments.get("sort", "size"),
+                limit=arguments.get("limit", 50),
+                format_style=arguments.get("format_style", "pretty")
+            )
+    
         # Cluster tools
         elif tool_name == "get_cluster_status":
             result = cluster_tools.get_cluster_status()
-        
+        elif tool_name == "get_cluster_health":
+            result = cluster_tools.get_cluster_health(
+                top=arguments.get("top", 5),
+                format_style=arguments.get("format_style", "pretty")
+            )
+    
         # Container tools
         elif tool_name == "get_containers":
             result = container_tools.get_containers(
@@ -310,20 +514,26 @@ async def execute_tool(tool_name: str, arguments: dict) -> dict:
         elif tool_name == "start_container":
             result = container_tools.start_container(
                 selector=arguments["selector"],
-                format_style=arguments.get("format_style", "pretty")
+                format_style=arguments.get("format_style", "pretty"),
+                wait=arguments.get("wait", False),
+                timeout=arguments.get("timeout", 60)
             )
         elif tool_name == "stop_container":
             result = container_tools.stop_container(
                 selector=arguments["selector"],
                 graceful=arguments.get("graceful", True),
                 timeout_seconds=arguments.get("timeout_seconds", 10),
-                format_style=arguments.get("format_style", "pretty")
+                format_style=arguments.get("format_style", "pretty"),
+                wait=arguments.get("wait", False),
+                timeout=arguments.get("timeout", 60)
             )
         elif tool_name == "restart_container":
             result = container_tools.restart_container(
                 selector=arguments["selector"],
                 timeout_seconds=arguments.get("timeout_seconds", 10),
-                format_style=arguments.get("format_style", "pretty")
+                format_style=arguments.get("format_style", "pretty"),
+                wait=arguments.get("wait", False),
+                timeout=arguments.get("timeout", 60)
             )
         elif tool_name == "update_container_resources":
             result = container_tools.update_container_resources(
@@ -333,10 +543,78 @@ async def execute_tool(tool_name: str, arguments: dict) -> dict:
                 swap=arguments.get("swap"),
                 disk_gb=arguments.get("disk_gb"),
                 disk=arguments.get("disk", "rootfs"),
+                format_style=arguments.get("format_style", "pretty"),
+                wait=arguments.get("wait", False),
+                timeout=arguments.get("timeout", 120),
+                per_node_parallel=arguments.get("per_node_parallel", 4),
+                force=arguments.get("force", False)
+            )
+        
+        # Task tools
+        elif tool_name == "list_tasks":
+            result = task_tools.list_tasks(
+                node=arguments.get("node"),
+                include_finished=arguments.get("include_finished", True)
+            )
+        elif tool_name == "wait_tasks":
+            result = task_tools.wait_tasks(
+                upids=arguments.get("upids"),
+                timeout=arguments.get("timeout", 60)
+            )
+        elif tool_name == "tail_task_log":
+            result = task_tools.tail_task_log(
+                arguments["upid"],
+                start=arguments.get("start", 0),
+                limit=arguments.get("limit", 100)
+            )
+        elif tool_name == "query_metrics":
+            result = metrics_tools.query_metrics(
+                metric=arguments.get("metric", "cpu"),
+                timeframe=arguments.get("timeframe", "day"),
+                aggregate=arguments.get("aggregate", "mean"),
+                type=arguments.get("type", "qemu"),
+                node=arguments.get("node"),
+                top=arguments.get("top", 10),
+                threshold=arguments.get("threshold"),
+                cf=arguments.get("cf", "AVERAGE"),
+                source=arguments.get("source", "auto"),
                 format_style=arguments.get("format_style", "pretty")
             )
         else:
             raise ValueError(f"Unknown tool: {tool_name}")
+    
+    return result
+
+def _stream_tool(tool_name: str, arguments: dict):
+    """Chunked output of the tools that can stream (None for the others)"""
+    if tool_name == "get_vms":
+        return vm_tools.stream_vms()
+    if tool_name == "get_containers":
+        return container_tools.stream_containers(
+            node=arguments.get("node"),
+            include_stats=arguments.get("include_stats", True),
+            format_style=arguments.get("format_style", "pretty")
+        )
+    return None
+
+def _render_tools():
+    """Tool definitions, built once (at warm-up or on first use)"""
+    global tools_list
+    if tools_list is None:
+        tools_list = get_all_tools()
+    return tools_list
+
+async def execute_tool(tool_name: str, arguments: dict) -> dict:
+    """Execute a tool and return the result"""
+    global logger
+    
+    if not await startup.wait_ready():
+        raise RuntimeError(
+            f"Server is still initializing ({startup.phase}): {startup.error or 'connecting to Proxmox'}"
+        )
+    
+    try:
+        result = await asyncio.to_thread(_dispatch_tool, tool_name, arguments)
         
         logger.info(f"Tool {tool_name} executed successfully")
         
@@ -375,7 +653,7 @@ async def handle_jsonrpc(request_data: dict) -> dict:
         }
     
     elif method == "tools/list":
-        tools = get_all_tools()
+        tools = _render_tools()
         return {
             "jsonrpc": "2.0",
             "id": req_id,
@@ -423,48 +701,130 @@ async def sse_generator(session_id: str) -> AsyncGenerator[str, None]:
         await asyncio.sleep(30)
         yield ": keepalive\n\n"
 
+def _initialize(config):
+    """Connect to Proxmox and build the engines and tools (blocking)"""
+    global proxmox_manager, inventory, metrics, content_index, listings, node_tools, vm_tools, storage_tools, cluster_tools, container_tools, task_tools, metrics_tools, task_tailer
+    
+    # Imported here so that the listener can bind without paying for
+    # proxmoxer and the tool modules (which import the MCP types)
+    from proxmox_mcp.core.proxmox import ProxmoxManager
+    from proxmox_mcp.core.inventory import ClusterInventory
+    from proxmox_mcp.core.metrics import MetricsEngine
+    from proxmox_mcp.core.placement import PlacementEngine
+    from proxmox_mcp.core.storage import StorageStatusCollector
+    from proxmox_mcp.core.listings import ListingCache
+    from proxmox_mcp.core.content import StorageContentIndex
+    from proxmox_mcp.core.tasks import TaskTracker, TaskLogTailer
+    from proxmox_mcp.tools.node import NodeTools
+    from proxmox_mcp.tools.vm import VMTools
+    from proxmox_mcp.tools.storage import StorageTools
+    from proxmox_mcp.tools.cluster import ClusterTools
+    from proxmox_mcp.tools.containers import ContainerTools
+    from proxmox_mcp.tools.tasks import TaskTools
+    from proxmox_mcp.tools.metrics import MetricsTools
+    
+    proxmox_manager = ProxmoxManager(config.proxmox, config.auth, governor=config.governor, retry=config.retry)
+    proxmox = proxmox_manager.get_api()
+    
+    # Background cluster inventory shared by the listing tools
+    inventory = ClusterInventory(proxmox, config.inventory)
+    task_tracker = TaskTracker(proxmox)
+    metrics = MetricsEngine(proxmox, inventory, config.metrics)
+    placement = PlacementEngine(metrics, config.placement)
+    storage_status = StorageStatusCollector(proxmox, config.storage)
+    content_index = StorageContentIndex(proxmox, storage_status, metrics, config.storage)
+    listings = ListingCache(config.listings) if config.listings.enabled else None
+    
+    node_tools = NodeTools(proxmox, inventory, metrics=metrics, listings=listings, config=config.nodes)
+    vm_tools = VMTools(proxmox, inventory, task_tracker, metrics, placement, listings)
+    storage_tools = StorageTools(proxmox, inventory, metrics=metrics, listings=listings, collector=storage_status,
+                                 content_index=content_index)
+    cluster_tools = ClusterTools(proxmox, inventory, metrics=metrics, listings=listings)
+    container_tools = ContainerTools(proxmox, inventory, task_tracker, metrics, listings=listings)
+    task_tools = TaskTools(proxmox, inventory, task_tracker, metrics)
+    metrics_tools = MetricsTools(proxmox, inventory, metrics=metrics)
+    task_tailer = TaskLogTailer(task_tracker)
+    
+    logger.info(f"Initialized all Proxmox tools")
+
+def _warm_up_steps(config):
+    """Warm-up run before readiness: connections, caches and the tool list"""
+    return [
+        ("connections", lambda: proxmox_manager.warm_up(config.startup.warmup_connections)),
+        ("inventory", inventory.refresh),
+        ("storage", storage_tools.collector.collect),
+        ("nodes", node_tools.get_nodes),
+        ("tools_list", _render_tools),
+    ]
+
+def _start_background():
+    """Start the background refreshers (on the event loop, once initialized)"""
+    inventory.start()
+    content_index.start()
+
+def _open_circuits():
+    """Proxmox nodes whose API circuit is open (empty before initialization)"""
+    governor = proxmox_manager.governor if proxmox_manager is not None else None
+    return governor.open_circuits() if governor is not None else {}
+
 def main():
-    global API_KEY, logger, node_tools, vm_tools, storage_tools, cluster_tools, container_tools
+    global api_keys, logger, startup, scheduler
     
     config_path = os.getenv("PROXMOX_MCP_CONFIG")
     if not config_path:
         print("PROXMOX_MCP_CONFIG environment variable must be set")
         sys.exit(1)
     
-    API_KEY = os.getenv("MCPO_API_KEY")
-    if not API_KEY:
-        print("MCPO_API_KEY environment variable must be set")
-        sys.exit(1)
-    
     host = os.getenv("SSE_HOST", "0.0.0.0")
     port = int(os.getenv("SSE_PORT", "8812"))
     
     try:
-        # Initialize configuration and tools
+        # Initialize configuration; the tools are initialized before binding
+        # or, with fast_start, in the background once the server listens
         config = load_config(config_path)
         logger = setup_logging(config.logging)
+        try:
+            api_keys = ApiKeyAuth.from_env(config.api_keys)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        scheduler = FairScheduler(config.scheduler)
+        startup = Startup(config.startup)
         
         logger.info(f"Starting Proxmox MCP Complete Server for n8n on {host}:{port}")
         
-        proxmox_manager = ProxmoxManager(config.proxmox, config.auth)
-        proxmox = proxmox_manager.get_api()
-        
-        node_tools = NodeTools(proxmox)
-        vm_tools = VMTools(proxmox)
-        storage_tools = StorageTools(proxmox)
-        cluster_tools = ClusterTools(proxmox)
-        container_tools = ContainerTools(proxmox)
+        warm_up = (lambda: _warm_up_steps(config)) if config.startup.warmup else None
+        if not config.startup.fast_start:
+            _initialize(config)
+            if warm_up is not None:
+                startup.warm_up(warm_up())
+        logger.info(f"Total tools available: {len(_render_tools())}")
         
-        logger.info(f"Initialized all Proxmox tools")
-        logger.info(f"Total tools available: {len(get_all_tools())}")
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            if config.startup.fast_start:
+                startup.start(lambda: _initialize(config), _start_background, warm_up)
+            else:
+                _start_background()
+                startup.set_ready()
+            yield
+            await startup.stop()
+            if content_index is not None:
+                await content_index.stop()
+            if inventory is not None:
+                await inventory.stop()
+            if metrics is not None:
+                metrics.close()
         
         app = FastAPI(
             title="Proxmox MCP Complete Server (n8n)",
             version="1.0.0",
+            lifespan=lifespan,
             docs_url=None,
             redoc_url=None,
             openapi_url=None
         )
+        app.add_middleware(RequestIdMiddleware)
         
         @app.get("/health")
         async def health_check():
@@ -472,13 +832,127 @@ def main():
                 "status": "healthy",
                 "transport": "hybrid-sse-jsonrpc",
                 "endpoint": "/proxmox/mcp/sse",
-                "total_tools": len(get_all_tools())
+                "total_tools": len(_render_tools()),
+                **startup.report(),
+                "open_circuits": _open_circuits()
             }
         
+        @app.get("/ready")
+        async def readiness_check():
+            """503 until initialization and warm-up are done (/health is liveness)"""
+            return JSONResponse(
+                {"ready": startup.ready, "phase": startup.phase, "error": startup.error},
+                status_code=200 if startup.ready else 503
+            )
+        
+        @app.get("/admin/profile")
+        async def admin_profile(seconds: float = 10.0, interval_ms: float = 5.0,
+                                authorization: str = Header(None)):
+            """Sample the live server and return collapsed stacks"""
+            api_keys.authenticate(authorization, ADMIN)
+            
+            try:
+                stacks = await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000.0)
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            
+            return PlainTextResponse(
+                stacks,
+                headers={"Content-Disposition": 'attachment; filename="proxmox-mcp.collapsed"'}
+            )
+        
+        @app.get("/admin/tool_stats")
+        async def admin_tool_stats(reset: bool = False, authorization: str = Header(None)):
+            """Return cumulative CPU/wall time per tool"""
+            api_keys.authenticate(authorization, ADMIN)
+            
+            stats = tool_stats.snapshot()
+            if reset:
+                tool_stats.reset()
+            return {"tools": stats}
+        
+        @app.get("/admin/inventory")
+        async def admin_inventory(authorization: str = Header(None)):
+            """Return background inventory refresher state and cost"""
+            api_keys.authenticate(authorization, ADMIN)
+            await require_ready()
+            
+            return inventory.report()
+        
+        @app.get("/admin/metrics")
+        async def admin_metrics(authorization: str = Header(None)):
+            """Return metrics engine state and API cost counters"""
+            api_keys.authenticate(authorization, ADMIN)
+            await require_ready()
+            
+            return metrics.report()
+        
+        @app.get("/admin/listings")
+        async def admin_listings(authorization: str = Header(None)):
+            """Return listing cache bounds, entry ages and hit counters"""
+            api_keys.authenticate(authorization, ADMIN)
+            await require_ready()
+            
+            if listings is None:
+                return {"enabled": False}
+            return {"enabled": True, **listings.report()}
+        
+        @app.get("/admin/governor")
+        async def admin_governor(authorization: str = Header(None)):
+            """Return Proxmox API rate limiter, circuit breaker and retry state"""
+            api_keys.authenticate(authorization, ADMIN)
+            await require_ready()
+            
+            return proxmox_manager.upstream_report()
+        
+        @app.get("/admin/logging")
+        async def admin_logging(authorization: str = Header(None)):
+            """Return logging queue and rate limiting counters"""
+            api_keys.authenticate(authorization, ADMIN)
+            
+            return logging_report()
+        
+        @app.get("/admin/auth")
+        async def admin_auth(authorization: str = Header(None)):
+            """Return the configured API keys (names and scopes) and their counters"""
+            api_keys.authenticate(authorization, ADMIN)
+            
+            return {"keys": api_keys.report()}
+        
+        @app.get("/admin/scheduler")
+        async def admin_scheduler(authorization: str = Header(None)):
+            """Return tool call lanes, per-client counters and fairness"""
+            api_keys.authenticate(authorization, ADMIN)
+            
+            return scheduler.report()
+        
+        @app.get("/tasks/log/stream")
+        async def task_log_stream(upid: str, start: int = 0,
+                                  authorization: str = Header(None),
+                                  last_event_id: Optional[str] = Header(None)):
+            """Follow a task log over SSE, sending only new lines"""
+            api_keys.authenticate(authorization, READ)
+            await require_ready()
+            
+            if last_event_id and last_event_id.isdigit():
+                start = int(last_event_id)
+            if not upid.startswith("UPID:"):
+                raise HTTPException(status_code=400, detail=f"Invalid UPID: {upid}")
+            
+            return StreamingResponse(
+                task_log_events(task_tailer, upid, start),
+                media_type="text/event-stream",
+                headers={
+                    "Cache-Control": "no-store",
+                    "Connection": "keep-alive",
+                    "X-Accel-Buffering": "no"
+                }
+            )
+        
         @app.get("/proxmox/mcp/sse")
         async def mcp_sse_get(authorization: str = Header(None)):
             """Handle GET requests - SSE connection"""
-            await verify_api_key(authorization)
+            api_keys.authenticate(authorization, READ)
             
             session_id = str(uuid4())
             sessions[session_id] = {}
@@ -496,18 +970,58 @@ def main():
             )
         
         @app.post("/proxmox/mcp/sse")
-        async def mcp_sse_post(request: Request, authorization: str = Header(None)):
-            """Handle POST requests - JSON-RPC messages"""
-            await verify_api_key(authorization)
+        async def mcp_sse_post(request: Request, authorization: str = Header(None),
+                               accept: Optional[str] = Header(None),
+                               mcp_session_id: Optional[str] = Header(None)):
+            """Handle POST requests - JSON-RPC messages (listing tools stream over SSE on request)
+            
+            Tool calls are rate limited and queued per client (API key and
+            session) by the scheduler; rejected calls get a JSON-RPC error
+            with a retry_after hint.
+            """
+            principal = api_keys.authenticate(authorization, None)
             
             body = await request.json()
             logger.info(f"JSON-RPC request: {body.get('method')}")
+            if body.get("method") != "tools/call":
+                principal.require(READ)
+                return JSONResponse(await handle_jsonrpc(body))
+            
+            params = body.get("params", {})
+            tool_name = params.get("name")
+            principal.require(tool_scope(tool_name))
+            session = request.query_params.get("session_id") or mcp_session_id
+            try:
+                ticket = await scheduler.acquire(principal.client(session), tool_name, principal.weight)
+            except Rejected as e:
+                return JSONResponse(
+                    {"jsonrpc": "2.0", "id": body.get("id"), "error": e.jsonrpc_error()},
+                    headers={"Retry-After": e.retry_after_header}
+                )
+            
+            # A streamed call keeps its slot until the stream ends
+            chunks = None
+            try:
+                if wants_stream(accept) and await startup.wait_ready():
+                    stream = _stream_tool(tool_name, params.get("arguments", {}))
+                    if stream is not None:
+                        chunks = scheduler.release_after(ticket, iterate_chunks(stream, tool_name))
+                if chunks is None:
+                    response = await handle_jsonrpc(body)
+            finally:
+                if chunks is None:
+                    ticket.release()
             
-            response = await handle_jsonrpc(body)
+            if chunks is not None:
+                return StreamingResponse(
+                    jsonrpc_events(body.get("id"), chunks),
+                    media_type="text/event-stream",
+                    headers=STREAM_HEADERS
+                )
             return JSONResponse(response)
         
         logger.info("Complete MCP Server ready for n8n")
-        logger.info(f"Available tools: {', '.join([t['name'] for t in get_all_tools()])}")
+        logger.info(f"Available tools: {', '.join([t['name'] for t in _render_tools()])}")
         
         uvicorn.run(app, host=host, port=port, log_level="info")
         
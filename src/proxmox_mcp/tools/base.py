@@ -11,10 +11,15 @@ All tool implementations inherit from the ProxmoxTool base class to ensure
 consistent behavior and error handling across the MCP server.
 """
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from mcp.types import TextContent as Content
 from proxmoxer import ProxmoxAPI
 from ..formatting import ProxmoxTemplates
+from ..core.inventory import ClusterInventory
+from ..core.tasks import TaskTracker
+from ..core.metrics import MetricsEngine
+from ..core.placement import PlacementEngine
+from ..core.listings import ListingCache
 
 class ProxmoxTool:
     """Base class for Proxmox MCP tools.
@@ -29,15 +34,95 @@ class ProxmoxTool:
     behavior and error handling across the MCP server.
     """
 
-    def __init__(self, proxmox_api: ProxmoxAPI):
+    def __init__(self, proxmox_api: ProxmoxAPI, inventory: Optional[ClusterInventory] = None,
+                 tasks: Optional[TaskTracker] = None, metrics: Optional[MetricsEngine] = None,
+                 placement: Optional[PlacementEngine] = None, listings: Optional[ListingCache] = None):
         """Initialize the tool.
 
         Args:
             proxmox_api: Initialized ProxmoxAPI instance
+            inventory: Optional background-refreshed cluster inventory
+            tasks: Shared task tracker (a private one is created if omitted)
+            metrics: Shared metrics engine (a private one is created if omitted)
+            placement: Shared placement engine (a private one is created if omitted)
+            listings: Shared listing cache (listings are not cached if omitted)
         """
         self.proxmox = proxmox_api
+        self.inventory = inventory
+        self.tasks = tasks if tasks is not None else TaskTracker(proxmox_api)
+        self.metrics = metrics if metrics is not None else MetricsEngine(proxmox_api)
+        self.placement = placement if placement is not None else PlacementEngine(self.metrics)
+        self.listings = listings
         self.logger = logging.getLogger(f"proxmox-mcp.{self.__class__.__name__.lower()}")
 
+    def _inventory_resources(self, rtype: str, node: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Return inventory entries of `rtype` if a fresh snapshot exists.
+
+        Listing tools call this first and fall back to live API requests
+        when it returns None (no inventory configured, or snapshot stale).
+
+        Args:
+            rtype: Resource type as reported by /cluster/resources
+            node: Optional node filter
+
+        Returns:
+            List of resource dictionaries, or None if the inventory can't be used
+        """
+        if self.inventory is None or not self.inventory.is_fresh():
+            return None
+        return self.inventory.resources(rtype, node)
+
+    def _listing(self, tool: str, args: Any, compute: Callable[[], List[Content]],
+                 refresh: bool = False) -> List[Content]:
+        """Answer a listing tool through the stale-while-revalidate cache.
+
+        An expired result served while it is refreshed gets a second
+        content item giving its age.
+
+        Args:
+            tool: Tool name
+            args: Hashable arguments of the call
+            compute: Produces the listing content
+            refresh: Ignore the cached result
+
+        Returns:
+            List of Content objects
+        """
+        if self.listings is None:
+            return compute()
+        content, age = self.listings.get(tool, args, compute, refresh)
+        if age is None:
+            return content
+        return content + [Content(type="text", text=f"⏳ Cached result from {age:.0f}s ago, refresh in progress")]
+
+    def _listings_changed(self) -> None:
+        """Drop cached listings after a write operation."""
+        if self.listings is not None:
+            self.listings.invalidate()
+
+    def _track_task(self, upid: Any, label: str, wait: bool = False,
+                    timeout: int = 60) -> Optional[Dict[str, Any]]:
+        """Register a task returned by a write operation and optionally await it.
+
+        Args:
+            upid: Return value of the Proxmox call (ignored if not a UPID)
+            label: Human-readable description of the operation
+            wait: Block until the task finishes or `timeout` expires
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Task record (see TaskTracker.get), or None if `upid` is not a UPID
+        """
+        self._listings_changed()
+        record = self.tasks.track(upid, label)
+        if record is None:
+            return None
+        if wait:
+            record = self.tasks.wait([upid], timeout)[0]
+            self._listings_changed()
+            return record
+        return self.tasks.get(upid)
+
     def _format_response(self, data: Any, resource_type: Optional[str] = None) -> List[Content]:
         """Format response data into MCP content using templates.
 
@@ -49,7 +134,8 @@ class ProxmoxTool:
         Args:
             data: Raw data from Proxmox API to format
             resource_type: Type of resource for template selection. Valid types:
-                         'nodes', 'node_status', 'vms', 'storage', 'containers', 'cluster'
+                         'nodes', 'node_status', 'vms', 'storage', 'containers', 'cluster',
+                         'tasks'
 
         Returns:
             List of Content objects formatted according to resource type
@@ -70,6 +156,8 @@ class ProxmoxTool:
             formatted = ProxmoxTemplates.container_list(data)
         elif resource_type == "cluster":
             formatted = ProxmoxTemplates.cluster_status(data)
+        elif resource_type == "tasks":
+            formatted = ProxmoxTemplates.task_list(data)
         else:
             # Fallback to JSON formatting for unknown types
             import json
@@ -6,14 +6,18 @@ This module provides tools for monitoring and managing Proxmox clusters:
 - Monitoring quorum status and node count
 - Tracking cluster resources and configuration
 - Checking cluster-wide service availability
+- Summarizing cluster health (capacity, overcommit, top consumers)
 
 The tools provide essential information for maintaining
 cluster health and ensuring proper operation.
 """
+import json
 from typing import List
 from mcp.types import TextContent as Content
 from .base import ProxmoxTool
 from .definitions import GET_CLUSTER_STATUS_DESC
+from ..core.health import summarize
+from ..formatting import ProxmoxTemplates
 
 class ClusterTools(ProxmoxTool):
     """Tools for managing Proxmox cluster.
@@ -64,15 +68,56 @@ class ClusterTools(ProxmoxTool):
                         - API endpoint failures
         """
         try:
-            result = self.proxmox.cluster.status.get()
-        
-            first_item = result[0] if result and len(result) > 0 else {}
-            status = {
-                "name": first_item.get("name") if first_item else None,
-                "quorum": first_item.get("quorate") if first_item else None,
-                "nodes": len([node for node in result if node.get("type") == "node"]) if result else 0,
-                "resources": [res for res in result if res.get("type") == "resource"] if result else []
-            }
-            return self._format_response(status, "cluster")
+            return self._listing("get_cluster_status", (), self._cluster_status)
         except Exception as e:
             self._handle_error("get cluster status", e)
+
+    def _cluster_status(self) -> List[Content]:
+        result = self.proxmox.cluster.status.get()
+
+        first_item = result[0] if result and len(result) > 0 else {}
+        status = {
+            "name": first_item.get("name") if first_item else None,
+            "quorum": first_item.get("quorate") if first_item else None,
+            "nodes": len([node for node in result if node.get("type") == "node"]) if result else 0,
+            "resources": [res for res in result if res.get("type") == "resource"] if result else []
+        }
+        return self._format_response(status, "cluster")
+
+    def get_cluster_health(self, top: int = 5, format_style: str = "pretty") -> List[Content]:
+        """Summarize cluster health in one pass.
+
+        Answered from one /cluster/resources snapshot (shared with the
+        metrics engine and inventory caches) plus one /cluster/status call:
+        - Quorum and online/offline nodes
+        - CPU, memory and storage usage (shared storages counted once)
+        - vCPU and memory overcommit ratios
+        - Running/stopped guests per type
+        - Top CPU and memory consumers, fullest storages
+        - Alerts (offline nodes, nodes or storages near capacity)
+
+        Args:
+            top: Number of top consumers and fullest storages to list
+            format_style: 'pretty' or 'json'
+
+        Returns:
+            List of Content objects with the health report
+
+        Raises:
+            RuntimeError: If the cluster resources can't be retrieved
+        """
+        try:
+            resources = list(self.metrics.latest().values())
+        except Exception as e:
+            self._handle_error("get cluster health", e)
+        try:
+            status = self.proxmox.cluster.status.get()
+        except Exception as e:
+            # Capacity figures are still useful without quorum information
+            self.logger.warning(f"Failed to get cluster status: {e}")
+            status = None
+
+        report = summarize(resources, status, top=max(0, top))
+        if format_style == "json":
+            return [Content(type="text", text=json.dumps(report, indent=2))]
+        return [Content(type="text", text=ProxmoxTemplates.cluster_health(report))]
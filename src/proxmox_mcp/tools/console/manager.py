@@ -98,16 +98,16 @@ class VMConsoleManager:
             # Get the API endpoint
             # Use the guest agent exec endpoint
             endpoint = self.proxmox.nodes(node).qemu(vmid).agent
-            self.logger.debug(f"Using API endpoint: {endpoint}")
+            self.logger.debug("Using API endpoint: %s", endpoint)
             
             # Execute the command using two-step process
             try:
                 # Start command execution
                 self.logger.info("Starting command execution...")
                 try:
-                    self.logger.debug(f"Executing command via agent: {command}")
+                    self.logger.debug("Executing command via agent: %s", command)
                     exec_result = endpoint("exec").post(command=command)
-                    self.logger.debug(f"Raw exec response: {exec_result}")
+                    self.logger.debug("Raw exec response: %s", exec_result)
                     self.logger.info(f"Command started with result: {exec_result}")
                 except Exception as e:
                     self.logger.error(f"Failed to start command: {str(e)}")
@@ -125,9 +125,9 @@ class VMConsoleManager:
 
                 # Get command output using exec-status
                 try:
-                    self.logger.debug(f"Getting status for PID {pid}...")
+                    self.logger.debug("Getting status for PID %s...", pid)
                     console = endpoint("exec-status").get(pid=pid)
-                    self.logger.debug(f"Raw exec-status response: {console}")
+                    self.logger.debug("Raw exec-status response: %s", console)
                     if not console:
                         raise RuntimeError("No response from exec-status")
                 except Exception as e:
@@ -137,8 +137,8 @@ class VMConsoleManager:
             except Exception as e:
                 self.logger.error(f"API call failed: {str(e)}")
                 raise RuntimeError(f"API call failed: {str(e)}")
-            self.logger.debug(f"Raw API response type: {type(console)}")
-            self.logger.debug(f"Raw API response: {console}")
+            self.logger.debug("Raw API response type: %s", type(console))
+            self.logger.debug("Raw API response: %s", console)
             
             # Handle different response structures
             if isinstance(console, dict):
@@ -152,16 +152,16 @@ class VMConsoleManager:
                     self.logger.warning("Command may not have completed")
             else:
                 # Some versions might return data differently
-                self.logger.debug(f"Unexpected response type: {type(console)}")
+                self.logger.debug("Unexpected response type: %s", type(console))
                 output = str(console)
                 error = ""
                 exit_code = 0
             
-            self.logger.debug(f"Processed output: {output}")
-            self.logger.debug(f"Processed error: {error}")
-            self.logger.debug(f"Processed exit code: {exit_code}")
+            self.logger.debug("Processed output: %s", output)
+            self.logger.debug("Processed error: %s", error)
+            self.logger.debug("Processed exit code: %s", exit_code)
             
-            self.logger.debug(f"Executed command '{command}' on VM {vmid} (node: {node})")
+            self.logger.debug("Executed command '%s' on VM %s (node: %s)", command, vmid, node)
 
             return {
                 "success": True,
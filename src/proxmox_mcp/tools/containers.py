@@ -1,7 +1,11 @@
-from typing import List, Dict, Optional, Tuple, Any, Union
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Any, Union
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from mcp.types import TextContent as Content
 from .base import ProxmoxTool
+from ..formatting.renderer import CHUNK_SIZE, chunked, iter_json_array
 
 
 def _b2h(n: Union[int, float, str]) -> str:
@@ -74,6 +78,11 @@ class ContainerTools(ProxmoxTool):
     # ---------- helpers ----------
     def _list_ct_pairs(self, node: Optional[str]) -> List[Tuple[str, Dict]]:
         """Yield (node_name, ct_dict). Coerce odd shapes into dicts with vmid."""
+        cached = self._inventory_resources("lxc", node)
+        if cached is not None:
+            cached.sort(key=lambda r: (r.get("node") or "", r.get("vmid", 0)))
+            return [(_get(ct, "node"), ct) for ct in cached if _get(ct, "node")]
+
         out: List[Tuple[str, Dict]] = []
         if node:
             raw = self.proxmox.nodes(node).lxc.get()
@@ -104,20 +113,12 @@ class ContainerTools(ProxmoxTool):
                             continue
         return out
 
-    def _rrd_last(self, node: str, vmid: int) -> Tuple[Optional[float], Optional[int], Optional[int]]:
-        """Return (cpu_pct, mem_bytes, maxmem_bytes) from the most recent RRD sample."""
+    def _bulk_usage(self, node: Optional[str]) -> Dict[str, Dict]:
+        """Latest usage of every container from one bulk sample (never per-guest RRD)."""
         try:
-            rrd = _as_list(self.proxmox.nodes(node).lxc(vmid).rrddata.get(timeframe="hour", ds="cpu,mem,maxmem"))
-            if not rrd or not isinstance(rrd[-1], dict):
-                return None, None, None
-            last = rrd[-1]
-            # Proxmox RRD cpu is fraction already (0..1). Convert to percent.
-            cpu_pct = float(_get(last, "cpu", 0.0) or 0.0) * 100.0
-            mem_bytes = int(_get(last, "mem", 0) or 0)
-            maxmem_bytes = int(_get(last, "maxmem", 0) or 0)
-            return cpu_pct, mem_bytes, maxmem_bytes
+            return self.metrics.latest("lxc", node)
         except Exception:
-            return None, None, None
+            return {}
 
     def _status_and_config(self, node: str, vmid: int) -> Tuple[Dict, Dict]:
         """Return (status_current_dict, config_dict)."""
@@ -133,8 +134,35 @@ class ContainerTools(ProxmoxTool):
             raw_config = {}
         return raw_status, raw_config
 
+    @staticmethod
+    def _stats_from_inventory(ct: Dict) -> Dict[str, Any]:
+        """Build the stats fields of a row from a /cluster/resources entry."""
+        cpu_pct = round(float(_get(ct, "cpu", 0.0) or 0.0) * 100.0, 2)
+        mem_bytes = int(_get(ct, "mem", 0) or 0)
+        maxmem_bytes = int(_get(ct, "maxmem", 0) or 0)
+        if str(_get(ct, "status") or "").lower() == "stopped":
+            mem_bytes = 0
+        cores = _get(ct, "maxcpu")
+        return {
+            "cores": int(cores) if cores is not None else None,
+            "memory": int(round(maxmem_bytes / (1024 * 1024))) if maxmem_bytes else 0,
+            "cpu_pct": cpu_pct,
+            "mem_bytes": mem_bytes,
+            "maxmem_bytes": maxmem_bytes,
+            "mem_pct": (
+                round((mem_bytes / maxmem_bytes * 100.0), 2)
+                if maxmem_bytes > 0
+                else None
+            ),
+            "unlimited_memory": maxmem_bytes == 0,
+        }
+
     def _render_pretty(self, rows: List[Dict]) -> List[Content]:
-        lines: List[str] = ["📦 Containers", ""]
+        return [Content(type="text", text="".join(self._iter_pretty(rows)))]
+
+    def _iter_pretty(self, rows: Iterable[Dict]) -> Iterator[str]:
+        """Pretty text of the rows, one block per container as rows arrive."""
+        yield "📦 Containers"
         for r in rows:
             name = r.get("name") or f"ct-{r.get('vmid')}"
             vmid = r.get("vmid")
@@ -147,6 +175,8 @@ class ContainerTools(ProxmoxTool):
             mem_pct = r.get("mem_pct")
             unlimited = bool(r.get("unlimited_memory", False))
 
+            # Block starts on a new line, after a blank line
+            lines: List[str] = ["", ""]
             lines.append(f"📦 {name} (ID: {vmid})")
             lines.append(f"  • Status: {status}")
             lines.append(f"  • Node: {node}")
@@ -161,8 +191,7 @@ class ContainerTools(ProxmoxTool):
                     lines.append(f"  • Memory: {_b2h(mem_bytes)} / {_b2h(maxmem_bytes)}{pct_str}")
                 else:
                     lines.append(f"  • Memory: {_b2h(mem_bytes)} / 0.00 B")
-            lines.append("")
-        return [Content(type="text", text="\n".join(lines).rstrip())]
+            yield "\n".join(lines)
 
     # ---------- tool ----------
     def get_containers(
@@ -176,127 +205,175 @@ class ContainerTools(ProxmoxTool):
         List containers cluster-wide or by node.
 
         - `include_stats=True` fetches live CPU/mem from /status/current
-        - RRD fallback is used if live returns zeros
+          (answered from the cluster inventory when a fresh one is available)
+        - Zeros in the live data are filled from one bulk /cluster/resources
+          sample shared by all containers (no per-container RRD download)
         - `format_style='json'` returns raw JSON list (sanitized)
         - `format_style='pretty'` renders a human-friendly table
+        - Results go through the listing cache (stale-while-revalidate)
         """
-        try:
-            pairs = self._list_ct_pairs(node)
-            rows: List[Dict] = []
-
-            for nname, ct in pairs:
-                vmid_val = _get(ct, "vmid")
-                vmid_int: Optional[int] = None
-                try:
-                    if vmid_val is not None:
-                        vmid_int = int(vmid_val)
-                except Exception:
-                    vmid_int = None
-
-                rec: Dict = {
-                    "vmid": str(vmid_val) if vmid_val is not None else None,
-                    "name": _get(ct, "name") or _get(ct, "hostname") or (f"ct-{vmid_val}" if vmid_val is not None else "ct-?"),
-                    "node": nname,
-                    "status": _get(ct, "status"),
-                }
-
-                if include_stats and vmid_int is not None:
-                    raw_status, raw_config = self._status_and_config(nname, vmid_int)
+        def compute() -> List[Content]:
+            rows = list(self._iter_rows(node, include_stats, include_raw, format_style))
 
-                    cpu_frac = float(_get(raw_status, "cpu", 0.0) or 0.0)
-                    cpu_pct = round(cpu_frac * 100.0, 2)
-                    mem_bytes = int(_get(raw_status, "mem", 0) or 0)
-                    maxmem_bytes = int(_get(raw_status, "maxmem", 0) or 0)
+            if format_style == "json":
+                # JSON path must be immune to any formatter assumptions; no raw payloads.
+                return self._json_fmt(rows)
+            return self._render_pretty(rows)
 
-                    memory_mib = 0
-                    cores: Optional[Union[int, float]] = None
-                    unlimited_memory = False
+        try:
+            return self._listing("get_containers", (node, include_stats, include_raw, format_style), compute)
+        except Exception as e:
+            return self._err("Failed to list containers", e)
 
-                    try:
-                        cfg_mem = _get(raw_config, "memory")
-                        if cfg_mem is None:
-                            cfg_mem = _get(raw_config, "ram")
-                        if cfg_mem is None:
-                            cfg_mem = _get(raw_config, "maxmem")
-                        if cfg_mem is None:
-                            cfg_mem = _get(raw_config, "memoryMiB")
-                        if cfg_mem is not None:
-                            try:
-                                memory_mib = int(cfg_mem)
-                            except Exception:
-                                memory_mib = 0
-                        else:
-                            memory_mib = 0
+    def stream_containers(
+        self,
+        node: Optional[str] = None,
+        include_stats: bool = True,
+        format_style: str = "pretty",
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """
+        Streaming form of get_containers for the HTTP transports.
 
-                        unlimited_memory = bool(_get(raw_config, "swap", 0) == 0 and memory_mib == 0)
+        Each container is rendered as soon as its stats are collected and
+        the text is yielded in chunks of about `chunk_size` characters; the
+        concatenation is the get_containers text (raw blobs are not streamed).
+        """
+        try:
+            rows = self._iter_rows(node, include_stats, False, format_style)
+            if format_style == "json":
+                parts = iter_json_array(rows, sort_keys=True)
+            else:
+                parts = self._iter_pretty(rows)
+            yield from chunked(parts, chunk_size)
+        except Exception as e:
+            for content in self._err("Failed to list containers", e):
+                yield content.text
 
-                        cfg_cores = _get(raw_config, "cores")
-                        cfg_cpulimit = _get(raw_config, "cpulimit")
-                        if cfg_cores is not None:
-                            cores = int(cfg_cores)
-                        elif cfg_cpulimit is not None and float(cfg_cpulimit) > 0:
-                            cores = float(cfg_cpulimit)
-                    except Exception:
-                        cores = None
+    def _iter_rows(
+        self,
+        node: Optional[str],
+        include_stats: bool,
+        include_raw: bool,
+        format_style: str,
+    ) -> Iterator[Dict]:
+        """Yield one row per container, collecting live stats as needed."""
+        pairs = self._list_ct_pairs(node)
+        from_inventory = (
+            not include_raw and self._inventory_resources("lxc", node) is not None
+        )
+        bulk: Optional[Dict[str, Dict]] = None
+
+        for nname, ct in pairs:
+            vmid_val = _get(ct, "vmid")
+            vmid_int: Optional[int] = None
+            try:
+                if vmid_val is not None:
+                    vmid_int = int(vmid_val)
+            except Exception:
+                vmid_int = None
+
+            rec: Dict = {
+                "vmid": str(vmid_val) if vmid_val is not None else None,
+                "name": _get(ct, "name") or _get(ct, "hostname") or (f"ct-{vmid_val}" if vmid_val is not None else "ct-?"),
+                "node": nname,
+                "status": _get(ct, "status"),
+            }
+
+            if include_stats and vmid_int is not None and from_inventory:
+                rec.update(self._stats_from_inventory(ct))
+            elif include_stats and vmid_int is not None:
+                raw_status, raw_config = self._status_and_config(nname, vmid_int)
+
+                cpu_frac = float(_get(raw_status, "cpu", 0.0) or 0.0)
+                cpu_pct = round(cpu_frac * 100.0, 2)
+                mem_bytes = int(_get(raw_status, "mem", 0) or 0)
+                maxmem_bytes = int(_get(raw_status, "maxmem", 0) or 0)
+
+                memory_mib = 0
+                cores: Optional[Union[int, float]] = None
+                unlimited_memory = False
 
-                    # --- NEW: fallbacks for stopped / missing maxmem ---
-                    status_str = str(_get(raw_status, "status") or _get(ct, "status") or "").lower()
-                    
-                    if status_str == "stopped":
+                try:
+                    cfg_mem = _get(raw_config, "memory")
+                    if cfg_mem is None:
+                        cfg_mem = _get(raw_config, "ram")
+                    if cfg_mem is None:
+                        cfg_mem = _get(raw_config, "maxmem")
+                    if cfg_mem is None:
+                        cfg_mem = _get(raw_config, "memoryMiB")
+                    if cfg_mem is not None:
                         try:
-                            mem_bytes = 0
+                            memory_mib = int(cfg_mem)
                         except Exception:
-                            mem_bytes = 0
+                            memory_mib = 0
+                    else:
+                        memory_mib = 0
+
+                    unlimited_memory = bool(_get(raw_config, "swap", 0) == 0 and memory_mib == 0)
+
+                    cfg_cores = _get(raw_config, "cores")
+                    cfg_cpulimit = _get(raw_config, "cpulimit")
+                    # vCPU count as in /cluster/resources (maxcpu), so both paths agree
+                    if _get(ct, "cpus") is not None:
+                        cores = int(_get(ct, "cpus"))
+                    elif cfg_cores is not None:
+                        cores = int(cfg_cores)
+                    elif cfg_cpulimit is not None and float(cfg_cpulimit) > 0:
+                        cores = float(cfg_cpulimit)
+                except Exception:
+                    cores = None
 
-                    if (not maxmem_bytes or int(maxmem_bytes) == 0) and memory_mib and int(memory_mib) > 0:
-                        try:
-                            maxmem_bytes = int(memory_mib) * 1024 * 1024
-                        except Exception:
-                            maxmem_bytes = 0
-
-                    # RRD fallback if zeros
-                    if (mem_bytes == 0) or (maxmem_bytes == 0) or (cpu_pct == 0.0):
-                        rrd_cpu, rrd_mem, rrd_maxmem = self._rrd_last(nname, vmid_int)
-                        if cpu_pct == 0.0 and rrd_cpu is not None:
-                            cpu_pct = rrd_cpu
-                        if mem_bytes == 0 and rrd_mem is not None:
-                            mem_bytes = rrd_mem
-                        if maxmem_bytes == 0 and rrd_maxmem:
-                            maxmem_bytes = rrd_maxmem
-                            if memory_mib == 0:
-                                try:
-                                    memory_mib = int(round(maxmem_bytes / (1024 * 1024)))
-                                except Exception:
-                                    memory_mib = 0
-
-                    rec.update({
-                        "cores": cores,
-                        "memory": memory_mib,
-                        "cpu_pct": cpu_pct,
-                        "mem_bytes": mem_bytes,
-                        "maxmem_bytes": maxmem_bytes,
-                        "mem_pct": (
-                            round((mem_bytes / maxmem_bytes * 100.0), 2)
-                            if (maxmem_bytes and maxmem_bytes > 0)
-                            else None
-                        ),
-                        "unlimited_memory": unlimited_memory,
-                    })
-
-                    # For PRETTY only: allow raw blobs to be attached if requested.
-                    if include_raw and format_style != "json":
-                        rec["raw_status"] = raw_status
-                        rec["raw_config"] = raw_config
-
-                rows.append(rec)
+                # --- NEW: fallbacks for stopped / missing maxmem ---
+                status_str = str(_get(raw_status, "status") or _get(ct, "status") or "").lower()
 
-            if format_style == "json":
-                # JSON path must be immune to any formatter assumptions; no raw payloads.
-                return self._json_fmt(rows)
-            return self._render_pretty(rows)
+                if status_str == "stopped":
+                    try:
+                        mem_bytes = 0
+                    except Exception:
+                        mem_bytes = 0
 
-        except Exception as e:
-            return self._err("Failed to list containers", e)
+                if (not maxmem_bytes or int(maxmem_bytes) == 0) and memory_mib and int(memory_mib) > 0:
+                    try:
+                        maxmem_bytes = int(memory_mib) * 1024 * 1024
+                    except Exception:
+                        maxmem_bytes = 0
+
+                # Bulk sample fallback if zeros
+                if (mem_bytes == 0) or (maxmem_bytes == 0) or (cpu_pct == 0.0):
+                    if bulk is None:
+                        bulk = self._bulk_usage(node)
+                    sample = bulk.get(f"lxc/{vmid_int}")
+                    if sample is not None:
+                        if cpu_pct == 0.0:
+                            cpu_pct = round(float(_get(sample, "cpu", 0.0) or 0.0) * 100.0, 2)
+                        if mem_bytes == 0 and status_str != "stopped":
+                            mem_bytes = int(_get(sample, "mem", 0) or 0)
+                        if maxmem_bytes == 0:
+                            maxmem_bytes = int(_get(sample, "maxmem", 0) or 0)
+                            if memory_mib == 0 and maxmem_bytes:
+                                memory_mib = int(round(maxmem_bytes / (1024 * 1024)))
+
+                rec.update({
+                    "cores": cores,
+                    "memory": memory_mib,
+                    "cpu_pct": cpu_pct,
+                    "mem_bytes": mem_bytes,
+                    "maxmem_bytes": maxmem_bytes,
+                    "mem_pct": (
+                        round((mem_bytes / maxmem_bytes * 100.0), 2)
+                        if (maxmem_bytes and maxmem_bytes > 0)
+                        else None
+                    ),
+                    "unlimited_memory": unlimited_memory,
+                })
+
+                # For PRETTY only: allow raw blobs to be attached if requested.
+                if include_raw and format_style != "json":
+                    rec["raw_status"] = raw_status
+                    rec["raw_config"] = raw_config
+
+            yield rec
 
     # ---------- target resolution for control ops ----------
     def _resolve_targets(self, selector: str) -> List[Tuple[str, int, str]]:
@@ -367,15 +444,41 @@ class ContainerTools(ProxmoxTool):
             node = r.get("node")
             vmid = r.get("vmid")
             name = r.get("name") or f"ct-{vmid}"
-            msg = r.get("message") or r.get("error") or ""
+            msg = r.get("error") or r.get("message") or ""
             lines.append(f"{status} {name} (ID: {vmid}, node: {node}) {('- ' + str(msg)) if msg else ''}")
         return [Content(type="text", text="\n".join(lines).rstrip())]
 
+    @staticmethod
+    def _result_upid(result: Dict[str, Any]) -> Optional[str]:
+        """UPID attached to an action result, if any."""
+        value = result.get("upid") or result.get("message")
+        if isinstance(value, str) and value.startswith("UPID:"):
+            return value
+        return None
+
+    def _settle_tasks(self, results: List[Dict[str, Any]], timeout: int) -> None:
+        """Wait for all UPIDs referenced by `results` at once and annotate them."""
+        upids = [u for u in (self._result_upid(r) for r in results) if u]
+        if not upids:
+            return
+        tasks = {t["upid"]: t for t in self.tasks.wait(upids, timeout) if t}
+        for r in results:
+            task = tasks.get(self._result_upid(r))
+            if task is None:
+                continue
+            r["task"] = {"status": task["status"], "exitstatus": task["exitstatus"],
+                         "elapsed": task["elapsed"]}
+            if task["status"] == "stopped" and not task["ok"]:
+                r["ok"] = False
+                r["error"] = f"task failed: {task['exitstatus']}"
+
     # ---------- container control tools ----------
-    def start_container(self, selector: str, format_style: str = "pretty") -> List[Content]:
+    def start_container(self, selector: str, format_style: str = "pretty", wait: bool = False,
+                        timeout: int = 60) -> List[Content]:
         """
         Start LXC containers matching `selector`.
         selector examples: '123', 'pve1:123', 'pve1/name', 'name', 'pve1:101,pve2/web'
+        wait=True blocks until the start tasks finish (bounded by `timeout` seconds).
         """
         try:
             targets = self._resolve_targets(selector)
@@ -386,10 +489,15 @@ class ContainerTools(ProxmoxTool):
             for node, vmid, label in targets:
                 try:
                     resp = self.proxmox.nodes(node).lxc(vmid).status.start.post()
+                    self.tasks.track(resp, f"start CT {vmid} ({label})")
                     results.append({"ok": True, "node": node, "vmid": vmid, "name": label, "message": resp})
                 except Exception as e:
                     results.append({"ok": False, "node": node, "vmid": vmid, "name": label, "error": str(e)})
 
+            if wait:
+                self._settle_tasks(results, timeout)
+            self._listings_changed()
+
             if format_style == "json":
                 return self._json_fmt(results)
             return self._render_action_result("Start Containers", results)
@@ -398,11 +506,13 @@ class ContainerTools(ProxmoxTool):
             return self._err("Failed to start container(s)", e)
 
     def stop_container(self, selector: str, graceful: bool = True, timeout_seconds: int = 10,
-                       format_style: str = "pretty") -> List[Content]:
+                       format_style: str = "pretty", wait: bool = False,
+                       timeout: int = 60) -> List[Content]:
         """
         Stop LXC containers.
         graceful=True → POST .../status/shutdown (graceful stop)
         graceful=False → POST .../status/stop (force stop)
+        wait=True blocks until the stop tasks finish (bounded by `timeout` seconds).
         """
         try:
             targets = self._resolve_targets(selector)
@@ -416,10 +526,15 @@ class ContainerTools(ProxmoxTool):
                         resp = self.proxmox.nodes(node).lxc(vmid).status.shutdown.post(timeout=timeout_seconds)
                     else:
                         resp = self.proxmox.nodes(node).lxc(vmid).status.stop.post()
+                    self.tasks.track(resp, f"stop CT {vmid} ({label})")
                     results.append({"ok": True, "node": node, "vmid": vmid, "name": label, "message": resp})
                 except Exception as e:
                     results.append({"ok": False, "node": node, "vmid": vmid, "name": label, "error": str(e)})
 
+            if wait:
+                self._settle_tasks(results, timeout)
+            self._listings_changed()
+
             if format_style == "json":
                 return self._json_fmt(results)
             return self._render_action_result("Stop Containers", results)
@@ -428,9 +543,11 @@ class ContainerTools(ProxmoxTool):
             return self._err("Failed to stop container(s)", e)
 
     def restart_container(self, selector: str, timeout_seconds: int = 10,
-                          format_style: str = "pretty") -> List[Content]:
+                          format_style: str = "pretty", wait: bool = False,
+                          timeout: int = 60) -> List[Content]:
         """
         Restart LXC containers via POST .../status/reboot.
+        wait=True blocks until the reboot tasks finish (bounded by `timeout` seconds).
         """
         try:
             targets = self._resolve_targets(selector)
@@ -441,10 +558,15 @@ class ContainerTools(ProxmoxTool):
             for node, vmid, label in targets:
                 try:
                     resp = self.proxmox.nodes(node).lxc(vmid).status.reboot.post()
+                    self.tasks.track(resp, f"restart CT {vmid} ({label})")
                     results.append({"ok": True, "node": node, "vmid": vmid, "name": label, "message": resp})
                 except Exception as e:
                     results.append({"ok": False, "node": node, "vmid": vmid, "name": label, "error": str(e)})
 
+            if wait:
+                self._settle_tasks(results, timeout)
+            self._listings_changed()
+
             if format_style == "json":
                 return self._json_fmt(results)
             return self._render_action_result("Restart Containers", results)
@@ -461,9 +583,23 @@ class ContainerTools(ProxmoxTool):
         disk_gb: Optional[int] = None,
         disk: str = "rootfs",
         format_style: str = "pretty",
+        wait: bool = False,
+        timeout: int = 120,
+        per_node_parallel: int = 4,
+        force: bool = False,
     ) -> List[Content]:
         """Update container CPU/memory/swap limits and/or extend disk size.
 
+        Matching containers are updated as one batch:
+        - Current configs are read concurrently and only the settings that
+          differ are sent; containers already at the requested values are
+          skipped
+        - The net CPU/memory increase per node is checked against the node
+          headroom of the placement engine before anything is applied
+        - Updates run concurrently, at most `per_node_parallel` per node;
+          with `wait`, a node slot is held until the container's resize
+          task finishes, otherwise the resize task IDs are returned at once
+
         Parameters:
             selector: Container selector (same grammar as start_container)
             cores: New CPU core count
@@ -472,6 +608,10 @@ class ContainerTools(ProxmoxTool):
             disk_gb: Additional disk size to add in GiB
             disk: Disk identifier to resize (default 'rootfs')
             format_style: Output format ('pretty' or 'json')
+            wait: Block until the resize tasks finish
+            timeout: Maximum seconds to wait for resize tasks when `wait` is set
+            per_node_parallel: Containers updated at once on each node
+            force: Apply even where a node lacks headroom for the increase
         """
 
         try:
@@ -479,42 +619,137 @@ class ContainerTools(ProxmoxTool):
             if not targets:
                 return self._err("No containers matched the selector", ValueError(selector))
 
-            results: List[Dict[str, Any]] = []
-            for node, vmid, label in targets:
-                rec: Dict[str, Any] = {"ok": True, "node": node, "vmid": vmid, "name": label}
-                changes: List[str] = []
+            slots = max(1, per_node_parallel)
+            results = self._plan_updates(targets, cores, memory, swap, disk, disk_gb, slots)
+            if not force:
+                self._check_headroom(results)
+            self._apply_updates(results, disk, disk_gb, slots, timeout if wait else None)
+            self._settle_tasks(results, 0)
+            self._listings_changed()
+
+            for rec in results:
+                rec.pop("params", None)
+                rec.pop("growth", None)
+            if format_style == "json":
+                return self._json_fmt(results)
+            updated = sum(1 for r in results if r["ok"] and not r.get("skipped"))
+            skipped = sum(1 for r in results if r.get("skipped"))
+            failed = sum(1 for r in results if not r["ok"])
+            return self._render_action_result(
+                f"Update Container Resources ({updated} updated, {skipped} unchanged, {failed} failed)",
+                results,
+            )
 
+        except Exception as e:
+            return self._err("Failed to update container(s)", e)
+
+    def _plan_updates(self, targets: List[Tuple[str, int, str]], cores: Optional[int],
+                      memory: Optional[int], swap: Optional[int], disk: str,
+                      disk_gb: Optional[int], per_node: int) -> List[Dict[str, Any]]:
+        """Read current configs concurrently and compute each container's delta.
+
+        /cluster/resources reports cpulimit rather than cores and no swap,
+        so the configs themselves are diffed.
+        """
+        wanted = {"cores": cores, "memory": memory, "swap": swap}
+        units = {"cores": "", "memory": "MiB", "swap": "MiB"}
+
+        def plan(target: Tuple[str, int, str]) -> Dict[str, Any]:
+            node, vmid, label = target
+            rec: Dict[str, Any] = {"ok": True, "node": node, "vmid": vmid, "name": label,
+                                   "params": {}, "growth": (0, 0)}
+            try:
+                current = _as_dict(self.proxmox.nodes(node).lxc(vmid).config.get())
+            except Exception as e:
+                rec["ok"] = False
+                rec["error"] = f"failed to read config: {e}"
+                return rec
+
+            changes: List[str] = []
+            unchanged: List[str] = []
+            olds: Dict[str, Optional[int]] = {}
+            for key, value in wanted.items():
+                if value is None:
+                    continue
                 try:
-                    update_params: Dict[str, Any] = {}
-                    if cores is not None:
-                        update_params["cores"] = cores
-                        changes.append(f"cores={cores}")
-                    if memory is not None:
-                        update_params["memory"] = memory
-                        changes.append(f"memory={memory}MiB")
-                    if swap is not None:
-                        update_params["swap"] = swap
-                        changes.append(f"swap={swap}MiB")
-
-                    if update_params:
-                        self.proxmox.nodes(node).lxc(vmid).config.put(**update_params)
-
-                    if disk_gb is not None:
-                        size_str = f"+{disk_gb}G"
+                    old = olds[key] = int(current[key]) if key in current else None
+                except (TypeError, ValueError):
+                    old = olds[key] = None
+                if old == value:
+                    unchanged.append(f"{key}={value}{units[key]}")
+                    continue
+                rec["params"][key] = value
+                changes.append(f"{key}={value}{units[key]}" if old is None
+                               else f"{key} {old}→{value}{units[key]}")
+            # Without cores a container may use every host CPU: limiting it is no growth
+            cpu_delta = cores - olds["cores"] if "cores" in rec["params"] and olds["cores"] else 0
+            mem_delta = memory - int(current.get("memory") or 0) if "memory" in rec["params"] else 0
+            rec["growth"] = (cpu_delta, mem_delta)
+            if disk_gb:
+                changes.append(f"{disk}+={disk_gb}G")
+            if changes:
+                rec["message"] = ", ".join(changes)
+            else:
+                rec["skipped"] = True
+                rec["message"] = "no changes" + (f" ({', '.join(unchanged)})" if unchanged else "")
+            return rec
+
+        nodes = {node for node, _, _ in targets}
+        workers = max(1, min(len(targets), per_node * len(nodes), 16))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ct-update-plan") as pool:
+            return list(pool.map(plan, targets))
+
+    def _check_headroom(self, results: List[Dict[str, Any]]) -> None:
+        """Fail the updates of nodes that can't absorb their net CPU/memory increase."""
+        growth: Dict[str, Tuple[int, int]] = {}
+        for rec in results:
+            if rec["ok"] and rec["params"]:
+                cpus, mem = growth.get(rec["node"], (0, 0))
+                growth[rec["node"]] = (cpus + rec["growth"][0], mem + rec["growth"][1])
+        if not growth:
+            return
+        try:
+            problems = self.placement.check_growth(growth)
+        except Exception as e:
+            self.logger.warning(f"Node headroom check unavailable, applying updates unchecked: {e}")
+            return
+        for rec in results:
+            problem = problems.get(rec["node"])
+            if problem and rec["ok"] and not rec.get("skipped"):
+                rec["ok"] = False
+                rec["error"] = f"insufficient headroom: {problem} (use force to apply anyway)"
+
+    def _apply_updates(self, results: List[Dict[str, Any]], disk: str, disk_gb: Optional[int],
+                       per_node: int, timeout: Optional[int]) -> None:
+        """Apply planned updates concurrently, at most `per_node` per node.
+
+        Resize tasks are awaited within their node slot for up to `timeout`
+        seconds overall; with None they are only submitted.
+        """
+        todo = [rec for rec in results if rec["ok"] and not rec.get("skipped")]
+        if not todo:
+            return
+        deadline = time.monotonic() + (timeout or 0)
+        slots = {rec["node"]: threading.Semaphore(per_node) for rec in todo}
+
+        def apply(rec: Dict[str, Any]) -> None:
+            node, vmid = rec["node"], rec["vmid"]
+            with slots[node]:
+                try:
+                    if rec["params"]:
+                        self.proxmox.nodes(node).lxc(vmid).config.put(**rec["params"])
+                    if disk_gb:
                         # Use PUT for disk resize - some Proxmox versions reject POST
-                        self.proxmox.nodes(node).lxc(vmid).resize.put(disk=disk, size=size_str)
-                        changes.append(f"{disk}+={disk_gb}G")
-
-                    rec["message"] = ", ".join(changes) if changes else "no changes"
+                        resp = self.proxmox.nodes(node).lxc(vmid).resize.put(disk=disk, size=f"+{disk_gb}G")
+                        if self.tasks.track(resp, f"resize CT {vmid} {disk} +{disk_gb}G") is not None:
+                            rec["upid"] = resp
+                            if timeout is not None:
+                                # Keep the node slot until the resize is done
+                                self.tasks.wait([resp], max(0.0, deadline - time.monotonic()))
                 except Exception as e:
                     rec["ok"] = False
                     rec["error"] = str(e)
 
-                results.append(rec)
-
-            if format_style == "json":
-                return self._json_fmt(results)
-            return self._render_action_result("Update Container Resources", results)
-
-        except Exception as e:
-            return self._err("Failed to update container(s)", e)
+        workers = max(1, min(len(todo), per_node * len(slots), 16))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ct-update") as pool:
+            list(pool.map(apply, todo))
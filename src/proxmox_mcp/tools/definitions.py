@@ -25,18 +25,48 @@ Example:
 CREATE_VM_DESC = """Create a new virtual machine with specified configuration.
 
 Parameters:
-node* - Host node name (e.g. 'pve')
+node* - Host node name (e.g. 'pve'), or 'auto' to pick the node with the most headroom
 vmid* - New VM ID number (e.g. '200', '300')
 name* - VM name (e.g. 'my-new-vm', 'web-server')
 cpus* - Number of CPU cores (e.g. 1, 2, 4)
 memory* - Memory size in MB (e.g. 2048 for 2GB, 4096 for 4GB)
 disk_size* - Disk size in GB (e.g. 10, 20, 50)
-storage - Storage name (optional, will auto-detect if not specified)
+storage - Storage name (optional, will auto-detect if not specified; 'auto' ranks storages by free space)
 ostype - OS type (optional, default: 'l26' for Linux)
+wait - Wait for the creation task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 120)
 
 Examples:
 - Create VM with 1 CPU, 2GB RAM, 10GB disk: node='pve', vmid='200', name='test-vm', cpus=1, memory=2048, disk_size=10
-- Create VM with 2 CPUs, 4GB RAM, 20GB disk: node='pve', vmid='201', name='web-server', cpus=2, memory=4096, disk_size=20"""
+- Create VM with 2 CPUs, 4GB RAM, 20GB disk: node='pve', vmid='201', name='web-server', cpus=2, memory=4096, disk_size=20
+- Let the server place it: node='auto', storage='auto', vmid='202', name='worker', cpus=2, memory=4096, disk_size=20"""
+
+BULK_CREATE_VMS_DESC = """Create a batch of identical VMs in one call (CI fleets, test labs).
+
+VMIDs are allocated in one shot, storages are listed once per node, creations are
+submitted with bounded concurrency and all tasks are awaited together.
+
+Parameters:
+count* - Number of VMs to create (1-200)
+name_pattern - Name template with {index} (1-based) and/or {vmid} (default: 'vm-{index}')
+cpus - CPU cores per VM (default: 1)
+memory - Memory per VM in MB (default: 2048)
+disk_size - Disk size per VM in GB (default: 10)
+node - Host node name, or 'auto' to spread VMs by free capacity (default: 'auto')
+storage - Storage name (optional, auto-detected per node; 'auto' for capacity-aware placement)
+ostype - OS type (optional, default: 'l26')
+start_vmid - First VMID to try (optional, default: next free cluster ID)
+max_parallel - Creation requests in flight (default: 4)
+wait - Wait for all creation tasks to finish (default: true; clones still block until earlier clones free their per-storage slot)
+timeout - Maximum seconds to wait for the whole batch (default: 600)
+template_vmid - Clone this template instead of creating empty VMs (cpus/memory/disk_size/ostype then come from the template)
+full_clone - true forces full copies, false requires linked clones (optional, default: linked when the storage supports it)
+per_storage_parallel - Clone tasks running at once per storage (default: 2)
+
+Examples:
+- 20 CI runners spread over the cluster: count=20, name_pattern='ci-{index}', cpus=2, memory=4096, disk_size=20
+- 5 VMs on one node named after their ID: count=5, node='pve1', name_pattern='lab-{vmid}'
+- 50 linked clones of template 9000: count=50, template_vmid=9000, name_pattern='ci-{index}'"""
 
 EXECUTE_VM_COMMAND_DESC = """Execute commands in a VM via QEMU guest agent.
 
@@ -54,6 +84,8 @@ START_VM_DESC = """Start a virtual machine.
 Parameters:
 node* - Host node name (e.g. 'pve')
 vmid* - VM ID number (e.g. '101')
+wait - Wait for the Proxmox task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 60)
 
 Example:
 Power on VPN-Server with ID 101 on node pve"""
@@ -63,6 +95,8 @@ STOP_VM_DESC = """Stop a virtual machine (force stop).
 Parameters:
 node* - Host node name (e.g. 'pve')  
 vmid* - VM ID number (e.g. '101')
+wait - Wait for the Proxmox task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 60)
 
 Example:
 Force stop VPN-Server with ID 101 on node pve"""
@@ -72,6 +106,8 @@ SHUTDOWN_VM_DESC = """Shutdown a virtual machine gracefully.
 Parameters:
 node* - Host node name (e.g. 'pve')
 vmid* - VM ID number (e.g. '101')
+wait - Wait for the Proxmox task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 60)
 
 Example:
 Gracefully shutdown VPN-Server with ID 101 on node pve"""
@@ -81,6 +117,8 @@ RESET_VM_DESC = """Reset (restart) a virtual machine.
 Parameters:
 node* - Host node name (e.g. 'pve')
 vmid* - VM ID number (e.g. '101')
+wait - Wait for the Proxmox task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 60)
 
 Example:
 Reset VPN-Server with ID 101 on node pve"""
@@ -93,6 +131,8 @@ Parameters:
 node* - Host node name (e.g. 'pve')
 vmid* - VM ID number (e.g. '998')
 force - Force deletion even if VM is running (optional, default: false)
+wait - Wait for the deletion task to finish (optional, default: false)
+timeout - Maximum seconds to wait (optional, default: 120)
 
 This will permanently remove:
 - VM configuration
@@ -121,36 +161,140 @@ Notes:
 
 START_CONTAINER_DESC = """Start one or more LXC containers.
 selector: '123' | 'pve1:123' | 'pve1/name' | 'name' | comma list
+wait: Wait for the start tasks to finish (default false, bounded by timeout)
 Example: start_container selector='pve1:101,pve2/web'
 """
 
 STOP_CONTAINER_DESC = """Stop LXC containers. graceful=True uses shutdown; otherwise force stop.
 selector: same grammar as start_container
 timeout_seconds: 10 (default)
+wait: Wait for the stop tasks to finish (default false, bounded by timeout)
 """
 
 RESTART_CONTAINER_DESC = """Restart LXC containers (reboot).
 selector: same grammar as start_container
+wait: Wait for the reboot tasks to finish (default false, bounded by timeout)
 """
 
 UPDATE_CONTAINER_RESOURCES_DESC = """Update resources for one or more LXC containers.
 
+Containers already at the requested values are skipped, and the total CPU/memory
+increase per node is checked against the node headroom before anything is applied.
+Updates run concurrently per node; resize tasks are tracked and, with wait=true,
+awaited to completion.
+
 selector: same grammar as start_container
 cores: New CPU core count (optional)
 memory: New memory limit in MiB (optional)
 swap: New swap limit in MiB (optional)
 disk_gb: Additional disk size in GiB to add (optional)
 disk: Disk identifier to resize (default 'rootfs')
+wait: Wait for the resize tasks to finish (default false: return their task IDs)
+timeout: Maximum seconds to wait for resize tasks when wait is set (default 120)
+per_node_parallel: Containers updated at once on each node (default 4)
+force: Apply even where a node lacks headroom for the increase (default false)
 """
 
 # Storage tool descriptions
 GET_STORAGE_DESC = """List storage pools across the cluster with their usage and configuration.
 
+Node-local storages are listed per node, shared storages once, with cluster-wide totals.
+Results are cached for a few seconds; refresh=true forces a new collection.
+
 Example:
 {"storage": "local-lvm", "type": "lvm", "used": "500GB", "total": "1TB"}"""
 
+SEARCH_STORAGE_CONTENT_DESC = """Search ISOs, container templates, backups and disks across every storage in the cluster.
+
+Answered from a server-side index (no per-storage crawling by the client).
+
+Parameters:
+content - Content type: 'iso', 'vztmpl', 'backup', 'images', 'rootdir', 'snippets' (optional)
+vmid - Owning VM/container ID (optional)
+storage - Storage name (optional)
+node - Node name; shared storages always match (optional)
+format - Volume format, e.g. 'qcow2', 'raw', 'iso', 'vma.zst' (optional)
+name - Substring of the volume ID (optional)
+orphaned - Only disks whose VM/container no longer exists (default: false)
+sort - 'size' (largest first), 'ctime' (newest first) or 'volid' (default: 'size')
+limit - Maximum results, 0 for all (default: 50)
+format_style - 'pretty' or 'json' (default: 'pretty')
+
+Examples:
+- All backups of VM 120, newest first: content='backup', vmid=120, sort='ctime'
+- Disks with no owning VM: orphaned=true
+- Largest volumes: sort='size', limit=10
+- Debian ISOs: content='iso', name='debian'"""
+
 # Cluster tool descriptions
 GET_CLUSTER_STATUS_DESC = """Get overall Proxmox cluster health and configuration status.
 
 Example:
 {"name": "proxmox", "quorum": "ok", "nodes": 3, "ha_status": "active"}"""
+
+GET_CLUSTER_HEALTH_DESC = """Summarize cluster health in one call: quorum, capacity, overcommit and top consumers.
+
+Computed from a single cluster-wide resource snapshot (no per-node or per-VM calls).
+
+Parameters:
+top - Number of top consumers and fullest storages to list (default: 5)
+format_style - 'pretty' or 'json' (default: 'pretty')
+
+Reports:
+- Nodes online/offline, CPU and memory usage
+- Guests running/stopped per type, templates
+- vCPU and memory overcommit (allocated / physical, running and all guests)
+- Storage usage with shared storages counted once, fullest storages
+- Top CPU and memory consumers
+- Alerts: lost quorum, offline nodes, nodes or storages near capacity"""
+
+# Task tool descriptions
+LIST_TASKS_DESC = """List asynchronous Proxmox tasks (UPIDs) started through this server.
+
+Parameters:
+node - Optional node name filter (e.g. 'pve1')
+include_finished - Include recently finished tasks (default: true)
+
+Example:
+{"label": "create VM 200 (web)", "status": "stopped", "exitstatus": "OK", "elapsed": 12.4}"""
+
+WAIT_TASKS_DESC = """Wait server-side until Proxmox tasks finish (no client polling needed).
+
+Parameters:
+upids - Comma-separated UPIDs (optional, default: all outstanding tasks)
+timeout - Maximum seconds to wait (default: 60, at most 300; call again to keep waiting)
+
+Example:
+Wait for all tasks started by the last create_vm calls"""
+
+TAIL_TASK_LOG_DESC = """Read a Proxmox task log incrementally.
+
+Parameters:
+upid* - Task UPID (as returned by create_vm, start_vm, ...)
+start - 0-based line offset to read from (default: 0)
+limit - Maximum lines to return (default: 100)
+
+Pass the returned "next start" back as `start` to get only new lines.
+For live following, use the /tasks/log/stream SSE endpoint.
+
+Example:
+Lines 0-99 of UPID:pve1:...:qmcreate:200:root@pam:, next start: 100"""
+
+# Metrics tool descriptions
+QUERY_METRICS_DESC = """Rank VMs, containers, nodes or storages by an aggregated metric over a timeframe.
+
+Series are fetched and reduced server-side; only the ranking is returned.
+
+Parameters:
+metric - cpu, mem, mem_pct, disk, disk_pct, netin, netout, diskread, diskwrite, loadavg, iowait (default: cpu)
+timeframe - hour, day, week, month, year (default: day)
+aggregate - mean, min, max, last, p50, p90, p95, p99 (default: mean)
+type - qemu, lxc, node or storage (default: qemu)
+node - Optional node filter
+top - Return only the K highest results (default: 10, 0 for all)
+threshold - Only results above this value (e.g. 80 for >80% CPU)
+cf - RRD consolidation function: AVERAGE or MAX (default: AVERAGE)
+source - auto, store or rrd (default: auto = local history store when it covers the period)
+
+Example:
+VMs that averaged >80% CPU over the last day: metric='cpu', aggregate='mean', timeframe='day', threshold=80"""
@@ -0,0 +1,62 @@
+"""
+Metrics-related tools for Proxmox MCP.
+
+This module provides cluster-wide time-series queries over RRD data:
+- Aggregation of a metric over a timeframe (mean, max, percentiles, ...)
+- Ranking across VMs, containers or nodes with top-K and thresholds
+- Compact results instead of raw sample dumps
+
+Series are read from the local metrics store when enabled, or fetched
+concurrently from RRD and cached by the shared metrics engine.
+"""
+import json
+from typing import List, Optional
+from mcp.types import TextContent as Content
+from .base import ProxmoxTool
+from ..formatting import ProxmoxTemplates
+from .definitions import QUERY_METRICS_DESC
+
+class MetricsTools(ProxmoxTool):
+    """Tools for querying Proxmox metrics history.
+    
+    Provides functionality for:
+    - Answering "which guests averaged >80% CPU over the last day" style questions
+    - Ranking guests or nodes by memory, network or disk throughput
+    """
+
+    def query_metrics(self, metric: str = "cpu", timeframe: str = "day", aggregate: str = "mean",
+                      type: str = "qemu", node: Optional[str] = None, top: int = 10,
+                      threshold: Optional[float] = None, cf: str = "AVERAGE",
+                      source: str = "auto", format_style: str = "pretty") -> List[Content]:
+        """Aggregate and rank a metric across the cluster.
+
+        Args:
+            metric: Metric name (cpu, mem, mem_pct, netin, ...)
+            timeframe: RRD timeframe (hour, day, week, month, year)
+            aggregate: Reduction (mean, min, max, last, p50, p90, p95, p99)
+            type: Resource type (qemu, lxc, node or storage)
+            node: Optional node filter
+            top: Number of results to keep (0 for all)
+            threshold: Keep only results above this value
+            cf: RRD consolidation function (AVERAGE or MAX)
+            source: 'auto' (local store when it covers the period), 'store' or 'rrd'
+            format_style: 'pretty' or 'json'
+
+        Returns:
+            List of Content objects containing the ranking
+
+        Raises:
+            ValueError: If an argument is not supported
+        """
+        try:
+            result = self.metrics.query(
+                metric=metric, timeframe=timeframe, agg=aggregate, rtype=type,
+                node=node, top=top, threshold=threshold, cf=cf.upper(), source=source,
+            )
+            if format_style == "json":
+                return [Content(type="text", text=json.dumps(result, indent=2))]
+            return [Content(type="text", text=ProxmoxTemplates.metrics_query(result))]
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error("query metrics", e)
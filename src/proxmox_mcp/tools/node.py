@@ -10,11 +10,16 @@ This module provides tools for managing and monitoring Proxmox nodes:
   * Health status
 
 The tools handle both basic and detailed node information retrieval,
-with fallback mechanisms for partial data availability.
+with fallback mechanisms for partial data availability. Detailed
+statuses are fetched concurrently under a deadline, so a fenced or slow
+node only degrades its own entry instead of the whole listing.
 """
-from typing import List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
 from mcp.types import TextContent as Content
 from .base import ProxmoxTool
+from ..config.models import NodeConfig
 from .definitions import GET_NODES_DESC, GET_NODE_STATUS_DESC
 
 class NodeTools(ProxmoxTool):
@@ -30,6 +35,58 @@ class NodeTools(ProxmoxTool):
     node information might be temporarily unavailable.
     """
 
+    def __init__(self, proxmox_api, inventory=None, tasks=None, metrics=None, placement=None, listings=None,
+                 config: Optional[NodeConfig] = None):
+        """Initialize node tools.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            inventory: Optional background-refreshed cluster inventory
+            tasks: Shared task tracker
+            metrics: Shared metrics engine
+            placement: Shared placement engine
+            listings: Shared listing cache
+            config: Node status collection settings (defaults apply when omitted)
+        """
+        super().__init__(proxmox_api, inventory, tasks, metrics, placement, listings)
+        self.config = config or NodeConfig()
+        # Long-lived pool: a status call stuck past the deadline keeps its
+        # worker without holding up the listing that gave up on it
+        self._status_pool = ThreadPoolExecutor(max_workers=self.config.status_workers,
+                                               thread_name_prefix="node-status")
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _status_future(self, node_name: str) -> Future:
+        """Status request for a node, joining one still in flight from an earlier call."""
+        with self._inflight_lock:
+            future = self._inflight.get(node_name)
+            if future is None or future.done():
+                future = self._status_pool.submit(lambda: self.proxmox.nodes(node_name).status.get())
+                self._inflight[node_name] = future
+            return future
+
+    def _collect_statuses(self, node_names: List[str]) -> Dict[str, Any]:
+        """Fetch node statuses concurrently, bounded by the status deadline.
+
+        Returns:
+            Mapping of node name to its status dict, or to the exception
+            (TimeoutError for nodes that missed the deadline)
+        """
+        futures = {name: self._status_future(name) for name in node_names}
+        wait(list(futures.values()), timeout=self.config.status_deadline)
+        statuses: Dict[str, Any] = {}
+        for name, future in futures.items():
+            if not future.done():
+                statuses[name] = TimeoutError(
+                    f"no status within {self.config.status_deadline:g}s"
+                )
+            elif future.exception() is not None:
+                statuses[name] = future.exception()
+            else:
+                statuses[name] = future.result()
+        return statuses
+
     def get_nodes(self) -> List[Content]:
         """List all nodes in the Proxmox cluster with detailed status.
 
@@ -40,7 +97,10 @@ class NodeTools(ProxmoxTool):
         - Memory usage and capacity
         
         Implements a fallback mechanism that returns basic information
-        if detailed status retrieval fails for any node.
+        if detailed status retrieval fails for any node, or doesn't answer
+        within `status_deadline`; such entries are marked "stale". When a
+        fresh cluster inventory is available the listing is answered from memory.
+        Results go through the listing cache (stale-while-revalidate).
 
         Returns:
             List of Content objects containing formatted node information:
@@ -52,53 +112,82 @@ class NodeTools(ProxmoxTool):
                 "memory": {
                     "used": bytes,
                     "total": bytes
-                }
+                },
+                "stale": true,  # only when detailed status was unavailable
+                "stale_reason": "..."
             }
 
         Raises:
             RuntimeError: If the cluster-wide node query fails
         """
         try:
-            result = self.proxmox.nodes.get()
-            nodes = []
-            
-            # Get detailed info for each node
-            for node in result:
-                node_name = node["node"]
-                try:
-                    # Get detailed status for each node
-                    status = self.proxmox.nodes(node_name).status.get()
-                    nodes.append({
-                        "node": node_name,
-                        "status": node["status"],
-                        "uptime": status.get("uptime", 0),
-                        "maxcpu": status.get("cpuinfo", {}).get("cpus", "N/A"),
-                        "memory": {
-                            "used": status.get("memory", {}).get("used", 0),
-                            "total": status.get("memory", {}).get("total", 0)
-                        }
-                    })
-                except Exception:
-                    # Fallback to basic info if detailed status fails
-                    nodes.append({
-                        "node": node_name,
-                        "status": node["status"],
-                        "uptime": 0,
-                        "maxcpu": "N/A",
-                        "memory": {
-                            # The nodes.get() API already returns memory usage
-                            # in the "mem" field, so use that directly. The
-                            # previous implementation subtracted this value
-                            # from "maxmem" which actually produced the amount
-                            # of *free* memory instead of the used memory.
-                            "used": node.get("mem", 0),
-                            "total": node.get("maxmem", 0)
-                        }
-                    })
-            return self._format_response(nodes, "nodes")
+            return self._listing("get_nodes", (), self._list_nodes)
         except Exception as e:
             self._handle_error("get nodes", e)
 
+    def _list_nodes(self) -> List[Content]:
+        cached = self._inventory_resources("node")
+        if cached is not None:
+            nodes = [
+                {
+                    "node": node["node"],
+                    "status": node.get("status", "unknown"),
+                    "uptime": node.get("uptime", 0),
+                    "maxcpu": node.get("maxcpu", "N/A"),
+                    "memory": {
+                        "used": node.get("mem", 0),
+                        "total": node.get("maxmem", 0)
+                    }
+                }
+                for node in sorted(cached, key=lambda r: r.get("node") or "")
+            ]
+            return self._format_response(nodes, "nodes")
+
+        result = self.proxmox.nodes.get()
+        nodes = []
+        
+        # Get detailed info for online nodes concurrently; offline
+        # nodes would only run into their HTTP timeout
+        statuses = self._collect_statuses(
+            [node["node"] for node in result if node.get("status") == "online"]
+        )
+        for node in result:
+            node_name = node["node"]
+            status = statuses.get(node_name)
+            if isinstance(status, dict):
+                nodes.append({
+                    "node": node_name,
+                    "status": node["status"],
+                    "uptime": status.get("uptime", 0),
+                    "maxcpu": status.get("cpuinfo", {}).get("cpus", "N/A"),
+                    "memory": {
+                        "used": status.get("memory", {}).get("used", 0),
+                        "total": status.get("memory", {}).get("total", 0)
+                    }
+                })
+            else:
+                # Fallback to basic info if detailed status fails or is late
+                entry = {
+                    "node": node_name,
+                    "status": node["status"],
+                    "uptime": node.get("uptime", 0),
+                    "maxcpu": node.get("maxcpu", "N/A"),
+                    "memory": {
+                        # The nodes.get() API already returns memory usage
+                        # in the "mem" field, so use that directly. The
+                        # previous implementation subtracted this value
+                        # from "maxmem" which actually produced the amount
+                        # of *free* memory instead of the used memory.
+                        "used": node.get("mem", 0),
+                        "total": node.get("maxmem", 0)
+                    }
+                }
+                if status is not None:
+                    entry["stale"] = True
+                    entry["stale_reason"] = str(status) or type(status).__name__
+                nodes.append(entry)
+        return self._format_response(nodes, "nodes")
+
     def get_node_status(self, node: str) -> List[Content]:
         """Get detailed status information for a specific node.
 
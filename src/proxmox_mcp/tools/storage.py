@@ -12,10 +12,14 @@ This module provides tools for managing and monitoring Proxmox storage:
 The tools implement fallback mechanisms for scenarios where
 detailed storage information might be temporarily unavailable.
 """
-from typing import List
+import json
+from typing import List, Optional
 from mcp.types import TextContent as Content
 from .base import ProxmoxTool
-from .definitions import GET_STORAGE_DESC
+from ..core.content import StorageContentIndex
+from ..core.storage import StorageStatusCollector
+from ..formatting import ProxmoxTemplates
+from .definitions import GET_STORAGE_DESC, SEARCH_STORAGE_CONTENT_DESC
 
 class StorageTools(ProxmoxTool):
     """Tools for managing Proxmox storage.
@@ -26,15 +30,37 @@ class StorageTools(ProxmoxTool):
     - Tracking storage utilization and capacity
     - Managing storage content types
     
-    Implements fallback mechanisms for scenarios where detailed
-    storage information might be temporarily unavailable.
+    Status is collected concurrently per node and cached briefly by a
+    StorageStatusCollector, which may be shared with other components.
+    Volume searches are answered from a StorageContentIndex.
     """
 
-    def get_storage(self) -> List[Content]:
+    def __init__(self, proxmox_api, inventory=None, tasks=None, metrics=None, placement=None, listings=None,
+                 collector: Optional[StorageStatusCollector] = None,
+                 content_index: Optional[StorageContentIndex] = None):
+        """Initialize storage tools.
+
+        Args:
+            proxmox_api: Initialized ProxmoxAPI instance
+            inventory: Optional background-refreshed cluster inventory
+            tasks: Shared task tracker
+            metrics: Shared metrics engine
+            placement: Shared placement engine
+            listings: Shared listing cache
+            collector: Shared storage status collector (a private one is created if omitted)
+            content_index: Shared storage content index (a private one is created if omitted)
+        """
+        super().__init__(proxmox_api, inventory, tasks, metrics, placement, listings)
+        self.collector = collector if collector is not None else StorageStatusCollector(proxmox_api)
+        self.content_index = content_index if content_index is not None else StorageContentIndex(
+            proxmox_api, self.collector, self.metrics
+        )
+
+    def get_storage(self, refresh: bool = False) -> List[Content]:
         """List storage pools across the cluster with detailed status.
 
         Retrieves comprehensive information for each storage pool including:
-        - Basic identification (name, type)
+        - Basic identification (name, type, node or "shared")
         - Content types supported (VM disks, backups, ISO images, etc.)
         - Availability status (online/offline)
         - Usage statistics:
@@ -42,13 +68,18 @@ class StorageTools(ProxmoxTool):
           * Total capacity
           * Available space
         
-        Implements a fallback mechanism that returns basic information
-        if detailed status retrieval fails for any storage pool.
+        Node-local storages are listed once per node, shared storages once
+        for the cluster. Nodes that can't be reached are reported instead of
+        failing the whole listing, and cluster-wide totals are included.
+
+        Args:
+            refresh: Bypass the short-lived status and listing caches
 
         Returns:
             List of Content objects containing formatted storage information:
             {
                 "storage": "storage-name",
+                "node": "node-name" or "shared",
                 "type": "storage-type",
                 "content": ["content-types"],
                 "status": "online/offline",
@@ -60,35 +91,55 @@ class StorageTools(ProxmoxTool):
         Raises:
             RuntimeError: If the cluster-wide storage query fails
         """
+        def compute() -> List[Content]:
+            # With a listing cache, the cache decides when a collection is due
+            status = self.collector.collect(force=refresh or self.listings is not None)
+            formatted = ProxmoxTemplates.storage_list(
+                status["storages"], status["totals"], status["errors"]
+            )
+            return [Content(type="text", text=formatted)]
+
         try:
-            result = self.proxmox.storage.get()
-            storage = []
-            
-            for store in result:
-                # Get detailed storage info including usage
-                try:
-                    status = self.proxmox.nodes(store.get("node", "localhost")).storage(store["storage"]).status.get()
-                    storage.append({
-                        "storage": store["storage"],
-                        "type": store["type"],
-                        "content": store.get("content", []),
-                        "status": "online" if store.get("enabled", True) else "offline",
-                        "used": status.get("used", 0),
-                        "total": status.get("total", 0),
-                        "available": status.get("avail", 0)
-                    })
-                except Exception:
-                    # If detailed status fails, add basic info
-                    storage.append({
-                        "storage": store["storage"],
-                        "type": store["type"],
-                        "content": store.get("content", []),
-                        "status": "online" if store.get("enabled", True) else "offline",
-                        "used": 0,
-                        "total": 0,
-                        "available": 0
-                    })
-                    
-            return self._format_response(storage, "storage")
+            return self._listing("get_storage", (), compute, refresh)
         except Exception as e:
             self._handle_error("get storage", e)
+
+    def search_storage_content(self, content: Optional[str] = None, vmid: Optional[int] = None,
+                               storage: Optional[str] = None, node: Optional[str] = None,
+                               format: Optional[str] = None, name: Optional[str] = None,
+                               orphaned: bool = False, sort: str = "size", limit: int = 50,
+                               format_style: str = "pretty") -> List[Content]:
+        """Search volumes (ISOs, templates, backups, disks) across all storages.
+
+        Answered from the server-side content index, which is refreshed in
+        the background (or on demand when it is older than its interval).
+
+        Args:
+            content: Content type filter (iso, vztmpl, backup, images, rootdir, ...)
+            vmid: Owning guest ID filter
+            storage: Storage name filter
+            node: Node filter (shared storages always match)
+            format: Volume format filter (qcow2, raw, vma.zst, ...)
+            name: Case-insensitive substring of the volume ID
+            orphaned: Only guest disks whose VMID no longer exists
+            sort: "size" (largest first), "ctime" (newest first) or "volid"
+            limit: Maximum results (0 for all)
+            format_style: 'pretty' or 'json'
+
+        Returns:
+            List of Content objects with the matching volumes
+
+        Raises:
+            ValueError: If `sort` is unknown
+            RuntimeError: If the index can't be built
+        """
+        try:
+            result = self.content_index.search(content, vmid, storage, node, format, name,
+                                               orphaned, sort, limit)
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error("search storage content", e)
+        if format_style == "json":
+            return [Content(type="text", text=json.dumps(result, indent=2))]
+        return [Content(type="text", text=ProxmoxTemplates.storage_content(result))]
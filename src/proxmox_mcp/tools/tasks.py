@@ -0,0 +1,98 @@
+"""
+Task-related tools for Proxmox MCP.
+
+This module exposes the server-side task tracker to MCP clients:
+- Listing tasks submitted through this server and their state
+- Waiting for outstanding (or explicitly given) UPIDs to finish
+- Reading task logs incrementally by line offset
+
+Waiting happens server-side with batched, rate-capped polling, so a
+client needs a single tool call instead of a polling loop of its own.
+"""
+from typing import List, Optional
+from mcp.types import TextContent as Content
+from .base import ProxmoxTool
+from ..formatting import ProxmoxTemplates
+from .definitions import LIST_TASKS_DESC, WAIT_TASKS_DESC, TAIL_TASK_LOG_DESC
+
+# Longest server-side wait of one call: it holds a scheduler slot and a worker thread
+MAX_WAIT_TIMEOUT = 300
+
+class TaskTools(ProxmoxTool):
+    """Tools for tracking asynchronous Proxmox tasks.
+    
+    Provides functionality for:
+    - Listing tracked tasks (running and recently finished)
+    - Awaiting completion of one or many tasks with a timeout
+    - Tailing task logs from a line offset
+    """
+
+    def list_tasks(self, node: Optional[str] = None, include_finished: bool = True) -> List[Content]:
+        """List tasks tracked by the server.
+
+        Args:
+            node: Optional node name filter
+            include_finished: Include tasks that already finished
+
+        Returns:
+            List of Content objects containing formatted task information
+        """
+        try:
+            self.tasks.poll()
+            return self._format_response(self.tasks.list(node, include_finished), "tasks")
+        except Exception as e:
+            self._handle_error("list tasks", e)
+
+    def wait_tasks(self, upids: Optional[str] = None, timeout: int = 60) -> List[Content]:
+        """Wait for tasks to finish.
+
+        Args:
+            upids: Comma-separated UPIDs; defaults to every outstanding task
+            timeout: Maximum seconds to wait (capped at MAX_WAIT_TIMEOUT)
+
+        Returns:
+            List of Content objects with the final state of each task
+
+        Raises:
+            ValueError: If a given identifier is not a UPID
+        """
+        try:
+            if upids:
+                wanted = [u.strip() for u in upids.split(",") if u.strip()]
+                invalid = [u for u in wanted if not u.startswith("UPID:")]
+                if invalid:
+                    raise ValueError(f"Invalid UPID: {invalid[0]}")
+            else:
+                wanted = self.tasks.outstanding()
+            timeout = max(0, min(timeout, MAX_WAIT_TIMEOUT))
+            tasks = [t for t in self.tasks.wait(wanted, timeout) if t]
+            return self._format_response(tasks, "tasks")
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error("wait for tasks", e)
+
+    def tail_task_log(self, upid: str, start: int = 0, limit: int = 100) -> List[Content]:
+        """Read task log lines starting at a 0-based offset.
+
+        Args:
+            upid: Task identifier
+            start: Offset of the first line to return
+            limit: Maximum number of lines
+
+        Returns:
+            List of Content objects with the lines and the next offset
+
+        Raises:
+            ValueError: If `upid` is not a UPID
+        """
+        try:
+            self.tasks.track(upid)
+            lines, next_start = self.tasks.fetch_log(upid, start, limit)
+            self.tasks.poll([upid])
+            text = ProxmoxTemplates.task_log(upid, lines, start, next_start, self.tasks.get(upid))
+            return [Content(type="text", text=text)]
+        except ValueError:
+            raise
+        except Exception as e:
+            self._handle_error(f"read log of task {upid}", e)
@@ -2,7 +2,8 @@
 VM-related tools for Proxmox MCP.
 
 This module provides tools for managing and interacting with Proxmox VMs:
-- Listing all VMs across the cluster with their status
+- Listing all VMs across the cluster with their status, optionally
+  streamed row by row to the HTTP transports
 - Retrieving detailed VM information including:
   * Resource allocation (CPU, memory)
   * Runtime status
@@ -11,16 +12,35 @@ This module provides tools for managing and interacting with Proxmox VMs:
 - Handling VM console operations
 - VM power management (start, stop, shutdown, reset)
 - VM creation with customizable specifications
+- Bulk VM provisioning with one-shot VMID allocation and pipelined creation,
+  either from scratch or as linked/full clones of a template
 
 The tools implement fallback mechanisms for scenarios where
 detailed VM information might be temporarily unavailable.
 """
-from typing import List, Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from mcp.types import TextContent as Content
 from .base import ProxmoxTool
+from ..core.placement import PlacementError
+from ..formatting import ProxmoxTemplates
+from ..formatting.renderer import CHUNK_SIZE, chunked
 from .definitions import GET_VMS_DESC, EXECUTE_VM_COMMAND_DESC
 from .console.manager import VMConsoleManager
 
+# Upper bound on VMs created by one bulk_create_vms call
+MAX_BULK_VMS = 200
+
+# Storage types with copy-on-write linked clones (file storages need qcow2 images)
+LINKED_CLONE_TYPES = ("lvmthin", "zfspool", "rbd", "btrfs", "dir", "nfs", "cifs", "glusterfs")
+FILE_STORAGE_TYPES = ("dir", "nfs", "cifs", "glusterfs")
+DISK_KEY = re.compile(r"^(scsi|sata|virtio|ide|efidisk|tpmstate)\d+$")
+DISK_SIZE = re.compile(r"size=(\d+(?:\.\d+)?)([KMGT]?)")
+SIZE_UNITS_GB = {"K": 1 / 1024 ** 2, "M": 1 / 1024, "G": 1, "T": 1024}
+
 class VMTools(ProxmoxTool):
     """Tools for managing Proxmox VMs.
     
@@ -37,13 +57,18 @@ class VMTools(ProxmoxTool):
     with QEMU guest agent for VM command execution.
     """
 
-    def __init__(self, proxmox_api):
+    def __init__(self, proxmox_api, inventory=None, tasks=None, metrics=None, placement=None, listings=None):
         """Initialize VM tools.
 
         Args:
             proxmox_api: Initialized ProxmoxAPI instance
+            inventory: Optional background-refreshed cluster inventory
+            tasks: Shared task tracker
+            metrics: Shared metrics engine
+            placement: Shared placement engine
+            listings: Shared listing cache
         """
-        super().__init__(proxmox_api)
+        super().__init__(proxmox_api, inventory, tasks, metrics, placement, listings)
         self.console_manager = VMConsoleManager(proxmox_api)
 
     def get_vms(self) -> List[Content]:
@@ -58,7 +83,9 @@ class VMTools(ProxmoxTool):
         - Node placement
         
         Implements a fallback mechanism that returns basic information
-        if detailed configuration retrieval fails for any VM.
+        if detailed configuration retrieval fails for any VM. When a fresh
+        cluster inventory is available the listing is answered from memory.
+        Results go through the listing cache (stale-while-revalidate).
 
         Returns:
             List of Content objects containing formatted VM information:
@@ -78,56 +105,162 @@ class VMTools(ProxmoxTool):
             RuntimeError: If the cluster-wide VM query fails
         """
         try:
-            result = []
-            for node in self.proxmox.nodes.get():
-                node_name = node["node"]
-                vms = self.proxmox.nodes(node_name).qemu.get()
-                for vm in vms:
-                    vmid = vm["vmid"]
+            return self._listing("get_vms", (), lambda: self._format_response(list(self._iter_vms()), "vms"))
+        except Exception as e:
+            self._handle_error("get VMs", e)
+
+    def stream_vms(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """Streaming form of get_vms for the HTTP transports.
+
+        VMs are rendered as soon as their data is available (node by node
+        when no inventory is available) and yielded in chunks of about
+        `chunk_size` characters; their concatenation is the get_vms text.
+
+        Raises:
+            RuntimeError: If the cluster-wide VM query fails
+        """
+        try:
+            yield from chunked(ProxmoxTemplates.iter_vm_list(self._iter_vms()), chunk_size)
+        except Exception as e:
+            self._handle_error("get VMs", e)
+
+    def _iter_vms(self) -> Iterator[Dict[str, Any]]:
+        """Yield VM rows, from the inventory or node by node."""
+        cached = self._inventory_resources("qemu")
+        if cached is not None:
+            for vm in sorted(cached, key=lambda r: (r.get("node") or "", r.get("vmid", 0))):
+                yield {
+                    "vmid": vm["vmid"],
+                    "name": vm.get("name", f"VM-{vm['vmid']}"),
+                    "status": vm.get("status", "unknown"),
+                    "node": vm.get("node"),
+                    "cpus": vm.get("maxcpu", "N/A"),
+                    "memory": {
+                        "used": vm.get("mem", 0),
+                        "total": vm.get("maxmem", 0)
+                    }
+                }
+            return
+
+        for node in self.proxmox.nodes.get():
+            node_name = node["node"]
+            vms = self.proxmox.nodes(node_name).qemu.get()
+            for vm in vms:
+                vmid = vm["vmid"]
+                # vCPU count as in /cluster/resources (maxcpu), so both paths agree
+                cpus = vm.get("cpus")
+                if cpus is None:
                     # Get VM config for CPU cores
                     try:
                         config = self.proxmox.nodes(node_name).qemu(vmid).config.get()
-                        result.append({
-                            "vmid": vmid,
-                            "name": vm["name"],
-                            "status": vm["status"],
-                            "node": node_name,
-                            "cpus": config.get("cores", "N/A"),
-                            "memory": {
-                                "used": vm.get("mem", 0),
-                                "total": vm.get("maxmem", 0)
-                            }
-                        })
+                        cpus = config.get("cores", "N/A")
                     except Exception:
                         # Fallback if can't get config
-                        result.append({
-                            "vmid": vmid,
-                            "name": vm["name"],
-                            "status": vm["status"],
-                            "node": node_name,
-                            "cpus": "N/A",
-                            "memory": {
-                                "used": vm.get("mem", 0),
-                                "total": vm.get("maxmem", 0)
-                            }
-                        })
-            return self._format_response(result, "vms")
-        except Exception as e:
-            self._handle_error("get VMs", e)
+                        cpus = "N/A"
+                yield {
+                    "vmid": vmid,
+                    "name": vm["name"],
+                    "status": vm["status"],
+                    "node": node_name,
+                    "cpus": cpus,
+                    "memory": {
+                        "used": vm.get("mem", 0),
+                        "total": vm.get("maxmem", 0)
+                    }
+                }
+
+    @staticmethod
+    def _select_storage(node: str, storage: Optional[str],
+                        storage_list: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """Pick (or validate) the storage for VM disks from a node's storage listing.
+
+        Args:
+            node: Node the listing belongs to
+            storage: Requested storage name, or None to auto-detect
+            storage_list: Result of /nodes/{node}/storage
+
+        Returns:
+            Tuple of (storage name, storage type)
+
+        Raises:
+            ValueError: If no suitable storage exists or the requested one can't hold images
+        """
+        storage_info = {s["storage"]: s for s in storage_list}
+        
+        # Auto-detect storage if not specified
+        if storage is None:
+            # Prefer local-lvm for VM images first, then vm-storage,
+            # then any storage that supports images
+            for preferred in ("local-lvm", "vm-storage", None):
+                for s in storage_list:
+                    if (preferred is None or s["storage"] == preferred) and "images" in s.get("content", ""):
+                        storage = s["storage"]
+                        break
+                if storage is not None:
+                    break
+            if storage is None:
+                raise ValueError("No suitable storage found for VM images")
+        
+        # Validate storage exists and supports images
+        if storage not in storage_info:
+            raise ValueError(f"Storage '{storage}' not found on node {node}")
+        
+        if "images" not in storage_info[storage].get("content", ""):
+            raise ValueError(f"Storage '{storage}' does not support VM images")
+        
+        return storage, storage_info[storage]["type"]
+
+    @staticmethod
+    def _disk_config(storage: str, storage_type: str, disk_size: int) -> Tuple[str, Dict[str, str]]:
+        """Disk format and disk-related VM config keys for a storage type."""
+        if storage_type in ["lvm", "lvmthin"]:
+            # LVM storages use raw format and no cloudinit
+            return "raw", {"scsi0": f"{storage}:{disk_size},format=raw"}
+        if storage_type in ["dir", "nfs", "cifs"]:
+            # File-based storages can use qcow2
+            return "qcow2", {
+                "scsi0": f"{storage}:{disk_size},format=qcow2",
+                "ide2": f"{storage}:cloudinit",
+            }
+        # Default to raw for unknown storage types
+        return "raw", {"scsi0": f"{storage}:{disk_size},format=raw"}
+
+    @staticmethod
+    def _vm_config(vmid: Any, name: str, cpus: int, memory: int, ostype: Optional[str],
+                   vm_config_storage: Dict[str, str]) -> Dict[str, Any]:
+        """Creation parameters shared by single and bulk VM creation."""
+        vm_config = {
+            "vmid": vmid,
+            "name": name,
+            "cores": cpus,
+            "memory": memory,
+            "ostype": ostype or "l26",  # Linux 2.6+ kernel
+            "scsihw": "virtio-scsi-pci",
+            "boot": "order=scsi0",
+            "agent": "1",  # Enable QEMU guest agent
+            "vga": "std",
+            "net0": "virtio,bridge=vmbr0",
+        }
+        vm_config.update(vm_config_storage)
+        return vm_config
 
     def create_vm(self, node: str, vmid: str, name: str, cpus: int, memory: int, 
-                  disk_size: int, storage: Optional[str] = None, ostype: Optional[str] = None) -> List[Content]:
+                  disk_size: int, storage: Optional[str] = None, ostype: Optional[str] = None,
+                  wait: bool = False, timeout: int = 120) -> List[Content]:
         """Create a new virtual machine with specified configuration.
         
         Args:
-            node: Host node name (e.g., 'pve')
+            node: Host node name (e.g., 'pve'), or 'auto' to let the placement engine choose
             vmid: New VM ID number (e.g., '200')
             name: VM name (e.g., 'my-new-vm')
             cpus: Number of CPU cores (e.g., 1, 2, 4)
             memory: Memory size in MB (e.g., 2048 for 2GB)
             disk_size: Disk size in GB (e.g., 10, 20, 50)
-            storage: Storage name (e.g., 'local-lvm', 'vm-storage'). If None, will auto-detect
+            storage: Storage name (e.g., 'local-lvm', 'vm-storage'). If None, will auto-detect;
+                'auto' picks the storage with the placement engine
             ostype: OS type (e.g., 'l26' for Linux, 'win10' for Windows). Default: 'l26'
+            wait: Block until the creation task finishes
+            timeout: Maximum seconds to wait when `wait` is set
             
         Returns:
             List of Content objects containing creation result
@@ -137,95 +270,55 @@ class VMTools(ProxmoxTool):
             RuntimeError: If VM creation fails
         """
         try:
-            # Check if VM ID already exists
-            try:
-                existing_vm = self.proxmox.nodes(node).qemu(vmid).config.get()
-                raise ValueError(f"VM {vmid} already exists on node {node}")
-            except Exception as e:
-                if "does not exist" not in str(e).lower():
-                    raise e
-            
-            # Get storage information
-            storage_list = self.proxmox.nodes(node).storage.get()
-            storage_info = {}
-            for s in storage_list:
-                storage_info[s["storage"]] = s
+            # Capacity-aware placement from the cached cluster snapshot
+            placement = None
+            if node in ("auto", "") or storage == "auto":
+                placement = self.placement.place(cpus, memory, disk_size, node, storage,
+                                                 content="images", vmid=vmid)
+                node, storage = placement["node"], placement["storage"]
             
-            # Auto-detect storage if not specified
-            if storage is None:
-                # Prefer local-lvm for VM images first
-                for s in storage_list:
-                    if s["storage"] == "local-lvm" and "images" in s.get("content", ""):
-                        storage = s["storage"]
-                        break
-                if storage is None:
-                    # Then try vm-storage 
-                    for s in storage_list:
-                        if s["storage"] == "vm-storage" and "images" in s.get("content", ""):
-                            storage = s["storage"]
-                            break
-                if storage is None:
-                    # Fallback to any storage that supports images
-                    for s in storage_list:
-                        if "images" in s.get("content", ""):
-                            storage = s["storage"]
-                            break
-                    if storage is None:
-                        raise ValueError("No suitable storage found for VM images")
-            
-            # Validate storage exists and supports images
-            if storage not in storage_info:
-                raise ValueError(f"Storage '{storage}' not found on node {node}")
-            
-            if "images" not in storage_info[storage].get("content", ""):
-                raise ValueError(f"Storage '{storage}' does not support VM images")
-            
-            # Determine appropriate disk format based on storage type
-            storage_type = storage_info[storage]["type"]
-            
-            if storage_type in ["lvm", "lvmthin"]:
-                # LVM storages use raw format and no cloudinit
-                disk_format = "raw"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                }
-            elif storage_type in ["dir", "nfs", "cifs"]:
-                # File-based storages can use qcow2
-                disk_format = "qcow2"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                    "ide2": f"{storage}:cloudinit",
-                }
-            else:
-                # Default to raw for unknown storage types
-                disk_format = "raw"
-                vm_config_storage = {
-                    "scsi0": f"{storage}:{disk_size},format={disk_format}",
-                }
-            
-            # Set default OS type
-            if ostype is None:
-                ostype = "l26"  # Linux 2.6+ kernel
-            
-            # Prepare VM configuration
-            vm_config = {
-                "vmid": vmid,
-                "name": name,
-                "cores": cpus,
-                "memory": memory,
-                "ostype": ostype,
-                "scsihw": "virtio-scsi-pci",
-                "boot": "order=scsi0",
-                "agent": "1",  # Enable QEMU guest agent
-                "vga": "std",
-                "net0": "virtio,bridge=vmbr0",
-            }
-            
-            # Add storage configuration
-            vm_config.update(vm_config_storage)
-            
-            # Create the VM
-            task_result = self.proxmox.nodes(node).qemu.create(**vm_config)
+            try:
+                # Check if VM ID already exists
+                try:
+                    existing_vm = self.proxmox.nodes(node).qemu(vmid).config.get()
+                    raise ValueError(f"VM {vmid} already exists on node {node}")
+                except Exception as e:
+                    if "does not exist" not in str(e).lower():
+                        raise e
+
+                if placement is not None and placement.get("storage_type"):
+                    # Placement already validated content type and free space
+                    storage_type = placement["storage_type"]
+                else:
+                    storage, storage_type = self._select_storage(
+                        node, storage, self.proxmox.nodes(node).storage.get()
+                    )
+
+                disk_format, vm_config_storage = self._disk_config(storage, storage_type, disk_size)
+
+                # Set default OS type
+                if ostype is None:
+                    ostype = "l26"  # Linux 2.6+ kernel
+
+                # Prepare VM configuration
+                vm_config = self._vm_config(vmid, name, cpus, memory, ostype, vm_config_storage)
+
+                # Create the VM
+                task_result = self.proxmox.nodes(node).qemu.create(**vm_config)
+            except Exception:
+                # Nothing was created: drop the reservation made by place()
+                if placement is not None:
+                    self.placement.release(vmid)
+                raise
+            task = self._track_task(task_result, f"create VM {vmid} ({name})", wait, timeout)
+            task_note = f"\n{ProxmoxTemplates.task_status(task)}" if wait and task else ""
+            
+            placement_note = ""
+            if placement is not None:
+                placement_note = (
+                    f"\n  • Placement: auto (score {placement['score']}, "
+                    f"{placement['candidates']} candidates, CPU commit {placement['cpu_commit_after']}x)"
+                )
             
             cloudinit_note = ""
             if storage_type in ["lvm", "lvmthin"]:
@@ -243,9 +336,9 @@ class VMTools(ProxmoxTool):
   • Storage Type: {storage_type}
   • OS Type: {ostype}
   • Network: virtio (bridge=vmbr0)
-  • QEMU Agent: Enabled{cloudinit_note}
+  • QEMU Agent: Enabled{placement_note}{cloudinit_note}
 
-🔧 Task ID: {task_result}
+🔧 Task ID: {task_result}{task_note}
 
 💡 Next steps:
   1. Upload an ISO to install the operating system
@@ -259,12 +352,251 @@ class VMTools(ProxmoxTool):
         except Exception as e:
             self._handle_error(f"create VM {vmid}", e)
 
-    def start_vm(self, node: str, vmid: str) -> List[Content]:
+    def _clone_source(self, template_vmid: int, full_clone: Optional[bool]) -> Dict[str, Any]:
+        """Inspect a template and decide how it can be cloned.
+
+        Linked clones need a template whose disks all live on a storage type
+        with copy-on-write support (qcow2 images on file storages). Proxmox
+        only clones to another node when the source disks are on shared storage.
+
+        Args:
+            template_vmid: VMID of the source template
+            full_clone: True forces a full copy, False requires a linked clone,
+                None uses a linked clone whenever possible
+
+        Returns:
+            Source description (node, storage, shared, linked, cores, memory, disk_gb)
+
+        Raises:
+            ValueError: If the template is missing, has no disks, or can't be linked as required
+        """
+        item = self.metrics.latest("qemu").get(f"qemu/{template_vmid}")
+        if item is None:
+            raise ValueError(f"Template VM {template_vmid} not found in cluster")
+        node = item["node"]
+        config = self.proxmox.nodes(node).qemu(template_vmid).config.get()
+        disks = [
+            str(value) for key, value in config.items()
+            if DISK_KEY.match(key) and ":" in str(value) and "media=cdrom" not in str(value)
+        ]
+        if not disks:
+            raise ValueError(f"Template VM {template_vmid} has no disks to clone")
+
+        storage_info = {s["storage"]: s for s in self.proxmox.nodes(node).storage.get()}
+        storages = [disk.split(":", 1)[0] for disk in disks]
+        shared = all(storage_info.get(s, {}).get("shared") for s in storages)
+        is_template = str(config.get("template", 0)) == "1"
+        linkable = is_template and all(
+            storage_info.get(s, {}).get("type") in LINKED_CLONE_TYPES
+            and (storage_info[s]["type"] not in FILE_STORAGE_TYPES or ".qcow2" in disk)
+            for s, disk in zip(storages, disks)
+        )
+        if full_clone is False and not linkable:
+            reason = "it is not a template" if not is_template else "its storage can't do linked clones"
+            raise ValueError(f"VM {template_vmid} can't be linked-cloned: {reason}")
+
+        disk_gb = 0.0
+        for disk in disks:
+            match = DISK_SIZE.search(disk)
+            if match:
+                disk_gb += float(match.group(1)) * SIZE_UNITS_GB[match.group(2) or "G"]
+        return {
+            "vmid": template_vmid,
+            "node": node,
+            "storage": storages[0],
+            "shared": shared,
+            "linked": linkable if full_clone is None else not full_clone,
+            "cores": int(config.get("cores", 1)) * int(config.get("sockets", 1)),
+            "memory": int(config.get("memory", 512)),
+            "disk_gb": int(round(disk_gb)),
+        }
+
+    def bulk_create_vms(self, count: int, name_pattern: str = "vm-{index}", cpus: int = 1,
+                        memory: int = 2048, disk_size: int = 10, node: str = "auto",
+                        storage: Optional[str] = None, ostype: Optional[str] = None,
+                        start_vmid: Optional[int] = None, max_parallel: int = 4,
+                        wait: bool = True, timeout: int = 600,
+                        template_vmid: Optional[int] = None, full_clone: Optional[bool] = None,
+                        per_storage_parallel: int = 2) -> List[Content]:
+        """Create a batch of identical virtual machines.
+
+        Compared to `count` create_vm calls, the batch:
+        - Allocates every VMID at once (one /cluster/nextid call plus the
+          placement engine's reservation table) instead of probing each ID
+        - Lists storages once per node instead of once per VM
+        - Submits creations with at most `max_parallel` requests in flight
+        - Awaits all UPIDs together with batched task polling
+
+        With `template_vmid` the VMs are cloned from a template instead of
+        being built with an empty disk: linked clones when the template's
+        storage supports them, full clones otherwise. At most
+        `per_storage_parallel` clone tasks run at once against each storage,
+        so the call blocks until earlier clones free their slot even without
+        `wait`; `timeout` bounds the whole batch, not each clone.
+
+        Args:
+            count: Number of VMs to create
+            name_pattern: Name template; `{index}` (1-based) and `{vmid}` are substituted
+            cpus: CPU cores per VM (ignored when cloning)
+            memory: Memory per VM in MB (ignored when cloning)
+            disk_size: Disk size per VM in GB (ignored when cloning)
+            node: Host node name, or 'auto' to place each VM with the placement engine
+            storage: Storage name; None auto-detects per node, 'auto' uses placement
+            ostype: OS type (default: 'l26', ignored when cloning)
+            start_vmid: First VMID to try (default: /cluster/nextid)
+            max_parallel: Maximum creation requests in flight
+            wait: Block until all creation tasks finish
+            timeout: Maximum seconds to wait for the batch's tasks
+            template_vmid: Clone from this template instead of creating empty VMs
+            full_clone: Force full (True) or linked (False) clones; None picks linked when possible
+            per_storage_parallel: Clone tasks running at once per storage
+
+        Returns:
+            List of Content objects with one line per VM
+
+        Raises:
+            ValueError: If the batch parameters are invalid
+            RuntimeError: If VMID allocation fails
+        """
+        if not 1 <= count <= MAX_BULK_VMS:
+            raise ValueError(f"count must be between 1 and {MAX_BULK_VMS}")
+        try:
+            name_pattern.format(index=1, vmid=100)
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"Invalid name_pattern '{name_pattern}': {e}")
+
+        clone = None
+        if template_vmid is not None:
+            try:
+                clone = self._clone_source(template_vmid, full_clone)
+            except ValueError:
+                raise
+            except Exception as e:
+                self._handle_error(f"inspect template {template_vmid}", e)
+            cpus, memory = clone["cores"], clone["memory"]
+            disk_size = 0 if clone["linked"] else clone["disk_gb"]
+            if not clone["shared"]:
+                # Proxmox only clones across nodes from shared storage
+                if node not in ("auto", "", clone["node"]):
+                    raise ValueError(
+                        f"Template {template_vmid} is on local storage; clones must stay on node {clone['node']}"
+                    )
+                node = clone["node"]
+            if clone["linked"]:
+                if storage not in (None, "", "auto", clone["storage"]):
+                    raise ValueError(f"Linked clones stay on the template storage '{clone['storage']}'")
+                storage = clone["storage"]
+
+        try:
+            vmids = self.placement.allocate_vmids(count, start_vmid)
+        except Exception as e:
+            self._handle_error("allocate VMIDs", e)
+
+        auto = node in ("auto", "") or storage == "auto"
+        storage_lists: Dict[str, List[Dict[str, Any]]] = {}
+        plan: List[Dict[str, Any]] = []
+        for index, vmid in enumerate(vmids, start=1):
+            entry = {"vmid": vmid, "name": name_pattern.format(index=index, vmid=vmid),
+                     "node": node, "storage": storage, "upid": None, "error": None}
+            plan.append(entry)
+            try:
+                if auto:
+                    placed = self.placement.place(cpus, memory, disk_size, node, storage,
+                                                  content="images", vmid=vmid)
+                    entry["node"], entry["storage"] = placed["node"], placed["storage"]
+                    storage_type = placed["storage_type"]
+                elif clone is None:
+                    if node not in storage_lists:
+                        storage_lists[node] = self.proxmox.nodes(node).storage.get()
+                    entry["storage"], storage_type = self._select_storage(
+                        node, storage, storage_lists[node]
+                    )
+
+                if clone is not None:
+                    entry["mode"] = "linked clone" if clone["linked"] else "full clone"
+                    request = {"newid": vmid, "name": entry["name"], "full": 0 if clone["linked"] else 1}
+                    if entry["node"] != clone["node"]:
+                        request["target"] = entry["node"]
+                    if not clone["linked"] and entry["storage"]:
+                        request["storage"] = entry["storage"]
+                    entry["storage"] = entry["storage"] or clone["storage"]
+                else:
+                    _, disk_config = self._disk_config(entry["storage"], storage_type, disk_size)
+                    request = self._vm_config(vmid, entry["name"], cpus, memory,
+                                              ostype, disk_config)
+                entry["request"] = request
+            except (PlacementError, ValueError) as e:
+                entry["error"] = str(e)
+                self.placement.release(vmid)
+            except Exception as e:
+                # Nothing was submitted yet: hand every VMID of the batch back
+                for allocated in vmids:
+                    self.placement.release(allocated)
+                self._handle_error(f"plan VM {vmid}", e)
+
+        lock = threading.Lock()
+        slots: Dict[str, threading.Semaphore] = {}
+        if clone is not None:
+            for entry in plan:
+                slots.setdefault(entry["storage"], threading.Semaphore(max(1, per_storage_parallel)))
+
+        deadline = time.monotonic() + timeout
+
+        def submit(entry: Dict[str, Any]) -> None:
+            slot = slots.get(entry["storage"])
+            if slot is not None:
+                slot.acquire()
+            try:
+                try:
+                    if clone is not None:
+                        source = self.proxmox.nodes(clone["node"]).qemu(clone["vmid"])
+                        upid = source.clone.post(**entry.pop("request"))
+                    else:
+                        upid = self.proxmox.nodes(entry["node"]).qemu.create(**entry.pop("request"))
+                except Exception as e:
+                    self.placement.release(entry["vmid"])
+                    with lock:
+                        entry["error"] = str(e)
+                    return
+                verb = "clone" if clone is not None else "create"
+                record = self.tasks.track(upid, f"{verb} VM {entry['vmid']} ({entry['name']})")
+                with lock:
+                    entry["upid"] = upid if record is not None else None
+                if slot is not None and record is not None:
+                    # Keep the storage slot until the clone task is done
+                    self.tasks.wait([upid], max(0.0, deadline - time.monotonic()))
+            finally:
+                if slot is not None:
+                    slot.release()
+
+        todo = [entry for entry in plan if entry["error"] is None]
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(todo))),
+                                    thread_name_prefix="bulk-create") as pool:
+                list(pool.map(submit, todo))
+
+        upids = [entry["upid"] for entry in plan if entry["upid"]]
+        if upids:
+            if wait:
+                records = self.tasks.wait(upids, max(0.0, deadline - time.monotonic()))
+            else:
+                records = [self.tasks.get(u) for u in upids]
+            by_upid = {r["upid"]: r for r in records if r is not None}
+            for entry in plan:
+                if entry["upid"]:
+                    entry["task"] = by_upid.get(entry["upid"])
+        self._listings_changed()
+
+        return [Content(type="text", text=ProxmoxTemplates.vm_bulk_create(plan))]
+
+    def start_vm(self, node: str, vmid: str, wait: bool = False, timeout: int = 60) -> List[Content]:
         """Start a virtual machine.
         
         Args:
             node: Host node name (e.g., 'pve1', 'proxmox-node2')
             vmid: VM ID number (e.g., '100', '101')
+            wait: Block until the Proxmox task finishes
+            timeout: Maximum seconds to wait when `wait` is set
             
         Returns:
             List of Content objects containing operation result
@@ -284,6 +616,9 @@ class VMTools(ProxmoxTool):
                 # Start the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.start.post()
                 result_text = f"🚀 VM {vmid} start initiated successfully\nTask ID: {task_result}"
+                task = self._track_task(task_result, f"start VM {vmid}", wait, timeout)
+                if wait and task:
+                    result_text += f"\n{ProxmoxTemplates.task_status(task)}"
                 
             return [Content(type="text", text=result_text)]
             
@@ -292,12 +627,14 @@ class VMTools(ProxmoxTool):
                 raise ValueError(f"VM {vmid} not found on node {node}")
             self._handle_error(f"start VM {vmid}", e)
 
-    def stop_vm(self, node: str, vmid: str) -> List[Content]:
+    def stop_vm(self, node: str, vmid: str, wait: bool = False, timeout: int = 60) -> List[Content]:
         """Stop a virtual machine (force stop).
         
         Args:
             node: Host node name (e.g., 'pve1', 'proxmox-node2') 
             vmid: VM ID number (e.g., '100', '101')
+            wait: Block until the Proxmox task finishes
+            timeout: Maximum seconds to wait when `wait` is set
             
         Returns:
             List of Content objects containing operation result
@@ -317,6 +654,9 @@ class VMTools(ProxmoxTool):
                 # Stop the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.stop.post()
                 result_text = f"🛑 VM {vmid} stop initiated successfully\nTask ID: {task_result}"
+                task = self._track_task(task_result, f"stop VM {vmid}", wait, timeout)
+                if wait and task:
+                    result_text += f"\n{ProxmoxTemplates.task_status(task)}"
                 
             return [Content(type="text", text=result_text)]
             
@@ -325,12 +665,14 @@ class VMTools(ProxmoxTool):
                 raise ValueError(f"VM {vmid} not found on node {node}")
             self._handle_error(f"stop VM {vmid}", e)
 
-    def shutdown_vm(self, node: str, vmid: str) -> List[Content]:
+    def shutdown_vm(self, node: str, vmid: str, wait: bool = False, timeout: int = 60) -> List[Content]:
         """Shutdown a virtual machine gracefully.
         
         Args:
             node: Host node name (e.g., 'pve1', 'proxmox-node2')
             vmid: VM ID number (e.g., '100', '101')
+            wait: Block until the Proxmox task finishes
+            timeout: Maximum seconds to wait when `wait` is set
             
         Returns:
             List of Content objects containing operation result
@@ -350,6 +692,9 @@ class VMTools(ProxmoxTool):
                 # Shutdown the VM gracefully
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.shutdown.post()
                 result_text = f"💤 VM {vmid} graceful shutdown initiated\nTask ID: {task_result}"
+                task = self._track_task(task_result, f"shutdown VM {vmid}", wait, timeout)
+                if wait and task:
+                    result_text += f"\n{ProxmoxTemplates.task_status(task)}"
                 
             return [Content(type="text", text=result_text)]
             
@@ -358,12 +703,14 @@ class VMTools(ProxmoxTool):
                 raise ValueError(f"VM {vmid} not found on node {node}")
             self._handle_error(f"shutdown VM {vmid}", e)
 
-    def reset_vm(self, node: str, vmid: str) -> List[Content]:
+    def reset_vm(self, node: str, vmid: str, wait: bool = False, timeout: int = 60) -> List[Content]:
         """Reset (restart) a virtual machine.
         
         Args:
             node: Host node name (e.g., 'pve1', 'proxmox-node2')
             vmid: VM ID number (e.g., '100', '101')
+            wait: Block until the Proxmox task finishes
+            timeout: Maximum seconds to wait when `wait` is set
             
         Returns:
             List of Content objects containing operation result
@@ -383,6 +730,9 @@ class VMTools(ProxmoxTool):
                 # Reset the VM
                 task_result = self.proxmox.nodes(node).qemu(vmid).status.reset.post()
                 result_text = f"🔄 VM {vmid} reset initiated successfully\nTask ID: {task_result}"
+                task = self._track_task(task_result, f"reset VM {vmid}", wait, timeout)
+                if wait and task:
+                    result_text += f"\n{ProxmoxTemplates.task_status(task)}"
                 
             return [Content(type="text", text=result_text)]
             
@@ -431,7 +781,8 @@ class VMTools(ProxmoxTool):
         except Exception as e:
             self._handle_error(f"execute command on VM {vmid}", e)
 
-    def delete_vm(self, node: str, vmid: str, force: bool = False) -> List[Content]:
+    def delete_vm(self, node: str, vmid: str, force: bool = False, wait: bool = False,
+                  timeout: int = 120) -> List[Content]:
         """Delete/remove a virtual machine completely.
         
         This will permanently delete the VM and all its associated data including:
@@ -445,6 +796,8 @@ class VMTools(ProxmoxTool):
             node: Host node name (e.g., 'pve1', 'proxmox-node2')
             vmid: VM ID number (e.g., '100', '101')
             force: Force deletion even if VM is running (will stop first)
+            wait: Block until the deletion task finishes
+            timeout: Maximum seconds to wait (also bounds the forced stop)
             
         Returns:
             List of Content objects containing deletion result
@@ -470,14 +823,18 @@ class VMTools(ProxmoxTool):
                     raise ValueError(f"VM {vmid} ({vm_name}) is currently running. "
                                    f"Please stop it first or use force=True to stop and delete.")
                 else:
-                    # Force stop the VM first
-                    self.proxmox.nodes(node).qemu(vmid).status.stop.post()
+                    # Force stop the VM first and let the stop task finish,
+                    # otherwise the delete races against the running VM
+                    stop_result = self.proxmox.nodes(node).qemu(vmid).status.stop.post()
+                    self._track_task(stop_result, f"stop VM {vmid} before deletion", True, timeout)
                     result_text = f"🛑 Stopping VM {vmid} ({vm_name}) before deletion...\n"
             else:
                 result_text = f"🗑️ Deleting VM {vmid} ({vm_name})...\n"
             
             # Delete the VM
             task_result = self.proxmox.nodes(node).qemu(vmid).delete()
+            task = self._track_task(task_result, f"delete VM {vmid} ({vm_name})", wait, timeout)
+            task_note = f"\n{ProxmoxTemplates.task_status(task)}" if wait and task else ""
             
             result_text += f"""🗑️ VM {vmid} ({vm_name}) deletion initiated successfully!
 
@@ -487,7 +844,7 @@ class VMTools(ProxmoxTool):
   • All snapshots
   • Cannot be undone!
 
-🔧 Task ID: {task_result}
+🔧 Task ID: {task_result}{task_note}
 
 ✅ VM {vmid} ({vm_name}) is being deleted from node {node}"""
             
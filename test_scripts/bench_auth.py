@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the per-request API key check
+
+Authenticates requests against registries of increasing size, with a valid
+key (the last one configured) and an unknown one, and compares with the
+previous single-key `!=` check. The cost per request should stay flat as
+keys are added.
+
+Usage:
+    python bench_auth.py [--requests 200000] [--keys 1,10,100,1000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.config.models import ApiKeyConfig  # noqa: E402
+from proxmox_mcp.core.auth import ApiKeyAuth  # noqa: E402
+
+
+def timed(check, header, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        try:
+            check(header)
+        except HTTPException:
+            pass
+    return (time.perf_counter() - started) / requests * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--keys", default="1,10,100,1000", help="Registry sizes")
+    args = parser.parse_args()
+
+    api_key = "k" * 64
+
+    def previous(authorization):
+        if authorization[7:] != api_key:
+            raise HTTPException(status_code=403, detail="Invalid API key")
+
+    print(f"{args.requests} requests per case")
+    print(f"{'check':<28}{'valid ns':>10}{'unknown ns':>12}")
+    print(f"{'previous (1 key, !=)':<28}{timed(previous, 'Bearer ' + api_key, args.requests):>10.0f}"
+          f"{timed(previous, 'Bearer ' + 'x' * 64, args.requests):>12.0f}")
+    for count in (int(n) for n in args.keys.split(",")):
+        keys = [ApiKeyConfig(name=f"key-{i}", key=f"{i:064d}", scopes=["read"]) for i in range(count)]
+        auth = ApiKeyAuth(keys)
+        valid = f"Bearer {count - 1:064d}"
+        print(f"{f'ApiKeyAuth ({count} keys)':<28}{timed(auth.authenticate, valid, args.requests):>10.0f}"
+              f"{timed(auth.authenticate, 'Bearer ' + 'x' * 64, args.requests):>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
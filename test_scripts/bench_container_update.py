@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark of resource updates on a tier of containers
+
+Simulates `--containers` containers spread over `--nodes` nodes, every API
+call taking `--api-ms`. Compares the previous serial loop (one config.put
+and one resize.put per container, one after the other) with the batched
+update_container_resources: concurrent config reads and updates, at most
+`--per-node` per node, and a second run where nothing changes.
+
+Usage:
+    python bench_container_update.py [--containers 60] [--nodes 3] [--api-ms 40] [--per-node 4]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.config.models import MetricsConfig  # noqa: E402
+from proxmox_mcp.core.metrics import MetricsEngine  # noqa: E402
+from proxmox_mcp.core.placement import PlacementEngine  # noqa: E402
+from proxmox_mcp.core.tasks import TaskTracker  # noqa: E402
+from proxmox_mcp.tools.containers import ContainerTools  # noqa: E402
+
+GIB = 1024 ** 3
+
+
+def fake_api(containers, nodes, api_s):
+    """ProxmoxAPI stand-in whose calls take `api_s`; configs are updated in place."""
+    names = [f"pve{i + 1}" for i in range(nodes)]
+    configs = {(names[i % nodes], 1000 + i): {"cores": 1, "memory": 1024} for i in range(containers)}
+
+    def call(result=None, effect=None):
+        def run(*args, **kwargs):
+            time.sleep(api_s)
+            if effect is not None:
+                effect(**kwargs)
+            return result() if callable(result) else result
+        return run
+
+    def container(node, vmid):
+        api = Mock()
+        api.config.get.side_effect = call(lambda: dict(configs[(node, vmid)]))
+        api.config.put.side_effect = call(effect=lambda **kw: configs[(node, vmid)].update(kw))
+        api.resize.put.side_effect = call(f"UPID:{node}:00001234:00005678:65000000:resize:{vmid}:root@pam:")
+        return api
+
+    def node(name):
+        api = Mock()
+        api.lxc.get.return_value = [{"vmid": v, "name": f"ct{v}"} for (n, v) in configs if n == name]
+        api.lxc.side_effect = lambda vmid: container(name, vmid)
+        api.tasks.get.side_effect = call([])
+        api.tasks.return_value.status.get.side_effect = call({"status": "stopped", "exitstatus": "OK"})
+        return api
+
+    api = Mock()
+    api.nodes.get.return_value = [{"node": n, "status": "online"} for n in names]
+    api.nodes.side_effect = node
+    api.cluster.resources.get.return_value = [
+        {"id": f"node/{n}", "type": "node", "node": n, "status": "online",
+         "maxcpu": 64, "mem": 8 * GIB, "maxmem": 256 * GIB} for n in names
+    ]
+    return api, configs
+
+
+def serial(tools, targets, cores, memory, disk_gb):
+    """The previous implementation: one container after the other."""
+    for node, vmid, _ in targets:
+        tools.proxmox.nodes(node).lxc(vmid).config.put(cores=cores, memory=memory)
+        resp = tools.proxmox.nodes(node).lxc(vmid).resize.put(disk="rootfs", size=f"+{disk_gb}G")
+        tools.tasks.track(resp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--containers", type=int, default=60)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--api-ms", type=float, default=40.0)
+    parser.add_argument("--per-node", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.getLogger("proxmox-mcp").setLevel(logging.ERROR)
+    print(f"{args.containers} containers on {args.nodes} nodes, {args.api_ms} ms per API call")
+    print(f"{'case':<28}{'seconds':>9}")
+    for name in ("serial loop (previous)", "batched", "batched, nothing to change"):
+        if name != "batched, nothing to change":
+            api, _ = fake_api(args.containers, args.nodes, args.api_ms / 1000)
+            metrics = MetricsEngine(api, config=MetricsConfig(sample_ttl=60))
+            tools = ContainerTools(api, tasks=TaskTracker(api, min_poll_interval=0.01),
+                                   metrics=metrics, placement=PlacementEngine(metrics))
+            selector = ",".join(str(1000 + i) for i in range(args.containers))
+        started = time.perf_counter()
+        if name.startswith("serial"):
+            serial(tools, tools._resolve_targets(selector), 2, 2048, 1)
+        else:
+            disk_gb = None if "nothing" in name else 1
+            tools.update_container_resources(selector, cores=2, memory=2048, disk_gb=disk_gb,
+                                             per_node_parallel=args.per_node)
+        print(f"{name:<28}{time.perf_counter() - started:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
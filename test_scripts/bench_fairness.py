@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark of tool call fairness between clients
+
+A runaway client calls get_containers from many concurrent loops while an
+interactive client makes one call at a time with some think time. The
+Proxmox API is modeled as a worker serving `--capacity` requests at a time,
+each taking `--api-ms`. Compares the latency seen by the interactive
+client and the API load without a scheduler (calls go straight to the
+worker threads, as before) and with the fair scheduler.
+
+Usage:
+    python bench_fairness.py [--seconds 5] [--loops 32] [--capacity 4] [--api-ms 20]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.config.models import SchedulerConfig  # noqa: E402
+from proxmox_mcp.core.scheduler import FairScheduler, Rejected  # noqa: E402
+
+
+async def run(scheduler, seconds, loops, capacity, api_s):
+    api = threading.Semaphore(capacity)
+    served = {"runaway": 0, "interactive": 0}
+    rejected = {"runaway": 0, "interactive": 0}
+    latencies = []
+    deadline = time.monotonic() + seconds
+
+    def proxmox_call():
+        with api:
+            time.sleep(api_s)
+
+    async def call(client):
+        ticket = None
+        if scheduler is not None:
+            try:
+                ticket = await scheduler.acquire(client, "get_containers")
+            except Rejected as e:
+                rejected[client] += 1
+                return e.retry_after
+        try:
+            await asyncio.to_thread(proxmox_call)
+            served[client] += 1
+        finally:
+            if ticket is not None:
+                ticket.release()
+        return 0.0
+
+    async def runaway():
+        while time.monotonic() < deadline:
+            retry = await call("runaway")
+            if retry:
+                # A runaway loop barely backs off
+                await asyncio.sleep(min(retry, 0.01))
+
+    async def interactive():
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            retry = await call("interactive")
+            if not retry:
+                latencies.append(time.monotonic() - started)
+            await asyncio.sleep(retry or 0.1)
+
+    await asyncio.gather(interactive(), *(runaway() for _ in range(loops)))
+    return served, rejected, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--loops", type=int, default=32, help="Concurrent loops of the runaway client")
+    parser.add_argument("--capacity", type=int, default=4, help="Concurrent requests served by the API")
+    parser.add_argument("--api-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    cases = [
+        ("no scheduler (previous)", None),
+        ("fair scheduler", FairScheduler(SchedulerConfig(read_slots=args.capacity))),
+    ]
+    print(f"{args.loops} runaway loops, API serving {args.capacity} x {args.api_ms} ms, {args.seconds}s")
+    print(f"{'case':<26}{'inter p50 ms':>13}{'inter p95 ms':>13}{'inter calls':>12}"
+          f"{'runaway calls':>14}{'rejected':>10}")
+    for name, scheduler in cases:
+        served, rejected, latencies = asyncio.run(
+            run(scheduler, args.seconds, args.loops, args.capacity, args.api_ms / 1000))
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan")
+        print(f"{name:<26}{p50:>13.1f}{p95:>13.1f}{served['interactive']:>12}"
+              f"{served['runaway']:>14}{rejected['runaway']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
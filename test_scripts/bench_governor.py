@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark of Proxmox API calls against an overloaded node
+
+Simulates a node that stops answering: after a healthy phase, every
+request to it hangs for `--timeout-ms` and fails, as a request timing out
+against an overloaded pveproxy would. Tool-like callers keep listing the
+guests of the node from several threads. Compares, without the governor
+(as before) and with it, the requests sent to the failing node, the time
+callers spend per call and how many calls still got data (stale).
+
+Usage:
+    python bench_governor.py [--calls 400] [--threads 8] [--timeout-ms 50]
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.config.models import GovernorConfig  # noqa: E402
+from proxmox_mcp.core.governor import UpstreamGovernor  # noqa: E402
+
+URL = "https://pve:8006/api2/json/nodes/pve1/lxc"
+
+
+class Upstream:
+    """A node answering `healthy` requests, then timing out."""
+
+    def __init__(self, healthy, timeout_s):
+        self.healthy = healthy
+        self.timeout_s = timeout_s
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.sent += 1
+            sent = self.sent
+        if sent <= self.healthy:
+            return type("Response", (), {"status_code": 200})()
+        time.sleep(self.timeout_s)
+        raise requests.ReadTimeout("Read timed out")
+
+
+def run(governor, calls, threads, timeout_s):
+    upstream = Upstream(threads, timeout_s)
+    send = upstream.request if governor is None else (
+        lambda method, url, **kwargs: governor.request(upstream.request, method, url, **kwargs))
+    outcome = {"data": 0, "error": 0}
+    lock = threading.Lock()
+
+    def call(_):
+        try:
+            send("GET", URL, params={"full": 1})
+            result = "data"
+        except (OSError, RuntimeError):
+            result = "error"
+        with lock:
+            outcome[result] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - started
+    return upstream.sent - threads, elapsed / calls * threads * 1000, outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--timeout-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    logging.getLogger("proxmox-mcp").setLevel(logging.ERROR)
+    cases = [
+        ("no governor (previous)", None),
+        ("governor", UpstreamGovernor(GovernorConfig(node_rate=1000, open_seconds=60))),
+    ]
+    print(f"{args.calls} calls from {args.threads} threads, failing node times out after {args.timeout_ms} ms")
+    print(f"{'case':<24}{'sent to node':>13}{'ms/call':>9}{'with data':>11}{'errors':>8}")
+    for name, governor in cases:
+        sent, per_call, outcome = run(governor, args.calls, args.threads, args.timeout_ms / 1000)
+        print(f"{name:<24}{sent:>13}{per_call:>9.1f}{outcome['data'] - args.threads:>11}{outcome['error']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
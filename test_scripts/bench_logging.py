@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the logging overhead per tool call
+
+Replays the log statements of one execute_vm_command call (INFO progress
+lines and DEBUG dumps of the raw API responses) at DEBUG level into a log
+file, with the previous direct file handler and with the queued pipeline
+in text and JSON, with and without repeat limiting. The three API calls of
+the tool are simulated by short sleeps, during which the background writer
+can drain the queue; they are not counted.
+
+Reports the time spent logging on the calling thread per tool call, the
+time needed to flush the queue afterwards and the number of lines written.
+A second run adds a per-write delay to the file handler to model a slow or
+contended disk, which is where moving writes off the request path matters.
+
+Usage:
+    python bench_logging.py [--calls 2000] [--payload 2048] [--api-ms 0.2] [--disk-ms 0.05]
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.config.models import LoggingConfig  # noqa: E402
+from proxmox_mcp.core.logging import request_id, setup_logging, shutdown_logging  # noqa: E402
+
+CASES = [
+    ("direct (previous)", dict(queued=False, repeat_window=0)),
+    ("queued text", dict(repeat_window=0)),
+    ("queued json", dict(json_format=True, repeat_window=0)),
+    ("queued text + limit", dict()),
+    ("queued json + limit", dict(json_format=True)),
+]
+
+
+def tool_call(logger, vmid, payload, api):
+    """The log statements of VMConsoleManager.execute_command.
+
+    Returns the seconds spent in simulated API calls.
+    """
+    exec_result = {"pid": vmid}
+    console = {"exited": 1, "exitcode": 0, "out-data": payload, "err-data": ""}
+    waited = api()
+    logger.info(f"Executing command on VM {vmid} (node: pve1): uname -a")
+    logger.debug("Using API endpoint: %s", "/nodes/pve1/qemu/%d/agent" % vmid)
+    logger.info("Starting command execution...")
+    logger.debug("Executing command via agent: %s", "uname -a")
+    waited += api()
+    logger.debug("Raw exec response: %s", exec_result)
+    logger.info(f"Command started with result: {exec_result}")
+    logger.info(f"Waiting for command completion (PID: {vmid})...")
+    logger.debug("Getting status for PID %s...", vmid)
+    waited += api()
+    logger.debug("Raw exec-status response: %s", console)
+    logger.info(f"Command completed with status: {console}")
+    logger.debug("Raw API response type: %s", type(console))
+    logger.debug("Raw API response: %s", console)
+    logger.debug("Processed output: %s", payload)
+    logger.debug("Processed error: %s", "")
+    logger.debug("Processed exit code: %s", 0)
+    logger.debug("Executed command '%s' on VM %s (node: %s)", "uname -a", vmid, "pve1")
+    return waited
+
+
+class SlowFileHandler(logging.FileHandler):
+    """File handler taking `latency` extra seconds per write."""
+
+    latency = 0.0
+
+    def emit(self, record):
+        super().emit(record)
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def run(options, calls, payload, directory, api_s, disk_s):
+    path = Path(directory) / "bench.log"
+    path.unlink(missing_ok=True)
+    logger = logging.getLogger("proxmox-mcp.vm-console")
+    SlowFileHandler.latency = disk_s
+
+    def api():
+        started = time.perf_counter()
+        time.sleep(api_s)
+        return time.perf_counter() - started
+
+    handler_class = logging.FileHandler
+    logging.FileHandler = SlowFileHandler
+    try:
+        setup_logging(LoggingConfig(level="DEBUG", file=str(path), queue_size=0, **options))
+    finally:
+        logging.FileHandler = handler_class
+    started = time.perf_counter()
+    waited = 0.0
+    for i in range(calls):
+        token = request_id.set(f"req-{i}")
+        waited += tool_call(logger, 100 + i % 50, payload, api)
+        request_id.reset(token)
+    elapsed = time.perf_counter() - started
+    shutdown_logging()
+    flushed = time.perf_counter() - started - elapsed
+    with open(path, "rb") as f:
+        lines = sum(1 for _ in f)
+    return elapsed - waited, flushed, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--payload", type=int, default=2048, help="Bytes of command output per call")
+    parser.add_argument("--api-ms", type=float, default=0.2, help="Simulated latency of each API call")
+    parser.add_argument("--disk-ms", type=float, default=0.05, help="Extra latency per write, second run")
+    args = parser.parse_args()
+
+    payload = "x" * args.payload
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    print(f"{args.calls} tool calls, 16 log statements and 3 API calls of {args.api_ms} ms each, "
+          f"{args.payload} B of output")
+    with tempfile.TemporaryDirectory() as directory:
+        for disk_ms in (0.0, args.disk_ms):
+            print(f"\nDisk write latency +{disk_ms} ms")
+            print(f"{'pipeline':<22}{'caller us/call':>15}{'speedup':>9}{'flush ms':>10}{'lines':>9}")
+            baseline = None
+            for name, options in CASES:
+                caller, flushed, lines = run(options, args.calls, payload, directory,
+                                             args.api_ms / 1000, disk_ms / 1000)
+                per_call = caller / args.calls * 1e6
+                baseline = baseline or per_call
+                print(f"{name:<22}{per_call:>15.1f}{baseline / per_call:>8.2f}x"
+                      f"{flushed * 1000:>10.1f}{lines:>9}")
+    root.handlers[:] = saved
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark of server import and startup time
+
+Imports each server entry point in fresh interpreters and reports the best
+and median import time, next to the cost of the full tool stack they used
+to import eagerly. Then starts the HTTP Streamable server under uvicorn
+with fast_start enabled and disabled and measures the time until /health
+first answers and until it reports `ready`.
+
+Without --config, the server is pointed at an unroutable address
+(192.0.2.1), which shows the startup behaviour when Proxmox is down: with
+fast_start the server answers /health right away and keeps retrying,
+without it the server never binds.
+
+Usage:
+    python bench_startup.py [--repeat 5] [--config ../proxmox-config/config.json] [--wait 20]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+SRC = Path(__file__).parent.parent / "src"
+
+MODULES = [
+    "proxmox_mcp.server_http_streamable",
+    "proxmox_mcp.server_sse",
+    "proxmox_mcp.server",
+]
+# What the HTTP entry points imported before fast start
+FULL_STACK = ("proxmox_mcp.server_http_streamable; import proxmoxer, proxmox_mcp.tools.node, "
+              "proxmox_mcp.tools.vm, proxmox_mcp.tools.storage, proxmox_mcp.tools.cluster, "
+              "proxmox_mcp.tools.containers, proxmox_mcp.tools.tasks, proxmox_mcp.tools.metrics")
+
+UNREACHABLE = {
+    "proxmox": {"host": "192.0.2.1", "port": 8006, "verify_ssl": False, "service": "PVE"},
+    "auth": {"user": "bench@pve", "token_name": "bench", "token_value": "bench"},
+    "logging": {"level": "WARNING"},
+    "startup": {"retry_interval": 1},
+}
+
+
+def _env(**extra):
+    env = dict(os.environ, PYTHONPATH=str(SRC), **extra)
+    return env
+
+
+def import_time(statement: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {statement}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], env=_env(), capture_output=True, text=True, check=True)
+    return float(out.stdout.strip()) * 1000
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def startup_time(config: dict, fast_start: bool, wait: float):
+    """(seconds to first /health, seconds to ready, exit code if the server died)."""
+    config = dict(config, startup=dict(config.get("startup", {}), fast_start=fast_start))
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "proxmox_mcp.server_http_streamable:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=_env(PROXMOX_MCP_CONFIG=f.name, MCPO_API_KEY="bench"),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    first = ready = None
+    try:
+        while time.perf_counter() - started < wait and proc.poll() is None:
+            try:
+                health = httpx.get(f"http://127.0.0.1:{port}/health", timeout=0.5).json()
+            except httpx.HTTPError:
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter() - started
+            first = first if first is not None else now
+            if health.get("ready"):
+                ready = now
+                break
+            time.sleep(0.05)
+        return first, ready, proc.poll()
+    finally:
+        proc.terminate()
+        proc.wait()
+        os.unlink(f.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--config", help="Real configuration file (default: unreachable host)")
+    parser.add_argument("--wait", type=float, default=20.0, help="Seconds to wait for readiness")
+    args = parser.parse_args()
+
+    print(f"Import time, fresh interpreter, {args.repeat} runs")
+    print(f"{'module':<40}{'best ms':>10}{'median ms':>11}")
+    for label, statement in [(m, m) for m in MODULES] + [("full tool stack (previous HTTP import)", FULL_STACK)]:
+        times = [import_time(statement) for _ in range(args.repeat)]
+        print(f"{label:<40}{min(times):>10.1f}{statistics.median(times):>11.1f}")
+
+    config = json.loads(Path(args.config).read_text()) if args.config else UNREACHABLE
+    target = config["proxmox"]["host"]
+    print(f"\nHTTP Streamable startup against {target} (waiting up to {args.wait:.0f}s)")
+    print(f"{'fast_start':<12}{'first /health':>15}{'ready':>10}")
+    for fast_start in (True, False):
+        first, ready, code = startup_time(config, fast_start, args.wait)
+        first_text = f"{first:.2f}s" if first is not None else "never"
+        ready_text = f"{ready:.2f}s" if ready is not None else "no"
+        exited = f"   (server exited with code {code})" if code not in (None, 0) else ""
+        print(f"{str(fast_start):<12}{first_text:>15}{ready_text:>10}{exited}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
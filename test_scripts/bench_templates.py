@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the list templates: precompiled rows vs. line-by-line f-strings
+
+Renders node, VM, container and storage lists of synthetic data with the
+current ProxmoxTemplates and with the previous line-by-line implementation
+(kept below as reference), checks that both produce identical text and
+prints the timings. "cold" clears the byte formatting memo before every
+run, "warm" renders values already seen (repeated listings).
+
+Usage:
+    python bench_templates.py [--guests 2000] [--repeat 20]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from proxmox_mcp.formatting import ProxmoxFormatters, ProxmoxTemplates, ProxmoxTheme  # noqa: E402
+from proxmox_mcp.formatting import renderer  # noqa: E402
+
+
+# ---------- reference implementation (before precompiled rendering) ----------
+def legacy_format_bytes(bytes_value):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if bytes_value < 1024:
+            return f"{bytes_value:.2f} {unit}"
+        bytes_value /= 1024
+    return f"{bytes_value:.2f} TB"
+
+
+def legacy_node_list(nodes):
+    result = [f"{ProxmoxTheme.RESOURCES['node']} Proxmox Nodes"]
+    for node in nodes:
+        status = node.get("status", "unknown")
+        memory = node.get("memory", {})
+        memory_used = memory.get("used", 0)
+        memory_total = memory.get("total", 0)
+        memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
+        result.extend([
+            "",
+            f"{ProxmoxTheme.RESOURCES['node']} {node['node']}",
+            f"  • Status: {status.upper()}",
+            f"  • Uptime: {ProxmoxFormatters.format_uptime(node.get('uptime', 0))}",
+            f"  • CPU Cores: {node.get('maxcpu', 'N/A')}",
+            f"  • Memory: {legacy_format_bytes(memory_used)} / "
+            f"{legacy_format_bytes(memory_total)} ({memory_percent:.1f}%)"
+        ])
+        if node.get("stale"):
+            result.append(
+                f"  {ProxmoxTheme.STATUS['warning']} Partial data (live status unavailable: "
+                f"{node.get('stale_reason', 'unknown')})"
+            )
+        disk = node.get("disk", {})
+        if disk:
+            disk_used = disk.get("used", 0)
+            disk_total = disk.get("total", 0)
+            disk_percent = (disk_used / disk_total * 100) if disk_total > 0 else 0
+            result.append(
+                f"  • Disk: {legacy_format_bytes(disk_used)} / "
+                f"{legacy_format_bytes(disk_total)} ({disk_percent:.1f}%)"
+            )
+    return "\n".join(result)
+
+
+def legacy_guest_list(icon, title, guests):
+    result = [f"{icon} {title}"]
+    for vm in guests:
+        memory = vm.get("memory", {})
+        memory_used = memory.get("used", 0)
+        memory_total = memory.get("total", 0)
+        memory_percent = (memory_used / memory_total * 100) if memory_total > 0 else 0
+        result.extend([
+            "",
+            f"{icon} {vm['name']} (ID: {vm['vmid']})",
+            f"  • Status: {vm['status'].upper()}",
+            f"  • Node: {vm['node']}",
+            f"  • CPU Cores: {vm.get('cpus', 'N/A')}",
+            f"  • Memory: {legacy_format_bytes(memory_used)} / "
+            f"{legacy_format_bytes(memory_total)} ({memory_percent:.1f}%)"
+        ])
+    return "\n".join(result)
+
+
+def legacy_storage_list(storage):
+    result = [f"{ProxmoxTheme.RESOURCES['storage']} Storage Pools"]
+    for store in storage:
+        used = store.get("used", 0)
+        total = store.get("total", 0)
+        percent = (used / total * 100) if total > 0 else 0
+        name = store['storage']
+        if store.get("node"):
+            name = f"{name} ({store['node']})"
+        result.extend([
+            "",
+            f"{ProxmoxTheme.RESOURCES['storage']} {name}",
+            f"  • Status: {store.get('status', 'unknown').upper()}",
+            f"  • Type: {store['type']}",
+            f"  • Usage: {legacy_format_bytes(used)} / "
+            f"{legacy_format_bytes(total)} ({percent:.1f}%)"
+        ])
+    return "\n".join(result)
+
+
+# ---------- synthetic data ----------
+def make_data(guests: int):
+    rng = random.Random(42)
+    nodes = [{
+        "node": f"pve{i}", "status": "online", "uptime": rng.randint(0, 10 ** 7), "maxcpu": 64,
+        "memory": {"used": rng.randint(0, 2 ** 39), "total": 2 ** 39},
+        "disk": {"used": rng.randint(0, 2 ** 40), "total": 2 ** 40},
+    } for i in range(max(1, guests // 50))]
+    vms = [{
+        "vmid": 100 + i, "name": f"vm-{i}", "node": f"pve{i % len(nodes)}",
+        "status": rng.choice(("running", "stopped")), "cpus": rng.choice((1, 2, 4, 8)),
+        "memory": {"used": rng.randint(0, 2 ** 34), "total": 2 ** 34},
+    } for i in range(guests)]
+    storage = [{
+        "storage": f"store-{i}", "node": f"pve{i % len(nodes)}", "type": "lvmthin", "status": "online",
+        "used": rng.randint(0, 2 ** 42), "total": 2 ** 42,
+    } for i in range(max(1, guests // 10))]
+    return nodes, vms, storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--guests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    nodes, vms, storage = make_data(args.guests)
+    cases = [
+        ("node_list", lambda: legacy_node_list(nodes), lambda: ProxmoxTemplates.node_list(nodes)),
+        ("vm_list", lambda: legacy_guest_list(ProxmoxTheme.RESOURCES['vm'], "Virtual Machines", vms),
+         lambda: ProxmoxTemplates.vm_list(vms)),
+        ("container_list", lambda: legacy_guest_list(ProxmoxTheme.RESOURCES['container'], "Containers", vms),
+         lambda: ProxmoxTemplates.container_list(vms)),
+        ("storage_list", lambda: legacy_storage_list(storage), lambda: ProxmoxTemplates.storage_list(storage)),
+    ]
+    values = [v for vm in vms for v in vm["memory"].values()] + [0, 1023, 1024, 2 ** 50, 2 ** 60]
+    cases.append(("format_bytes", lambda: [legacy_format_bytes(v) for v in values],
+                  lambda: [ProxmoxFormatters.format_bytes(v) for v in values]))
+
+    print(f"{args.guests} guests, {len(nodes)} nodes, {len(storage)} storages, best of {args.repeat}")
+    print(f"{'template':<16}{'legacy ms':>11}{'cold ms':>10}{'speedup':>9}{'warm ms':>10}{'speedup':>9}")
+    for name, legacy, current in cases:
+        if legacy() != current():
+            print(f"{name}: OUTPUT MISMATCH")
+            return 1
+        old = min(timeit.repeat(legacy, number=1, repeat=args.repeat)) * 1000
+        cold = min(timeit.repeat(current, setup=renderer._BYTES_MEMO.clear,
+                                 number=1, repeat=args.repeat)) * 1000
+        warm = min(timeit.repeat(current, number=1, repeat=args.repeat)) * 1000
+        print(f"{name:<16}{old:>11.2f}{cold:>10.2f}{old / cold:>8.2f}x{warm:>10.2f}{old / warm:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
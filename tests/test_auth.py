@@ -0,0 +1,81 @@
+"""
+Tests for API key authentication (scopes, rate limits, key sources).
+"""
+
+import hashlib
+import pytest
+from fastapi import HTTPException
+
+from proxmox_mcp.config.models import ApiKeyConfig
+from proxmox_mcp.core.auth import ADMIN, POWER, READ, ApiKeyAuth, tool_scope
+
+@pytest.fixture
+def auth(monkeypatch):
+    """Fixture for a registry with a default key and three configured keys."""
+    monkeypatch.setenv("OPS_KEY", "ops-secret")
+    return ApiKeyAuth([
+        ApiKeyConfig(name="reader", key="read-secret", scopes=["read"]),
+        ApiKeyConfig(name="ops", key_env="OPS_KEY", scopes=["power"]),
+        ApiKeyConfig(name="ci", key_sha256=hashlib.sha256(b"ci-secret").hexdigest(),
+                     scopes=["read"], rate_limit=0.001, rate_burst=2),
+    ], default_key="root-secret")
+
+def status(call):
+    with pytest.raises(HTTPException) as e:
+        call()
+    return e.value.status_code
+
+def test_keys_resolve_to_cached_principals(auth):
+    """Test that each key source resolves to the same principal object every time."""
+    reader = auth.authenticate("Bearer read-secret")
+    assert reader.name == "reader"
+    assert auth.authenticate("Bearer read-secret") is reader
+    assert auth.authenticate("Bearer ops-secret", POWER).name == "ops"
+    assert auth.authenticate("Bearer ci-secret").name == "ci"
+    assert auth.authenticate("Bearer root-secret", ADMIN).name == "default"
+    assert reader.requests == 2
+
+def test_rejections(auth):
+    """Test missing, malformed and unknown credentials and missing scopes."""
+    assert status(lambda: auth.authenticate(None)) == 401
+    assert status(lambda: auth.authenticate("Basic cm9vdA==")) == 401
+    assert status(lambda: auth.authenticate("Bearer read-secret-2")) == 403
+    assert status(lambda: auth.authenticate("Bearer read-secret", POWER)) == 403
+    assert status(lambda: auth.authenticate("Bearer ops-secret", ADMIN)) == 403
+
+def test_tool_scopes(auth):
+    """Test that read-only keys can list but not change guests."""
+    assert tool_scope("get_vms") == READ
+    assert tool_scope("stop_container") == POWER
+    assert tool_scope("some_new_tool") == POWER
+
+    reader = auth.authenticate("Bearer read-secret", None)
+    reader.require(tool_scope("get_containers"))
+    assert status(lambda: reader.require(tool_scope("delete_vm"))) == 403
+
+def test_rate_limit_per_key(auth):
+    """Test that a key over its rate limit gets 429 with Retry-After, other keys don't."""
+    auth.authenticate("Bearer ci-secret")
+    auth.authenticate("Bearer ci-secret")
+    with pytest.raises(HTTPException) as e:
+        auth.authenticate("Bearer ci-secret")
+
+    assert e.value.status_code == 429
+    assert int(e.value.headers["Retry-After"]) >= 1
+    assert auth.authenticate("Bearer read-secret").name == "reader"
+    report = auth.report()
+    assert report["ci"]["limited"] == 1
+    assert report["ci"]["requests"] == 2
+    assert report["default"]["scopes"] == ["admin", "power", "read"]
+
+def test_invalid_configurations(monkeypatch):
+    """Test configuration errors and keys whose environment variable is unset."""
+    monkeypatch.delenv("MISSING_KEY", raising=False)
+    with pytest.raises(ValueError, match="No API key"):
+        ApiKeyAuth([ApiKeyConfig(name="ghost", key_env="MISSING_KEY")])
+    with pytest.raises(ValueError, match="unknown scope"):
+        ApiKeyAuth([ApiKeyConfig(name="x", key="k", scopes=["write"])])
+    with pytest.raises(ValueError, match="same key"):
+        ApiKeyAuth([ApiKeyConfig(name="x", key="k")], default_key="k")
+    with pytest.raises(ValueError, match="64 hex digits"):
+        ApiKeyAuth([ApiKeyConfig(name="x", key_sha256="abcd")])
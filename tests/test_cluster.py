@@ -0,0 +1,115 @@
+"""
+Tests for the cluster health summary.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import MetricsConfig
+from proxmox_mcp.core.health import summarize
+from proxmox_mcp.core.metrics import MetricsEngine
+from proxmox_mcp.tools.cluster import ClusterTools
+
+GIB = 1024 ** 3
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online",
+     "cpu": 0.5, "maxcpu": 8, "mem": 30 * GIB, "maxmem": 32 * GIB},
+    {"id": "node/pve2", "type": "node", "node": "pve2", "status": "online",
+     "cpu": 0.25, "maxcpu": 8, "mem": 8 * GIB, "maxmem": 32 * GIB},
+    {"id": "node/pve3", "type": "node", "node": "pve3", "status": "offline",
+     "maxcpu": 64, "maxmem": 512 * GIB},
+    {"id": "qemu/100", "type": "qemu", "node": "pve1", "vmid": 100, "name": "db", "status": "running",
+     "cpu": 0.5, "maxcpu": 8, "mem": 16 * GIB, "maxmem": 24 * GIB},
+    {"id": "qemu/101", "type": "qemu", "node": "pve2", "vmid": 101, "name": "web", "status": "running",
+     "cpu": 0.75, "maxcpu": 4, "mem": 4 * GIB, "maxmem": 8 * GIB},
+    {"id": "qemu/102", "type": "qemu", "node": "pve2", "vmid": 102, "name": "old", "status": "stopped",
+     "maxcpu": 8, "maxmem": 32 * GIB},
+    {"id": "qemu/9000", "type": "qemu", "node": "pve2", "vmid": 9000, "name": "tpl", "status": "stopped",
+     "template": 1, "maxcpu": 2, "maxmem": 2 * GIB},
+    {"id": "lxc/200", "type": "lxc", "node": "pve1", "vmid": 200, "name": "dns", "status": "running",
+     "cpu": 0.1, "maxcpu": 2, "mem": 1 * GIB, "maxmem": 2 * GIB},
+    {"id": "storage/pve1/local-lvm", "type": "storage", "node": "pve1", "storage": "local-lvm",
+     "disk": 900 * GIB, "maxdisk": 1000 * GIB, "status": "available"},
+    {"id": "storage/pve1/ceph", "type": "storage", "node": "pve1", "storage": "ceph", "shared": 1,
+     "disk": 100 * GIB, "maxdisk": 1000 * GIB, "status": "available"},
+    {"id": "storage/pve2/ceph", "type": "storage", "node": "pve2", "storage": "ceph", "shared": 1,
+     "disk": 100 * GIB, "maxdisk": 1000 * GIB, "status": "available"},
+]
+
+STATUS = [
+    {"type": "cluster", "name": "lab", "quorate": 1, "nodes": 3},
+    {"type": "node", "name": "pve1", "online": 1},
+    {"type": "node", "name": "pve2", "online": 1},
+    {"type": "node", "name": "pve3", "online": 0},
+]
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    mock = Mock()
+    mock.cluster.resources.get.return_value = [dict(r) for r in RESOURCES]
+    mock.cluster.status.get.return_value = [dict(s) for s in STATUS]
+    return mock
+
+def test_summarize_aggregates():
+    """Test totals, overcommit ratios and guest counts."""
+    report = summarize(RESOURCES, STATUS, top=2)
+
+    assert report["cluster"] == {"name": "lab", "quorate": True}
+    assert report["nodes"]["online"] == 2
+    assert report["nodes"]["offline"] == ["pve3"]
+    assert report["nodes"]["cores"] == 16
+    assert report["nodes"]["cpu_pct"] == 37.5
+    assert report["guests"]["by_type"]["qemu"] == {"running": 2, "stopped": 1, "other": 0}
+    assert report["guests"]["templates"] == 1
+    assert report["overcommit"]["vcpu_running"] == 0.88
+    assert report["overcommit"]["vcpu_allocated"] == 1.38
+    assert report["overcommit"]["mem_allocated"] == 1.03
+
+def test_summarize_top_consumers_and_alerts():
+    """Test rankings, shared storage deduplication and alerts."""
+    report = summarize(RESOURCES, STATUS, top=2)
+
+    assert [g["vmid"] for g in report["top"]["cpu"]] == [100, 101]
+    assert [g["vmid"] for g in report["top"]["mem"]] == [100, 101]
+    assert report["storage"]["count"] == 2
+    assert report["storage"]["total"] == 2000 * GIB
+    assert report["storage"]["fullest"][0] == {"storage": "local-lvm", "node": "pve1", "pct": 90.0}
+    assert report["alerts"] == [
+        "Node pve3 is offline",
+        "Node pve1 memory at 93.8%",
+        "Storage local-lvm (on pve1) at 90.0%",
+    ]
+    full = [dict(r, disk=950 * GIB) if r["id"].startswith("storage/") else r for r in RESOURCES]
+    assert [a for a in summarize(full, STATUS)["alerts"] if a.startswith("Storage")] == [
+        "Storage ceph (shared) at 95.0%",
+        "Storage local-lvm (on pve1) at 95.0%",
+    ]
+
+def test_cluster_health_uses_one_snapshot(mock_proxmox):
+    """Test that the tool needs one resources and one status call."""
+    metrics = MetricsEngine(mock_proxmox, config=MetricsConfig(sample_ttl=60))
+    tools = ClusterTools(mock_proxmox, metrics=metrics)
+
+    text = tools.get_cluster_health()[0].text
+    data = json.loads(tools.get_cluster_health(format_style="json")[0].text)
+
+    assert mock_proxmox.cluster.resources.get.call_count == 1
+    assert mock_proxmox.cluster.status.get.call_count == 2
+    mock_proxmox.nodes.assert_not_called()
+    assert "Cluster health: lab" in text
+    assert "VMs 2 running / 1 stopped, containers 1 running / 0 stopped, 1 templates" in text
+    assert "Node pve3 is offline" in text
+    assert data["guests"]["total"] == 4
+
+def test_cluster_health_without_status(mock_proxmox):
+    """Test that a failing status call still yields a capacity report."""
+    mock_proxmox.cluster.status.get.side_effect = Exception("timeout")
+    tools = ClusterTools(mock_proxmox)
+
+    text = tools.get_cluster_health()[0].text
+
+    assert "quorum unknown" in text
+    assert "2/3 online" in text
@@ -0,0 +1,147 @@
+"""
+Tests for batched container resource updates.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import MetricsConfig, PlacementConfig
+from proxmox_mcp.core.metrics import MetricsEngine
+from proxmox_mcp.core.placement import PlacementEngine
+from proxmox_mcp.core.tasks import TaskTracker
+from proxmox_mcp.tools.containers import ContainerTools
+
+GIB = 1024 ** 3
+
+class Cluster:
+    """Fake API: two nodes, containers with a config each, concurrency probe."""
+
+    def __init__(self, configs, delay=0.0):
+        self.configs = configs  # {(node, vmid): config}
+        self.delay = delay
+        self.puts = []
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+        self.api = Mock()
+        self.api.nodes.get.return_value = [{"node": "pve1", "status": "online"},
+                                           {"node": "pve2", "status": "online"}]
+        self.api.nodes.side_effect = self.node
+        self.api.cluster.resources.get.return_value = [
+            {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online",
+             "maxcpu": 8, "mem": 4 * GIB, "maxmem": 32 * GIB},
+            {"id": "node/pve2", "type": "node", "node": "pve2", "status": "online",
+             "maxcpu": 8, "mem": 26 * GIB, "maxmem": 32 * GIB},
+        ]
+
+    def node(self, name):
+        api = Mock()
+        api.lxc.get.return_value = [{"vmid": vmid, "name": f"ct{vmid}"}
+                                    for (node, vmid) in self.configs if node == name]
+        api.lxc.side_effect = lambda vmid: self.container(name, vmid)
+        api.tasks.get.return_value = []
+        api.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+        return api
+
+    def container(self, node, vmid):
+        api = Mock()
+        api.config.get.return_value = dict(self.configs[(node, vmid)])
+
+        def put(**params):
+            with self.lock:
+                self.active[node] = self.active.get(node, 0) + 1
+                self.peak[node] = max(self.peak.get(node, 0), self.active[node])
+            time.sleep(self.delay)
+            with self.lock:
+                self.active[node] -= 1
+                self.puts.append((node, vmid, params))
+
+        api.config.put.side_effect = put
+        api.resize.put.return_value = f"UPID:{node}:00001234:00005678:65000000:resize:{vmid}:root@pam:"
+        return api
+
+def tools_for(cluster):
+    metrics = MetricsEngine(cluster.api, config=MetricsConfig(sample_ttl=60))
+    tracker = TaskTracker(cluster.api, min_poll_interval=0.01)
+    return ContainerTools(cluster.api, tasks=tracker, metrics=metrics,
+                          placement=PlacementEngine(metrics, PlacementConfig()))
+
+def test_only_changed_settings_are_sent():
+    """Test that configs are diffed and no-op updates skipped."""
+    cluster = Cluster({
+        ("pve1", 101): {"cores": 2, "memory": 1024, "swap": 512},
+        ("pve1", 102): {"cores": 1, "memory": 1024, "swap": 512},
+    })
+    results = tools_for(cluster).update_container_resources(
+        "101,102", cores=2, memory=1024, format_style="json")
+
+    assert cluster.puts == [("pve1", 102, {"cores": 2})]
+    skipped, updated = json.loads(results[0].text)
+    assert skipped["skipped"] is True
+    assert skipped["message"] == "no changes (cores=2, memory=1024MiB)"
+    assert updated["message"] == "cores 1→2"
+
+def test_headroom_is_checked_per_node():
+    """Test that a node that can't absorb the total increase is refused."""
+    cluster = Cluster({
+        **{("pve1", 100 + i): {"cores": 1, "memory": 1024} for i in range(3)},
+        **{("pve2", 200 + i): {"cores": 1, "memory": 1024} for i in range(3)},
+    })
+    tools = tools_for(cluster)
+    # +3 GiB fits on pve1 (28 GiB free) but not on pve2 (6 GiB free, 3.2 GiB headroom)
+    results = tools.update_container_resources(
+        "100,101,102,200,201,202", memory=2048, format_style="json")
+
+    assert sorted(vmid for _, vmid, _ in cluster.puts) == [100, 101, 102]
+    assert results[0].text.count("insufficient headroom") == 3
+
+    tools.update_container_resources("200,201,202", memory=2048, force=True)
+    assert len(cluster.puts) == 6
+
+def test_unlimited_cores_are_not_growth():
+    """Test that limiting a container without a cores setting needs no CPU headroom."""
+    cluster = Cluster({("pve1", 100 + i): {"memory": 1024} for i in range(3)})
+    tools = tools_for(cluster)
+    # 3 x 8 cores would overcommit pve1's 8 CPUs if counted from 0
+    results = tools.update_container_resources("100,101,102", cores=8, format_style="json")
+
+    assert len(cluster.puts) == 3
+    assert "insufficient headroom" not in results[0].text
+    assert all(rec["growth"] == (0, 0) for rec in tools._plan_updates(
+        tools._resolve_targets("100"), 8, None, None, "rootfs", None, 1))
+
+def test_concurrent_per_node_with_resize_tasks():
+    """Test per-node concurrency limits and resize tasks awaited to completion."""
+    cluster = Cluster({
+        **{("pve1", 100 + i): {"cores": 1} for i in range(6)},
+        **{("pve2", 200 + i): {"cores": 1} for i in range(6)},
+    }, delay=0.05)
+    started = time.monotonic()
+    results = tools_for(cluster).update_container_resources(
+        ",".join(str(v) for _, v in cluster.configs), cores=2, disk_gb=1,
+        per_node_parallel=3, wait=True, format_style="json")
+
+    assert len(cluster.puts) == 12
+    assert cluster.peak == {"pve1": 3, "pve2": 3}
+    assert time.monotonic() - started < 0.5  # 12 x 50 ms serially
+    assert results[0].text.count('"exitstatus": "OK"') == 12
+
+def test_resize_tasks_not_awaited_without_wait():
+    """Test that wait=False returns the running resize tasks at once."""
+    cluster = Cluster({("pve1", 100 + i): {"cores": 1} for i in range(4)})
+
+    def node(name):
+        api = Cluster.node(cluster, name)
+        api.tasks.return_value.status.get.return_value = {"status": "running"}
+        return api
+
+    cluster.api.nodes.side_effect = node
+    started = time.monotonic()
+    results = tools_for(cluster).update_container_resources(
+        "100,101,102,103", disk_gb=1, per_node_parallel=1, timeout=2, format_style="json")
+
+    assert time.monotonic() - started < 1  # 2 s when each resize holds its node slot
+    rows = json.loads(results[0].text)
+    assert all(row["upid"] and row["task"]["status"] == "running" for row in rows)
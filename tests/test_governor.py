@@ -0,0 +1,146 @@
+"""
+Tests for the Proxmox API governor (rate limits, circuit breakers, stale data).
+"""
+
+import time
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from proxmoxer import ProxmoxAPI
+
+from proxmox_mcp.config.models import GovernorConfig
+from proxmox_mcp.core.governor import (
+    CircuitOpenError,
+    GovernedSession,
+    ThrottledError,
+    UpstreamGovernor,
+    classify,
+    install,
+)
+
+BASE = "https://pve:8006/api2/json"
+
+def response(status=200, data=None):
+    return Mock(status_code=status, data=data)
+
+def governor(**options):
+    settings = dict(node_rate=1000, class_rates={}, failure_threshold=3, open_seconds=0.05)
+    settings.update(options)
+    return UpstreamGovernor(GovernorConfig(**settings))
+
+def test_classify():
+    """Test node and endpoint class extraction from request URLs."""
+    assert classify("GET", f"{BASE}/nodes/pve1/qemu") == ("pve1", "read")
+    assert classify("POST", f"{BASE}/nodes/pve1/qemu/100/status/start") == ("pve1", "write")
+    assert classify("GET", f"{BASE}/nodes/pve2/tasks/UPID:x/status") == ("pve2", "tasks")
+    assert classify("GET", f"{BASE}/nodes/pve2/rrddata") == ("pve2", "rrd")
+    assert classify("GET", f"{BASE}/cluster/resources") == ("cluster", "read")
+
+def test_circuit_opens_probes_and_closes():
+    """Test that consecutive failures open the circuit of the node only."""
+    gov = governor()
+    send = Mock(return_value=response(503))
+    for _ in range(3):
+        assert gov.request(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/start").status_code == 503
+
+    with pytest.raises(CircuitOpenError, match="pve1"):
+        gov.request(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/start")
+    assert send.call_count == 3
+    assert gov.open_circuits().keys() == {"pve1"}
+    send.return_value = response(200)
+    assert gov.request(send, "GET", f"{BASE}/nodes/pve2/qemu").status_code == 200
+
+    # After open_seconds one probe goes through and closes the circuit
+    time.sleep(0.06)
+    assert gov.request(send, "GET", f"{BASE}/nodes/pve1/qemu").status_code == 200
+    report = gov.report()["nodes"]["pve1"]
+    assert report["state"] == "closed"
+    assert report["opens"] == 1
+    assert report["rejected"] == 1
+    assert gov.open_circuits() == {}
+
+def test_failed_probe_doubles_open_time():
+    """Test that a failed probe reopens the circuit for twice as long."""
+    gov = governor(failure_threshold=1)
+    send = Mock(side_effect=requests.ConnectTimeout("timed out"))
+    with pytest.raises(requests.ConnectTimeout):
+        gov.request(send, "GET", f"{BASE}/nodes/pve1/status")
+    time.sleep(0.06)
+    with pytest.raises(requests.ConnectTimeout):
+        gov.request(send, "GET", f"{BASE}/nodes/pve1/status")
+
+    assert gov.report()["nodes"]["pve1"]["retry_in"] == pytest.approx(0.1, abs=0.02)
+
+def test_stale_responses_while_failing():
+    """Test that GETs fall back to the last good response once the circuit opens."""
+    gov = governor(failure_threshold=2)
+    good = response(200, "fresh")
+    send = Mock(return_value=good)
+    gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc", params={"full": 1})
+    gov.request(send, "GET", f"{BASE}/nodes/pve1/tasks/UPID:x/status")
+
+    send.return_value = response(504)
+    # The circuit is still closed: the failure is not masked
+    assert gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc", params={"full": 1}).status_code == 504
+    assert gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc", params={"full": 1}) is good  # opens
+    calls = send.call_count
+    assert gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc", params={"full": 1}) is good
+    assert send.call_count == calls
+    with pytest.raises(CircuitOpenError):
+        gov.request(send, "GET", f"{BASE}/nodes/pve1/tasks/UPID:x/status")
+    with pytest.raises(CircuitOpenError):
+        gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc", params={"full": 0})
+    assert gov.report()["nodes"]["pve1"]["stale_served"] == 2
+
+def test_no_stale_data_while_circuit_closed():
+    """Test that a single timeout on a healthy node raises instead of serving stale data."""
+    gov = governor(failure_threshold=3)
+    send = Mock(return_value=response(200, "fresh"))
+    gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc/200/config")
+
+    send.side_effect = requests.ReadTimeout("timed out")
+    with pytest.raises(requests.ReadTimeout):
+        gov.request(send, "GET", f"{BASE}/nodes/pve1/lxc/200/config")
+    assert gov.stale("GET", f"{BASE}/nodes/pve1/lxc/200/config") is None
+    assert gov.report()["nodes"]["pve1"]["stale_served"] == 0
+
+def test_server_errors_are_not_failures():
+    """Test that HTTP 500 (ordinary Proxmox errors) doesn't open circuits."""
+    gov = governor(failure_threshold=1)
+    send = Mock(return_value=response(500))
+    for _ in range(3):
+        gov.request(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/start")
+    assert gov.report()["nodes"]["pve1"]["state"] == "closed"
+
+def test_rate_limits_hold_back_then_refuse():
+    """Test per-class throttling delays and the max_delay limit."""
+    gov = governor(class_rates={"write": 20.0})
+    send = Mock(return_value=response(200))
+    started = time.monotonic()
+    for _ in range(42):  # burst of 40, then 50 ms per request
+        gov.request(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/start")
+    assert time.monotonic() - started >= 0.09
+    assert gov.report()["nodes"]["pve1"]["throttled"] == 2
+    assert gov.report()["classes"]["write"]["requests"] == 42
+
+    gov = governor(class_rates={"write": 20.0}, max_delay=0.01)
+    for _ in range(40):
+        gov.request(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/start")
+    with pytest.raises(ThrottledError):
+        gov.request(send, "POST", f"{BASE}/nodes/pve2/lxc/200/status/start")
+    gov.request(send, "GET", f"{BASE}/nodes/pve2/lxc")
+
+def test_install_on_proxmoxer():
+    """Test that proxmoxer requests go through the governed session."""
+    api = ProxmoxAPI("pve.example.com", user="root@pam", token_name="t", token_value="v", verify_ssl=False)
+    gov = governor()
+    assert install(api, gov)
+    assert isinstance(api._store["session"], GovernedSession)
+
+    reply = requests.Response()
+    reply.status_code = 200
+    reply._content = b'{"data": [{"node": "pve1"}]}'
+    with patch.object(requests.Session, "request", return_value=reply):
+        assert api.nodes.get() == [{"node": "pve1"}]
+    assert gov.report()["nodes"]["cluster"]["requests"] == 1
+    assert not install(Mock(), gov)
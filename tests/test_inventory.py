@@ -0,0 +1,116 @@
+"""
+Tests for the background cluster inventory.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import InventoryConfig
+from proxmox_mcp.core.inventory import ClusterInventory
+from proxmox_mcp.tools.containers import ContainerTools
+from proxmox_mcp.tools.vm import VMTools
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online",
+     "maxcpu": 8, "mem": 1024, "maxmem": 4096, "uptime": 100},
+    {"id": "qemu/100", "type": "qemu", "node": "pve1", "vmid": 100, "name": "web",
+     "status": "running", "maxcpu": 2, "mem": 512, "maxmem": 2048, "cpu": 0.1},
+    {"id": "lxc/200", "type": "lxc", "node": "pve1", "vmid": 200, "name": "db",
+     "status": "stopped", "maxcpu": 1, "mem": 0, "maxmem": 1024},
+]
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    mock = Mock()
+    mock.cluster.resources.get.return_value = [dict(r) for r in RESOURCES]
+    return mock
+
+@pytest.fixture
+def inventory(mock_proxmox):
+    """Fixture to create an inventory with fast adaptive bounds."""
+    return ClusterInventory(mock_proxmox, InventoryConfig(min_interval=1, max_interval=8))
+
+def test_refresh_detects_changes(inventory, mock_proxmox):
+    """Test incremental change detection between snapshots."""
+    assert inventory.refresh() == {"added": 3, "removed": 0, "changed": 0, "structural": 0}
+    unchanged = inventory._resources["lxc/200"]
+
+    updated = [dict(r) for r in RESOURCES[:2]]
+    updated[1]["cpu"] = 0.5
+    mock_proxmox.cluster.resources.get.return_value = updated
+
+    counts = inventory.refresh()
+    assert counts == {"added": 0, "removed": 1, "changed": 1, "structural": 0}
+    assert inventory.get("lxc/200") is None
+    assert inventory.get("qemu/100")["cpu"] == 0.5
+    assert unchanged["name"] == "db"
+
+def test_unchanged_entries_keep_identity(inventory, mock_proxmox):
+    """Test that only changed entries are replaced."""
+    inventory.refresh()
+    node_entry = inventory._resources["node/pve1"]
+    updated = [dict(r) for r in RESOURCES]
+    updated[1]["status"] = "stopped"
+    mock_proxmox.cluster.resources.get.return_value = updated
+
+    counts = inventory.refresh()
+    assert counts["structural"] == 1
+    assert inventory._resources["node/pve1"] is node_entry
+
+def test_interval_adapts(inventory):
+    """Test that the interval backs off while idle and speeds up on change."""
+    inventory.refresh()
+    assert inventory.report()["interval_seconds"] == 1
+    inventory.refresh()
+    inventory.refresh()
+    assert inventory.report()["interval_seconds"] == 2.25
+
+def test_resources_filter_and_freshness(inventory):
+    """Test typed lookups and staleness handling."""
+    assert not inventory.is_fresh()
+    inventory.refresh()
+    assert inventory.is_fresh()
+    assert [r["vmid"] for r in inventory.resources("qemu")] == [100]
+    assert inventory.resources("lxc", node="pve2") == []
+
+def test_vm_listing_uses_fresh_inventory(inventory, mock_proxmox):
+    """Test that get_vms answers from memory when the inventory is fresh."""
+    inventory.refresh()
+    tools = VMTools(mock_proxmox, inventory)
+
+    response = tools.get_vms()
+
+    assert "web (ID: 100)" in response[0].text
+    mock_proxmox.nodes.get.assert_not_called()
+
+def test_inventory_and_live_listings_agree(inventory, mock_proxmox):
+    """Test that templates and CPU counts match with and without the inventory."""
+    resources = [dict(r) for r in RESOURCES] + [
+        {"id": "qemu/9000", "type": "qemu", "node": "pve1", "vmid": 9000, "name": "tpl",
+         "status": "stopped", "template": 1, "maxcpu": 4, "mem": 0, "maxmem": 2048},
+    ]
+    mock_proxmox.cluster.resources.get.return_value = resources
+    inventory.refresh()
+    node = mock_proxmox.nodes.return_value
+    mock_proxmox.nodes.get.return_value = [{"node": "pve1", "status": "online"}]
+    node.qemu.get.return_value = [
+        {"vmid": r["vmid"], "name": r["name"], "status": r["status"], "cpus": r["maxcpu"],
+         "mem": r["mem"], "maxmem": r["maxmem"], **({"template": 1} if r.get("template") else {})}
+        for r in resources if r["type"] == "qemu"
+    ]
+    node.lxc.get.return_value = [{"vmid": 200, "name": "db", "status": "stopped", "cpus": 1}]
+    # Config cores per socket differ from the vCPU count of a 2-socket VM
+    node.qemu.return_value.config.get.return_value = {"cores": 1, "sockets": 2}
+    node.lxc.return_value.config.get.return_value = {"cores": 4, "cpulimit": 1, "memory": 1024}
+    node.lxc.return_value.status.current.get.return_value = {"status": "stopped", "maxmem": 1024}
+
+    def listed(tools):
+        vms = [(vm["vmid"], vm["cpus"]) for vm in tools[0]._iter_vms()]
+        cts = [(ct["vmid"], ct["cores"]) for ct in tools[1]._iter_rows(None, True, False, "json")]
+        return vms, cts
+
+    cached = listed((VMTools(mock_proxmox, inventory), ContainerTools(mock_proxmox, inventory)))
+    live = listed((VMTools(mock_proxmox), ContainerTools(mock_proxmox)))
+
+    assert cached == live == ([(100, 2), (9000, 4)], [("200", 1)])
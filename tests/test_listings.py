@@ -0,0 +1,103 @@
+"""
+Tests for the stale-while-revalidate listing cache.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import Config, ListingCacheConfig
+from proxmox_mcp.core.listings import ListingCache
+from proxmox_mcp.tools.cluster import ClusterTools
+
+def cache(**options):
+    return ListingCache(ListingCacheConfig(**options))
+
+def wait_idle(listings):
+    deadline = time.monotonic() + 2
+    while listings.report()["refreshing"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+def test_fresh_then_stale_with_one_refresh():
+    """Test that an expired entry is served at once while one refresh runs."""
+    listings = cache(ttl=0.05, max_stale=60)
+    release = threading.Event()
+    values = iter(["v1", "v2"])
+
+    def compute():
+        value = next(values)
+        if value == "v2":
+            release.wait(2)
+        return value
+
+    assert listings.get("get_vms", (), compute) == ("v1", None)
+    assert listings.get("get_vms", (), compute) == ("v1", None)
+    time.sleep(0.06)
+    for _ in range(3):
+        value, age = listings.get("get_vms", (), compute)
+        assert value == "v1"
+        assert age >= 0.05
+    release.set()
+    wait_idle(listings)
+
+    assert listings.get("get_vms", (), compute) == ("v2", None)
+    report = listings.report()["tools"]["get_vms"]
+    assert (report["fresh"], report["stale"], report["refreshes"]) == (2, 3, 1)
+
+def test_concurrent_misses_compute_once():
+    """Test that callers of a missing listing share one computation."""
+    listings = cache()
+    compute = Mock(side_effect=lambda: time.sleep(0.05) or "nodes")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(listings.get("get_nodes", (), compute)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [("nodes", None)] * 5
+    assert compute.call_count == 1
+    assert listings.report()["tools"]["get_nodes"]["joined"] == 4
+
+def test_failed_refresh_and_invalidation():
+    """Test that a failed refresh keeps the entry and writes drop it."""
+    listings = cache(ttl=0, max_stale=60)
+    listings.get("get_storage", (), lambda: "old")
+    _, age = listings.get("get_storage", (), Mock(side_effect=RuntimeError("timeout")))
+    assert age is not None
+    wait_idle(listings)
+    assert listings.get("get_storage", (), Mock())[0] == "old"
+    assert listings.report()["tools"]["get_storage"]["refresh_errors"] == 1
+
+    listings.invalidate()
+    with pytest.raises(RuntimeError):
+        listings.get("get_storage", (), Mock(side_effect=RuntimeError("timeout")))
+    assert listings.get("get_storage", (), lambda: "new", refresh=True) == ("new", None)
+
+def test_per_tool_bounds_from_config():
+    """Test that per-tool bounds from the JSON config override the defaults."""
+    config = Config(**{
+        "proxmox": {"host": "pve"},
+        "auth": {"user": "root@pam", "token_name": "t", "token_value": "v"},
+        "logging": {},
+        "listings": {"ttl": 5, "max_stale": 60, "tools": {"get_cluster_status": {"max_stale": 0}}},
+    })
+    listings = ListingCache(config.listings)
+    assert listings.bounds("get_vms") == (5, 60)
+    assert listings.bounds("get_cluster_status") == (5, 0)
+
+def test_stale_listing_is_flagged():
+    """Test that a tool serving an expired listing reports its age."""
+    proxmox = Mock()
+    proxmox.cluster.status.get.return_value = [{"type": "cluster", "name": "lab", "quorate": 1}]
+    tools = ClusterTools(proxmox, metrics=Mock(), listings=cache(ttl=0, max_stale=60))
+
+    fresh = tools.get_cluster_status()
+    stale = tools.get_cluster_status()
+    assert len(fresh) == 1
+    assert stale[0].text == fresh[0].text
+    assert "Cached result from" in stale[1].text
+    wait_idle(tools.listings)
+    assert proxmox.cluster.status.get.call_count == 2
@@ -0,0 +1,119 @@
+"""
+Tests for the queued, structured logging pipeline.
+"""
+
+import json
+import logging
+import queue
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from proxmox_mcp.config.models import LoggingConfig
+from proxmox_mcp.core.logging import (
+    NonBlockingQueueHandler,
+    RepeatLimiter,
+    RequestIdMiddleware,
+    logging_report,
+    request_id,
+    setup_logging,
+    shutdown_logging,
+)
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Fixture restoring the root logger after each test."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield tmp_path / "mcp.log"
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+def read_json(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_queued_json_records(log_file):
+    """Test that records are written by the background writer as JSON with request IDs."""
+    logger = setup_logging(LoggingConfig(level="DEBUG", file=str(log_file), json_format=True))
+    token = request_id.set("req-1")
+    try:
+        logger.info("listing %d guests", 3, extra={"tool": "get_vms"})
+    finally:
+        request_id.reset(token)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("tool failed")
+    shutdown_logging()
+
+    first, second = read_json(log_file)
+    assert first["message"] == "listing 3 guests"
+    assert first["request_id"] == "req-1"
+    assert first["tool"] == "get_vms"
+    assert first["level"] == "INFO"
+    assert second["request_id"] == "-"
+    assert "ValueError: boom" in second["exc_info"]
+
+def test_repeat_limiter_burst_sample_and_summary():
+    """Test per call site limiting: burst, sampling, then a summary record."""
+    limiter = RepeatLimiter(window=60, burst=3, sample=5)
+    record = lambda: logging.LogRecord("proxmox-mcp.vm", logging.DEBUG, "vm.py", 10, "raw", None, None)
+
+    passed = [limiter.filter(record()) for _ in range(13)]
+    assert passed == [True] * 3 + [False] * 4 + [True] + [False] * 4 + [True]
+    assert limiter.suppressed_total == 8
+
+    # Other call sites and warnings are not affected
+    assert limiter.filter(logging.LogRecord("proxmox-mcp.vm", logging.DEBUG, "vm.py", 11, "x", None, None))
+    assert all(limiter.filter(logging.LogRecord("proxmox-mcp.vm", logging.WARNING, "vm.py", 10, "w", None, None))
+               for _ in range(10))
+
+    # Next window: the first record reports what was suppressed
+    limiter.window = 0.0001
+    summary = record()
+    assert limiter.filter(summary)
+    assert summary.getMessage() == "raw [8 similar messages suppressed]"
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that a full queue drops records and counts them."""
+    handler = NonBlockingQueueHandler(queue.Queue(2))
+    for i in range(5):
+        handler.handle(logging.LogRecord("proxmox-mcp", logging.INFO, "x.py", 1, "msg %d", (i,), None))
+
+    assert handler.enqueued == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "msg 0"
+
+def test_request_id_middleware(log_file):
+    """Test that request IDs reach the records and are echoed to the client."""
+    setup_logging(LoggingConfig(level="INFO", file=str(log_file), json_format=True))
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/ping")
+    def ping():
+        logging.getLogger("proxmox-mcp.test").info("pong")
+        return {"ok": True}
+
+    with TestClient(app) as client:
+        given = client.get("/ping", headers={"X-Request-ID": "client-42"})
+        generated = client.get("/ping")
+    shutdown_logging()
+
+    assert given.headers["x-request-id"] == "client-42"
+    assert len(generated.headers["x-request-id"]) == 16
+    ids = [r["request_id"] for r in read_json(log_file) if r["message"] == "pong"]
+    assert ids == ["client-42", generated.headers["x-request-id"]]
+
+def test_report_counts(log_file):
+    """Test the admin counters of the pipeline."""
+    logger = setup_logging(LoggingConfig(level="DEBUG", file=str(log_file), repeat_burst=1, repeat_sample=0))
+    for _ in range(4):
+        logger.debug("hot path")
+
+    report = logging_report()
+    assert report["queued"] is True
+    assert report["enqueued"] == 1
+    assert report["suppressed"] == 3
+    assert report["dropped"] == 0
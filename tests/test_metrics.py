@@ -0,0 +1,182 @@
+"""
+Tests for the bulk metrics engine.
+"""
+
+import math
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import InventoryConfig, MetricsConfig
+from proxmox_mcp.core.inventory import ClusterInventory
+from proxmox_mcp.core.metrics import MetricsEngine, SeriesRing, aggregate
+from proxmox_mcp.tools.containers import ContainerTools
+
+def _cts(count):
+    """Build /cluster/resources entries for `count` idle containers."""
+    return [
+        {"id": f"lxc/{200 + i}", "type": "lxc", "node": "pve1", "vmid": 200 + i,
+         "name": f"ct{i}", "status": "running", "cpu": 0.02, "mem": 256 * 2**20,
+         "maxmem": 512 * 2**20}
+        for i in range(count)
+    ]
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    mock = Mock()
+    mock.cluster.resources.get.return_value = _cts(3)
+    return mock
+
+def test_ring_wraps_and_rejects_old_samples():
+    """Test ring capacity, ordering and duplicate rejection."""
+    ring = SeriesRing(3, fields=("cpu",))
+    for ts in (1, 2, 3, 4):
+        assert ring.append(ts, {"cpu": ts / 10})
+    assert not ring.append(4, {"cpu": 1.0})
+
+    times, cols = ring.window()
+    assert times == [2, 3, 4]
+    assert cols["cpu"] == [0.2, 0.3, 0.4]
+    assert ring.window(since=3)[0] == [4]
+
+def test_ring_missing_values_are_nan():
+    """Test that unreported fields are stored as NaN."""
+    ring = SeriesRing(2)
+    ring.append(1, {"cpu": 0.5})
+    assert math.isnan(ring.latest()["netin"])
+
+def test_latest_is_one_bulk_call(mock_proxmox):
+    """Test that latest() reuses one bulk sample within the TTL."""
+    engine = MetricsEngine(mock_proxmox, config=MetricsConfig(sample_ttl=60))
+
+    assert set(engine.latest("lxc")) == {"lxc/200", "lxc/201", "lxc/202"}
+    engine.latest("lxc", node="pve1")
+
+    assert mock_proxmox.cluster.resources.get.call_count == 1
+    assert engine.report()["bulk_fetches"] == 1
+
+def test_inventory_refresh_feeds_engine(mock_proxmox):
+    """Test that inventory snapshots are ingested without extra calls."""
+    inventory = ClusterInventory(mock_proxmox, InventoryConfig())
+    engine = MetricsEngine(mock_proxmox, inventory)
+    inventory.refresh()
+
+    assert engine.latest("lxc")["lxc/201"]["name"] == "ct1"
+    assert mock_proxmox.cluster.resources.get.call_count == 1
+    assert len(engine.series("lxc/200")[0]) == 1
+
+def test_rrd_cached_until_next_step(mock_proxmox):
+    """Test that RRD rows are only re-requested once a new step is due."""
+    now = int(time.time()) // 60 * 60
+    guest = mock_proxmox.nodes.return_value.lxc.return_value
+    guest.rrddata.get.return_value = [
+        {"time": now - 60, "cpu": 0.1, "mem": 1, "maxmem": 2},
+        {"time": now, "cpu": None},
+    ]
+    engine = MetricsEngine(mock_proxmox)
+
+    assert engine.rrd_last("pve1", "lxc", 200)["cpu"] == 0.1
+    engine.rrd_last("pve1", "lxc", 200)
+
+    assert guest.rrddata.get.call_count == 1
+    assert engine.report()["rrd_cache_hits"] == 1
+
+def test_rrd_fetch_error_is_not_cached(mock_proxmox):
+    """Test that a failed RRD fetch is retried and vanished guests are evicted."""
+    now = int(time.time()) // 60 * 60
+    guest = mock_proxmox.nodes.return_value.lxc.return_value
+    guest.rrddata.get.side_effect = [
+        RuntimeError("timeout"),
+        [{"time": now, "cpu": 0.3, "mem": 1, "maxmem": 2}],
+    ]
+    engine = MetricsEngine(mock_proxmox)
+
+    with pytest.raises(RuntimeError):
+        engine.rrd("pve1", "lxc", 200)
+    assert engine.rrd_last("pve1", "lxc", 200)["cpu"] == 0.3
+    assert guest.rrddata.get.call_count == 2
+
+    engine.ingest(_cts(3))
+    assert engine.report()["rrd_series"] == 1
+    engine.ingest(_cts(3)[1:])
+    assert engine.report()["rrd_series"] == 0
+
+def test_container_listing_avoids_per_guest_rrd(mock_proxmox):
+    """Test that idle containers are filled from one bulk sample."""
+    node = mock_proxmox.nodes.return_value
+    mock_proxmox.nodes.get.return_value = [{"node": "pve1"}]
+    node.lxc.get.return_value = _cts(3)
+    node.lxc.return_value.status.current.get.return_value = {
+        "status": "running", "cpu": 0, "mem": 0, "maxmem": 0
+    }
+    node.lxc.return_value.config.get.return_value = {"cores": 1, "memory": 512}
+    tools = ContainerTools(mock_proxmox)
+
+    response = tools.get_containers(format_style="json")
+
+    assert '"cpu_pct": 2.0' in response[0].text
+    node.lxc.return_value.rrddata.get.assert_not_called()
+    assert mock_proxmox.cluster.resources.get.call_count == 1
+
+def test_aggregate_ignores_gaps():
+    """Test reductions over a series with missing samples."""
+    values = [10.0, float("nan"), 20.0, 30.0, 40.0]
+    result = aggregate(values, ("mean", "max", "p50", "p95", "last"))
+
+    assert result == {"mean": 25.0, "max": 40.0, "p50": 25.0, "p95": 38.5, "last": 40.0}
+    assert aggregate([float("nan")], ("mean",)) == {"mean": None}
+    with pytest.raises(ValueError):
+        aggregate([1.0], ("median",))
+
+def test_query_ranks_and_filters(mock_proxmox):
+    """Test top-K ranking with a threshold across guests."""
+    now = time.time()
+    usage = {200: 0.9, 201: 0.5, 202: 0.85}
+
+    def lxc(vmid):
+        guest = Mock()
+        guest.rrddata.get.return_value = [
+            {"time": now - 600, "cpu": usage[vmid]},
+            {"time": now - 300, "cpu": usage[vmid] - 0.02},
+            {"time": now - 2 * 86400, "cpu": 0.0},
+        ]
+        return guest
+
+    mock_proxmox.nodes.return_value.lxc.side_effect = lxc
+    engine = MetricsEngine(mock_proxmox)
+
+    result = engine.query("cpu", "day", "max", rtype="lxc", top=1, threshold=80)
+
+    assert result["evaluated"] == 3
+    assert result["matched"] == 2
+    assert [(r["vmid"], r["value"]) for r in result["results"]] == [(200, 90.0)]
+    with pytest.raises(ValueError):
+        engine.query("temperature")
+
+def test_storage_series_are_kept_per_node(mock_proxmox):
+    """Test that same-named local storages on two nodes keep separate RRD series."""
+    now = time.time()
+    used = {"pve1": 10, "pve2": 90}
+    mock_proxmox.cluster.resources.get.return_value = [
+        {"id": f"storage/{node}/local", "type": "storage", "node": node, "storage": "local",
+         "disk": pct, "maxdisk": 100}
+        for node, pct in used.items()
+    ]
+
+    def node_api(name):
+        api = Mock()
+        api.storage.return_value.rrddata.get.return_value = [
+            {"time": now - 300, "used": used[name], "total": 100},
+        ]
+        return api
+
+    mock_proxmox.nodes.side_effect = node_api
+    engine = MetricsEngine(mock_proxmox)
+
+    result = engine.query("disk_pct", "day", "max", rtype="storage", top=None)
+
+    assert sorted((r["id"], r["value"]) for r in result["results"]) == [
+        ("storage/pve1/local", 10.0), ("storage/pve2/local", 90.0),
+    ]
+    assert engine.report()["rrd_series"] == 2
@@ -0,0 +1,69 @@
+"""
+Tests for concurrent node status collection.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import NodeConfig
+from proxmox_mcp.tools.node import NodeTools
+
+@pytest.fixture
+def release():
+    """Event unblocking the fenced node's status call."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+@pytest.fixture
+def mock_proxmox(release):
+    """Fixture to create a mock ProxmoxAPI instance with one hanging node."""
+    mock = Mock()
+    mock.nodes.get.return_value = [
+        {"node": "pve1", "status": "online", "mem": 1, "maxmem": 2},
+        {"node": "pve2", "status": "online", "mem": 3, "maxmem": 4, "maxcpu": 16, "uptime": 50},
+        {"node": "pve3", "status": "offline"},
+    ]
+    calls = []
+
+    def node(name):
+        calls.append(name)
+        api = Mock()
+        if name == "pve2":
+            api.status.get.side_effect = lambda: release.wait(5) or {}
+        else:
+            api.status.get.return_value = {
+                "uptime": 100, "cpuinfo": {"cpus": 8},
+                "memory": {"used": 1024, "total": 4096},
+            }
+        return api
+
+    mock.nodes.side_effect = node
+    mock.calls = calls
+    return mock
+
+def test_slow_node_marked_stale(mock_proxmox):
+    """Test that a hanging node doesn't delay the others past the deadline."""
+    tools = NodeTools(mock_proxmox, config=NodeConfig(status_deadline=0.2))
+
+    started = time.monotonic()
+    response = tools.get_nodes()
+    elapsed = time.monotonic() - started
+
+    text = response[0].text
+    assert elapsed < 2
+    assert "Partial data (live status unavailable: no status within 0.2s)" in text
+    assert "CPU Cores: 8" in text and "CPU Cores: 16" in text
+    assert "pve3" not in mock_proxmox.calls
+
+def test_inflight_status_is_reused(mock_proxmox):
+    """Test that a still-running status call is joined instead of repeated."""
+    tools = NodeTools(mock_proxmox, config=NodeConfig(status_deadline=0.1))
+
+    tools.get_nodes()
+    tools.get_nodes()
+
+    assert mock_proxmox.calls.count("pve2") == 1
+    assert mock_proxmox.calls.count("pve1") == 2
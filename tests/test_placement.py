@@ -0,0 +1,228 @@
+"""
+Tests for the placement recommender.
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import MetricsConfig, PlacementConfig
+from proxmox_mcp.core.metrics import MetricsEngine
+from proxmox_mcp.core.placement import PlacementEngine, PlacementError
+from proxmox_mcp.tools.vm import VMTools
+
+GIB = 1024 ** 3
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1", "status": "online",
+     "maxcpu": 8, "mem": 20 * GIB, "maxmem": 32 * GIB},
+    {"id": "node/pve2", "type": "node", "node": "pve2", "status": "online",
+     "maxcpu": 8, "mem": 8 * GIB, "maxmem": 32 * GIB},
+    {"id": "node/pve3", "type": "node", "node": "pve3", "status": "offline",
+     "maxcpu": 64, "mem": 0, "maxmem": 512 * GIB},
+    {"id": "qemu/100", "type": "qemu", "node": "pve2", "vmid": 100, "maxcpu": 4},
+    {"id": "storage/pve1/local-lvm", "type": "storage", "node": "pve1", "storage": "local-lvm",
+     "plugintype": "lvmthin", "content": "images,rootdir", "disk": 0, "maxdisk": 1000 * GIB,
+     "status": "available"},
+    {"id": "storage/pve2/local", "type": "storage", "node": "pve2", "storage": "local",
+     "plugintype": "dir", "content": "iso,vztmpl", "disk": 0, "maxdisk": 1000 * GIB,
+     "status": "available"},
+    {"id": "storage/pve2/local-lvm", "type": "storage", "node": "pve2", "storage": "local-lvm",
+     "plugintype": "lvmthin", "content": "images,rootdir", "disk": 900 * GIB, "maxdisk": 1000 * GIB,
+     "status": "available"},
+    {"id": "storage/pve2/ceph", "type": "storage", "node": "pve2", "storage": "ceph",
+     "plugintype": "rbd", "content": "images", "disk": 100 * GIB, "maxdisk": 1000 * GIB,
+     "status": "available", "shared": 1},
+]
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    mock = Mock()
+    mock.cluster.resources.get.return_value = [dict(r) for r in RESOURCES]
+    return mock
+
+@pytest.fixture
+def placement(mock_proxmox):
+    """Fixture to create a placement engine over a cached snapshot."""
+    metrics = MetricsEngine(mock_proxmox, config=MetricsConfig(sample_ttl=60))
+    return PlacementEngine(metrics, PlacementConfig())
+
+def test_picks_node_and_storage_with_headroom(placement):
+    """Test that the best node and an images-capable storage are chosen."""
+    result = placement.place(cpus=2, memory_mb=4096, disk_gb=50)
+
+    assert result["node"] == "pve2"
+    assert result["storage"] == "ceph"
+    assert result["storage_type"] == "rbd"
+    assert result["cpu_commit_after"] == 0.75
+
+def test_fixed_node_and_content_filter(placement):
+    """Test constraints on node and storage content."""
+    assert placement.place(2, 1024, 10, node="pve1")["storage"] == "local-lvm"
+    with pytest.raises(PlacementError):
+        placement.place(2, 1024, 10, node="pve2", storage="local")
+    with pytest.raises(PlacementError):
+        placement.place(2, 10240, 10, node="pve1")
+
+def test_reservations_spread_bulk_creations(placement):
+    """Test that reserved capacity steers the next placements elsewhere."""
+    nodes = [placement.place(2, 8192, 10, vmid=200 + i)["node"] for i in range(3)]
+
+    assert nodes == ["pve2", "pve1", "pve2"]
+    with pytest.raises(PlacementError):
+        placement.place(2, 8192, 10)
+    placement.release(200)
+    assert all(r["vmid"] != 200 for r in placement._reservations)
+
+def test_create_vm_auto_skips_storage_listing(mock_proxmox, placement):
+    """Test that create_vm with auto placement needs no storage API call."""
+    node = mock_proxmox.nodes.return_value
+    node.qemu.return_value.config.get.side_effect = Exception("VM 300 does not exist")
+    node.qemu.create.return_value = "UPID:pve2:0001:0002:65000000:qmcreate:300:root@pam:"
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    response = tools.create_vm("auto", "300", "auto-vm", 2, 2048, 20, storage="auto")
+
+    mock_proxmox.nodes.assert_any_call("pve2")
+    node.storage.get.assert_not_called()
+    assert node.qemu.create.call_args.kwargs["scsi0"] == "ceph:20,format=raw"
+    assert "Placement: auto" in response[0].text
+
+def test_create_vm_existing_id_releases_reservation(mock_proxmox, placement):
+    """Test that a rejected create_vm does not keep its placement reservation."""
+    mock_proxmox.nodes.return_value.qemu.return_value.config.get.return_value = {"name": "taken"}
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    with pytest.raises(ValueError, match="already exists"):
+        tools.create_vm("auto", "300", "auto-vm", 2, 2048, 20, storage="auto")
+
+    assert placement._reservations == []
+
+def test_vmids_allocated_once_and_reserved(mock_proxmox, placement):
+    """Test one-shot VMID allocation skipping used and handed-out IDs."""
+    mock_proxmox.cluster.nextid.get.return_value = "99"
+
+    first = placement.allocate_vmids(3)
+    second = placement.allocate_vmids(2)
+    placement.release(102)
+
+    assert first == [101, 102, 103]
+    assert second == [104, 105]
+    assert placement.allocate_vmids(1) == [102]
+    assert mock_proxmox.cluster.nextid.get.call_count == 3
+
+def test_bulk_create_lists_storage_once_per_node(mock_proxmox, placement):
+    """Test that a fixed-node batch shares one storage lookup and one wait."""
+    node = mock_proxmox.nodes.return_value
+    node.storage.get.return_value = [
+        {"storage": "local-lvm", "type": "lvmthin", "content": "images,rootdir"}
+    ]
+    node.qemu.create.side_effect = lambda **cfg: (
+        f"UPID:pve1:0001:0002:65000000:qmcreate:{cfg['vmid']}:root@pam:"
+    )
+    node.tasks.get.return_value = []
+    node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    response = tools.bulk_create_vms(5, "ci-{index}", node="pve1", start_vmid=300)
+
+    assert node.storage.get.call_count == 1
+    assert node.qemu.create.call_count == 5
+    names = sorted(c.kwargs["name"] for c in node.qemu.create.call_args_list)
+    assert names == ["ci-1", "ci-2", "ci-3", "ci-4", "ci-5"]
+    node.qemu.return_value.config.get.assert_not_called()
+    assert "5 requested, 5 ok, 0 running, 0 failed" in response[0].text
+
+def test_bulk_create_planning_error_releases_vmids(mock_proxmox, placement):
+    """Test that an unexpected planning failure hands back the batch's VMIDs."""
+    mock_proxmox.nodes.return_value.storage.get.side_effect = Exception("connection reset")
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    with pytest.raises(RuntimeError):
+        tools.bulk_create_vms(3, node="pve1", start_vmid=320)
+
+    assert placement.allocate_vmids(3, 320) == [320, 321, 322]
+
+def test_bulk_create_reports_per_vm_failures(mock_proxmox, placement):
+    """Test that placement and API failures are reported per VM."""
+    node = mock_proxmox.nodes.return_value
+    node.qemu.create.side_effect = [
+        Exception("storage locked"),
+        "UPID:pve1:1:2:65000000:qmcreate:401:root@pam:",
+        "UPID:pve2:1:2:65000000:qmcreate:402:root@pam:",
+    ]
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    response = tools.bulk_create_vms(4, cpus=2, memory=8192, start_vmid=400, max_parallel=1, wait=False)
+
+    assert node.qemu.create.call_count == 3
+    assert "storage locked" in response[0].text
+    assert "vm-4 (ID: 403, auto): ❌ No capacity" in response[0].text
+    assert "2 running, 2 failed" in response[0].text
+    with pytest.raises(ValueError):
+        tools.bulk_create_vms(2, name_pattern="vm-{host}")
+
+def _template(mock_proxmox, disk, storage_type, shared):
+    """Register template 9000 on pve2 with one disk."""
+    resources = [dict(r) for r in RESOURCES]
+    resources.append({"id": "qemu/9000", "type": "qemu", "node": "pve2", "vmid": 9000,
+                      "template": 1, "maxcpu": 2})
+    mock_proxmox.cluster.resources.get.return_value = resources
+    node = mock_proxmox.nodes.return_value
+    node.qemu.return_value.config.get.return_value = {
+        "template": 1, "cores": 2, "memory": 2048, "scsi0": disk,
+        "ide2": "ceph:vm-9000-cloudinit,media=cdrom",
+    }
+    node.storage.get.return_value = [
+        {"storage": disk.split(":")[0], "type": storage_type, "shared": int(shared), "content": "images"}
+    ]
+    node.qemu.return_value.clone.post.side_effect = lambda **p: (
+        f"UPID:pve2:0001:0002:65000000:qmclone:{p['newid']}:root@pam:"
+    )
+    node.tasks.get.return_value = []
+    node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+    return node
+
+def test_bulk_linked_clones_from_template(mock_proxmox, placement):
+    """Test that a template on copy-on-write storage is linked-cloned."""
+    node = _template(mock_proxmox, "ceph:base-9000-disk-0,size=32G", "rbd", True)
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    response = tools.bulk_create_vms(3, "ci-{index}", template_vmid=9000, start_vmid=500)
+
+    calls = node.qemu.return_value.clone.post.call_args_list
+    assert sorted(c.kwargs["newid"] for c in calls) == [500, 501, 502]
+    assert all(c.kwargs["full"] == 0 and "storage" not in c.kwargs for c in calls)
+    node.qemu.create.assert_not_called()
+    assert "(ID: 500, pve2/ceph, linked clone): ✅" in response[0].text
+    assert "3 requested, 3 ok" in response[0].text
+
+def test_bulk_full_clone_fallback(mock_proxmox, placement):
+    """Test full clones for raw images on local file storage."""
+    node = _template(mock_proxmox, "local:9000/base-9000-disk-0.raw,size=10G", "dir", False)
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    with pytest.raises(ValueError):
+        tools.bulk_create_vms(2, template_vmid=9000, full_clone=False)
+    with pytest.raises(ValueError):
+        tools.bulk_create_vms(2, template_vmid=9000, node="pve1")
+    response = tools.bulk_create_vms(2, template_vmid=9000, node="pve2", start_vmid=600)
+
+    calls = node.qemu.return_value.clone.post.call_args_list
+    assert [c.kwargs["full"] for c in calls] == [1, 1]
+    assert "pve2/local, full clone" in response[0].text
+
+def test_bulk_clone_timeout_bounds_whole_batch(mock_proxmox, placement):
+    """Test that clones queued behind a storage slot share one deadline."""
+    node = _template(mock_proxmox, "ceph:base-9000-disk-0,size=32G", "rbd", True)
+    node.tasks.return_value.status.get.return_value = {"status": "running"}
+    tools = VMTools(mock_proxmox, placement=placement)
+
+    started = time.monotonic()
+    response = tools.bulk_create_vms(3, template_vmid=9000, start_vmid=700,
+                                     per_storage_parallel=1, timeout=0.3)
+
+    assert time.monotonic() - started < 0.6  # 3 x 0.3 s with a timeout per clone
+    assert node.qemu.return_value.clone.post.call_count == 3
+    assert "3 running" in response[0].text
@@ -0,0 +1,63 @@
+"""
+Tests for the runtime profiler and per-tool time accounting.
+"""
+
+import threading
+import time
+
+import pytest
+
+from proxmox_mcp.core.profiler import SamplingProfiler, ToolStats
+
+def _busy_worker(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+def test_profile_returns_collapsed_stacks():
+    """Test that samples are rendered root-first with counts."""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy")
+    worker.start()
+    try:
+        output = SamplingProfiler().profile(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = output.splitlines()
+    assert lines
+    busy = [line for line in lines if line.startswith("thread:busy;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "_busy_worker" in stack
+
+def test_profile_rejects_concurrent_sessions():
+    """Test that only one profiling session may run at a time."""
+    profiler = SamplingProfiler()
+    thread = threading.Thread(target=profiler.profile, args=(0.3,))
+    thread.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(RuntimeError, match="already running"):
+            profiler.profile(0.1)
+    finally:
+        thread.join()
+    assert not profiler.running
+
+def test_tool_stats_tracks_calls_and_errors():
+    """Test cumulative per-tool counters."""
+    stats = ToolStats()
+    with stats.track("get_vms"):
+        sum(range(10000))
+    with pytest.raises(ValueError):
+        with stats.track("get_vms"):
+            raise ValueError("boom")
+
+    snapshot = stats.snapshot()
+    assert snapshot["get_vms"]["calls"] == 2
+    assert snapshot["get_vms"]["errors"] == 1
+    assert snapshot["get_vms"]["cpu_seconds"] >= 0.0
+
+    stats.reset()
+    assert stats.snapshot() == {}
@@ -0,0 +1,72 @@
+"""
+Tests for the precompiled list rendering.
+"""
+
+from proxmox_mcp.formatting import ProxmoxTemplates, ProxmoxTheme
+from proxmox_mcp.formatting.renderer import RenderBuffer, RowLayout, format_bytes
+
+def _loop_format_bytes(bytes_value):
+    """Reference unit loop the fast path must match."""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if bytes_value < 1024:
+            return f"{bytes_value:.2f} {unit}"
+        bytes_value /= 1024
+    return f"{bytes_value:.2f} TB"
+
+def test_format_bytes_matches_unit_loop():
+    """Test unit boundaries, floats and PiB-scale values."""
+    values = [0, 1, 1023, 1024, 1025, 1536.5, 1024 ** 2 - 1, 1024 ** 3, 123456789012,
+              1024 ** 4 - 1, 1024 ** 5, 3 * 1024 ** 6, -5]
+    for i in range(64):
+        values.extend([2 ** i - 1, 2 ** i, 2 ** i + 0.5])
+    for value in values:
+        assert format_bytes(value) == _loop_format_bytes(value), value
+        assert format_bytes(value) == _loop_format_bytes(value), value  # memoized path
+
+def test_row_layout_compiles_constants_and_fields():
+    """Test baked-in constants, printf specs and literal percent signs."""
+    layout = RowLayout("{icon} {name}", "  • Usage: {pct:.1f}% of {total}", icon="*")
+
+    assert layout.fields == ("name", "pct", "total")
+    assert layout.render(("a", 12.345, "1.00 GB")) == "\n* a\n  • Usage: 12.3% of 1.00 GB"
+
+    out = RenderBuffer("Header")
+    out.write(layout.render(("b", 0, "0.00 B")))
+    out.line("tail")
+    assert out.getvalue() == "Header\n* b\n  • Usage: 0.0% of 0.00 B\ntail"
+
+def test_vm_list_output():
+    """Test the rendered VM list line by line."""
+    vms = [{"vmid": 100, "name": "web", "node": "pve1", "status": "running", "cpus": 2,
+            "memory": {"used": 512 * 1024 ** 2, "total": 2 * 1024 ** 3}},
+           {"vmid": 101, "name": "db", "node": "pve2", "status": "stopped",
+            "memory": {"used": 0, "total": 0}}]
+    icon = ProxmoxTheme.RESOURCES['vm']
+
+    assert ProxmoxTemplates.vm_list(vms).split("\n") == [
+        f"{icon} Virtual Machines",
+        "",
+        f"{icon} web (ID: 100)",
+        "  • Status: RUNNING",
+        "  • Node: pve1",
+        "  • CPU Cores: 2",
+        "  • Memory: 512.00 MB / 2.00 GB (25.0%)",
+        "",
+        f"{icon} db (ID: 101)",
+        "  • Status: STOPPED",
+        "  • Node: pve2",
+        "  • CPU Cores: N/A",
+        "  • Memory: 0.00 B / 0.00 B (0.0%)",
+    ]
+
+def test_node_list_optional_lines():
+    """Test stale and disk lines of the node list."""
+    nodes = [{"node": "pve1", "status": "online", "uptime": 90061, "maxcpu": 8,
+              "memory": {"used": 1024 ** 3, "total": 4 * 1024 ** 3}, "stale": True,
+              "stale_reason": "timeout", "disk": {"used": 10 * 1024 ** 3, "total": 100 * 1024 ** 3}}]
+
+    lines = ProxmoxTemplates.node_list(nodes).split("\n")
+
+    assert lines[6] == "  • Memory: 1.00 GB / 4.00 GB (25.0%)"
+    assert lines[7] == f"  {ProxmoxTheme.STATUS['warning']} Partial data (live status unavailable: timeout)"
+    assert lines[8] == "  • Disk: 10.00 GB / 100.00 GB (10.0%)"
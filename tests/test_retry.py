@@ -0,0 +1,97 @@
+"""
+Tests for the retry policy of Proxmox API requests.
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from proxmox_mcp.config.models import GovernorConfig, RetryConfig
+from proxmox_mcp.core.governor import GovernedSession, UpstreamGovernor
+from proxmox_mcp.core.retry import RetryPolicy
+
+BASE = "https://pve:8006/api2/json"
+
+def response(status=200, data=None, headers=None):
+    return Mock(status_code=status, data=data, headers=headers or {})
+
+def policy(**options):
+    settings = dict(base_delay=0.001, max_delay=0.01)
+    settings.update(options)
+    return RetryPolicy(RetryConfig(**settings))
+
+def test_get_retried_until_recovered():
+    """Test that a GET is repeated on failure statuses and timeouts."""
+    retry = policy()
+    send = Mock(side_effect=[response(503), requests.ReadTimeout("timed out"), response(200, "ok")])
+    assert retry.call(send, "GET", f"{BASE}/nodes/pve1/qemu", {}).data == "ok"
+    assert send.call_count == 3
+    report = retry.report()
+    assert report["retries"] == 2
+    assert report["recovered"] == 1
+
+    send = Mock(return_value=response(502))
+    assert retry.call(send, "GET", f"{BASE}/nodes", {}).status_code == 502
+    assert send.call_count == 3
+    assert retry.report()["exhausted"] == 1
+
+def test_post_only_retried_when_safe():
+    """Test that POSTs are retried only before reaching Proxmox or when opted in."""
+    retry = policy()
+    url = f"{BASE}/nodes/pve1/qemu/100/status/start"
+    send = Mock(side_effect=requests.ReadTimeout("timed out"))
+    with pytest.raises(requests.ReadTimeout):
+        retry.call(send, "POST", url, {})
+    assert send.call_count == 1
+
+    send = Mock(side_effect=[requests.ConnectTimeout("timed out"), response(200)])
+    assert retry.call(send, "POST", url, {}).status_code == 200
+
+    retry = policy(safe_posts=["status/start"])
+    send = Mock(side_effect=[response(503), response(200)])
+    assert retry.call(send, "POST", url, {}).status_code == 200
+    send = Mock(return_value=response(503))
+    retry.call(send, "POST", f"{BASE}/nodes/pve1/qemu/100/status/stop", {})
+    assert send.call_count == 1
+
+def test_deadline_and_retry_after():
+    """Test that backoff honors Retry-After and stops at the deadline."""
+    retry = policy(max_delay=5.0, deadline=1.0)
+    assert retry.backoff(1, response(503, headers={"Retry-After": "2"})) == 2.0
+    assert 0 <= retry.backoff(3) <= 0.004
+
+    send = Mock(return_value=response(503, headers={"Retry-After": "2"}))
+    with patch("proxmox_mcp.core.retry.time.sleep") as sleep:
+        assert retry.call(send, "GET", f"{BASE}/nodes", {}).status_code == 503
+    sleep.assert_not_called()
+    assert send.call_count == 1
+    assert retry.report()["deadline"] == 1
+
+    retry = policy(deadline=0.5)
+    send = Mock(side_effect=[response(503), response(200)])
+    retry.call(send, "GET", f"{BASE}/nodes", {}, timeout=5)
+    assert send.call_args.kwargs["timeout"] <= 0.5
+
+def test_stale_fallback_after_retries():
+    """Test that the governed session serves stale data once retries are exhausted."""
+    gov = UpstreamGovernor(GovernorConfig(node_rate=1000, class_rates={}, failure_threshold=3))
+    session = Mock()
+    session.auth.timeout = 5
+    good = response(200, "fresh")
+    session.request.return_value = good
+    governed = GovernedSession(session, gov, policy(max_attempts=2))
+    assert governed.request("GET", f"{BASE}/nodes/pve1/lxc") is good
+
+    # Failures that leave the circuit closed are returned as they are
+    session.request.side_effect = [response(503), response(503)]
+    assert governed.request("GET", f"{BASE}/nodes/pve1/lxc").status_code == 503
+
+    # The failure that opens the circuit falls back to the last good response
+    session.request.side_effect = [response(503)]
+    assert governed.request("GET", f"{BASE}/nodes/pve1/lxc") is good
+    assert session.request.call_count == 4
+
+    session.request.side_effect = requests.ConnectionError("reset")
+    assert governed.request("GET", f"{BASE}/nodes/pve1/lxc") is good
+    with pytest.raises(requests.ConnectionError):
+        governed.request("GET", f"{BASE}/nodes/pve2/lxc")
@@ -0,0 +1,99 @@
+"""
+Tests for per-client rate limiting and fair scheduling of tool calls.
+"""
+
+import asyncio
+import pytest
+
+from proxmox_mcp.config.models import SchedulerConfig
+from proxmox_mcp.core.scheduler import JSONRPC_RATE_LIMITED, FairScheduler, Rejected
+
+def scheduler(**options):
+    settings = dict(read_rate=1000, read_burst=1000, write_rate=1000, write_burst=1000)
+    settings.update(options)
+    return FairScheduler(SchedulerConfig(**settings))
+
+async def run_backlog(sched, calls):
+    """Queue (client, weight) calls behind a held slot; return the service order."""
+    order = []
+    blocker = await sched.acquire("blocker", "get_vms")
+
+    async def call(client, weight):
+        async with await sched.acquire(client, "get_vms", weight):
+            order.append(client)
+
+    tasks = [asyncio.create_task(call(client, weight)) for client, weight in calls]
+    await asyncio.sleep(0)
+    blocker.release()
+    await asyncio.gather(*tasks)
+    return order
+
+@pytest.mark.asyncio
+async def test_budgets_per_client_and_lane():
+    """Test that budgets are per client and separate for read and write tools."""
+    sched = scheduler(read_rate=0.5, read_burst=2, write_rate=0.5, write_burst=1)
+    for _ in range(2):
+        (await sched.acquire("n8n/loop", "get_containers")).release()
+
+    with pytest.raises(Rejected) as e:
+        await sched.acquire("n8n/loop", "get_containers")
+    assert 1.0 < e.value.retry_after <= 2.0
+    assert e.value.retry_after_header == "2"
+    error = e.value.jsonrpc_error()
+    assert error["code"] == JSONRPC_RATE_LIMITED
+    assert error["data"]["retry_after"] == pytest.approx(e.value.retry_after, abs=0.01)
+
+    # Write tools and other clients have their own budgets
+    (await sched.acquire("n8n/loop", "stop_container")).release()
+    (await sched.acquire("ops", "get_containers")).release()
+    report = sched.report()
+    assert report["read"]["clients"]["n8n/loop"]["rate_limited"] == 1
+    assert report["read"]["clients"]["n8n/loop"]["admitted"] == 2
+    assert report["write"]["clients"]["n8n/loop"]["admitted"] == 1
+
+@pytest.mark.asyncio
+async def test_busy_client_does_not_starve_others():
+    """Test that a client arriving behind a backlog is served next, not last."""
+    sched = scheduler(read_slots=1)
+    order = await run_backlog(sched, [("loop", 1.0)] * 5 + [("other", 1.0)])
+
+    assert order.index("other") == 1
+    assert sched.report()["read"]["jain_index"] is not None
+
+@pytest.mark.asyncio
+async def test_weighted_share():
+    """Test that a key with weight 2 gets two slots for every one of weight 1."""
+    sched = scheduler(read_slots=1)
+    order = await run_backlog(sched, [("heavy", 2.0)] * 6 + [("light", 1.0)] * 6)
+
+    assert order[:6].count("heavy") == 4
+    assert order[:6].count("light") == 2
+
+@pytest.mark.asyncio
+async def test_queue_limit_and_timeout():
+    """Test rejections for too many waiting calls and for waiting too long."""
+    sched = scheduler(read_slots=1, max_queued=1, queue_timeout=0.05)
+    held = await sched.acquire("a", "get_vms")
+    waiting = asyncio.create_task(sched.acquire("a", "get_vms"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Rejected, match="Too many queued"):
+        await sched.acquire("a", "get_vms")
+    with pytest.raises(Rejected, match="Timed out"):
+        await waiting
+
+    held.release()
+    (await sched.acquire("a", "get_vms")).release()
+    clients = sched.report()["read"]["clients"]
+    assert clients["a"]["queue_rejected"] == 1
+    assert clients["a"]["timed_out"] == 1
+    assert sched.report()["read"]["active"] == 0
+
+@pytest.mark.asyncio
+async def test_disabled_scheduler_admits_everything():
+    """Test that a disabled scheduler neither limits nor queues."""
+    sched = scheduler(enabled=False, read_rate=0.001, read_burst=1, read_slots=1)
+    tickets = [await sched.acquire("a", "get_vms") for _ in range(5)]
+    for ticket in tickets:
+        ticket.release()
+    assert sched.report()["read"]["clients"] == {}
@@ -0,0 +1,131 @@
+"""
+Tests for fast start (background initialization and readiness).
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from proxmox_mcp.config.models import AuthConfig, ProxmoxConfig, StartupConfig
+from proxmox_mcp.core.proxmox import ProxmoxManager
+from proxmox_mcp.core.startup import Startup
+
+@pytest.fixture
+def config():
+    """Fixture for a startup configuration retrying quickly."""
+    return StartupConfig(ready_timeout=1.0, retry_interval=0.01)
+
+@pytest.mark.asyncio
+async def test_retries_until_initialized(config):
+    """Test that failed attempts are retried and readiness follows success."""
+    initialize = Mock(side_effect=[RuntimeError("unreachable"), RuntimeError("unreachable"), None])
+    on_ready = Mock()
+    startup = Startup(config)
+
+    startup.start(initialize, on_ready)
+    assert await startup.wait_ready()
+
+    assert initialize.call_count == 3
+    on_ready.assert_called_once()
+    report = startup.report()
+    assert report["ready"] is True
+    assert report["phase"] == "ready"
+    assert report["attempts"] == 3
+    assert report["error"] is None
+    assert report["timings"]["starting"] <= report["timings"]["retrying"] <= report["timings"]["ready"]
+    await startup.stop()
+
+@pytest.mark.asyncio
+async def test_wait_ready_times_out(config):
+    """Test that callers stop waiting after the timeout while retries go on."""
+    startup = Startup(config)
+    startup.start(Mock(side_effect=RuntimeError("connection refused")))
+
+    assert not await startup.wait_ready(timeout=0.05)
+    report = startup.report()
+    assert report["ready"] is False
+    assert report["phase"] == "retrying"
+    assert report["error"] == "connection refused"
+    assert report["attempts"] >= 1
+
+    await startup.stop()
+    attempts = startup.attempts
+    await asyncio.sleep(0.05)
+    assert startup.attempts <= attempts + 1
+
+@pytest.mark.asyncio
+async def test_set_ready_without_background(config):
+    """Test the blocking startup path (fast_start disabled)."""
+    startup = Startup(config)
+    assert not startup.ready
+
+    startup.set_ready()
+
+    assert await startup.wait_ready(timeout=0)
+    assert startup.report()["attempts"] == 0
+
+@pytest.mark.asyncio
+async def test_warm_up_before_ready(config):
+    """Test that warm-up steps run before readiness and failures don't block it."""
+    order = []
+    startup = Startup(config)
+    steps = [
+        ("inventory", lambda: order.append(("inventory", startup.ready))),
+        ("storage", Mock(side_effect=RuntimeError("node pve2 down"))),
+        ("tools_list", lambda: order.append(("tools_list", startup.ready))),
+    ]
+
+    startup.start(Mock(), lambda: order.append(("on_ready", startup.ready)), lambda: steps)
+    assert await startup.wait_ready()
+
+    assert order == [("inventory", False), ("tools_list", False), ("on_ready", False)]
+    report = startup.report()
+    assert report["warmup"]["inventory"]["ok"] is True
+    assert report["warmup"]["storage"] == {"ok": False, "error": "node pve2 down"}
+    assert report["timings"]["warming"] <= report["timings"]["ready"]
+    await startup.stop()
+
+def test_manager_warm_up_opens_connections():
+    """Test that ProxmoxManager.warm_up issues concurrent requests and counts successes."""
+    with patch("proxmox_mcp.core.proxmox.ProxmoxAPI") as api:
+        manager = ProxmoxManager(ProxmoxConfig(host="pve.example.com"),
+                                 AuthConfig(user="root@pam", token_name="t", token_value="v"),
+                                 verify=False)
+        api.return_value.version.get.side_effect = [{"version": "8.2"}] * 3 + [Exception("reset")]
+
+        assert manager.warm_up(4) == 3
+        assert api.return_value.version.get.call_count == 4
+        assert manager.warm_up(0) == 0
+
+def test_manager_defers_version_check():
+    """Test that ProxmoxManager(verify=False) makes no request until check()."""
+    with patch("proxmox_mcp.core.proxmox.ProxmoxAPI") as api:
+        api.return_value.version.get.return_value = {"version": "8.2"}
+        manager = ProxmoxManager(ProxmoxConfig(host="pve.example.com"),
+                                 AuthConfig(user="root@pam", token_name="t", token_value="v"),
+                                 verify=False)
+        api.return_value.version.get.assert_not_called()
+
+        assert manager.check() == {"version": "8.2"}
+
+        api.return_value.version.get.side_effect = Exception("timeout")
+        with pytest.raises(RuntimeError, match="timeout"):
+            manager.check()
+
+def test_ready_endpoint_reflects_warm_up(config):
+    """Test that /ready answers 503 until ready while /health stays 200."""
+    from fastapi.testclient import TestClient
+    from proxmox_mcp import server_http_streamable as server
+
+    startup = Startup(config)
+    with patch.object(server, "startup", startup):
+        client = TestClient(server.app)
+        startup._mark("warming up")
+
+        assert client.get("/health").status_code == 200
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["phase"] == "warming up"
+
+        startup.set_ready()
+        assert client.get("/ready").status_code == 200
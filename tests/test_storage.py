@@ -0,0 +1,149 @@
+"""
+Tests for the cluster-wide storage status collector.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import StorageConfig
+from proxmox_mcp.core.content import StorageContentIndex
+from proxmox_mcp.core.metrics import MetricsEngine
+from proxmox_mcp.core.storage import StorageStatusCollector
+from proxmox_mcp.tools.storage import StorageTools
+
+GIB = 1024 ** 3
+
+def _listing(node):
+    """Storage listing reported by one node."""
+    return [
+        {"storage": "local", "type": "dir", "content": "iso,backup", "active": 1, "enabled": 1,
+         "used": 10 * GIB, "total": 100 * GIB, "avail": 90 * GIB},
+        {"storage": "ceph", "type": "rbd", "content": "images", "shared": 1, "active": 1,
+         "enabled": 1, "used": 400 * GIB, "total": 1000 * GIB, "avail": 600 * GIB},
+    ]
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance with three nodes."""
+    mock = Mock()
+    mock.nodes.get.return_value = [
+        {"node": "pve1", "status": "online"},
+        {"node": "pve2", "status": "online"},
+        {"node": "pve3", "status": "offline"},
+    ]
+
+    def node(name):
+        api = Mock()
+        if name == "pve2":
+            api.storage.get.side_effect = Exception("timeout")
+        else:
+            api.storage.get.return_value = _listing(name)
+        return api
+
+    mock.nodes.side_effect = node
+    return mock
+
+def test_shared_storage_counted_once(mock_proxmox):
+    """Test merging of per-node listings and cluster totals."""
+    mock_proxmox.nodes.side_effect = lambda name: Mock(**{"storage.get.return_value": _listing(name)})
+    mock_proxmox.nodes.get.return_value = [{"node": "pve1", "status": "online"},
+                                           {"node": "pve2", "status": "online"}]
+    collector = StorageStatusCollector(mock_proxmox)
+
+    status = collector.collect()
+
+    names = [(s["storage"], s["node"]) for s in status["storages"]]
+    assert names == [("local", "pve1"), ("local", "pve2"), ("ceph", "shared")]
+    assert status["storages"][2]["nodes"] == ["pve1", "pve2"]
+    assert status["totals"]["total"] == 1200 * GIB
+    assert status["totals"]["used"] == 420 * GIB
+
+def test_failed_and_offline_nodes_reported(mock_proxmox):
+    """Test that one unreachable node doesn't fail the listing."""
+    collector = StorageStatusCollector(mock_proxmox)
+
+    status = collector.collect()
+
+    assert status["errors"] == {"pve2": "timeout", "pve3": "node offline"}
+    assert status["totals"]["nodes_ok"] == 1
+    assert len(status["storages"]) == 2
+
+def test_status_cached_for_ttl(mock_proxmox):
+    """Test that repeated listings reuse one collection."""
+    collector = StorageStatusCollector(mock_proxmox, StorageConfig(status_ttl=60))
+    tools = StorageTools(mock_proxmox, collector=collector)
+
+    first = tools.get_storage()
+    tools.get_storage()
+    tools.get_storage(refresh=True)
+
+    assert mock_proxmox.nodes.get.call_count == 2
+    assert collector.stats["cache_hits"] == 1
+    assert "ceph (shared)" in first[0].text
+    assert "nodes answered: 1/3" in first[0].text
+
+CONTENT = {
+    "local": [
+        {"volid": "local:iso/debian-12.iso", "content": "iso", "format": "iso", "size": 600 * 2**20},
+        {"volid": "local:backup/vzdump-qemu-120-2024_01_01.vma.zst", "content": "backup",
+         "format": "vma.zst", "size": 5 * GIB, "vmid": 120, "ctime": 1704067200},
+        {"volid": "local:backup/vzdump-qemu-120-2024_02_01.vma.zst", "content": "backup",
+         "format": "vma.zst", "size": 6 * GIB, "vmid": 120, "ctime": 1706745600},
+    ],
+    "ceph": [
+        {"volid": "ceph:vm-120-disk-0", "content": "images", "format": "raw", "size": 32 * GIB, "vmid": 120},
+        {"volid": "ceph:vm-999-disk-0", "content": "images", "format": "raw", "size": 64 * GIB, "vmid": 999},
+    ],
+}
+
+@pytest.fixture
+def content_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance with storage content."""
+    mock = Mock()
+    mock.nodes.get.return_value = [{"node": "pve1", "status": "online"}]
+    node = mock.nodes.return_value
+    node.storage.get.return_value = _listing("pve1")
+    node.storage.side_effect = lambda name: Mock(**{"content.get.return_value": CONTENT[name]})
+    mock.cluster.resources.get.return_value = [
+        {"id": "qemu/120", "type": "qemu", "node": "pve1", "vmid": 120}
+    ]
+    return mock
+
+@pytest.fixture
+def index(content_proxmox):
+    """Fixture to create a content index without status caching."""
+    config = StorageConfig(status_ttl=0)
+    collector = StorageStatusCollector(content_proxmox, config)
+    return StorageContentIndex(content_proxmox, collector, MetricsEngine(content_proxmox), config)
+
+def test_content_search_by_vmid_and_orphans(index):
+    """Test indexed lookups for backups, orphans and largest volumes."""
+    backups = index.search(content="backup", vmid=120, sort="ctime")
+    orphans = index.search(orphaned=True)
+    largest = index.search(limit=1)
+
+    assert [r["volid"] for r in backups["results"]] == [
+        "local:backup/vzdump-qemu-120-2024_02_01.vma.zst",
+        "local:backup/vzdump-qemu-120-2024_01_01.vma.zst",
+    ]
+    assert [r["volid"] for r in orphans["results"]] == ["ceph:vm-999-disk-0"]
+    assert largest["matched"] == 5 and largest["results"][0]["size"] == 64 * GIB
+    with pytest.raises(ValueError):
+        index.search(sort="name")
+
+def test_content_refresh_is_incremental(index, content_proxmox):
+    """Test that only storages whose usage changed are listed again."""
+    assert index.refresh()["crawled"] == 2
+    assert index.refresh()["crawled"] == 0
+
+    listing = _listing("pve1")
+    listing[0]["used"] += GIB
+    local = CONTENT["local"][:1]
+    content_proxmox.nodes.return_value.storage.get.return_value = listing
+    content_proxmox.nodes.return_value.storage.side_effect = lambda name: Mock(
+        **{"content.get.return_value": local if name == "local" else CONTENT[name]}
+    )
+
+    assert index.refresh() == {"crawled": 1, "skipped": 1, "added": 1, "removed": 3}
+    assert index.search(content="backup")["matched"] == 0
+    assert index.search(vmid=120)["matched"] == 1
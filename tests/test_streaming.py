@@ -0,0 +1,107 @@
+"""
+Tests for streamed listing output.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.core.profiler import tool_stats
+from proxmox_mcp.core.streaming import iterate_chunks, jsonrpc_events, text_events, wants_stream
+from proxmox_mcp.tools.containers import ContainerTools
+from proxmox_mcp.tools.vm import VMTools
+
+GIB = 1024 ** 3
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI with two nodes of guests."""
+    mock = Mock()
+    mock.nodes.get.return_value = [{"node": "pve1"}, {"node": "pve2"}]
+    guests = {
+        "pve1": [{"vmid": 100 + i, "name": f"vm-{i}", "status": "running",
+                  "mem": i * GIB, "maxmem": 8 * GIB} for i in range(5)],
+        "pve2": [{"vmid": 200, "name": "db", "status": "stopped", "mem": 0, "maxmem": 16 * GIB}],
+    }
+
+    def node(name):
+        api = Mock()
+        api.qemu.get.return_value = guests[name]
+        api.qemu.return_value.config.get.return_value = {"cores": 2}
+        api.lxc.get.return_value = [dict(g, vmid=g["vmid"] + 1000) for g in guests[name]]
+        api.lxc.return_value.status.current.get.return_value = {
+            "status": "running", "cpu": 0.5, "mem": GIB, "maxmem": 2 * GIB}
+        api.lxc.return_value.config.get.return_value = {"memory": 2048, "cores": 1}
+        return api
+
+    nodes = {}
+    mock.nodes.side_effect = lambda name: nodes.setdefault(name, node(name))
+    return mock
+
+def test_stream_vms_matches_get_vms_and_is_lazy(mock_proxmox):
+    """Test chunk concatenation and that nodes are queried as rows are needed."""
+    tools = VMTools(mock_proxmox)
+    full = tools.get_vms()[0].text
+
+    mock_proxmox.nodes.reset_mock()
+
+    stream = tools.stream_vms(chunk_size=1)
+    first = next(stream)
+    mock_proxmox.nodes.get.assert_not_called()
+    rest = list(stream)
+
+    assert first == full.split("\n")[0]
+    assert mock_proxmox.nodes.get.call_count == 1
+    assert first + "".join(rest) == full
+    assert len(rest) == 6
+
+def test_stream_containers_matches_get_containers(mock_proxmox):
+    """Test pretty and JSON streams against the buffered output."""
+    tools = ContainerTools(mock_proxmox)
+
+    for style in ("pretty", "json"):
+        full = tools.get_containers(format_style=style)[0].text
+        chunks = list(tools.stream_containers(format_style=style, chunk_size=200))
+        assert len(chunks) > 1
+        assert "".join(chunks) == full
+    assert len(json.loads(full)) == 6
+
+def test_text_events_and_stats():
+    """Test SSE rendering, error events and time accounting."""
+    def chunks():
+        yield "a"
+        yield "b"
+
+    def failing():
+        yield "a"
+        raise RuntimeError("node down")
+
+    async def collect(events):
+        return [e async for e in events]
+
+    events = asyncio.run(collect(text_events(iterate_chunks(chunks(), "stream_test"))))
+    failed = asyncio.run(collect(text_events(iterate_chunks(failing(), "stream_test"))))
+
+    assert events[0] == 'event: chunk\ndata: {"type": "text", "text": "a"}\n\n'
+    assert events[-1] == 'event: end\ndata: {"chunks": 2}\n\n'
+    assert failed[-1] == 'event: error\ndata: {"message": "node down"}\n\n'
+    stats = tool_stats.snapshot("stream_test")["stream_test"]
+    assert stats["calls"] == 2 and stats["errors"] == 1
+
+def test_jsonrpc_events_and_negotiation():
+    """Test JSON-RPC notifications, final response and Accept handling."""
+    async def chunks():
+        yield "x"
+
+    async def collect():
+        return [e async for e in jsonrpc_events(7, chunks())]
+
+    notification, response = [json.loads(e.split("data: ", 1)[1]) for e in asyncio.run(collect())]
+
+    assert notification["method"] == "notifications/tools/output"
+    assert notification["params"] == {"requestId": 7, "content": [{"type": "text", "text": "x"}]}
+    assert response == {"jsonrpc": "2.0", "id": 7, "result": {"content": [], "streamed": True, "chunks": 1}}
+    assert wants_stream("text/event-stream")
+    assert not wants_stream("application/json, text/event-stream")
+    assert not wants_stream(None)
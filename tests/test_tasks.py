@@ -0,0 +1,171 @@
+"""
+Tests for the asynchronous task tracker.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.core.tasks import TaskLogTailer, TaskTracker, parse_upid
+from proxmox_mcp.tools.containers import ContainerTools
+from proxmox_mcp.tools.tasks import MAX_WAIT_TIMEOUT, TaskTools
+
+UPID_A = "UPID:pve1:0000A1B2:00C0FFEE:65000000:qmstart:100:root@pam:"
+UPID_B = "UPID:pve1:0000A1B3:00C0FFEF:65000001:vzstart:200:root@pam:"
+
+@pytest.fixture
+def mock_proxmox():
+    """Fixture to create a mock ProxmoxAPI instance."""
+    return Mock()
+
+@pytest.fixture
+def tracker(mock_proxmox):
+    """Fixture to create a tracker without poll rate limiting."""
+    return TaskTracker(mock_proxmox, min_poll_interval=0.01, max_poll_interval=0.01)
+
+def test_parse_upid():
+    """Test splitting a UPID into its fields."""
+    info = parse_upid(UPID_A)
+    assert info["node"] == "pve1"
+    assert info["type"] == "qmstart"
+    assert info["id"] == "100"
+    assert info["starttime"] == 0x65000000
+
+    with pytest.raises(ValueError):
+        parse_upid("not-a-upid")
+
+def test_track_ignores_non_upids(tracker):
+    """Test that synchronous responses are not tracked."""
+    assert tracker.track(None) is None
+    assert tracker.track({"data": None}) is None
+    assert tracker.track(UPID_A, "start VM 100")["label"] == "start VM 100"
+    assert tracker.outstanding() == [UPID_A]
+
+def test_poll_batches_per_node(tracker, mock_proxmox):
+    """Test that one active-task listing covers every pending task on a node."""
+    node = mock_proxmox.nodes.return_value
+    node.tasks.get.return_value = [{"upid": UPID_B}]
+    node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+    tracker.track(UPID_A)
+    tracker.track(UPID_B)
+
+    tracker.poll(force=True)
+
+    node.tasks.get.assert_called_once_with(source="active")
+    node.tasks.assert_called_once_with(UPID_A)
+    assert tracker.get(UPID_A)["ok"] is True
+    assert tracker.get(UPID_B)["status"] == "running"
+    assert tracker.api_calls == 2
+
+def test_poll_rate_cap(mock_proxmox):
+    """Test that a node is not polled again within min_poll_interval."""
+    tracker = TaskTracker(mock_proxmox, min_poll_interval=60)
+    node = mock_proxmox.nodes.return_value
+    node.tasks.return_value.status.get.return_value = {"status": "running"}
+    tracker.track(UPID_A)
+
+    tracker.poll()
+    tracker.poll()
+
+    assert tracker.api_calls == 1
+
+def test_concurrent_waiters_share_node_polls(mock_proxmox):
+    """Test that two waiters on one node stay within its poll rate cap."""
+    tracker = TaskTracker(mock_proxmox, min_poll_interval=0.05, max_poll_interval=0.05)
+    node = mock_proxmox.nodes.return_value
+    done_at = time.monotonic() + 0.5
+    node.tasks.get.side_effect = lambda **kw: (
+        [{"upid": UPID_A}, {"upid": UPID_B}] if time.monotonic() < done_at else [])
+    node.tasks.return_value.status.get.side_effect = lambda: (
+        {"status": "running"} if time.monotonic() < done_at else {"status": "stopped", "exitstatus": "OK"})
+    results = {}
+    threads = [threading.Thread(target=lambda u=upid: results.update({u: tracker.wait([u], timeout=2)}))
+               for upid in (UPID_A, UPID_B)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[UPID_A][0]["ok"] is True and results[UPID_B][0]["ok"] is True
+    # One listing per interval covers both waiters (about 10 over 0.5 s) plus
+    # a few status reads; waiters polling on their own make ~20 reads
+    assert tracker.api_calls <= 14
+
+def test_wait_tasks_timeout_is_capped(mock_proxmox):
+    """Test that a caller-supplied timeout can't exceed MAX_WAIT_TIMEOUT."""
+    tracker = Mock()
+    tracker.wait.return_value = []
+    tools = TaskTools(mock_proxmox, tasks=tracker)
+
+    tools.wait_tasks(UPID_A, timeout=86400)
+    tools.wait_tasks(UPID_A, timeout=-5)
+
+    assert [c.args[1] for c in tracker.wait.call_args_list] == [MAX_WAIT_TIMEOUT, 0]
+
+def test_wait_times_out(tracker, mock_proxmox):
+    """Test that wait returns running tasks once the timeout expires."""
+    node = mock_proxmox.nodes.return_value
+    node.tasks.return_value.status.get.return_value = {"status": "running"}
+
+    tasks = tracker.wait([UPID_A], timeout=0.05)
+
+    assert tasks[0]["status"] == "running"
+    assert tasks[0]["ok"] is False
+
+def test_container_wait_reports_failed_task(tracker, mock_proxmox):
+    """Test that a failed task marks the container action as failed."""
+    node = mock_proxmox.nodes.return_value
+    node.tasks.return_value.status.get.return_value = {
+        "status": "stopped", "exitstatus": "command failed"
+    }
+    tools = ContainerTools(mock_proxmox, tasks=tracker)
+    results = [{"ok": True, "node": "pve1", "vmid": "200", "name": "db", "message": UPID_B}]
+
+    tools._settle_tasks(results, timeout=1)
+
+    assert results[0]["ok"] is False
+    assert results[0]["error"] == "task failed: command failed"
+    assert results[0]["task"]["status"] == "stopped"
+
+def _log_pages(lines):
+    """Build a fake /tasks/{upid}/log endpoint over `lines`."""
+    def get(start=0, limit=50):
+        page = [{"n": i + 1, "t": t} for i, t in enumerate(lines)][start:start + limit]
+        return page or [{"n": 0, "t": "no content"}]
+    return get
+
+def test_fetch_log_is_incremental(tracker, mock_proxmox):
+    """Test offset-based log reads and paging."""
+    lines = [f"line {i}" for i in range(7)]
+    mock_proxmox.nodes.return_value.tasks.return_value.log.get.side_effect = _log_pages(lines)
+
+    first, nxt = tracker.fetch_log(UPID_A, 0, page_size=3)
+    assert [l["t"] for l in first] == lines
+    assert nxt == 7
+    assert tracker.api_calls == 3
+
+    more, nxt = tracker.fetch_log(UPID_A, nxt)
+    assert more == [] and nxt == 7
+
+def test_tailer_shares_polling(tracker, mock_proxmox):
+    """Test that two followers of one task share a single log cursor."""
+    node = mock_proxmox.nodes.return_value
+    lines = ["starting", "copying", "done"]
+    node.tasks.return_value.log.get.side_effect = _log_pages(lines)
+    node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+    tailer = TaskLogTailer(tracker, poll_interval=0.01)
+
+    async def follow(start):
+        return [e async for e in tailer.stream(UPID_A, start)]
+
+    async def run():
+        return await asyncio.gather(follow(0), follow(1))
+
+    full, resumed = asyncio.run(run())
+
+    assert [p["t"] for k, p in full if k == "line"] == lines
+    assert [p["t"] for k, p in resumed if k == "line"] == lines[1:]
+    assert full[-1][0] == "end" and full[-1][1]["ok"] is True
+    assert node.tasks.return_value.log.get.call_count == 1
@@ -0,0 +1,126 @@
+"""
+Tests for the local time-series store.
+"""
+
+import math
+import os
+import time
+import pytest
+from unittest.mock import Mock
+
+from proxmox_mcp.config.models import MetricsConfig
+from proxmox_mcp.core.metrics import MetricsEngine
+from proxmox_mcp.core.tsstore import TimeSeriesStore
+
+DAY = 86400
+
+def _snapshot(cpu, netin):
+    """Build one /cluster/resources snapshot."""
+    return [
+        {"id": "qemu/100", "type": "qemu", "node": "pve1", "vmid": 100, "name": "web",
+         "cpu": cpu, "mem": 512, "maxmem": 1024, "netin": netin},
+        {"id": "storage/pve1/local", "type": "storage", "node": "pve1", "storage": "local",
+         "disk": 30, "maxdisk": 100},
+        {"id": "pool/ops", "type": "pool"},
+    ]
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture to create a store flushing on demand only."""
+    return TimeSeriesStore(str(tmp_path), retention_days=7, flush_interval=3600)
+
+def test_reads_merge_disk_and_buffer(store):
+    """Test that flushed and buffered samples are both visible."""
+    now = time.time()
+    assert store.append(now - 120, _snapshot(0.1, 0)) == 2
+    store.flush()
+    store.append(now - 60, _snapshot(0.3, 6000))
+    assert store.append(now - 60, _snapshot(0.9, 0)) == 0
+
+    times, cols = store.window("qemu/100", now - 3600, fields=("cpu", "netin"))
+
+    assert times == [now - 120, now - 60]
+    assert cols == {"cpu": [0.1, 0.3], "netin": [0.0, 6000.0]}
+    assert store.window("storage/pve1/local", now - 3600, fields=("disk",))[1]["disk"] == [30.0, 30.0]
+
+def test_columns_are_fixed_width_files(store, tmp_path):
+    """Test the on-disk columnar layout."""
+    now = time.time()
+    for i in range(3):
+        store.append(now - 300 + i, _snapshot(0.5, i))
+    store.flush()
+
+    segment = store.segments()[-1]
+    series = os.path.join(str(tmp_path), segment, "qemu%2F100")
+    assert os.path.getsize(os.path.join(series, "cpu.f64")) == 3 * 8
+    assert os.path.getsize(os.path.join(series, "time.f64")) == 3 * 8
+
+def test_past_segments_are_memory_mapped_and_expired(store):
+    """Test reads across days and whole-segment retention."""
+    now = time.time()
+    store.append(now - 3 * DAY, _snapshot(0.2, 0))
+    store.flush()
+    store.append(now, _snapshot(0.4, 0))
+
+    times, cols = store.window("qemu/100", now - 4 * DAY, fields=("cpu",))
+    assert cols["cpu"] == [0.2, 0.4]
+    assert store.report()["open_maps"] == 2
+    assert store.covers(now - 3 * DAY)
+
+    store.append(now + 6 * DAY, _snapshot(0.5, 0))
+    assert not store.covers(now - 3 * DAY)
+    assert store.report()["segments_expired"] == 1
+    store.close()
+
+def test_coverage_starts_at_first_sample(store):
+    """Test that a segment only covers the day from its first sample on."""
+    now = time.time()
+    midnight = now - now % DAY
+    store.append(midnight + 3600, _snapshot(0.1, 0))
+    store.flush()
+
+    assert store.covers(midnight + 3600)
+    assert not store.covers(midnight + 60)
+    store.append(midnight + 7200, _snapshot(0.2, 0))
+    assert not store.covers(midnight + 60)
+
+def test_torn_flush_is_truncated_to_whole_rows(store, tmp_path):
+    """Test that columns left uneven by a crash are realigned before appending."""
+    now = time.time()
+    store.append(now - 300, _snapshot(0.1, 0))
+    store.flush()
+    series = os.path.join(str(tmp_path), store.segments()[-1], "qemu%2F100")
+    # Crash mid-flush: a whole cpu row and half a netin value, no time row
+    with open(os.path.join(series, "cpu.f64"), "ab") as fh:
+        fh.write(b"\0" * 8)
+    with open(os.path.join(series, "netin.f64"), "ab") as fh:
+        fh.write(b"\0" * 3)
+
+    reopened = TimeSeriesStore(str(tmp_path), retention_days=7, flush_interval=3600)
+    reopened.append(now - 60, _snapshot(0.3, 42))
+    reopened.flush()
+
+    times, cols = reopened.window("qemu/100", now - 3600, fields=("cpu", "netin"))
+    assert times == [now - 300, now - 60]
+    assert cols == {"cpu": [0.1, 0.3], "netin": [0.0, 42.0]}
+    assert os.path.getsize(os.path.join(series, "netin.f64")) == 2 * 8
+
+def test_query_answered_from_store(tmp_path):
+    """Test that a covered query never touches the RRD API."""
+    mock = Mock()
+    now = time.time()
+    mock.cluster.resources.get.return_value = _snapshot(0.5, 0)
+    engine = MetricsEngine(mock, config=MetricsConfig(store_path=str(tmp_path)))
+    engine.ingest(_snapshot(0.9, 0), now - 2 * DAY)
+    engine.ingest(_snapshot(0.7, 1000), now - 3600)
+    engine.ingest(_snapshot(0.5, 4600), now - 3000)
+
+    cpu = engine.query("cpu", "day", "max")
+    net = engine.query("netin", "day", "mean", source="store")
+
+    assert cpu["source"] == "store"
+    assert cpu["results"][0]["value"] == 70.0
+    assert math.isclose(net["results"][0]["value"], 6.0)
+    mock.nodes.assert_not_called()
+    with pytest.raises(ValueError):
+        engine.query("loadavg", source="store")